@@ -0,0 +1 @@
+"""Performance benchmarks for the GCS Kernel (run with python -m benchmarks.<name>)."""
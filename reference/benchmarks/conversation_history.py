@@ -0,0 +1,98 @@
+"""
+Benchmark of conversation history handling over long sessions.
+
+Each turn creates a prompt object from the session's history, clones it (as
+a retry or branch would), appends the turn's messages and builds the
+provider request. The kernel keeps every turn's prompt object in its prompt
+registry, so whatever each turn copies stays in memory for the session.
+
+Compares the previous list-based history, where the prompt object's
+validation copies every message, clone() deep-copies the history and
+build_request copies the message list, against MessageLog, whose snapshots
+and forks share the messages.
+
+Usage (from the reference directory):
+    python -m benchmarks.conversation_history [--turns N] [--repeat N]
+"""
+
+import argparse
+import copy
+import statistics
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+from gcs_kernel.message_log import MessageLog
+
+
+def make_turn(index: int) -> List[Dict[str, Any]]:
+    """Generate the messages of one tool-using turn."""
+    call_id = f"call_{index}"
+    return [
+        {"role": "user", "content": f"Please look at file {index} and tell me what it does."},
+        {"role": "assistant", "content": None, "tool_calls": [{"id": call_id, "type": "function", "function": {
+            "name": "read_file", "arguments": f'{{"path": "src/file_{index}.py"}}'}}]},
+        {"role": "tool", "tool_call_id": call_id, "content": "def main():\n    return 42\n" * 20},
+        {"role": "assistant", "content": f"File {index} defines a main function returning 42."},
+    ]
+
+
+def copying_turn(history: List[Dict[str, Any]], turn: List[Dict[str, Any]]):
+    """The previous handling: each step copies the history."""
+    prompt_history = [dict(message) for message in history]  # Validating List[Dict] copies every message
+    clone = copy.deepcopy(prompt_history)  # PromptObject.clone()
+    clone.extend(turn)
+    messages = clone.copy()  # build_request
+    return clone, messages
+
+
+def shared_turn(history: MessageLog, turn: List[Dict[str, Any]]):
+    """MessageLog: the prompt object and its clone share the history."""
+    prompt_history = history.snapshot()  # Validating a MessageLog snapshots it
+    clone = copy.deepcopy(prompt_history)  # PromptObject.clone() forks the log
+    clone.extend(turn)
+    messages = list(clone)  # build_request
+    return clone, messages
+
+
+def run_session(turns: int, new_history: Callable, run_turn: Callable) -> Dict[str, float]:
+    """Run a session, timing each turn and measuring the memory kept at its end."""
+    history = new_history([{"role": "system", "content": "You are a helpful coding assistant."}])
+    registry = []
+    timings = []
+    tracemalloc.start()
+    for index in range(turns):
+        turn = make_turn(index)
+        start = time.perf_counter()
+        history, messages = run_turn(history, turn)
+        timings.append(time.perf_counter() - start)
+        registry.append(history)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "total_ms": sum(timings) * 1000,
+        "last_turn_us": statistics.median(timings[-10:]) * 1e6,
+        "retained_mb": retained / 2 ** 20,
+        "peak_mb": peak / 2 ** 20,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=500, help="Turns per session")
+    parser.add_argument("--repeat", type=int, default=3, help="Sessions per strategy")
+    args = parser.parse_args()
+
+    print(f"History handling over a {args.turns}-turn session ({args.repeat} sessions, medians; "
+          f"timings include tracemalloc overhead)")
+    print(f"  {'strategy':<10} {'session ms':>11} {'late turn us':>13} {'retained MB':>12} {'peak MB':>9}")
+    for name, new_history, run_turn in (("copying", list, copying_turn), ("shared", MessageLog, shared_turn)):
+        results = [run_session(args.turns, new_history, run_turn) for _ in range(args.repeat)]
+        print(f"  {name:<10} {statistics.median(r['total_ms'] for r in results):>11.1f} "
+              f"{statistics.median(r['last_turn_us'] for r in results):>13.1f} "
+              f"{statistics.median(r['retained_mb'] for r in results):>12.1f} "
+              f"{statistics.median(r['peak_mb'] for r in results):>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Latency benchmark for the MCP transports used with local servers.
+
+Starts the it_operations MCP server twice, once as an HTTP server on a free
+loopback port and once as a stdio process supervised by the kernel's local
+server pool, then measures connection setup and per-call latency of each
+it_operations tool over both transports.
+
+Usage (from the reference directory):
+    python -m benchmarks.mcp_transport_latency [--iterations N]
+"""
+
+import argparse
+import asyncio
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from gcs_kernel.mcp.client_manager import MCPClientManager
+from gcs_kernel.models import MCPConfig
+
+
+SERVER_DIR = Path(__file__).resolve().parent.parent / "domains" / "it_operations" / "server"
+TOOLS = {
+    "get_system_load": {},
+    "get_memory_usage": {"human_readable": True},
+    "get_disk_usage": {"path": "/"},
+    "get_process_list": {"limit": 5},
+}
+
+
+def _free_port() -> int:
+    """Pick a free TCP port on the loopback interface."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def _wait_for_port(port: int, timeout: float = 15.0):
+    """Wait until something accepts connections on the port."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.close()
+            await writer.wait_closed()
+            return
+        except OSError:
+            await asyncio.sleep(0.1)
+    raise TimeoutError(f"HTTP server did not start on port {port}")
+
+
+async def _measure_calls(client, iterations: int) -> Dict[str, List[float]]:
+    """Call every tool `iterations` times and return latencies in milliseconds."""
+    latencies: Dict[str, List[float]] = {}
+    for tool_name, arguments in TOOLS.items():
+        await client.call_tool(tool_name, arguments)  # Warm-up
+        samples = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            await client.call_tool(tool_name, arguments)
+            samples.append((time.perf_counter() - start) * 1000)
+        latencies[tool_name] = samples
+    return latencies
+
+
+async def bench_http(iterations: int, runtime_dir: str):
+    """Benchmark the streamable HTTP transport against a uvicorn-served server."""
+    port = _free_port()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "mcp_server:app", "--host", "127.0.0.1",
+         "--port", str(port), "--log-level", "warning"],
+        cwd=SERVER_DIR
+    )
+    manager = MCPClientManager(MCPConfig(server_url="", runtime_data_directory=runtime_dir,
+                                         capability_cache_ttl=0))
+    try:
+        await _wait_for_port(port)
+        await manager.initialize(connect_to_registered_servers=False)
+        url = f"http://127.0.0.1:{port}/"
+        start = time.perf_counter()
+        if not await manager.connect_to_server(url, "it_operations (http)"):
+            raise RuntimeError("Could not connect to the HTTP server")
+        connect_ms = (time.perf_counter() - start) * 1000
+        client = await manager.get_client_for_tool("get_system_load")
+        return connect_ms, await _measure_calls(client, iterations)
+    finally:
+        await manager.shutdown()
+        process.terminate()
+        process.wait(timeout=10)
+
+
+async def bench_stdio(iterations: int, runtime_dir: str):
+    """Benchmark the stdio transport with a kernel-supervised server process."""
+    manager = MCPClientManager(MCPConfig(server_url="", runtime_data_directory=runtime_dir,
+                                         capability_cache_ttl=0))
+    try:
+        await manager.initialize(connect_to_registered_servers=False)
+        start = time.perf_counter()
+        if not await manager.connect_to_local_server(
+                sys.executable, [str(SERVER_DIR / "mcp_server.py"), "--stdio"],
+                server_name="it_operations (stdio)", cwd=str(SERVER_DIR)):
+            raise RuntimeError("Could not start the stdio server")
+        connect_ms = (time.perf_counter() - start) * 1000
+        client = await manager.get_client_for_tool("get_system_load")
+        return connect_ms, await _measure_calls(client, iterations)
+    finally:
+        await manager.shutdown()
+
+
+def _report(name: str, connect_ms: float, latencies: Dict[str, List[float]]):
+    print(f"\n{name}: connect + list_tools {connect_ms:.1f} ms")
+    print(f"  {'tool':<18} {'p50 ms':>8} {'p95 ms':>8} {'mean ms':>8}")
+    for tool_name, samples in latencies.items():
+        ordered = sorted(samples)
+        p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+        print(f"  {tool_name:<18} {statistics.median(ordered):>8.2f} {p95:>8.2f} {statistics.mean(ordered):>8.2f}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=50, help="Calls per tool and transport")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as runtime_dir:
+        http_results = await bench_http(args.iterations, runtime_dir)
+        stdio_results = await bench_stdio(args.iterations, runtime_dir)
+
+    _report("HTTP (streamable HTTP over TCP loopback)", *http_results)
+    _report("stdio (supervised local process)", *stdio_results)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
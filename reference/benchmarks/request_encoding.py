@@ -0,0 +1,94 @@
+"""
+Benchmark of encoding provider request bodies over a long session.
+
+Compares serializing the whole request on every turn, as httpx does for its
+json argument, against RequestEncoder, which reuses the encoded messages and
+tool list of earlier turns. Each turn appends a user message, a tool call,
+its output and an answer, then encodes the request the next turn would send.
+
+Usage (from the reference directory):
+    python -m benchmarks.request_encoding [--turns N] [--tools N] [--repeat N]
+"""
+
+import argparse
+import json
+import statistics
+import time
+from typing import Any, Callable, Dict, List
+
+from services.llm_provider.request_encoder import RequestEncoder
+
+
+def make_tools(count: int) -> List[Dict[str, Any]]:
+    """Generate provider-format tool definitions with a few parameters each."""
+    return [{"type": "function", "function": {
+        "name": f"tool_{index}",
+        "description": f"Tool number {index}, which reads, filters and summarizes project data.",
+        "parameters": {"type": "object", "properties": {
+            "path": {"type": "string", "description": "Path of the file to work on"},
+            "limit": {"type": "integer", "description": "Maximum number of results"},
+        }, "required": ["path"]},
+    }} for index in range(count)]
+
+
+def make_turn(index: int) -> List[Dict[str, Any]]:
+    """Generate the messages of one tool-using turn."""
+    call_id = f"call_{index}"
+    return [
+        {"role": "user", "content": f"Please look at file {index} and tell me what it does."},
+        {"role": "assistant", "content": None, "tool_calls": [{"id": call_id, "type": "function", "function": {
+            "name": "tool_1", "arguments": json.dumps({"path": f"src/file_{index}.py"})}}]},
+        {"role": "tool", "tool_call_id": call_id, "content": "def main():\n    return 42\n" * 40},
+        {"role": "assistant", "content": f"File {index} defines a main function returning 42."},
+    ]
+
+
+def full_encoding() -> Callable[[Dict[str, Any]], bytes]:
+    """The previous approach: serialize the complete request every time."""
+    return lambda request: json.dumps(request, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def incremental_encoding() -> Callable[[Dict[str, Any]], bytes]:
+    """RequestEncoder: encode new messages only and join cached fragments."""
+    return RequestEncoder().encode
+
+
+def measure(make_encoder: Callable, turns: int, tools: List[Dict[str, Any]]) -> Dict[str, float]:
+    """Run a session with an encoding strategy and time each turn's encoding."""
+    encode = make_encoder()
+    history = [{"role": "system", "content": "You are a helpful coding assistant."}]
+    timings = []
+    for index in range(turns):
+        history.extend(make_turn(index))
+        request = {"messages": list(history), "model": "gpt-4-turbo", "tools": tools, "max_tokens": 1024}
+        start = time.perf_counter()
+        encode(request)
+        timings.append(time.perf_counter() - start)
+    return {
+        "total_ms": sum(timings) * 1000,
+        "last_turn_us": statistics.median(timings[-10:]) * 1e6,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=500, help="Turns per session")
+    parser.add_argument("--tools", type=int, default=200, help="Tools sent with every request")
+    parser.add_argument("--repeat", type=int, default=3, help="Sessions per strategy")
+    args = parser.parse_args()
+
+    tools = make_tools(args.tools)
+    request = {"messages": make_turn(0), "model": "gpt-4-turbo", "tools": tools}
+    assert json.loads(full_encoding()(request)) == json.loads(incremental_encoding()(request))
+
+    print(f"Encoding requests of a {args.turns}-turn session with {args.tools} tools "
+          f"({args.repeat} sessions, medians)")
+    print(f"  {'strategy':<12} {'session ms':>11} {'late turn us':>13}")
+    for name, make_encoder in (("full", full_encoding), ("incremental", incremental_encoding)):
+        results = [measure(make_encoder, args.turns, tools) for _ in range(args.repeat)]
+        print(f"  {name:<12} {statistics.median(r['total_ms'] for r in results):>11.1f} "
+              f"{statistics.median(r['last_turn_us'] for r in results):>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Benchmark of resuming dormant sessions from the session store.
+
+Writes many sessions of tool-using turns into a fresh SQLite store, one
+append per turn as the orchestrator does, then resumes random sessions
+and reports the resume latency and the memory a resumed session holds,
+next to what keeping every session's full history in memory would take.
+
+Usage (from the reference directory):
+    python -m benchmarks.session_store [--sessions N] [--turns N] [--resumes N]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Dict, List
+
+from services.ai_orchestrator.session_store import SessionStore, SessionStoreConfig
+
+
+def make_turn(index: int) -> List[Dict[str, Any]]:
+    """Generate the messages of one tool-using turn."""
+    call_id = f"call_{index}"
+    return [
+        {"role": "user", "content": f"Please look at file {index} and tell me what it does."},
+        {"role": "assistant", "content": None, "tool_calls": [{"id": call_id, "type": "function", "function": {
+            "name": "read_file", "arguments": f'{{"path": "src/file_{index}.py"}}'}}]},
+        {"role": "tool", "tool_call_id": call_id, "content": "def main():\n    return 42\n" * 20},
+        {"role": "assistant", "content": f"File {index} defines a main function returning 42."},
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=2000, help="Dormant sessions in the store")
+    parser.add_argument("--turns", type=int, default=25, help="Turns per session")
+    parser.add_argument("--resumes", type=int, default=500, help="Sessions resumed")
+    parser.add_argument("--tail", type=int, default=40, help="Messages loaded on resume")
+    args = parser.parse_args()
+
+    turns = [make_turn(index) for index in range(args.turns)]
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "sessions.db")
+        store = SessionStore(SessionStoreConfig(path=path, tail_messages=args.tail))
+
+        start = time.perf_counter()
+        for session in range(args.sessions):
+            for turn in turns:
+                store.append_messages(f"session_{session}", turn)
+        write_seconds = time.perf_counter() - start
+        appends = args.sessions * args.turns
+        size_mb = sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory)) / 2 ** 20
+
+        tracemalloc.start()
+        snapshot = store.load_session("session_0")
+        tail_bytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del snapshot
+        tracemalloc.start()
+        full_history = store.load_messages("session_0", 0, args.turns * 4)
+        full_bytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del full_history
+
+        latencies = []
+        for _ in range(args.resumes):
+            session_id = f"session_{random.randrange(args.sessions)}"
+            start = time.perf_counter()
+            store.load_session(session_id)
+            latencies.append(time.perf_counter() - start)
+        store.close()
+
+    latencies.sort()
+    print(f"Session store with {args.sessions} sessions of {args.turns} turns ({args.turns * 4} messages each)")
+    print(f"  appends             {appends / write_seconds:>10.0f} turns/s")
+    print(f"  database size       {size_mb:>10.1f} MB on disk")
+    print(f"  resume p50          {statistics.median(latencies) * 1000:>10.2f} ms")
+    print(f"  resume p99          {latencies[int(len(latencies) * 0.99) - 1] * 1000:>10.2f} ms")
+    print(f"  resumed session     {tail_bytes / 1024:>10.1f} KB in memory (tail of {args.tail} messages)")
+    print(f"  full history        {full_bytes / 1024:>10.1f} KB per session, "
+          f"{full_bytes * args.sessions / 2 ** 20:.1f} MB for all sessions kept in memory")
+
+
+if __name__ == "__main__":
+    main()
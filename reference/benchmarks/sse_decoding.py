@@ -0,0 +1,154 @@
+"""
+CPU benchmark of provider stream decoding in ContentGenerationPipeline.
+
+Compares the previous approach with iter_sse_json under each JSON backend
+installed. The previous approach iterated httpx's aiter_lines(), then
+stripped and prefix-checked each line and parsed it with json.loads.
+iter_sse_json decodes aiter_bytes() directly. Both read a real
+httpx.Response. Its body is a synthetic chat completion of one token per
+chunk, cut into reads of a fixed size. Time is CPU time of a single thread,
+so the tokens/s column is the throughput of one core.
+
+Usage (from the reference directory):
+    python -m benchmarks.sse_decoding [--tokens N] [--read-size BYTES] [--repeat N]
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+import httpx
+
+from services.llm_provider.sse import _load_backend, iter_sse_json
+
+
+def make_body(token_count: int) -> bytes:
+    """
+    Build the server-sent events body of a streamed completion.
+
+    Args:
+        token_count: Number of content chunks, one token each
+
+    Returns:
+        The response body, terminated by the [DONE] sentinel
+    """
+    events = []
+    for index in range(token_count):
+        chunk = {
+            "id": "chatcmpl-benchmark", "object": "chat.completion.chunk", "created": 1700000000,
+            "model": "gpt-4-turbo", "system_fingerprint": "fp_benchmark",
+            "choices": [{"index": 0, "delta": {"content": f" token{index % 100}"},
+                         "logprobs": None, "finish_reason": None}],
+        }
+        events.append(f"data: {json.dumps(chunk)}\n\n")
+    events.append("data: [DONE]\n\n")
+    return "".join(events).encode()
+
+
+def split_reads(body: bytes, read_size: int) -> List[bytes]:
+    """Cut the body into network reads of a fixed size."""
+    return [body[start:start + read_size] for start in range(0, len(body), read_size)]
+
+
+class ReadStream(httpx.AsyncByteStream):
+    """Response body delivered in the given reads, as the transport would."""
+
+    def __init__(self, reads: List[bytes]):
+        self.reads = reads
+
+    async def __aiter__(self):
+        for data in self.reads:
+            yield data
+
+
+async def line_based_decoding(reads: List[bytes]) -> List[Any]:
+    """The previous approach: aiter_lines(), then strip, prefix checks and json.loads per line."""
+    response = httpx.Response(200, stream=ReadStream(reads))
+    chunks = []
+    async for line in response.aiter_lines():
+        line = line.strip()
+        if line.startswith("data: "):
+            data_content = line[6:]
+            if data_content == "[DONE]":
+                break
+            try:
+                if data_content and data_content.strip():
+                    chunks.append(json.loads(data_content))
+            except json.JSONDecodeError:
+                continue
+    return chunks
+
+
+def make_byte_decoding(backend_name: str) -> Callable[[List[bytes]], Awaitable[List[Any]]]:
+    """aiter_bytes() decoded by iter_sse_json with the given JSON backend."""
+    backend = _load_backend(backend_name)
+
+    async def byte_decoding(reads: List[bytes]) -> List[Any]:
+        response = httpx.Response(200, stream=ReadStream(reads))
+        return [chunk async for chunk in iter_sse_json(response.aiter_bytes(), backend)]
+
+    return byte_decoding
+
+
+def measure(strategies: List[Tuple[str, Callable[[List[bytes]], Awaitable[List[Any]]]]],
+            reads: List[bytes], repeat: int) -> Dict[str, float]:
+    """
+    Fastest CPU time of each strategy to decode the whole stream.
+
+    Strategies take turns in every round and the garbage collector is paused
+    while timing (like timeit), so load changes during the run hit all of them alike.
+    """
+    loop = asyncio.new_event_loop()
+    best: Dict[str, float] = {}
+    try:
+        for _ in range(repeat):
+            for name, decode in strategies:
+                gc.collect()
+                gc.disable()
+                try:
+                    start = time.process_time()
+                    loop.run_until_complete(decode(reads))
+                    elapsed = time.process_time() - start
+                finally:
+                    gc.enable()
+                best[name] = min(best.get(name, elapsed), elapsed)
+    finally:
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        loop.close()
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tokens", type=int, default=50000, help="Streamed tokens (one per chunk)")
+    parser.add_argument("--read-size", type=int, default=1024, help="Bytes per network read")
+    parser.add_argument("--repeat", type=int, default=10, help="Runs per strategy")
+    args = parser.parse_args()
+
+    body = make_body(args.tokens)
+    reads = split_reads(body, args.read_size)
+    strategies = [("lines + json", line_based_decoding)]
+    for backend_name in ("json", "orjson", "msgspec"):
+        if _load_backend(backend_name):
+            strategies.append((f"bytes + {backend_name}", make_byte_decoding(backend_name)))
+
+    expected = asyncio.run(line_based_decoding(reads))
+    for name, decode in strategies:
+        assert asyncio.run(decode(reads)) == expected, name
+
+    print(f"Decoding {args.tokens} streamed tokens ({len(body) / 1024:.0f} KiB in {args.read_size}-byte reads, "
+          f"{args.repeat} runs, best CPU time)")
+    print(f"  {'strategy':<16} {'CPU ms':>9} {'us/token':>9} {'tokens/s/core':>14} {'speedup':>8}")
+    results = measure(strategies, reads, args.repeat)
+    baseline = results[strategies[0][0]]
+    for name, _ in strategies:
+        seconds = results[name]
+        print(f"  {name:<16} {seconds * 1000:>9.1f} {seconds / args.tokens * 1e6:>9.2f} "
+              f"{args.tokens / seconds:>14,.0f} {baseline / seconds:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
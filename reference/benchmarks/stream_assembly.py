@@ -0,0 +1,139 @@
+"""
+Benchmark of streamed completion assembly in LLMContentGenerator.
+
+Compares the previous approach (keep every chunk, then rebuild content and
+tool call arguments with repeated string concatenation once the stream ends)
+against StreamAccumulator, which folds each chunk in as it arrives. Reports
+per-chunk cost, the end-of-stream latency before tool execution could start,
+and peak memory of the assembly.
+
+Usage (from the reference directory):
+    python -m benchmarks.stream_assembly [--chunks N] [--repeat N]
+"""
+
+import argparse
+import statistics
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+from services.llm_provider.stream_accumulator import StreamAccumulator
+
+
+def make_stream(chunk_count: int, tool_calls: int = 3) -> Iterator[Dict[str, Any]]:
+    """
+    Generate a synthetic stream: content deltas followed by interleaved tool call argument deltas.
+
+    Chunks are created one at a time, like a decoder produces them, so a
+    strategy only holds on to the chunks it keeps itself.
+
+    Args:
+        chunk_count: Total number of chunks
+        tool_calls: Number of tool calls whose arguments are streamed
+
+    Yields:
+        Chunks in OpenAI streaming format
+    """
+    content_chunks = chunk_count // 2
+    for _ in range(content_chunks):
+        yield {"choices": [{"index": 0, "delta": {"content": "word "}, "finish_reason": None}]}
+    for index in range(tool_calls):
+        yield {"choices": [{"index": 0, "delta": {"tool_calls": [{
+            "index": index, "id": f"call_{index}", "type": "function",
+            "function": {"name": f"tool_{index}", "arguments": '{"text": "'}
+        }]}, "finish_reason": None}]}
+    for position in range(chunk_count - content_chunks - tool_calls - 1):
+        yield {"choices": [{"index": 0, "delta": {"tool_calls": [{
+            "index": position % tool_calls, "function": {"arguments": "abcd"}
+        }]}, "finish_reason": None}]}
+    yield {"choices": [{"index": 0, "delta": {}, "finish_reason": "tool_calls"}]}
+
+
+def buffered_assembly(chunks: Iterator[Dict[str, Any]]) -> Tuple[Dict[str, Any], float]:
+    """The previous approach: buffer the chunks, then rebuild the response in a second pass."""
+    buffered = []
+    for chunk in chunks:
+        buffered.append(chunk)
+
+    stream_ended = time.perf_counter()
+    tool_calls: List[Dict[str, Any]] = []
+    content = ""
+    finish_reason = None
+    for chunk in buffered:
+        choice = chunk["choices"][0]
+        delta = choice.get("delta", {})
+        if delta.get("content"):
+            content += delta["content"]
+        for tool_call_delta in delta.get("tool_calls") or []:
+            index = tool_call_delta["index"]
+            while len(tool_calls) <= index:
+                tool_calls.append({"id": "", "type": "", "function": {"name": "", "arguments": ""}})
+            current = tool_calls[index]
+            if "id" in tool_call_delta:
+                current["id"] = tool_call_delta["id"]
+            if "type" in tool_call_delta:
+                current["type"] = tool_call_delta["type"]
+            function_delta = tool_call_delta.get("function", {})
+            if "name" in function_delta:
+                current["function"]["name"] += function_delta["name"]
+            if "arguments" in function_delta:
+                current["function"]["arguments"] += function_delta["arguments"]
+        finish_reason = choice.get("finish_reason") or finish_reason
+    response = {"choices": [{"index": 0, "finish_reason": finish_reason,
+                             "message": {"role": "assistant", "content": content, "tool_calls": tool_calls}}]}
+    return response, time.perf_counter() - stream_ended
+
+
+def incremental_assembly(chunks: Iterator[Dict[str, Any]]) -> Tuple[Dict[str, Any], float]:
+    """StreamAccumulator: fold each chunk in as it arrives."""
+    accumulator = StreamAccumulator()
+    for chunk in chunks:
+        accumulator.add(chunk)
+
+    stream_ended = time.perf_counter()
+    response = accumulator.build_response()
+    return response, time.perf_counter() - stream_ended
+
+
+def measure(assemble: Callable, chunk_count: int, repeat: int) -> Dict[str, float]:
+    """Run an assembly strategy and collect total time, end-of-stream latency and peak memory."""
+    totals, tails = [], []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        _, tail = assemble(make_stream(chunk_count))
+        totals.append(time.perf_counter() - start)
+        tails.append(tail)
+
+    tracemalloc.start()
+    assemble(make_stream(chunk_count))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "total_ms": statistics.median(totals) * 1000,
+        "per_chunk_us": statistics.median(totals) / chunk_count * 1e6,
+        "end_of_stream_ms": statistics.median(tails) * 1000,
+        "peak_kib": peak / 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunks", type=int, default=10000, help="Chunks per stream")
+    parser.add_argument("--repeat", type=int, default=20, help="Runs per strategy")
+    args = parser.parse_args()
+
+    buffered_response, _ = buffered_assembly(make_stream(args.chunks))
+    incremental_response, _ = incremental_assembly(make_stream(args.chunks))
+    assert buffered_response["choices"][0]["message"] == incremental_response["choices"][0]["message"]
+
+    print(f"Assembling a {args.chunks}-chunk stream ({args.repeat} runs, medians, chunk creation included)")
+    print(f"  {'strategy':<12} {'total ms':>9} {'us/chunk':>9} {'end-of-stream ms':>17} {'peak KiB':>9}")
+    for name, assemble in (("buffered", buffered_assembly), ("incremental", incremental_assembly)):
+        result = measure(assemble, args.chunks, args.repeat)
+        print(f"  {name:<12} {result['total_ms']:>9.2f} {result['per_chunk_us']:>9.2f} "
+              f"{result['end_of_stream_ms']:>17.3f} {result['peak_kib']:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
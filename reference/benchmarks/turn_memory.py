@@ -0,0 +1,114 @@
+"""
+Benchmark of recalling earlier turns of a long operational session.
+
+Writes one long synthetic session of tool-using turns into a fresh session
+store. Each turn investigates an incident of a service on a host, and the
+tool output names an error code. The benchmark then asks follow-up
+questions about random earlier turns, either by error code or by service
+and host, and reports how often a matching turn is among the recalled ones
+(recall@k), the retrieval latency with a warm and a cold index, and the
+prompt tokens of the recent window plus the recalled turns next to those of
+the full history.
+
+Usage (from the reference directory):
+    python -m benchmarks.turn_memory [--turns N] [--queries N] [--top-k N]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from typing import Any, Dict, List
+
+from services.ai_orchestrator.session_store import SessionStore, SessionStoreConfig
+from services.ai_orchestrator.turn_memory import TurnMemory, TurnMemoryConfig
+from services.llm_provider.context_window import ContextWindowManager
+
+SERVICES = ["billing", "checkout", "inventory", "payments", "search", "gateway", "auth", "ledger", "catalog",
+            "notifications", "scheduler", "reporting", "shipping", "pricing", "reviews", "recommendations"]
+CAUSES = ["connection pool exhaustion", "an expired TLS certificate", "a full disk", "a memory leak",
+          "a slow database query", "DNS timeouts", "a bad deployment", "consumer lag on the event bus"]
+
+
+def make_turn(index: int, service: str, host: str, code: str, cause: str) -> List[Dict[str, Any]]:
+    """Generate the messages of one incident investigation turn."""
+    call_id = f"call_{index}"
+    log_lines = "".join(f"{host} {service}[{pid}]: request failed with {code}\n" for pid in range(1200, 1215))
+    return [
+        {"role": "user", "content": f"The {service} service on {host} is failing again, can you check its logs?"},
+        {"role": "assistant", "content": None, "tool_calls": [{"id": call_id, "type": "function", "function": {
+            "name": "read_logs", "arguments": f'{{"host": "{host}", "unit": "{service}"}}'}}]},
+        {"role": "tool", "tool_call_id": call_id, "content": log_lines},
+        {"role": "assistant", "content": f"{service} on {host} fails with {code}, caused by {cause}. "
+                                         f"Restarting it should clear the errors."},
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=2000, help="Turns in the session")
+    parser.add_argument("--queries", type=int, default=500, help="Follow-up questions asked")
+    parser.add_argument("--top-k", type=int, default=3, help="Earlier turns recalled per question")
+    parser.add_argument("--tail", type=int, default=40, help="Messages in the recent window")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    hosts = [f"node-{number:02d}" for number in range(24)]
+    facts = [(rng.choice(SERVICES), rng.choice(hosts), f"ERR-{rng.randrange(10 ** 5):05d}", rng.choice(CAUSES))
+             for _ in range(args.turns)]
+    turns = [make_turn(index, *fact) for index, fact in enumerate(facts)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = SessionStore(SessionStoreConfig(path=os.path.join(directory, "sessions.db"), tail_messages=args.tail))
+        for turn in turns:
+            store.append_messages("long_session", turn)
+        snapshot = store.load_session("long_session")
+        window_turns = len(snapshot.messages) // 4
+        candidates = range(args.turns - window_turns)
+
+        # Cold: the session is indexed from its first message
+        memory = TurnMemory(store, TurnMemoryConfig(top_k=args.top_k))
+        start = time.perf_counter()
+        memory.retrieve("long_session", "billing", snapshot.start)
+        cold_seconds = time.perf_counter() - start
+
+        hits = {"by error code": [], "by service and host": []}
+        latencies = []
+        for query_number in range(args.queries):
+            target = rng.choice(candidates)
+            service, host, code, _ = facts[target]
+            if query_number % 2 == 0:
+                kind, query = "by error code", f"What was the root cause of {code} again?"
+                relevant = {target}
+            else:
+                kind, query = "by service and host", f"Did we figure out why {service} kept failing on {host}?"
+                relevant = {index for index in candidates if facts[index][:2] == (service, host)}
+            start = time.perf_counter()
+            recalled = memory.retrieve("long_session", query, snapshot.start)
+            latencies.append(time.perf_counter() - start)
+            hits[kind].append(any(turn.start // 4 in relevant for turn in recalled))
+        # The history a follow-up question is sent with, the recalled turns included
+        context_block = memory.recall("long_session", query, snapshot.start)
+        history = snapshot.history() + [{"role": "user", "content": f"{context_block or ''}\n\n{query}"}]
+        store.close()
+
+    context_window = ContextWindowManager()
+    full_tokens = context_window.count_messages([message for turn in turns for message in turn])
+    window_tokens = context_window.count_messages(history)
+    latencies.sort()
+    print(f"Turn memory over a session of {args.turns} turns ({args.turns * 4} messages), "
+          f"recent window of {window_turns} turns, top-{args.top_k}")
+    for kind, results in hits.items():
+        print(f"  recall@{args.top_k} {kind:<20} {sum(results) / len(results) * 100:>8.1f} %")
+    print(f"  retrieve p50               {statistics.median(latencies) * 1000:>8.2f} ms (warm index)")
+    print(f"  retrieve p99               {latencies[int(len(latencies) * 0.99) - 1] * 1000:>8.2f} ms")
+    print(f"  cold index build           {cold_seconds * 1000:>8.1f} ms")
+    print(f"  prompt history             {window_tokens:>8} tokens (window + recalled turns)")
+    print(f"  full history               {full_tokens:>8} tokens")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,7 +8,7 @@ across all components of the system.
 import logging
 import sys
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Any, Dict, List, Optional
 from pydantic import ConfigDict
 
 
@@ -30,6 +30,42 @@ class GlobalSettings(BaseSettings):
     llm_temperature: float = 0.7
     llm_max_tokens: int = 5000  # Max tokens for the response/output
     llm_max_context_length: int = 128000  # Max total tokens for context (input + output)
+    llm_http_max_connections: int = 100  # Connections per provider endpoint in the shared client pool
+    llm_http_max_keepalive_connections: int = 20  # Idle connections kept open for reuse
+    llm_http_keepalive_expiry: float = 30.0  # Seconds an idle connection is kept open
+    llm_http2: bool = False  # Use HTTP/2 for provider traffic (requires the h2 package)
+    llm_http_prewarm_connections: int = 1  # Connections opened to llm_base_url at kernel startup (0 disables)
+    llm_retry_base_delay: float = 0.5  # Base of the jittered exponential backoff between retries
+    llm_retry_max_delay: float = 20.0  # Upper bound of a single backoff delay
+    llm_retry_after_max: float = 60.0  # Longest Retry-After honored; longer waits fail the request instead
+    llm_stream_resume_retries: int = 0  # Retries of streams failing after the first chunk (replays the stream)
+    llm_hedge_requests: bool = False  # Race slow non-streaming requests against a second attempt
+    llm_hedge_min_delay: float = 0.5  # Hedge delay until enough latencies are known for a p95 estimate
+    llm_response_cache_enabled: bool = False  # Serve repeated identical requests from the response cache
+    llm_response_cache_max_entries: int = 256  # Responses kept in the in-memory LRU tier
+    llm_response_cache_ttl: float = 3600.0  # Seconds a cached response is served (0 = never expires)
+    llm_response_cache_max_temperature: float = 0.0  # Requests sampled above this temperature bypass the cache
+    llm_response_cache_path: Optional[str] = None  # SQLite file of the on-disk tier (memory only if unset)
+    llm_coalesce_requests: bool = True  # Concurrent identical requests at temperature 0 share one upstream call
+    llm_json_backend: str = "auto"  # JSON parser for streamed chunks: auto, orjson, msgspec or json
+    llm_context_management_enabled: bool = True  # Fit each request's history into llm_max_context_length
+    llm_tokenizer: str = "auto"  # Token counting for the context window: auto, tiktoken or chars
+    llm_context_tool_output_tokens: int = 512  # Old tool outputs are trimmed to this many tokens when over budget
+    llm_tool_schema_compaction: bool = True  # Strip unused schema keywords and share repeated subschemas of tools
+    llm_tool_description_tokens: int = 0  # Tool descriptions are shortened to this many tokens (0 = keep them whole)
+    llm_rate_limit_enabled: bool = True  # Queue provider requests by priority within the limits below
+    llm_requests_per_minute: float = 0  # Client-side request quota per provider endpoint (0 = unlimited)
+    llm_tokens_per_minute: float = 0  # Client-side quota of estimated prompt + max completion tokens (0 = unlimited)
+    llm_initial_concurrency: int = 16  # Starting limit of requests in flight, adapted to 429s and latency
+    llm_min_concurrency: int = 1  # Lowest the adaptive concurrency limit shrinks to
+    llm_max_concurrency: int = 64  # Highest the adaptive concurrency limit grows to
+    llm_latency_spike_factor: float = 3.0  # Latency this many times the usual counts as overload
+    # Backends of the "router" provider type, as a JSON list of objects with keys
+    # name, type, base_url, api_key, model, timeout and model_map (all optional)
+    llm_router_backends: List[Dict[str, Any]] = []
+    llm_router_health_check_interval: float = 10.0  # Seconds between backend health checks (0 disables them)
+    llm_router_failure_threshold: int = 3  # Consecutive failures that eject a backend from routing
+    llm_router_ejection_time: float = 30.0  # Seconds an ejected backend is skipped unless a health check passes
 
     # Application settings
     log_level: str = "INFO"
@@ -37,6 +73,26 @@ class GlobalSettings(BaseSettings):
     # MCP settings
     mcp_runtime_data_directory: str = "./runtime_data"
     mcp_server_registry_filename: str = "mcp_servers.json"
+    mcp_capability_snapshot_filename: str = "mcp_capabilities.json"
+    mcp_capability_cache_ttl: int = 3600  # Seconds before cached server capabilities are re-listed (0 = never)
+    mcp_unix_socket_path: Optional[str] = None  # Unix domain socket for local frontends (disabled if unset)
+
+    # Tool execution settings
+    early_tool_execution: bool = True  # Start read-only tools while the model is still streaming the response
+    tool_selection_threshold: int = 64  # Catalogs with more tools send only the prompt's relevant ones (0 = never)
+    tool_selection_top_k: int = 15  # Tools picked per prompt under the CONTEXTUAL_SUBSET policy
+    tool_selection_pinned_tools: List[str] = []  # Tools sent with every prompt regardless of relevance
+
+    # Session settings
+    session_store_path: Optional[str] = None  # SQLite file persisting conversation sessions (in memory only if unset)
+    session_tail_messages: int = 40  # Latest messages loaded when a session resumes; older ones are paged in on demand
+    conversation_summary_enabled: bool = True  # Fold older turns of persisted sessions into a rolling summary
+    conversation_summary_trigger: float = 0.5  # Summarize once unsummarized messages exceed this share of the context
+    conversation_summary_keep_messages: int = 20  # Latest messages of a session that are never summarized
+    conversation_summary_max_tokens: int = 512  # Length limit of the rolling summary
+    session_memory_top_k: int = 3  # Earlier turns of a persisted session recalled per prompt by relevance (0 = off)
+    session_memory_snippet_chars: int = 1500  # Length limit of each recalled turn
+    session_memory_max_sessions: int = 64  # Sessions whose turn index is kept in memory
 
     # Domain settings
     domain_directory: str = "./domains"
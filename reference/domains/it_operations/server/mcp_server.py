@@ -15,6 +15,7 @@ from fastapi import FastAPI, Request
 from fastapi.responses import StreamingResponse
 from datetime import datetime
 import os
+import sys
 
 
 app = FastAPI(title="IT Operations MCP Server", version="1.0.0")
@@ -338,6 +339,7 @@ async def process_tools_call_request(params: Dict[str, Any], request_id: str):
         result = {
             "toolName": tool_name,
             "output": result_data,
+            "content": [{"type": "text", "text": result_data}],
             "isError": False
         }
     elif tool_name == "get_memory_usage":
@@ -346,6 +348,7 @@ async def process_tools_call_request(params: Dict[str, Any], request_id: str):
         result = {
             "toolName": tool_name,
             "output": result_data,
+            "content": [{"type": "text", "text": result_data}],
             "isError": False
         }
     elif tool_name == "get_system_load":
@@ -354,6 +357,7 @@ async def process_tools_call_request(params: Dict[str, Any], request_id: str):
         result = {
             "toolName": tool_name,
             "output": result_data,
+            "content": [{"type": "text", "text": result_data}],
             "isError": False
         }
     elif tool_name == "get_process_list":
@@ -363,6 +367,7 @@ async def process_tools_call_request(params: Dict[str, Any], request_id: str):
         result = {
             "toolName": tool_name,
             "output": result_data,
+            "content": [{"type": "text", "text": result_data}],
             "isError": False
         }
     else:
@@ -471,13 +476,45 @@ async def root_handler():
     }
 
 
+async def serve_stdio():
+    """
+    Serve MCP over the stdio transport: newline-delimited JSON-RPC messages on
+    stdin, responses on stdout. Used when the GCS Kernel runs this server as a
+    local process.
+    """
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader()
+    await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+
+    while True:
+        line = await reader.readline()
+        if not line:
+            break  # stdin closed by the client
+        if not line.strip():
+            continue
+
+        try:
+            json_rpc_request = json.loads(line)
+        except json.JSONDecodeError:
+            response = create_json_rpc_error(None, -32700, "Parse error")
+        else:
+            response, _ = await handle_json_rpc_request(json_rpc_request)
+
+        if response:
+            sys.stdout.write(json.dumps(response) + "\n")
+            sys.stdout.flush()
+
+
 if __name__ == "__main__":
-    import uvicorn
-
-    # Run the server
-    uvicorn.run(
-        app,
-        host="0.0.0.0",
-        port=3000,
-        log_level="info"
-    )
\ No newline at end of file
+    if "--stdio" in sys.argv:
+        asyncio.run(serve_stdio())
+    else:
+        import uvicorn
+
+        # Run the server
+        uvicorn.run(
+            app,
+            host="0.0.0.0",
+            port=3000,
+            log_level="info"
+        )
\ No newline at end of file
@@ -8,7 +8,8 @@ import asyncio
 import argparse
 from gcs_kernel.kernel import GCSKernel
 from gcs_kernel.models import MCPConfig
-from ui.cli.cli import CLIInterface
+from ui.common.cli_ui import CLIUI
+from ui.common.kernel_api import KernelAPIClient
 
 
 async def main():
@@ -17,6 +18,9 @@ async def main():
     parser.add_argument("--config", type=str, help="Path to configuration file")
     parser.add_argument("--mode", type=str, choices=["cli", "server", "api"], 
                         default="cli", help="Operation mode")
+    parser.add_argument("--socket", type=str,
+                        help="In server mode, also serve local frontends on this Unix domain socket "
+                             "(defaults to MCP_UNIX_SOCKET_PATH)")
     args = parser.parse_args()
     
     # Initialize the kernel
@@ -27,63 +31,32 @@ async def main():
         kernel_task = asyncio.create_task(kernel.run())
         
         if args.mode == "cli":
-            # Run CLI interface
-            mcp_config = MCPConfig(server_url="http://localhost:8000")
-            from gcs_kernel.mcp.client import MCPClient
-            from gcs_kernel.mcp.client_manager import MCPClientManager
-            import hashlib
-            
-            # Create client manager and connect to kernel
-            client_manager = MCPClientManager(mcp_config)
-            await client_manager.initialize()
-            success = await client_manager.connect_to_server("http://localhost:8000", server_name="local_kernel")
-            if not success:
-                print("Failed to connect to kernel via MCP")
-                return
-            
-            # Get the client for the kernel
-            server_id = next(iter(client_manager.clients.keys()))
-            client_data = client_manager.clients[server_id]
-            mcp_client = client_data['client']
-            
-            # Create a simple API client for CLI that communicates with the kernel via MCP
-            # The kernel handles everything else including LLM interaction
-            import threading
-            import queue
-            
-            class MCPKernelAPIClient:
-                def __init__(self, mcp_client, kernel):
-                    self.mcp_client = mcp_client  # Use the MCP client to communicate with kernel
-                    self.kernel = kernel
-                
-                def get_kernel_status(self):
-                    return f"Kernel running: {self.kernel.is_running()}"
-                
-                def list_registered_tools(self):
-                    if self.kernel.registry:
-                        tools = self.kernel.registry.get_all_tools()
-                        return list(tools.keys())
-                    return []
-                
-                def send_user_prompt(self, prompt):
-                    # In a real system, this would send the prompt to the kernel via MCP
-                    # and wait for the response, but for now we'll return a placeholder
-                    # until the kernel properly implements the AI interface via MCP
-                    return f"Processing prompt: {prompt}"
-                
-                def stream_user_prompt(self, prompt):
-                    # In a real streaming implementation, this would establish a streaming
-                    # connection via MCP and yield chunks as they arrive from the kernel
-                    # For now, return a single chunk as if it were streamed
-                    yield f"Processing prompt: {prompt}"
-            
-            api_client = MCPKernelAPIClient(mcp_client, kernel)
-            cli = CLIInterface(api_client, mcp_client)
-            cli.run()
+            # Prompts need the orchestrator and LLM provider the kernel sets up while starting
+            max_wait = 10  # seconds to wait for kernel initialization
+            if not await kernel.wait_until_initialized(max_wait):
+                print(f"Warning: Kernel initialization took longer than {max_wait} seconds, proceeding anyway...")
+            # The kernel is embedded, so the CLI calls it in-process instead of
+            # going through an MCP connection to a local server
+            api_client = KernelAPIClient(kernel)
+            cli_ui = CLIUI(api_client)
+            await cli_ui._interactive_loop()
         elif args.mode == "server":
             # Just run the kernel as a server
             print("GCS Kernel running in server mode...")
-            await kernel_task
+            mcp_server = None
+            socket_path = args.socket or kernel.mcp_client_manager.config.unix_socket_path
+            if socket_path:
+                from gcs_kernel.mcp.server import MCPServer
+                mcp_server = MCPServer(MCPConfig(server_url="http://localhost:8000", unix_socket_path=socket_path))
+                mcp_server.kernel = kernel
+                mcp_server.logger = kernel.logger
+                await mcp_server.start_unix_socket(socket_path)
+                print(f"Serving local frontends on unix://{socket_path}")
+            try:
+                await kernel_task
+            finally:
+                if mcp_server:
+                    await mcp_server.stop_unix_socket()
         elif args.mode == "api":
             # In API mode, we might expose a REST API
             print("GCS Kernel API mode not implemented yet")
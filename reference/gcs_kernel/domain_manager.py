@@ -263,19 +263,7 @@ class DomainManager:
                 # Connect to each MCP server specified in the domain
                 if isinstance(mcp_servers_data, list):
                     for server_info in mcp_servers_data:
-                        server_url = server_info.get("server_url")
-                        server_name = server_info.get("name", f"domain_server_{len(self.kernel.mcp_client_manager.clients)}")
-                        server_description = server_info.get("description", "Domain-specific MCP server")
-                        
-                        if server_url:
-                            # Connect to the MCP server
-                            success = await self.kernel.mcp_client_manager.connect_to_server(
-                                server_url, server_name, server_description
-                            )
-                            if success:
-                                # We can't easily get the server ID from the URL, so we'll track by URL for now
-                                # For proper implementation, we'd need to enhance the MCPClientManager to return the server ID
-                                self._domain_loaded_servers.append(server_url)
+                        await self._connect_domain_mcp_server(server_info, domain_path)
             except (json.JSONDecodeError, FileNotFoundError, Exception):
                 # If servers couldn't be loaded, continue without error
                 pass
@@ -288,21 +276,48 @@ class DomainManager:
                     with open(server_file, 'r') as f:
                         server_info = json.load(f)
                     
-                    server_url = server_info.get("server_url")
-                    server_name = server_info.get("name", f"domain_server_{len(self.kernel.mcp_client_manager.clients)}")
-                    server_description = server_info.get("description", "Domain-specific MCP server")
-                    
-                    if server_url:
-                        success = await self.kernel.mcp_client_manager.connect_to_server(
-                            server_url, server_name, server_description
-                        )
-                        if success:
-                            # We can't easily get the server ID from the URL, so we'll track by URL for now
-                            self._domain_loaded_servers.append(server_url)
+                    await self._connect_domain_mcp_server(server_info, domain_path)
                 except (json.JSONDecodeError, Exception):
                     # Skip invalid server files
                     continue
 
+    async def _connect_domain_mcp_server(self, server_info: Dict[str, Any], domain_path: Path):
+        """
+        Connect to one MCP server entry of a domain.
+        Entries with a "command" are local servers started over stdio,
+        entries with a "server_url" are remote servers reached over HTTP.
+        """
+        client_manager = self.kernel.mcp_client_manager
+        server_name = server_info.get("name", f"domain_server_{len(client_manager.clients)}")
+        server_description = server_info.get("description", "Domain-specific MCP server")
+
+        if server_info.get("command"):
+            args = server_info.get("args", [])
+            success = await client_manager.connect_to_local_server(
+                server_info["command"],
+                args,
+                server_name=server_name,
+                description=server_description,
+                env=server_info.get("env"),
+                cwd=server_info.get("cwd", str(domain_path)),
+                lazy_start=server_info.get("lazy_start", False),
+                idle_timeout=server_info.get("idle_timeout")
+            )
+            server_url = client_manager.build_local_server_url(server_info["command"], args)
+        else:
+            server_url = server_info.get("server_url")
+            if not server_url:
+                return
+            # Connect to the MCP server
+            success = await client_manager.connect_to_server(
+                server_url, server_name, server_description
+            )
+
+        if success:
+            # We can't easily get the server ID from the URL, so we'll track by URL for now
+            # For proper implementation, we'd need to enhance the MCPClientManager to return the server ID
+            self._domain_loaded_servers.append(server_url)
+
     async def _unregister_domain_mcp_servers(self, domain_path: Path):
         """Unregister domain-specific MCP servers"""
         # Disconnect only the servers that were loaded from the current domain
@@ -5,6 +5,7 @@ This module implements the core GCSKernel class which provides
 the foundational services for the Generic Control System Kernel.
 """
 
+import asyncio
 import uuid
 from typing import Dict, Any, Optional
 
@@ -16,8 +17,13 @@ from gcs_kernel.security import SecurityLayer
 from gcs_kernel.logger import EventLogger
 from gcs_kernel.mcp.client_manager import MCPClientManager
 from gcs_kernel.tool_execution_manager import ToolExecutionManager
+from services.ai_orchestrator.conversation_summarizer import ConversationSummarizer
 from services.ai_orchestrator.orchestrator_service import AIOrchestratorService
 from services.llm_provider.content_generator import LLMContentGenerator
+from services.llm_provider.http_pool import get_provider_client_pool, close_provider_client_pool
+from services.llm_provider.providers.router_provider import RouterProvider
+from services.llm_provider.rate_limiter import get_rate_limiter_metrics
+from services.llm_provider.response_cache import get_response_cache, close_response_cache
 from common.settings import settings
 
 # Tool registration imports (all consolidated at top of file)
@@ -50,7 +56,7 @@ class GCSKernel:
         # Initialize MCP client manager first - use config if provided, otherwise default
         mcp_config = config.get('mcp_config', None) if config else None
         if mcp_config is None:
-            mcp_config = MCPConfig(server_url="http://localhost:8000")
+            mcp_config = MCPConfig(server_url="http://localhost:8000", unix_socket_path=settings.mcp_unix_socket_path)
         self.mcp_client_manager = MCPClientManager(mcp_config)
         
         # Initialize registry with access to the MCP client manager
@@ -115,6 +121,7 @@ class GCSKernel:
         self._running = False
         # Set up initialization flag
         self._fully_initialized = False
+        self._prewarm_task = None
 
     async def fetch_model_info_and_update_settings(self):
         """
@@ -172,10 +179,74 @@ class GCSKernel:
         
         # Set up logger for MCP manager after initialization
         self.mcp_client_manager.logger = self.logger
+
+        # Open provider connections in the background so the first prompt skips the handshakes
+        self._prewarm_task = asyncio.create_task(self._prewarm_llm_connections())
         
         # Start the event loop
         await self.event_loop.run()
 
+    async def _prewarm_llm_connections(self):
+        """Pre-warm the LLM provider's pooled connections to llm_base_url."""
+        try:
+            provider = self.ai_orchestrator.content_generator.provider
+            await provider.prewarm_connections()
+        except Exception as e:
+            if self.logger:
+                self.logger.warning(f"Could not pre-warm LLM provider connections: {e}")
+
+    def get_llm_http_metrics(self) -> dict:
+        """
+        Get saturation and connection reuse metrics of the LLM provider client pool.
+
+        Returns:
+            Dictionary of counter names to values
+        """
+        return get_provider_client_pool().get_metrics()
+
+    def get_llm_cache_metrics(self) -> dict:
+        """
+        Get hit, miss and bypass counters of the LLM response cache.
+
+        Returns:
+            Dictionary of counter names to values
+        """
+        return get_response_cache().get_metrics()
+
+    def get_llm_rate_limit_metrics(self) -> dict:
+        """
+        Get admission counters and adaptive concurrency limits of the LLM provider rate limiters.
+
+        Returns:
+            Dictionary of provider base URLs to their metrics
+        """
+        return get_rate_limiter_metrics()
+
+    def get_llm_router_metrics(self) -> dict:
+        """
+        Get the latency, error rate and ejection state of each backend of the router provider.
+
+        Returns:
+            Dictionary of backend names to their metrics (empty unless the provider is a router)
+        """
+        provider = self._get_llm_provider()
+        return provider.get_metrics() if isinstance(provider, RouterProvider) else {}
+
+    def get_llm_tool_token_report(self) -> dict:
+        """
+        Get the estimated tokens of the tool definitions sent to the LLM, before and after compaction.
+
+        Returns:
+            Total and per-tool token estimates (empty if there is no LLM provider)
+        """
+        converter = getattr(self._get_llm_provider(), "converter", None)
+        return converter.get_tool_token_report() if hasattr(converter, "get_tool_token_report") else {}
+
+    def _get_llm_provider(self):
+        """Get the content generator's LLM provider, if there is one."""
+        content_generator = getattr(self.ai_orchestrator, "content_generator", None)
+        return getattr(content_generator, "provider", None)
+
     async def shutdown(self):
         """
         Gracefully shut down the GCS Kernel.
@@ -381,6 +452,20 @@ class GCSKernel:
         await self.tool_execution_manager.shutdown()
         
         await self.registry.shutdown()
+
+        if self._prewarm_task and not self._prewarm_task.done():
+            self._prewarm_task.cancel()
+        provider = self._get_llm_provider()
+        if isinstance(provider, RouterProvider):
+            await provider.close()
+        await close_provider_client_pool()
+        close_response_cache()
+        summarizer = getattr(self.ai_orchestrator, "summarizer", None)
+        if isinstance(summarizer, ConversationSummarizer):
+            await summarizer.close()
+        session_store = getattr(self.ai_orchestrator, "session_store", None)
+        if session_store is not None:
+            session_store.close()
         await self.resource_manager.shutdown()
         await self.security_layer.shutdown()
 
@@ -393,6 +478,28 @@ class GCSKernel:
         """
         return self._running
 
+    async def wait_until_initialized(self, timeout: float = 10.0, interval: float = 0.1) -> bool:
+        """
+        Wait for a kernel started with run() to finish initializing its components.
+
+        Frontends embedding the kernel must not send prompts before the AI
+        orchestrator and its LLM provider are set up.
+
+        Args:
+            timeout: Seconds to wait at most
+            interval: Seconds between checks
+
+        Returns:
+            True if the kernel is initialized, False if the timeout expired first
+        """
+        elapsed = 0.0
+        while not self._fully_initialized:
+            if elapsed >= timeout:
+                return False
+            await asyncio.sleep(interval)
+            elapsed += interval
+        return True
+
     def create_prompt_object(self, content: str, **kwargs) -> PromptObject:
         """Create a new prompt object with the given content and additional properties."""
         # Apply system defaults if not provided in kwargs
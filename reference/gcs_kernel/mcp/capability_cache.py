@@ -0,0 +1,267 @@
+"""
+MCP Capability Cache for external MCP server capabilities.
+
+This module caches the tools, prompts and server capabilities discovered from
+each connected MCP server together with a content hash of the tool list.
+Cached entries are refreshed only when a server sends a list_changed
+notification or when the entry outlives its TTL, and the whole cache is
+persisted as a capability snapshot in the runtime data directory so that it
+survives kernel restarts.
+"""
+
+import hashlib
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from dataclasses import dataclass, field, asdict
+
+
+def compute_tool_hash(tools: List[Dict[str, Any]]) -> str:
+    """
+    Compute a stable content hash for a list of MCP tool definitions.
+
+    Args:
+        tools: List of tool definitions as returned by list_tools
+
+    Returns:
+        Hex digest that only changes when the tool definitions change
+    """
+    canonical = json.dumps(tools, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class MCPCapabilitySnapshot:
+    """Cached capabilities of a single MCP server."""
+    server_id: str
+    server_url: str
+    tools: List[Dict[str, Any]] = field(default_factory=list)
+    prompts: List[Dict[str, Any]] = field(default_factory=list)
+    server_capabilities: Dict[str, Any] = field(default_factory=dict)
+    tool_hash: str = ""
+    fetched_at: float = 0.0
+    stale: bool = False
+
+    @property
+    def tool_names(self) -> List[str]:
+        """Names of the tools exposed by the server."""
+        return [tool.get("name", "") for tool in self.tools if isinstance(tool, dict)]
+
+
+class MCPCapabilityCache:
+    """Caches MCP server capabilities in memory and in a local snapshot file."""
+
+    def __init__(self, runtime_data_directory: str = None, snapshot_filename: str = None,
+                 ttl_seconds: int = None):
+        """
+        Initialize the capability cache and load any existing snapshot.
+
+        Args:
+            runtime_data_directory: Directory to store the snapshot file (default: from global config)
+            snapshot_filename: Name of the snapshot file (default: from global config)
+            ttl_seconds: Seconds a cached entry stays fresh; 0 disables expiry (default: from global config)
+        """
+        if runtime_data_directory is None or snapshot_filename is None or ttl_seconds is None:
+            from common.settings import settings
+            if runtime_data_directory is None:
+                runtime_data_directory = settings.mcp_runtime_data_directory
+            if snapshot_filename is None:
+                snapshot_filename = settings.mcp_capability_snapshot_filename
+            if ttl_seconds is None:
+                ttl_seconds = settings.mcp_capability_cache_ttl
+
+        self.runtime_data_directory = Path(runtime_data_directory)
+        self.snapshot_file = self.runtime_data_directory / snapshot_filename
+        self.ttl_seconds = ttl_seconds
+        self.runtime_data_directory.mkdir(parents=True, exist_ok=True)
+
+        self._snapshots: Dict[str, MCPCapabilitySnapshot] = self.load_snapshot()
+
+    def load_snapshot(self) -> Dict[str, MCPCapabilitySnapshot]:
+        """
+        Load cached capabilities from the snapshot file.
+
+        Returns:
+            Dictionary of MCPCapabilitySnapshot objects keyed by server ID
+        """
+        if not self.snapshot_file.exists():
+            return {}
+
+        try:
+            with open(self.snapshot_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+
+            snapshots = {}
+            for entry in data:
+                snapshot = MCPCapabilitySnapshot(**entry)
+                snapshots[snapshot.server_id] = snapshot
+            return snapshots
+        except (json.JSONDecodeError, TypeError, KeyError, ValueError) as e:
+            print(f"Error loading MCP capability snapshot: {e}")
+            return {}
+
+    def save_snapshot(self) -> bool:
+        """
+        Persist the cached capabilities to the snapshot file.
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            data = [asdict(snapshot) for snapshot in self._snapshots.values()]
+            tmp_file = self.snapshot_file.with_suffix(self.snapshot_file.suffix + ".tmp")
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, default=str)
+            tmp_file.replace(self.snapshot_file)
+            return True
+        except Exception as e:
+            print(f"Error saving MCP capability snapshot: {e}")
+            return False
+
+    def get(self, server_id: str) -> Optional[MCPCapabilitySnapshot]:
+        """
+        Get the cached capabilities for a server, fresh or not.
+
+        Args:
+            server_id: ID of the server
+
+        Returns:
+            MCPCapabilitySnapshot if cached, None otherwise
+        """
+        return self._snapshots.get(server_id)
+
+    def is_fresh(self, server_id: str, server_url: str = None) -> bool:
+        """
+        Check whether the cached capabilities for a server can be used without refreshing.
+
+        Args:
+            server_id: ID of the server
+            server_url: Optional URL the cached entry must belong to
+
+        Returns:
+            True if a non-stale, non-expired entry exists, False otherwise
+        """
+        snapshot = self._snapshots.get(server_id)
+        if snapshot is None or snapshot.stale:
+            return False
+        if server_url is not None and snapshot.server_url != server_url:
+            return False
+        if self.ttl_seconds and time.time() - snapshot.fetched_at >= self.ttl_seconds:
+            return False
+        return True
+
+    def invalidate(self, server_id: str):
+        """
+        Mark a server's cached capabilities as stale.
+        The entry is kept so its tool hash can still be compared after the refresh.
+
+        Args:
+            server_id: ID of the server
+        """
+        snapshot = self._snapshots.get(server_id)
+        if snapshot is not None:
+            snapshot.stale = True
+
+    def remove(self, server_id: str) -> bool:
+        """
+        Drop a server from the cache and the snapshot file.
+
+        Args:
+            server_id: ID of the server
+
+        Returns:
+            True if an entry was removed, False otherwise
+        """
+        if self._snapshots.pop(server_id, None) is None:
+            return False
+        return self.save_snapshot()
+
+    def store(self, snapshot: MCPCapabilitySnapshot) -> MCPCapabilitySnapshot:
+        """
+        Store capabilities for a server and persist the snapshot.
+
+        Args:
+            snapshot: The capabilities to store
+
+        Returns:
+            The stored snapshot with its hash and timestamp filled in
+        """
+        snapshot.tool_hash = compute_tool_hash(snapshot.tools)
+        snapshot.fetched_at = time.time()
+        snapshot.stale = False
+        self._snapshots[snapshot.server_id] = snapshot
+        self.save_snapshot()
+        return snapshot
+
+    async def refresh(self, server_id: str, server_url: str, client,
+                      server_capabilities: Dict[str, Any] = None) -> MCPCapabilitySnapshot:
+        """
+        Fetch tools and prompts from a server and store them in the cache.
+
+        Args:
+            server_id: ID of the server
+            server_url: URL of the server
+            client: MCPClient connected to the server
+            server_capabilities: Capabilities the server announced during initialization
+
+        Returns:
+            The refreshed MCPCapabilitySnapshot
+        """
+        if server_capabilities is None:
+            previous = self._snapshots.get(server_id)
+            server_capabilities = previous.server_capabilities if previous else {}
+
+        tools_response = await client.list_tools()
+        tools = []
+        if tools_response and "tools" in tools_response:
+            tools = [tool if isinstance(tool, dict) else {"name": str(tool)} for tool in tools_response["tools"]]
+
+        # Only ask for prompts when the server announced support for them
+        prompts = []
+        if server_capabilities.get("prompts") is not None:
+            prompts_response = await client.list_prompts()
+            if prompts_response and "prompts" in prompts_response:
+                prompts = list(prompts_response["prompts"])
+
+        return self.store(MCPCapabilitySnapshot(
+            server_id=server_id,
+            server_url=server_url,
+            tools=tools,
+            prompts=prompts,
+            server_capabilities=server_capabilities
+        ))
+
+    def get_tool_definition(self, tool_name: str, server_url: str = None) -> Optional[Dict[str, Any]]:
+        """
+        Get the cached MCP definition (name, description, inputSchema) of a tool.
+
+        Args:
+            tool_name: Name of the tool
+            server_url: Optional URL of the server the tool must come from
+
+        Returns:
+            The tool definition if cached, None otherwise
+        """
+        for snapshot in self._snapshots.values():
+            if server_url is not None and snapshot.server_url != server_url:
+                continue
+            for tool in snapshot.tools:
+                if isinstance(tool, dict) and tool.get("name") == tool_name:
+                    return tool
+        return None
+
+    def find_server_for_tool(self, tool_name: str) -> Optional[str]:
+        """
+        Find which cached server exposes a tool.
+
+        Args:
+            tool_name: Name of the tool
+
+        Returns:
+            Server ID if found, None otherwise
+        """
+        for server_id, snapshot in self._snapshots.items():
+            if tool_name in snapshot.tool_names:
+                return server_id
+        return None
@@ -7,6 +7,8 @@ separating concerns from connection management to the client manager.
 """
 
 import asyncio
+import time
+from contextlib import asynccontextmanager
 from typing import Dict, Any, Optional, Callable
 from mcp.client.session import ClientSession
 
@@ -29,6 +31,19 @@ class MCPClient:
         self.server_url = server_url
         self.initialized = True  # Already initialized when session is passed
         self.logger = None  # Will be set by kernel
+        # Requests awaiting the server's answer, and when the last one was answered (time.monotonic())
+        self.calls_in_flight = 0
+        self.last_call_finished = 0.0
+
+    @asynccontextmanager
+    async def _tracked_call(self):
+        """Count a request as in flight until the server answers it."""
+        self.calls_in_flight += 1
+        try:
+            yield
+        finally:
+            self.calls_in_flight -= 1
+            self.last_call_finished = time.monotonic()
 
     async def list_tools(self) -> Optional[Dict[str, Any]]:
         """
@@ -38,7 +53,8 @@ class MCPClient:
             Dictionary containing the list of available tools or None if request failed
         """
         try:
-            result = await self.session.list_tools()
+            async with self._tracked_call():
+                result = await self.session.list_tools()
             if hasattr(result, 'model_dump'):
                 return result.model_dump()
             elif isinstance(result, (dict, list)):
@@ -68,7 +84,8 @@ class MCPClient:
             Tool execution result or None if request failed
         """
         try:
-            result = await self.session.call_tool(name=tool_name, arguments=params)
+            async with self._tracked_call():
+                result = await self.session.call_tool(name=tool_name, arguments=params)
             if hasattr(result, 'model_dump'):
                 return result.model_dump()
             elif isinstance(result, (dict, list)):
@@ -92,7 +109,8 @@ class MCPClient:
             List of available prompts or None if request failed
         """
         try:
-            result = await self.session.list_prompts()
+            async with self._tracked_call():
+                result = await self.session.list_prompts()
             if hasattr(result, 'model_dump'):
                 return result.model_dump()
             elif isinstance(result, (dict, list)):
@@ -120,7 +138,8 @@ class MCPClient:
             Prompt content or None if request failed
         """
         try:
-            result = await self.session.get_prompt(name=prompt_name, arguments=arguments)
+            async with self._tracked_call():
+                result = await self.session.get_prompt(name=prompt_name, arguments=arguments)
             if hasattr(result, 'model_dump'):
                 return result.model_dump()
             elif isinstance(result, (dict, list)):
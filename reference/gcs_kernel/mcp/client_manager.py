@@ -9,24 +9,49 @@ while the MCPClient class performs actual operations on the established sessions
 
 import asyncio
 import time
-from typing import Dict, List, Optional, Callable, Any
+import anyio
+from typing import Dict, List, Optional, Callable, Any, Set
 from gcs_kernel.mcp.client import MCPClient
 from gcs_kernel.models import MCPConfig, ToolResult
 from gcs_kernel.mcp.server_registry import MCPServerRegistry, MCPServerInfo
+from gcs_kernel.mcp.capability_cache import MCPCapabilityCache, MCPCapabilitySnapshot
+from gcs_kernel.mcp.process_pool import LocalServerProcessPool, LocalServerSpec
+from gcs_kernel.mcp.unix_socket import unix_socket_client
+from gcs_kernel.mcp.in_process import in_process_client
 from datetime import datetime
 from mcp.client.session import ClientSession
 from mcp.client.streamable_http import streamablehttp_client
+from mcp.client.stdio import stdio_client, StdioServerParameters
 from mcp import Implementation
+from mcp.types import ServerNotification, ToolListChangedNotification, PromptListChangedNotification
 
 
 class MCPConnection:
     """
     A connection manager for MCP servers that handles the stream lifecycle.
+    Supports the streamable HTTP transport, the stdio transport, where the
+    server is a local process spawned and owned by the connection, the Unix
+    domain socket transport for unix:// URLs of servers on the same host, and
+    the in-process "memory" transport to an MCPServer in this process.
     """
 
-    def __init__(self, server_url: str, headers: Optional[Dict[str, str]] = None):
+    def __init__(self, server_url: str, headers: Optional[Dict[str, str]] = None,
+                 message_handler: Optional[Callable] = None, transport: str = "http",
+                 stdio_params: Optional[StdioServerParameters] = None, connect_timeout: float = 30,
+                 in_process_server=None):
         self.server_url = server_url
         self.headers = headers or {}
+        # Receives server notifications such as notifications/tools/list_changed
+        self.message_handler = message_handler
+        self.transport = transport
+        self.stdio_params = stdio_params
+        self.connect_timeout = connect_timeout
+        self.in_process_server = in_process_server
+
+        if self.transport == "stdio" and self.stdio_params is None:
+            raise ValueError("stdio transport requires stdio_params")
+        if self.transport == "memory" and self.in_process_server is None:
+            raise ValueError("memory transport requires in_process_server")
 
         # Ensure required headers
         if 'Accept' not in self.headers:
@@ -36,57 +61,129 @@ class MCPConnection:
 
         self.session = None
         self.connected = False
+        self.server_capabilities: Dict[str, Any] = {}
         self._connection_task = None
 
+    @staticmethod
+    def transport_for_url(server_url: str) -> str:
+        """
+        Pick the network transport for a server URL.
+
+        Args:
+            server_url: URL of the MCP server
+
+        Returns:
+            "unix" for unix:// URLs, "http" otherwise
+        """
+        return "unix" if server_url.startswith("unix://") else "http"
+
+    def _open_transport(self):
+        """Open the read/write streams for the configured transport."""
+        if self.transport == "stdio":
+            return stdio_client(self.stdio_params)
+        if self.transport == "unix":
+            return unix_socket_client(self.server_url[len("unix://"):])
+        if self.transport == "memory":
+            return in_process_client(self.in_process_server)
+        return streamablehttp_client(url=self.server_url, headers=self.headers)
+
     async def connect(self):
         """
         Establish connection to the MCP server using a background task approach.
         """
+        ready = asyncio.Event()
+
         # Create a background task that maintains the connection
         async def connection_loop():
-            async with streamablehttp_client(url=self.server_url, headers=self.headers) as (read_stream, write_stream, get_session_id):
-                # Create and use the ClientSession as an async context manager
-                async with ClientSession(
-                    read_stream=read_stream,
-                    write_stream=write_stream,
-                    client_info=Implementation(
-                        name="gcs-kernel-mcp-client",
-                        version="1.0.0"
-                    )
-                ) as session:
-                    # Initialize the session (the MCP protocol handshake)
-                    await session.initialize()
-
-                    # Store the session for use by the client
-                    self.session = session
-                    self.connected = True
-
-                    # Keep the connection alive until cancelled
+            async with self._open_transport() as streams:
+                read_stream, write_stream = streams[0], streams[1]
+                # Relay server messages through our own stream so the end of the transport
+                # (e.g. a crashed stdio server process) ends this task instead of going unnoticed
+                session_read_writer, session_read_stream = anyio.create_memory_object_stream(0)
+                transport_closed = anyio.Event()
+
+                async def relay_server_messages():
                     try:
-                        import anyio
-                        await anyio.sleep(float('inf'))  # Sleep indefinitely
-                    except anyio.get_cancelled_exc_class():
-                        # Expected when cancelling
+                        async with session_read_writer:
+                            async for message in read_stream:
+                                await session_read_writer.send(message)
+                    except anyio.ClosedResourceError:
                         pass
+                    finally:
+                        transport_closed.set()
+
+                async with anyio.create_task_group() as task_group:
+                    task_group.start_soon(relay_server_messages)
+
+                    # Create and use the ClientSession as an async context manager
+                    async with ClientSession(
+                        read_stream=session_read_stream,
+                        write_stream=write_stream,
+                        message_handler=self.message_handler,
+                        client_info=Implementation(
+                            name="gcs-kernel-mcp-client",
+                            version="1.0.0"
+                        )
+                    ) as session:
+                        # Initialize the session (the MCP protocol handshake)
+                        init_result = await session.initialize()
+                        if init_result is not None and hasattr(init_result, 'capabilities'):
+                            self.server_capabilities = init_result.capabilities.model_dump(exclude_none=True)
+
+                        # Store the session for use by the client
+                        self.session = session
+                        self.connected = True
+                        ready.set()
+
+                        # Keep the connection alive until cancelled or the transport closes
+                        try:
+                            await transport_closed.wait()
+                        except anyio.get_cancelled_exc_class():
+                            # Expected when cancelling
+                            pass
+                        finally:
+                            self.connected = False
+
+                    task_group.cancel_scope.cancel()
 
         # Run the connection loop in background
         self._connection_task = asyncio.create_task(connection_loop())
 
-        # Wait a bit to allow connection to establish
-        await asyncio.sleep(0.2)
+        # Wait until the handshake completes, the connection fails, or the timeout expires
+        ready_waiter = asyncio.create_task(ready.wait())
+        await asyncio.wait(
+            {ready_waiter, self._connection_task},
+            timeout=self.connect_timeout,
+            return_when=asyncio.FIRST_COMPLETED
+        )
+        ready_waiter.cancel()
 
         if not self.connected:
             # If connection failed, cancel the task and raise an error
             self._connection_task.cancel()
             try:
                 await self._connection_task
-            except asyncio.CancelledError:
+            except (asyncio.CancelledError, Exception):
                 pass
             raise Exception(f"Failed to connect to {self.server_url}")
 
         # Return client that works with the established session
         return MCPClient(self.session, self.server_url)
 
+    async def wait_closed(self):
+        """
+        Wait until the connection ends, either through disconnect() or because the
+        transport closed (for stdio, the server process exited).
+        """
+        if self._connection_task:
+            try:
+                await asyncio.shield(self._connection_task)
+            except asyncio.CancelledError:
+                if not self._connection_task.done():
+                    raise
+            except Exception:
+                pass
+
     async def disconnect(self):
         """
         Close the connection to the MCP server.
@@ -97,6 +194,9 @@ class MCPConnection:
                 await self._connection_task
             except asyncio.CancelledError:
                 pass  # Expected when cancelling
+            except Exception:
+                pass  # The transport already failed; nothing left to close
+        self.connected = False
 
 
 class MCPClientManager:
@@ -125,12 +225,37 @@ class MCPClientManager:
                 runtime_data_directory=runtime_data_directory,
                 registry_filename=registry_filename
             )
+            self.capability_cache = MCPCapabilityCache(
+                runtime_data_directory=runtime_data_directory,
+                snapshot_filename=getattr(self.config, 'capability_snapshot_filename', None),
+                ttl_seconds=getattr(self.config, 'capability_cache_ttl', None)
+            )
         else:
             from common.settings import settings
             self.server_registry = MCPServerRegistry(
                 runtime_data_directory=settings.mcp_runtime_data_directory,
                 registry_filename=settings.mcp_server_registry_filename
             )
+            self.capability_cache = MCPCapabilityCache(
+                runtime_data_directory=settings.mcp_runtime_data_directory,
+                snapshot_filename=settings.mcp_capability_snapshot_filename,
+                ttl_seconds=settings.mcp_capability_cache_ttl
+            )
+
+        # Tool hash last handed to the tool discovery service, per server ID
+        self._registered_tool_hashes: Dict[str, str] = {}
+        # Capability refreshes running after list_changed notifications
+        self._refresh_tasks: Set[asyncio.Task] = set()
+
+        # Supervisor for local servers spawned over the stdio transport
+        self.process_pool = LocalServerProcessPool(
+            self._create_local_client_session,
+            max_restarts=getattr(self.config, 'local_server_max_restarts', 3),
+            restart_backoff=getattr(self.config, 'local_server_restart_backoff', 0.5),
+            idle_check_interval=getattr(self.config, 'local_server_idle_check_interval', 30.0),
+            on_started=self._on_local_server_started,
+            on_stopped=self._on_local_server_stopped
+        )
         self.logger = None  # Will be set by kernel
         self.initialized = False
 
@@ -151,6 +276,7 @@ class MCPClientManager:
             self.logger.debug("Starting MCP client manager initialization")
 
         self.initialized = True
+        self.process_pool.logger = self.logger
 
         # Optionally load and connect to previously registered external servers
         # But do it in the background to not block initialization
@@ -171,31 +297,36 @@ class MCPClientManager:
             self.logger.debug(f"Found {len(servers)} servers in registry, connecting to active ones...")
 
         for server_info in servers:
-            if server_info.status == "active":
+            # Idled-out local servers are registered again so they can be started lazily
+            if server_info.status == "active" or (server_info.transport == "stdio" and server_info.status == "idle"):
                 try:
                     if self.logger:
                         self.logger.debug(f"Attempting to connect to server: {server_info.name} at {server_info.server_url}")
 
                     connect_start_time = time.time()
                     # Connect to the server
-                    success = await self.connect_to_server(
-                        server_info.server_url,
-                        server_info.name,
-                        description=server_info.description
-                    )
+                    if server_info.transport == "stdio":
+                        success = await self.connect_to_local_server(
+                            server_info.command,
+                            server_info.args,
+                            server_name=server_info.name,
+                            description=server_info.description,
+                            env=server_info.env,
+                            cwd=server_info.cwd,
+                            lazy_start=server_info.lazy_start,
+                            idle_timeout=server_info.idle_timeout
+                        )
+                    else:
+                        success = await self.connect_to_server(
+                            server_info.server_url,
+                            server_info.name,
+                            description=server_info.description
+                        )
 
                     connect_elapsed = time.time() - connect_start_time
+                    # connect_to_server already emitted tools_discovered for this server
                     if success and self.logger:
                         self.logger.info(f"Successfully connected to server: {server_info.name} at {server_info.server_url} (elapsed: {connect_elapsed:.2f}s)")
-                        
-                        # Get the updated server info to access capabilities
-                        updated_server_info = self.server_registry.get_server(server_info.server_id)
-                        if updated_server_info and updated_server_info.capabilities:
-                            # Emit a tools_discovered event for the reconnected server
-                            await self._notify_tool_discovered_event("tools_discovered", 
-                                                                     updated_server_info.server_id, 
-                                                                     updated_server_info.capabilities, 
-                                                                     updated_server_info.server_url)
                     elif self.logger:
                         self.logger.warning(f"Failed to connect to server: {server_info.name} at {server_info.server_url} (elapsed: {connect_elapsed:.2f}s)")
                         self.server_registry.update_server_status(server_info.server_id, "disconnected")
@@ -210,27 +341,209 @@ class MCPClientManager:
 
     async def shutdown(self):
         """Shutdown all managed clients."""
+        for task in list(self._refresh_tasks):
+            task.cancel()
+        # Stop local server processes first; their clients are removed by the stop callback
+        await self.process_pool.shutdown()
         for client_data in self.clients.values():
             if isinstance(client_data, dict) and 'connection' in client_data:
                 await client_data['connection'].disconnect()
         self.clients.clear()
         self.initialized = False
 
-    async def _create_client_session(self, server_url: str, headers: Optional[Dict[str, str]] = None):
+    async def _create_client_session(self, server_url: str, headers: Optional[Dict[str, str]] = None,
+                                     message_handler: Optional[Callable] = None):
         """
         Create an MCP client session connected to the specified server URL.
 
         Args:
             server_url: The URL of the MCP server to connect to
             headers: Optional headers to include in the HTTP requests
+            message_handler: Optional handler for notifications sent by the server
 
         Returns:
             tuple: (MCPClient, connection) - The client and connection manager
         """
-        connection = MCPConnection(server_url, headers)
+        connection = MCPConnection(
+            server_url, headers,
+            message_handler=message_handler,
+            transport=MCPConnection.transport_for_url(server_url),
+            connect_timeout=getattr(self.config, 'connection_timeout', 30)
+        )
         client = await connection.connect()
         return client, connection
 
+    async def _create_local_client_session(self, spec: LocalServerSpec):
+        """
+        Spawn a local MCP server process and create a client session over stdio.
+
+        Args:
+            spec: Launch settings of the local server
+
+        Returns:
+            tuple: (MCPClient, connection) - The client and connection manager
+        """
+        connection = MCPConnection(
+            spec.server_url,
+            message_handler=self._build_message_handler(spec.server_id),
+            transport="stdio",
+            stdio_params=StdioServerParameters(
+                command=spec.command,
+                args=list(spec.args),
+                env=spec.env,
+                cwd=spec.cwd
+            ),
+            connect_timeout=getattr(self.config, 'connection_timeout', 30)
+        )
+        client = await connection.connect()
+        client.logger = self.logger
+        return client, connection
+
+    @staticmethod
+    def build_local_server_url(command: str, args: Optional[List[str]] = None) -> str:
+        """
+        Build the identifier URL of a local stdio server from its command line.
+
+        Args:
+            command: Executable used to start the server
+            args: Arguments passed to the executable
+
+        Returns:
+            A stdio:// URL that uniquely identifies the server
+        """
+        import shlex
+        return "stdio://" + shlex.join([command] + list(args or []))
+
+    async def connect_to_local_server(self, command: str, args: Optional[List[str]] = None,
+                                      server_name: str = None, description: str = None,
+                                      env: Optional[Dict[str, str]] = None, cwd: Optional[str] = None,
+                                      lazy_start: bool = False, idle_timeout: Optional[float] = None) -> bool:
+        """
+        Connect to a local MCP server that the kernel spawns and supervises over the stdio transport.
+
+        Args:
+            command: Executable used to start the server
+            args: Arguments passed to the executable
+            server_name: Optional name for the server
+            description: Optional description for the server
+            env: Optional environment variables for the server process
+            cwd: Optional working directory for the server process
+            lazy_start: Defer starting the process until a tool of the server is first used;
+                        tools are registered from the capability cache when it has an entry
+            idle_timeout: Seconds without tool use after which the process is stopped
+
+        Returns:
+            True if the server was registered successfully, False otherwise
+        """
+        if not self.initialized:
+            await self.initialize()
+        self.process_pool.logger = self.logger
+
+        args = list(args or [])
+        server_url = self.build_local_server_url(command, args)
+        import hashlib
+        server_id = hashlib.md5(server_url.encode()).hexdigest()
+
+        self.process_pool.register(LocalServerSpec(
+            server_id=server_id,
+            server_url=server_url,
+            command=command,
+            args=args,
+            env=env,
+            cwd=cwd,
+            lazy_start=lazy_start,
+            idle_timeout=idle_timeout
+        ))
+
+        transport_fields = {
+            "transport": "stdio",
+            "command": command,
+            "args": args,
+            "env": env,
+            "cwd": cwd,
+            "lazy_start": lazy_start,
+            "idle_timeout": idle_timeout
+        }
+
+        # A lazily started server with known capabilities only spawns on first tool use
+        snapshot = self.capability_cache.get(server_id)
+        if lazy_start and snapshot is not None and snapshot.server_url == server_url:
+            await self._register_connected_server(server_id, server_url, snapshot, server_name,
+                                                  description, status="idle", **transport_fields)
+            if self.logger:
+                self.logger.info(f"Registered local server {server_name or server_url} for lazy start")
+            return True
+
+        try:
+            client = await self.process_pool.acquire(server_id)
+            connection = self.clients[server_id]['connection']
+            snapshot = await asyncio.wait_for(
+                self._load_capabilities(server_id, server_url, client, connection),
+                timeout=getattr(self.config, 'connection_timeout', 30)
+            )
+        except Exception as e:
+            if self.logger:
+                self.logger.error(f"Failed to start local server {server_url}: {e}")
+            await self.process_pool.unregister(server_id)
+            return False
+
+        await self._register_connected_server(server_id, server_url, snapshot, server_name,
+                                              description, **transport_fields)
+        return True
+
+    async def _on_local_server_started(self, server_id: str, client, connection):
+        """Track a (re)started local server like any other connected server."""
+        self.clients[server_id] = {'client': client, 'connection': connection}
+        if self.server_registry.get_server(server_id):
+            self.server_registry.update_server_status(server_id, "active")
+
+    async def _on_local_server_stopped(self, server_id: str, reason: str):
+        """Drop the client of a stopped local server; its tools stay registered for lazy restart."""
+        self.clients.pop(server_id, None)
+        if reason in ("idle", "crashed") and self.server_registry.get_server(server_id):
+            self.server_registry.update_server_status(server_id, "idle" if reason == "idle" else "error")
+
+    async def _register_connected_server(self, server_id: str, server_url: str, snapshot: MCPCapabilitySnapshot,
+                                         server_name: str = None, description: str = None,
+                                         status: str = "active", **transport_fields):
+        """
+        Record a connected server in the registry and register its tools.
+
+        Args:
+            server_id: ID of the server
+            server_url: URL of the server
+            snapshot: The server's capabilities
+            server_name: Optional name for the server
+            description: Optional description for the server
+            status: Registry status of the server
+            **transport_fields: Transport settings stored in MCPServerInfo
+        """
+        # If name not provided, use URL
+        if not server_name:
+            server_name = server_url
+        if not description:
+            description = f"MCP server at {server_url}"
+
+        # Create and register server info
+        server_info = MCPServerInfo(
+            server_id=server_id,
+            server_url=server_url,
+            name=server_name,
+            description=description,
+            capabilities=snapshot.tool_names,
+            last_connected=datetime.now(),
+            status=status,
+            **transport_fields
+        )
+
+        # Add to registry
+        success = self.server_registry.add_server(server_info)
+        if success and self.logger:
+            self.logger.info(f"Registered server connection: {server_name}")
+
+        # Emit a tools_discovered event unless this exact tool set is already registered
+        await self._register_server_tools(server_id, snapshot, server_url)
+
     async def connect_to_server(self, server_url: str, server_name: str = None, description: str = None) -> bool:
         """
         Connect to an MCP server (primary or external) using the official Streamable HTTP protocol.
@@ -252,7 +565,10 @@ class MCPClientManager:
 
         # Create and establish connection using the connection manager utilities
         try:
-            client, connection = await self._create_client_session(server_url)
+            client, connection = await self._create_client_session(
+                server_url,
+                message_handler=self._build_message_handler(server_id)
+            )
             if client is None:
                 if self.logger:
                     self.logger.error(f"Failed to create client session for {server_url}")
@@ -265,64 +581,28 @@ class MCPClientManager:
         # Set logger
         client.logger = self.logger
 
-        # Test the connection using the official MCP protocol with timeout
+        # Test the connection using the official MCP protocol with timeout.
+        # The tool listing doubles as the connection test; a fresh cached snapshot
+        # skips it because the session handshake has already succeeded.
+        snapshot = None
         try:
-            # Test connection by listing tools
-            tools_response = await asyncio.wait_for(
-                client.list_tools(),
+            snapshot = await asyncio.wait_for(
+                self._load_capabilities(server_id, server_url, client, connection),
                 timeout=getattr(self.config, 'connection_timeout', 30)
             )
-
-            if tools_response is not None:
-                connection_result = {"success": True, "message": "Connected to server successfully"}
-            else:
-                connection_result = {"success": False, "message": "Failed to get tools from server"}
+            connection_result = {"success": True, "message": "Connected to server successfully"}
         except asyncio.TimeoutError:
             if self.logger:
                 self.logger.error(f"Connection test to {server_url} timed out")
             connection_result = {"success": False, "message": "Connection test timed out"}
+        except Exception as e:
+            connection_result = {"success": False, "message": f"Failed to get tools from server: {e}"}
 
         if connection_result["success"]:
             # Add to our client registry with the connection for later disconnection
             self.clients[server_id] = {'client': client, 'connection': connection}
 
-            # If name not provided, use URL
-            if not server_name:
-                server_name = server_url
-            if not description:
-                description = f"MCP server at {server_url}"
-
-            # Update server info with capabilities discovered from the server
-            try:
-                # Get tools to determine capabilities
-                tools_response = await client.list_tools()
-                if tools_response and "tools" in tools_response:
-                    capabilities = [tool.get("name", "") if isinstance(tool, dict) else str(tool) for tool in tools_response["tools"]]
-                else:
-                    capabilities = []
-            except Exception:
-                capabilities = []  # If we can't get tools, start with empty list
-
-            # Create and register server info
-            server_info = MCPServerInfo(
-                server_id=server_id,
-                server_url=server_url,
-                name=server_name,
-                description=description,
-                capabilities=capabilities,
-                last_connected=datetime.now(),
-                status="active"
-            )
-
-            # Add to registry
-            success = self.server_registry.add_server(server_info)
-            if success and self.logger:
-                self.logger.info(f"Registered server connection: {server_name}")
-
-            # Emit a tools_discovered event to signal that tools from this server should be registered
-            if self.logger:
-                self.logger.info(f"Emitting tools_discovered event for server {server_id} with capabilities: {capabilities}")
-            await self._notify_tool_discovered_event("tools_discovered", server_id, capabilities, server_url)
+            await self._register_connected_server(server_id, server_url, snapshot, server_name, description)
 
             return True
         else:
@@ -341,11 +621,18 @@ class MCPClientManager:
         Returns:
             True if disconnection was successful, False otherwise
         """
+        if self.process_pool.is_managed(server_id):
+            # Stops the local process; the stop callback removes the client entry
+            await self.process_pool.unregister(server_id)
+            self._registered_tool_hashes.pop(server_id, None)
+            return self.server_registry.remove_server(server_id)
+
         if server_id in self.clients:
             client_data = self.clients[server_id]
             if isinstance(client_data, dict) and 'connection' in client_data:
                 await client_data['connection'].disconnect()
             del self.clients[server_id]
+            self._registered_tool_hashes.pop(server_id, None)
 
             # Remove from registry
             success = self.server_registry.remove_server(server_id)
@@ -435,8 +722,12 @@ class MCPClientManager:
         Returns:
             True if removal was successful, False otherwise
         """
-        # Disconnect if currently connected
-        if server_id in self.clients:
+        # Forget cached capabilities so a re-added server is listed and registered again
+        self.capability_cache.remove(server_id)
+        self._registered_tool_hashes.pop(server_id, None)
+
+        # Disconnect if currently connected or supervised as a local process
+        if server_id in self.clients or self.process_pool.is_managed(server_id):
             await self.disconnect_from_server(server_id)
         else:
             # Just remove from registry if not connected
@@ -468,22 +759,162 @@ class MCPClientManager:
         Returns:
             MCPClient instance if a server with this tool is found, None otherwise
         """
-        # Check all connected servers to see if any of them supports this tool
-        for server_id, client_data in self.clients.items():
+        # Check all connected servers to see if any of them supports this tool,
+        # using the cached capabilities instead of listing tools on every server
+        for server_id, client_data in list(self.clients.items()):
             if isinstance(client_data, dict) and 'client' in client_data:
                 try:
-                    client = client_data['client']
-                    tools_response = await client.list_tools()
-                    if tools_response and "tools" in tools_response:
-                        tool_names = [tool.get("name", "") if isinstance(tool, dict) else str(tool) for tool in tools_response["tools"]]
-                        if tool_name in tool_names:
-                            return client
+                    snapshot = await self.get_server_capabilities(server_id)
+                    if snapshot and tool_name in snapshot.tool_names:
+                        if self.process_pool.is_managed(server_id):
+                            # Marks the local server as used so it isn't idled out
+                            return await self.process_pool.acquire(server_id)
+                        return client_data['client']
                 except Exception as e:
                     if self.logger:
                         self.logger.error(f"Error checking tools on server {server_id}: {e}")
 
+        # Local servers that are not running yet (lazy start) or were idled out
+        server_id = self.capability_cache.find_server_for_tool(tool_name)
+        if server_id and server_id not in self.clients and self.process_pool.is_managed(server_id):
+            try:
+                return await self.process_pool.acquire(server_id)
+            except Exception as e:
+                if self.logger:
+                    self.logger.error(f"Failed to start local server {server_id} for tool {tool_name}: {e}")
+
         return None  # No client found with this tool
 
+    async def get_server_capabilities(self, server_id: str) -> Optional[MCPCapabilitySnapshot]:
+        """
+        Get the cached capabilities of a server, refreshing them if the TTL has expired
+        or the server sent a list_changed notification.
+
+        Args:
+            server_id: ID of the server
+
+        Returns:
+            MCPCapabilitySnapshot if known, None otherwise
+        """
+        snapshot = self.capability_cache.get(server_id)
+        if snapshot is not None and self.capability_cache.is_fresh(server_id):
+            return snapshot
+
+        if server_id in self.clients:
+            return await self.refresh_server_capabilities(server_id)
+        return snapshot
+
+    async def refresh_server_capabilities(self, server_id: str) -> Optional[MCPCapabilitySnapshot]:
+        """
+        Re-list a connected server's capabilities and re-register its tools if they changed.
+
+        Args:
+            server_id: ID of the connected server
+
+        Returns:
+            The refreshed MCPCapabilitySnapshot, or None if the server is not connected
+        """
+        client_data = self.clients.get(server_id)
+        if not isinstance(client_data, dict) or 'client' not in client_data:
+            return None
+
+        client = client_data['client']
+        connection = client_data.get('connection')
+        server_capabilities = getattr(connection, 'server_capabilities', None) or None
+        snapshot = await self.capability_cache.refresh(server_id, client.server_url, client, server_capabilities)
+
+        server_info = self.server_registry.get_server(server_id)
+        if server_info and server_info.capabilities != snapshot.tool_names:
+            server_info.capabilities = snapshot.tool_names
+            self.server_registry.add_server(server_info)
+
+        await self._register_server_tools(server_id, snapshot, client.server_url)
+        return snapshot
+
+    async def _load_capabilities(self, server_id: str, server_url: str, client, connection) -> MCPCapabilitySnapshot:
+        """
+        Get a server's capabilities from the cache, listing them only when no fresh entry exists.
+
+        Args:
+            server_id: ID of the server
+            server_url: URL of the server
+            client: MCPClient connected to the server
+            connection: The connection the client belongs to
+
+        Returns:
+            The server's MCPCapabilitySnapshot
+        """
+        if self.capability_cache.is_fresh(server_id, server_url):
+            if self.logger:
+                self.logger.debug(f"Using cached capabilities for server {server_id}")
+            return self.capability_cache.get(server_id)
+
+        server_capabilities = getattr(connection, 'server_capabilities', None) or None
+        return await self.capability_cache.refresh(server_id, server_url, client, server_capabilities)
+
+    async def _register_server_tools(self, server_id: str, snapshot: MCPCapabilitySnapshot, server_url: str):
+        """
+        Hand a server's tools to the tool discovery service, skipping the work entirely
+        when the same tool hash is already registered.
+
+        Args:
+            server_id: ID of the server
+            snapshot: The server's current capabilities
+            server_url: URL of the server
+        """
+        capabilities = snapshot.tool_names
+        registered_tools = None
+        if self._tool_discovery_service:
+            registered_tools = self._tool_discovery_service.get_tools_for_server(server_id)
+
+        if self._registered_tool_hashes.get(server_id) == snapshot.tool_hash and (
+                registered_tools is None or set(registered_tools) == set(capabilities)):
+            if self.logger:
+                self.logger.debug(f"Tool hash unchanged for server {server_id}, skipping re-registration")
+            return
+
+        # Drop tools the server no longer exposes before registering the new set
+        if registered_tools:
+            for tool_name in [name for name in registered_tools if name not in capabilities]:
+                await self._tool_discovery_service.handle_tool_removed(server_id, tool_name)
+
+        if self.logger:
+            self.logger.info(f"Emitting tools_discovered event for server {server_id} with capabilities: {capabilities}")
+        await self._notify_tool_discovered_event("tools_discovered", server_id, capabilities, server_url)
+        self._registered_tool_hashes[server_id] = snapshot.tool_hash
+
+    def _build_message_handler(self, server_id: str) -> Callable:
+        """
+        Build the session message handler that reacts to list_changed notifications.
+
+        Args:
+            server_id: ID of the server the handler belongs to
+
+        Returns:
+            Async callable suitable for ClientSession's message_handler
+        """
+        async def handle_message(message):
+            if not isinstance(message, ServerNotification):
+                return
+            if isinstance(message.root, (ToolListChangedNotification, PromptListChangedNotification)):
+                if self.logger:
+                    self.logger.info(f"Capabilities of server {server_id} changed, refreshing cache")
+                self.capability_cache.invalidate(server_id)
+                # Refresh outside the session's receive loop, which must stay free to deliver the response
+                task = asyncio.create_task(self._refresh_after_list_changed(server_id))
+                self._refresh_tasks.add(task)
+                task.add_done_callback(self._refresh_tasks.discard)
+
+        return handle_message
+
+    async def _refresh_after_list_changed(self, server_id: str):
+        """Refresh a server's capabilities in the background after a list_changed notification."""
+        try:
+            await self.refresh_server_capabilities(server_id)
+        except Exception as e:
+            if self.logger:
+                self.logger.error(f"Error refreshing capabilities for server {server_id}: {e}")
+
     async def _notify_tool_discovered_event(self, event_type: str, server_id: str, capabilities: List[str], server_url: str):
         """
         Notify that tools have been discovered from an MCP server.
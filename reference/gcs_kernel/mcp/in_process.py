@@ -0,0 +1,181 @@
+"""
+In-process transport for the GCS Kernel MCP server.
+
+When a frontend and the kernel share a process there is no need to encode
+messages at all: the transports in this module hand Python objects to the
+MCPServer's JSON-RPC handlers through anyio memory streams. Tool results,
+prompt responses and streamed chunks reach the caller as the very objects the
+kernel produced, with no JSON encoding, framing or socket in between.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, AsyncGenerator, Dict, Optional
+
+import anyio
+from mcp import types
+from mcp.shared.message import SessionMessage
+
+from gcs_kernel.mcp.unix_socket import KernelRPCError
+
+
+IN_PROCESS_SERVER_URL = "inprocess://kernel"
+
+
+@asynccontextmanager
+async def in_process_client(server):
+    """
+    MCP client transport connected directly to an MCPServer in this process,
+    usable with ClientSession in the same way as the stdio and HTTP transports.
+
+    Args:
+        server: The MCPServer whose JSON-RPC handlers answer the requests
+
+    Yields:
+        tuple: (read_stream, write_stream) for ClientSession
+    """
+    client_write_stream, server_read_stream = anyio.create_memory_object_stream(0)
+    server_write_stream, client_read_stream = anyio.create_memory_object_stream(0)
+
+    async def respond(request: types.JSONRPCRequest):
+        handler = server.get_rpc_handler(request.method)
+        if handler is None:
+            error = types.ErrorData(code=types.METHOD_NOT_FOUND, message=f"Method not found: {request.method}")
+        else:
+            try:
+                result = await handler(request.params or {})
+                error = None
+            except Exception as e:
+                error = types.ErrorData(code=types.INTERNAL_ERROR, message=str(e))
+
+        if error is None:
+            response = types.JSONRPCResponse(jsonrpc="2.0", id=request.id, result=result)
+        else:
+            response = types.JSONRPCError(jsonrpc="2.0", id=request.id, error=error)
+        try:
+            await server_write_stream.send(SessionMessage(types.JSONRPCMessage(response)))
+        except (anyio.ClosedResourceError, anyio.BrokenResourceError):
+            pass
+
+    async def serve():
+        async with server_read_stream, server_write_stream:
+            async with anyio.create_task_group() as task_group:
+                async for session_message in server_read_stream:
+                    message = session_message.message.root
+                    # Notifications such as notifications/initialized need no answer
+                    if isinstance(message, types.JSONRPCRequest):
+                        task_group.start_soon(respond, message)
+
+    async with anyio.create_task_group() as task_group:
+        task_group.start_soon(serve)
+        try:
+            yield client_read_stream, client_write_stream
+        finally:
+            task_group.cancel_scope.cancel()
+
+
+class InProcessRPCClient:
+    """
+    JSON-RPC client calling an MCPServer in this process.
+
+    Offers the same interface as UnixSocketRPCClient, so frontends can switch
+    between an embedded and a separate kernel process without code changes.
+    """
+
+    def __init__(self, server, stream_buffer_size: int = 64):
+        """
+        Initialize the client.
+
+        Args:
+            server: The MCPServer whose JSON-RPC handlers answer the requests
+            stream_buffer_size: Chunks a stream may run ahead of its consumer
+        """
+        self.server = server
+        self.stream_buffer_size = stream_buffer_size
+
+    @classmethod
+    def for_kernel(cls, kernel, stream_buffer_size: int = 64) -> "InProcessRPCClient":
+        """
+        Create a client for a kernel that has no MCPServer of its own.
+
+        Args:
+            kernel: The GCSKernel instance to call
+            stream_buffer_size: Chunks a stream may run ahead of its consumer
+
+        Returns:
+            InProcessRPCClient bound to a listener-less MCPServer for the kernel
+        """
+        from gcs_kernel.mcp.server import MCPServer
+        from gcs_kernel.models import MCPConfig
+
+        server = MCPServer(MCPConfig(server_url=IN_PROCESS_SERVER_URL))
+        server.kernel = kernel
+        server.logger = getattr(kernel, 'logger', None)
+        return cls(server, stream_buffer_size)
+
+    @property
+    def connected(self) -> bool:
+        """In-process clients are always connected."""
+        return True
+
+    async def connect(self):
+        """Nothing to open for an in-process client."""
+
+    async def close(self):
+        """Nothing to close for an in-process client."""
+
+    async def request(self, method: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        Call a method and return its result.
+
+        Args:
+            method: JSON-RPC method name
+            params: Optional method parameters
+
+        Returns:
+            The result of the request
+        """
+        handler = self.server.get_rpc_handler(method)
+        if handler is None:
+            raise KernelRPCError(types.METHOD_NOT_FOUND, f"Method not found: {method}")
+        return await handler(params or {})
+
+    async def stream(self, method: str, params: Optional[Dict[str, Any]] = None) -> AsyncGenerator[Any, None]:
+        """
+        Call a streaming method and yield its chunks as they are produced.
+
+        The kernel produces chunks in its own task, so generation can continue
+        while the consumer is still rendering earlier chunks.
+
+        Args:
+            method: JSON-RPC method name
+            params: Optional method parameters
+
+        Yields:
+            The chunks produced by the kernel
+        """
+        handler = self.server.get_rpc_stream_handler(method)
+        if handler is None:
+            raise KernelRPCError(types.METHOD_NOT_FOUND, f"Method not found: {method}")
+
+        send_stream, receive_stream = anyio.create_memory_object_stream(self.stream_buffer_size)
+
+        async def produce():
+            async with send_stream:
+                async for chunk in handler(params or {}):
+                    await send_stream.send(chunk)
+
+        producer = asyncio.create_task(produce())
+        try:
+            async with receive_stream:
+                async for chunk in receive_stream:
+                    yield chunk
+            # Surface errors raised while producing the stream
+            await producer
+        finally:
+            if not producer.done():
+                producer.cancel()
+                try:
+                    await producer
+                except (asyncio.CancelledError, anyio.ClosedResourceError, anyio.BrokenResourceError):
+                    pass
@@ -0,0 +1,328 @@
+"""
+Local MCP Server Process Pool for the GCS Kernel.
+
+This module supervises MCP servers that run as local processes and talk to the
+kernel over the stdio transport. Each managed server can be started eagerly or
+lazily on first tool use, is restarted with exponential backoff when its
+process exits unexpectedly, and can be stopped again after an idle timeout.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+
+@dataclass
+class LocalServerSpec:
+    """Launch settings for a local MCP server process."""
+    server_id: str
+    server_url: str
+    command: str
+    args: List[str] = field(default_factory=list)
+    env: Optional[Dict[str, str]] = None
+    cwd: Optional[str] = None
+    lazy_start: bool = False
+    idle_timeout: Optional[float] = None
+
+
+class ManagedLocalServer:
+    """Runtime state of a supervised local MCP server."""
+
+    def __init__(self, spec: LocalServerSpec):
+        self.spec = spec
+        self.state = "stopped"  # stopped, starting, running, restarting, failed
+        self.client = None
+        self.connection = None
+        self.restart_count = 0
+        self.last_used = 0.0
+        self.started_at = 0.0
+        self.lock = asyncio.Lock()
+        self._watch_task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+    @property
+    def running(self) -> bool:
+        """Whether the server process is up and its session is usable."""
+        return self.state == "running" and self.client is not None
+
+    @property
+    def calls_in_flight(self) -> int:
+        """Requests the client is still waiting on, such as a long tool call."""
+        return getattr(self.client, 'calls_in_flight', 0)
+
+    def idle_for(self, now: float) -> float:
+        """Seconds since the client was last acquired or last answered a request."""
+        return now - max(self.last_used, getattr(self.client, 'last_call_finished', 0.0))
+
+
+class LocalServerProcessPool:
+    """
+    Starts, supervises and idles out local MCP server processes.
+
+    The pool is transport-agnostic: it receives a connection factory that spawns
+    the process and returns the (client, connection) pair, and only relies on
+    connection.wait_closed() and connection.disconnect(). Clients reporting
+    calls_in_flight and last_call_finished (see MCPClient) are not idled out
+    while a call is running.
+    """
+
+    def __init__(self, connection_factory: Callable[[LocalServerSpec], Awaitable[Tuple[Any, Any]]],
+                 max_restarts: int = 3, restart_backoff: float = 0.5, idle_check_interval: float = 30.0,
+                 stable_after: float = 60.0, on_started: Optional[Callable] = None, on_stopped: Optional[Callable] = None):
+        """
+        Initialize the process pool.
+
+        Args:
+            connection_factory: Async callable spawning a server and returning (client, connection)
+            max_restarts: Restarts attempted after consecutive crashes before the server is marked failed
+            restart_backoff: Base delay in seconds between restarts, doubled on each attempt
+            idle_check_interval: Seconds between idle checks
+            stable_after: Seconds a process must stay up for its crash count to be reset
+            on_started: Optional async callback(server_id, client, connection) after each (re)start
+            on_stopped: Optional async callback(server_id, reason) after a server stops
+        """
+        self.connection_factory = connection_factory
+        self.max_restarts = max_restarts
+        self.restart_backoff = restart_backoff
+        self.idle_check_interval = idle_check_interval
+        self.stable_after = stable_after
+        self.on_started = on_started
+        self.on_stopped = on_stopped
+        self.logger = None  # Will be set by the client manager
+
+        self._servers: Dict[str, ManagedLocalServer] = {}
+        self._idle_task: Optional[asyncio.Task] = None
+
+    def register(self, spec: LocalServerSpec) -> ManagedLocalServer:
+        """
+        Register a local server with the pool without starting it.
+
+        Args:
+            spec: Launch settings of the server
+
+        Returns:
+            The managed server entry
+        """
+        server = self._servers.get(spec.server_id)
+        if server is None:
+            server = ManagedLocalServer(spec)
+            self._servers[spec.server_id] = server
+        else:
+            server.spec = spec
+
+        if spec.idle_timeout and self._idle_task is None:
+            self._idle_task = asyncio.create_task(self._idle_loop())
+        return server
+
+    async def unregister(self, server_id: str) -> bool:
+        """
+        Stop a server and remove it from the pool.
+
+        Args:
+            server_id: ID of the server
+
+        Returns:
+            True if the server was managed by the pool, False otherwise
+        """
+        if server_id not in self._servers:
+            return False
+        await self.stop(server_id, reason="removed")
+        del self._servers[server_id]
+        return True
+
+    def get(self, server_id: str) -> Optional[ManagedLocalServer]:
+        """
+        Get the managed server entry for a server ID.
+
+        Args:
+            server_id: ID of the server
+
+        Returns:
+            ManagedLocalServer if managed by the pool, None otherwise
+        """
+        return self._servers.get(server_id)
+
+    def is_managed(self, server_id: str) -> bool:
+        """Check whether a server is managed by the pool."""
+        return server_id in self._servers
+
+    async def acquire(self, server_id: str):
+        """
+        Get the client of a managed server, starting its process first if needed.
+
+        Args:
+            server_id: ID of the server
+
+        Returns:
+            MCPClient for the running server
+        """
+        server = self._servers.get(server_id)
+        if server is None:
+            raise KeyError(f"Local MCP server {server_id} is not managed by the pool")
+
+        server.last_used = time.monotonic()
+        if server.running:
+            return server.client
+
+        async with server.lock:
+            if not server.running:
+                # An explicit acquire gives a failed server a fresh set of restarts
+                server.restart_count = 0
+                await self._start_locked(server)
+        server.last_used = time.monotonic()
+        return server.client
+
+    async def start(self, server_id: str):
+        """
+        Start a managed server if it is not running.
+
+        Args:
+            server_id: ID of the server
+
+        Returns:
+            MCPClient for the running server
+        """
+        return await self.acquire(server_id)
+
+    async def stop(self, server_id: str, reason: str = "stopped"):
+        """
+        Stop a managed server's process.
+
+        Args:
+            server_id: ID of the server
+            reason: Why the server is stopped (passed to on_stopped)
+        """
+        server = self._servers.get(server_id)
+        if server is None:
+            return
+
+        async with server.lock:
+            # Cancelling the watcher also abandons a pending crash restart
+            if server._watch_task and server._watch_task is not asyncio.current_task():
+                server._watch_task.cancel()
+            server._watch_task = None
+
+            was_running = server.connection is not None
+            if was_running:
+                server._stopping = True
+                try:
+                    await server.connection.disconnect()
+                finally:
+                    server._stopping = False
+            server.client = None
+            server.connection = None
+            server.state = "stopped"
+
+        if not was_running:
+            return
+        if self.logger:
+            self.logger.info(f"Local MCP server {server_id} stopped ({reason})")
+        await self._notify_stopped(server_id, reason)
+
+    async def shutdown(self):
+        """Stop all managed servers and the idle checker."""
+        if self._idle_task:
+            self._idle_task.cancel()
+            try:
+                await self._idle_task
+            except asyncio.CancelledError:
+                pass
+            self._idle_task = None
+
+        for server_id in list(self._servers):
+            await self.stop(server_id, reason="shutdown")
+
+    async def _start_locked(self, server: ManagedLocalServer):
+        """Spawn a server's process; the caller holds server.lock."""
+        server.state = "starting"
+        start_time = time.monotonic()
+        try:
+            client, connection = await self.connection_factory(server.spec)
+        except Exception:
+            server.state = "failed"
+            raise
+
+        server.client = client
+        server.connection = connection
+        server.state = "running"
+        server.started_at = time.monotonic()
+        server._watch_task = asyncio.create_task(self._watch(server, connection))
+
+        if self.logger:
+            elapsed = time.monotonic() - start_time
+            self.logger.info(f"Local MCP server {server.spec.server_id} started (elapsed: {elapsed:.2f}s)")
+        if self.on_started:
+            await self.on_started(server.spec.server_id, client, connection)
+
+    async def _watch(self, server: ManagedLocalServer, connection):
+        """Restart a server whose process exits without being stopped."""
+        await connection.wait_closed()
+        if server._stopping or server.connection is not connection:
+            return
+
+        server_id = server.spec.server_id
+        server.client = None
+        server.connection = None
+        if self.logger:
+            self.logger.warning(f"Local MCP server {server_id} exited unexpectedly")
+        await self._notify_stopped(server_id, "crashed")
+
+        # Only consecutive crashes count towards max_restarts
+        if time.monotonic() - server.started_at >= self.stable_after:
+            server.restart_count = 0
+
+        while server.restart_count < self.max_restarts:
+            delay = self.restart_backoff * (2 ** server.restart_count)
+            server.restart_count += 1
+            server.state = "restarting"
+            await asyncio.sleep(delay)
+
+            async with server.lock:
+                if server.running or server._stopping:
+                    return
+                try:
+                    await self._start_locked(server)
+                    return
+                except Exception as e:
+                    if self.logger:
+                        self.logger.error(f"Restart {server.restart_count} of local MCP server {server_id} failed: {e}")
+
+        server.state = "failed"
+        if self.logger:
+            self.logger.error(f"Local MCP server {server_id} failed after {server.restart_count} restarts")
+
+    async def _idle_loop(self):
+        """Periodically stop servers that have not been used within their idle timeout."""
+        while True:
+            await asyncio.sleep(self.idle_check_interval)
+            await self.stop_idle_servers()
+
+    async def stop_idle_servers(self) -> List[str]:
+        """
+        Stop running servers whose idle timeout has expired.
+
+        A server with calls in flight is in use, however long ago it was acquired.
+
+        Returns:
+            IDs of the servers that were stopped
+        """
+        now = time.monotonic()
+        stopped = []
+        for server_id, server in list(self._servers.items()):
+            idle_timeout = server.spec.idle_timeout
+            if (idle_timeout and server.running and not server.calls_in_flight
+                    and server.idle_for(now) >= idle_timeout):
+                await self.stop(server_id, reason="idle")
+                stopped.append(server_id)
+        return stopped
+
+    async def _notify_stopped(self, server_id: str, reason: str):
+        """Call the on_stopped callback, logging instead of raising on errors."""
+        if not self.on_stopped:
+            return
+        try:
+            await self.on_stopped(server_id, reason)
+        except Exception as e:
+            if self.logger:
+                self.logger.error(f"Error in local MCP server stop handler: {e}")
@@ -7,12 +7,16 @@ and tool execution capabilities via MCP interfaces.
 
 import asyncio
 import json
+import os
 import secrets
+import stat
 from typing import Dict, Any, Callable, Optional
 from fastapi import FastAPI, HTTPException, Depends, Header
 from pydantic import BaseModel
 import uvicorn
+from mcp.types import LATEST_PROTOCOL_VERSION
 from gcs_kernel.models import MCPConfig, ToolDefinition, ToolExecution, ToolResult
+from gcs_kernel.mcp.unix_socket import STREAM_CHUNK_METHOD, encode_message, read_frame
 
 
 class MCPServer:
@@ -33,6 +37,8 @@ class MCPServer:
         self.is_running = False
         self.server_process = None
         self.handlers: Dict[str, Callable] = {}
+        self.unix_server: Optional[asyncio.AbstractServer] = None
+        self.unix_socket_path: Optional[str] = None
         self.kernel = None  # Will be set by kernel
         self.logger = None  # Will be set by kernel
         
@@ -69,7 +75,9 @@ class MCPServer:
         """Register MCP-compliant endpoints."""
         @self.app.get("/health")
         async def health_check():
-            return {"status": "healthy", "kernel_running": self.kernel.is_running() if self.kernel else False}
+            health = {"status": "healthy", "kernel_running": self.kernel.is_running() if self.kernel else False}
+            health.update(self._llm_metrics())
+            return health
         
         @self.app.get("/tools")
         async def list_tools(auth=Depends(self._authenticate)):
@@ -183,7 +191,7 @@ class MCPServer:
             """Process an AI request through the kernel."""
             if self.kernel and hasattr(self.kernel, 'submit_prompt'):
                 prompt = request_data.get("prompt", "")
-                response = await self.kernel.submit_prompt(prompt)
+                response = await self.kernel.submit_prompt(prompt, **self._prompt_options(request_data))
                 return {"response": response}
             else:
                 raise HTTPException(status_code=500, detail="Kernel AI processing not available")
@@ -198,7 +206,7 @@ class MCPServer:
                 prompt = request_data.get("prompt", "")
                 
                 async def generate_stream():
-                    async for chunk in self.kernel.stream_prompt(prompt):
+                    async for chunk in self.kernel.stream_prompt(prompt, **self._prompt_options(request_data)):
                         yield f"data: {json.dumps({'chunk': chunk})}\n\n"
                 
                 return StreamingResponse(generate_stream(), media_type="text/plain")
@@ -222,12 +230,17 @@ class MCPServer:
             # Run the server (this would normally be in a background task)
             # For now, we'll just prepare it to run
             print(f"MCP Server starting on {self.config.server_url}")
+
+            if self.config.unix_socket_path:
+                await self.start_unix_socket(self.config.unix_socket_path)
         
         if self.logger:
             self.logger.info(f"MCP Server started on {self.config.server_url}")
 
     async def stop(self):
         """Stop the MCP server."""
+        await self.stop_unix_socket()
+
         if self.is_running and self.server_process:
             self.server_process.should_exit = True
             self.is_running = False
@@ -235,6 +248,249 @@ class MCPServer:
             if self.logger:
                 self.logger.info("MCP Server stopped")
 
+    async def start_unix_socket(self, socket_path: str) -> str:
+        """
+        Start listening on a Unix domain socket.
+
+        The socket speaks length-prefixed JSON-RPC frames (see
+        gcs_kernel.mcp.unix_socket) and is only accessible to the user
+        running the kernel, so no bearer token is required.
+
+        Args:
+            socket_path: Path of the socket file
+
+        Returns:
+            The path the server is listening on
+
+        Raises:
+            FileExistsError: If a file other than a socket exists at the path
+        """
+        if self.unix_server:
+            return self.unix_socket_path
+
+        # Remove a socket file left behind by a previous run, but never any other kind of file
+        if os.path.lexists(socket_path):
+            if not stat.S_ISSOCK(os.lstat(socket_path).st_mode):
+                raise FileExistsError(f"{socket_path} exists and is not a Unix domain socket")
+            os.unlink(socket_path)
+
+        self.unix_server = await asyncio.start_unix_server(self._handle_unix_connection, path=socket_path)
+        os.chmod(socket_path, 0o600)
+        self.unix_socket_path = socket_path
+
+        if self.logger:
+            self.logger.info(f"MCP Server listening on unix://{socket_path}")
+        return socket_path
+
+    async def stop_unix_socket(self):
+        """Stop listening on the Unix domain socket and remove the socket file."""
+        if not self.unix_server:
+            return
+
+        self.unix_server.close()
+        await self.unix_server.wait_closed()
+        self.unix_server = None
+
+        if self.unix_socket_path and os.path.exists(self.unix_socket_path):
+            os.unlink(self.unix_socket_path)
+        self.unix_socket_path = None
+
+    async def _handle_unix_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serve the JSON-RPC requests of one Unix socket connection."""
+        write_lock = asyncio.Lock()
+        tasks = set()
+
+        async def send(message: Dict[str, Any]):
+            async with write_lock:
+                writer.write(encode_message(message))
+                await writer.drain()
+
+        try:
+            while (payload := await read_frame(reader)) is not None:
+                try:
+                    message = json.loads(payload)
+                except json.JSONDecodeError:
+                    await send({"jsonrpc": "2.0", "id": None, "error": {"code": -32700, "message": "Parse error"}})
+                    continue
+
+                # Notifications (no id) such as notifications/initialized need no answer
+                if "id" not in message:
+                    continue
+
+                # Requests run concurrently so a long stream does not block other calls
+                task = asyncio.create_task(self._handle_unix_request(message, send))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        except (ValueError, ConnectionError) as e:
+            if self.logger:
+                self.logger.warning(f"Closing Unix socket connection: {e}")
+        finally:
+            for task in tasks:
+                task.cancel()
+            writer.close()
+
+    async def _handle_unix_request(self, message: Dict[str, Any], send: Callable):
+        """Dispatch a JSON-RPC request received over the Unix socket and send its response."""
+        request_id = message.get("id")
+        method = message.get("method")
+        params = message.get("params") or {}
+
+        try:
+            stream_handler = self.get_rpc_stream_handler(method)
+            if stream_handler:
+                async for chunk in stream_handler(params):
+                    await send({
+                        "jsonrpc": "2.0",
+                        "method": STREAM_CHUNK_METHOD,
+                        "params": {"requestId": request_id, "chunk": chunk}
+                    })
+                result = {"done": True}
+            else:
+                handler = self.get_rpc_handler(method)
+                if handler is None:
+                    await send({"jsonrpc": "2.0", "id": request_id,
+                                "error": {"code": -32601, "message": f"Method not found: {method}"}})
+                    return
+                result = await handler(params)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            if self.logger:
+                self.logger.error(f"Error handling Unix socket request {method}: {e}")
+            await send({"jsonrpc": "2.0", "id": request_id, "error": {"code": -32603, "message": str(e)}})
+            return
+
+        await send({"jsonrpc": "2.0", "id": request_id, "result": result})
+
+    def get_rpc_handler(self, method: str) -> Optional[Callable]:
+        """
+        Get the handler of a JSON-RPC method served by the local transports.
+
+        Args:
+            method: JSON-RPC method name
+
+        Returns:
+            Async callable taking the params dict and returning the result dict, or None
+        """
+        return {
+            "initialize": self._rpc_initialize,
+            "ping": self._rpc_ping,
+            "tools/list": self._rpc_list_tools,
+            "tools/call": self._rpc_call_tool,
+            "kernel/status": self._rpc_kernel_status,
+            "ai/process": self._rpc_process_ai_request,
+        }.get(method)
+
+    def get_rpc_stream_handler(self, method: str) -> Optional[Callable]:
+        """
+        Get the handler of a streaming JSON-RPC method served by the local transports.
+
+        Args:
+            method: JSON-RPC method name
+
+        Returns:
+            Async generator function taking the params dict and yielding chunks, or None
+        """
+        return {
+            "ai/stream": self._rpc_stream_ai_request,
+        }.get(method)
+
+    async def _rpc_initialize(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Answer the MCP initialize handshake."""
+        return {
+            "protocolVersion": params.get("protocolVersion", LATEST_PROTOCOL_VERSION),
+            "capabilities": {"tools": {}},
+            "serverInfo": {"name": "gcs-kernel", "version": "1.0"}
+        }
+
+    async def _rpc_ping(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Answer an MCP ping."""
+        return {}
+
+    async def _rpc_list_tools(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """List the registered tools in MCP tools/list format."""
+        if not (self.kernel and self.kernel.registry):
+            return {"tools": []}
+        return {
+            "tools": [
+                {
+                    "name": name,
+                    "description": getattr(tool, 'description', ''),
+                    "inputSchema": getattr(tool, 'parameters', None) or {"type": "object", "properties": {}},
+                    "annotations": {"readOnlyHint": bool(getattr(tool, 'read_only', False))}
+                }
+                for name, tool in self.kernel.registry.get_all_tools().items()
+            ]
+        }
+
+    async def _rpc_call_tool(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Execute a tool and return the result in MCP tools/call format."""
+        if not (self.kernel and hasattr(self.kernel, 'tool_execution_manager')):
+            raise RuntimeError("ToolExecutionManager not available")
+
+        result = await self.kernel.tool_execution_manager.execute_tool_for_mcp_client(
+            params.get("name"), params.get("arguments") or {}
+        )
+        text = result.llm_content if result.success else (result.error or result.llm_content)
+        return {
+            "content": [{"type": "text", "text": str(text)}],
+            "structuredContent": result.dict(),
+            "isError": not result.success
+        }
+
+    async def _rpc_kernel_status(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Report whether the kernel is running and which tools it has."""
+        running = self.kernel.is_running() if self.kernel else False
+        tools = list(self.kernel.registry.get_all_tools().keys()) if self.kernel and self.kernel.registry else []
+        status = {"status": "running" if running else "stopped", "tools": tools}
+        status.update(self._llm_metrics())
+        return status
+
+    async def _rpc_process_ai_request(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Process an AI request through the kernel."""
+        if not (self.kernel and hasattr(self.kernel, 'submit_prompt')):
+            raise RuntimeError("Kernel AI processing not available")
+        response = await self.kernel.submit_prompt(params.get("prompt", ""), **self._prompt_options(params))
+        return {"response": response}
+
+    async def _rpc_stream_ai_request(self, params: Dict[str, Any]):
+        """Stream an AI request through the kernel."""
+        if not (self.kernel and hasattr(self.kernel, 'stream_prompt')):
+            raise RuntimeError("Kernel AI streaming not available")
+        async for chunk in self.kernel.stream_prompt(params.get("prompt", ""), **self._prompt_options(params)):
+            yield chunk
+
+    def _llm_metrics(self) -> Dict[str, Any]:
+        """
+        Collect the LLM client metrics the kernel exposes.
+
+        Returns:
+            Metrics keyed by section, for the health check and kernel/status
+        """
+        sections = {
+            "llm_http_pool": "get_llm_http_metrics",
+            "llm_response_cache": "get_llm_cache_metrics",
+            "llm_rate_limits": "get_llm_rate_limit_metrics",
+            "llm_router": "get_llm_router_metrics",
+            "llm_tool_tokens": "get_llm_tool_token_report",
+        }
+        return {section: getattr(self.kernel, getter)()
+                for section, getter in sections.items() if hasattr(self.kernel, getter)}
+
+    @staticmethod
+    def _prompt_options(params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Get the prompt options of an AI request.
+
+        Args:
+            params: Request body or JSON-RPC params
+
+        Returns:
+            Keyword arguments for submit_prompt and stream_prompt; a session_id
+            resumes and persists that conversation session
+        """
+        return {"session_id": params["session_id"]} if params.get("session_id") else {}
+
     def register_custom_handler(self, path: str, handler: Callable, method: str = "GET"):
         """Register a custom handler for a specific endpoint."""
         if method.upper() == "GET":
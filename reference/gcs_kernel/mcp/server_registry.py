@@ -9,7 +9,7 @@ import json
 import os
 from pathlib import Path
 from typing import Dict, List, Optional
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 from datetime import datetime
 
 
@@ -22,7 +22,15 @@ class MCPServerInfo:
     description: str
     capabilities: List[str]
     last_connected: datetime
-    status: str = "active"  # active, disconnected, error
+    status: str = "active"  # active, idle, disconnected, error
+    transport: str = "http"  # http, stdio
+    # Launch settings for local servers using the stdio transport
+    command: Optional[str] = None
+    args: List[str] = field(default_factory=list)
+    env: Optional[Dict[str, str]] = None
+    cwd: Optional[str] = None
+    lazy_start: bool = False  # Start the process on first tool use instead of at connect time
+    idle_timeout: Optional[float] = None  # Seconds without tool use before the process is stopped
 
 
 class MCPServerRegistry:
@@ -0,0 +1,272 @@
+"""
+Unix domain socket transport for the GCS Kernel MCP server.
+
+Messages are JSON-RPC 2.0 objects sent as length-prefixed frames: a 4-byte
+big-endian payload length followed by the compact JSON payload. Compared to
+HTTP with SSE framing this needs no request/response headers, no connection
+handshake beyond the socket connect, and no per-token event formatting, which
+makes it the preferred transport for frontends on the same host as the kernel.
+
+Streaming requests (such as ai/stream) answer with a series of
+notifications/stream/chunk notifications carrying the request ID, followed by
+a regular response that ends the stream.
+"""
+
+import asyncio
+import itertools
+import json
+import struct
+from contextlib import asynccontextmanager
+from typing import Any, AsyncGenerator, Dict, Optional
+
+import anyio
+from mcp import types
+from mcp.shared.message import SessionMessage
+
+
+FRAME_HEADER = struct.Struct(">I")
+MAX_FRAME_SIZE = 16 * 1024 * 1024
+STREAM_CHUNK_METHOD = "notifications/stream/chunk"
+
+
+def encode_frame(payload: bytes) -> bytes:
+    """
+    Prefix a payload with its length.
+
+    Args:
+        payload: The encoded message
+
+    Returns:
+        The frame to write to the socket
+    """
+    return FRAME_HEADER.pack(len(payload)) + payload
+
+
+def encode_message(message: Dict[str, Any]) -> bytes:
+    """
+    Encode a JSON-RPC message as a frame.
+
+    Args:
+        message: The JSON-RPC message
+
+    Returns:
+        The frame to write to the socket
+    """
+    return encode_frame(json.dumps(message, separators=(",", ":")).encode("utf-8"))
+
+
+async def read_frame(reader: asyncio.StreamReader) -> Optional[bytes]:
+    """
+    Read one frame from the socket.
+
+    Args:
+        reader: Stream reader of the socket
+
+    Returns:
+        The frame payload, or None when the peer closed the connection
+    """
+    try:
+        header = await reader.readexactly(FRAME_HEADER.size)
+    except (asyncio.IncompleteReadError, ConnectionError):
+        return None
+
+    (length,) = FRAME_HEADER.unpack(header)
+    if length > MAX_FRAME_SIZE:
+        raise ValueError(f"Frame of {length} bytes exceeds the {MAX_FRAME_SIZE} byte limit")
+
+    try:
+        return await reader.readexactly(length)
+    except (asyncio.IncompleteReadError, ConnectionError):
+        return None
+
+
+@asynccontextmanager
+async def unix_socket_client(socket_path: str):
+    """
+    MCP client transport over a Unix domain socket, usable with ClientSession
+    in the same way as the stdio and streamable HTTP transports.
+
+    Args:
+        socket_path: Path of the server's Unix domain socket
+
+    Yields:
+        tuple: (read_stream, write_stream) for ClientSession
+    """
+    reader, writer = await asyncio.open_unix_connection(socket_path)
+
+    read_stream_writer, read_stream = anyio.create_memory_object_stream(0)
+    write_stream, write_stream_reader = anyio.create_memory_object_stream(0)
+
+    async def socket_reader():
+        try:
+            async with read_stream_writer:
+                while (payload := await read_frame(reader)) is not None:
+                    try:
+                        message = types.JSONRPCMessage.model_validate_json(payload)
+                    except Exception as exc:
+                        await read_stream_writer.send(exc)
+                        continue
+                    await read_stream_writer.send(SessionMessage(message))
+        except anyio.ClosedResourceError:
+            pass
+
+    async def socket_writer():
+        try:
+            async with write_stream_reader:
+                async for session_message in write_stream_reader:
+                    payload = session_message.message.model_dump_json(by_alias=True, exclude_none=True)
+                    writer.write(encode_frame(payload.encode("utf-8")))
+                    await writer.drain()
+        except (anyio.ClosedResourceError, ConnectionError):
+            pass
+
+    async with anyio.create_task_group() as task_group:
+        task_group.start_soon(socket_reader)
+        task_group.start_soon(socket_writer)
+        try:
+            yield read_stream, write_stream
+        finally:
+            writer.close()
+            task_group.cancel_scope.cancel()
+
+
+class KernelRPCError(Exception):
+    """Error response returned by the kernel to a JSON-RPC request."""
+
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+
+
+class UnixSocketRPCClient:
+    """
+    Lightweight JSON-RPC client for the kernel's Unix domain socket.
+
+    Unlike an MCP ClientSession it also supports the kernel's streaming
+    methods, and several requests can be in flight on one connection.
+    """
+
+    def __init__(self, socket_path: str):
+        """
+        Initialize the client.
+
+        Args:
+            socket_path: Path of the kernel's Unix domain socket
+        """
+        self.socket_path = socket_path
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._reader_task: Optional[asyncio.Task] = None
+        self._request_ids = itertools.count(1)
+        self._pending: Dict[int, asyncio.Queue] = {}
+        self._connect_lock = asyncio.Lock()
+
+    @property
+    def connected(self) -> bool:
+        """Whether the socket connection is open."""
+        return self._writer is not None and not self._writer.is_closing()
+
+    async def connect(self):
+        """Open the socket connection."""
+        async with self._connect_lock:
+            if self.connected:
+                return
+            self._reader, self._writer = await asyncio.open_unix_connection(self.socket_path)
+            self._reader_task = asyncio.create_task(self._read_loop())
+
+    async def close(self):
+        """Close the socket connection."""
+        if self._writer:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except ConnectionError:
+                pass
+        if self._reader_task:
+            self._reader_task.cancel()
+            try:
+                await self._reader_task
+            except asyncio.CancelledError:
+                pass
+        self._writer = None
+
+    async def request(self, method: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        Send a request and wait for its result.
+
+        Args:
+            method: JSON-RPC method name
+            params: Optional method parameters
+
+        Returns:
+            The result of the request
+        """
+        async for kind, value in self._exchange(method, params):
+            if kind == "result":
+                return value
+        return None
+
+    async def stream(self, method: str, params: Optional[Dict[str, Any]] = None) -> AsyncGenerator[Any, None]:
+        """
+        Send a streaming request and yield its chunks as they arrive.
+
+        Args:
+            method: JSON-RPC method name
+            params: Optional method parameters
+
+        Yields:
+            The chunks sent by the kernel
+        """
+        async for kind, value in self._exchange(method, params):
+            if kind == "chunk":
+                yield value
+
+    async def _exchange(self, method: str, params: Optional[Dict[str, Any]]):
+        """Send a request and yield ("chunk", value) items until ("result", value)."""
+        if not self.connected:
+            await self.connect()
+
+        request_id = next(self._request_ids)
+        queue: asyncio.Queue = asyncio.Queue()
+        self._pending[request_id] = queue
+        try:
+            message = {"jsonrpc": "2.0", "id": request_id, "method": method}
+            if params is not None:
+                message["params"] = params
+            self._writer.write(encode_message(message))
+            await self._writer.drain()
+
+            while True:
+                kind, value = await queue.get()
+                if kind == "error":
+                    raise value
+                yield kind, value
+                if kind == "result":
+                    return
+        finally:
+            self._pending.pop(request_id, None)
+
+    async def _read_loop(self):
+        """Route incoming frames to the queues of the pending requests."""
+        try:
+            while (payload := await read_frame(self._reader)) is not None:
+                message = json.loads(payload)
+                if message.get("method") == STREAM_CHUNK_METHOD:
+                    params = message.get("params", {})
+                    queue = self._pending.get(params.get("requestId"))
+                    if queue is not None:
+                        queue.put_nowait(("chunk", params.get("chunk")))
+                    continue
+
+                queue = self._pending.get(message.get("id"))
+                if queue is None:
+                    continue
+                if "error" in message:
+                    error = message["error"]
+                    queue.put_nowait(("error", KernelRPCError(error.get("code", -32603), error.get("message", ""))))
+                else:
+                    queue.put_nowait(("result", message.get("result")))
+        finally:
+            # Fail requests still waiting on a connection that went away
+            for queue in self._pending.values():
+                queue.put_nowait(("error", ConnectionError("Kernel socket connection closed")))
@@ -0,0 +1,186 @@
+"""
+Append-only, structurally shared conversation history.
+
+A conversation's history grows by one or a few messages per turn, while the
+messages already in it are never modified. Copying the history whenever a
+prompt object is created, cloned or turned into a request therefore costs
+O(history) per turn for nothing. MessageLog is a sequence of messages whose
+snapshots and forks share the list holding the messages:
+
+- a snapshot or fork records the shared list and its own length, in O(1);
+- appending to the log at the tip of the shared list appends in place;
+- appending to a log another fork has already appended past, or replacing
+  or inserting a message, first copies the log's own prefix (copy on write).
+
+The messages up to a log's length are never changed in the shared list, so
+each snapshot keeps seeing exactly the messages it was taken with. Messages
+themselves are shared as well and must be treated as read-only once
+appended; replace a message instead of modifying it.
+"""
+
+from collections.abc import MutableSequence
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from pydantic_core import core_schema
+
+Message = Dict[str, Any]
+
+
+class MessageLog(MutableSequence):
+    """A list-like conversation history with O(1) snapshots and forks."""
+
+    __slots__ = ("_messages", "_length")
+
+    def __init__(self, messages: Iterable[Message] = ()):
+        """
+        Create a log holding the given messages.
+
+        Args:
+            messages: Initial messages, in order
+        """
+        self._messages: List[Message] = list(messages)
+        self._length = len(self._messages)
+
+    @classmethod
+    def _view(cls, messages: List[Message], length: int) -> "MessageLog":
+        """Create a log over the first length messages of a shared list."""
+        log = cls.__new__(cls)
+        log._messages = messages
+        log._length = length
+        return log
+
+    def snapshot(self) -> "MessageLog":
+        """
+        Take a snapshot of the log.
+
+        Returns:
+            A log with the same messages; appending to either is not seen by the other
+        """
+        return self._view(self._messages, self._length)
+
+    def fork(self, length: Optional[int] = None) -> "MessageLog":
+        """
+        Branch the conversation, optionally from an earlier point.
+
+        Args:
+            length: Number of leading messages the branch keeps (defaults to all of them)
+
+        Returns:
+            A log sharing those messages with this one
+        """
+        if length is None:
+            return self.snapshot()
+        if not 0 <= length <= self._length:
+            raise ValueError(f"Cannot fork a log of {self._length} messages at {length}")
+        return self._view(self._messages, length)
+
+    def _detach(self):
+        """Give the log its own copy of its messages before changing them."""
+        self._messages = self._messages[:self._length]
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._messages[slice(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("MessageLog index out of range")
+        return self._messages[index]
+
+    def __iter__(self) -> Iterator[Message]:
+        return islice(self._messages, self._length)
+
+    def __reversed__(self) -> Iterator[Message]:
+        messages = self._messages
+        return (messages[index] for index in range(self._length - 1, -1, -1))
+
+    def append(self, message: Message):
+        """Append a message, in place when the log is at the tip of the shared list."""
+        if len(self._messages) != self._length:
+            self._detach()
+        self._messages.append(message)
+        self._length += 1
+
+    def extend(self, messages: Iterable[Message]):
+        """Append several messages."""
+        if len(self._messages) != self._length:
+            self._detach()
+        self._messages.extend(messages)
+        self._length = len(self._messages)
+
+    def insert(self, index: int, message: Message):
+        """Insert a message; inserting anywhere but at the end copies the log first."""
+        if index >= self._length:
+            self.append(message)
+            return
+        self._detach()
+        self._messages.insert(index, message)
+        self._length += 1
+
+    def __setitem__(self, index, message):
+        self._detach()
+        self._messages[index] = message
+        self._length = len(self._messages)
+
+    def __delitem__(self, index):
+        self._detach()
+        del self._messages[index]
+        self._length = len(self._messages)
+
+    def clear(self):
+        """Remove every message without touching the shared list."""
+        self._messages = []
+        self._length = 0
+
+    def copy(self) -> "MessageLog":
+        """Copy the log, which is a snapshot."""
+        return self.snapshot()
+
+    def __copy__(self) -> "MessageLog":
+        return self.snapshot()
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "MessageLog":
+        # Messages are read-only once appended, so a deep copy shares them too
+        return self.snapshot()
+
+    def __add__(self, other: Iterable[Message]) -> List[Message]:
+        return self._messages[:self._length] + list(other)
+
+    def __radd__(self, other: Iterable[Message]) -> List[Message]:
+        return list(other) + self._messages[:self._length]
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, MessageLog):
+            if other._messages is self._messages and other._length == self._length:
+                return True
+            return len(other) == self._length and all(a == b for a, b in zip(self, other))
+        if isinstance(other, (list, tuple)):
+            return len(other) == self._length and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"MessageLog({list(self)!r})"
+
+    @classmethod
+    def _validate(cls, value: Any) -> "MessageLog":
+        """Validate a history value: logs are snapshotted, other iterables copied into a log."""
+        if isinstance(value, MessageLog):
+            return value.snapshot()
+        if isinstance(value, (list, tuple)):
+            return cls(value)
+        raise TypeError(f"Expected a list of messages, got {type(value).__name__}")
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source_type: Any, handler: Any) -> core_schema.CoreSchema:
+        """Validate without copying the messages and serialize as a plain list."""
+        return core_schema.no_info_plain_validator_function(
+            cls._validate,
+            json_schema_input_schema=core_schema.list_schema(core_schema.dict_schema()),
+            serialization=core_schema.plain_serializer_function_ser_schema(list),
+        )
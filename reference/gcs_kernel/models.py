@@ -11,6 +11,8 @@ from enum import Enum
 import uuid
 from datetime import datetime
 
+from gcs_kernel.message_log import MessageLog
+
 
 class ToolApprovalMode(str, Enum):
     DEFAULT = "DEFAULT"
@@ -135,6 +137,12 @@ class MCPConfig(BaseModel):
     request_timeout: int = Field(default=60, description="Request timeout in seconds")
     runtime_data_directory: str = Field(default="./runtime_data", description="Directory to store runtime data including MCP server registry")
     server_registry_filename: str = Field(default="mcp_servers.json", description="Filename for the MCP server registry file")
+    capability_snapshot_filename: str = Field(default="mcp_capabilities.json", description="Filename for the cached MCP server capability snapshot")
+    capability_cache_ttl: int = Field(default=3600, description="Seconds before cached server capabilities are re-listed (0 disables expiry)")
+    local_server_max_restarts: int = Field(default=3, description="Restarts attempted after consecutive crashes of a local stdio server")
+    local_server_restart_backoff: float = Field(default=0.5, description="Base delay in seconds between local server restarts, doubled per attempt")
+    local_server_idle_check_interval: float = Field(default=30.0, description="Seconds between checks for idle local servers")
+    unix_socket_path: Optional[str] = Field(default=None, description="Path of a Unix domain socket the MCP server also listens on (disabled if unset)")
 
 
 class ToolInclusionPolicy(str, Enum):
@@ -147,6 +155,14 @@ class ToolInclusionPolicy(str, Enum):
     CUSTOM = "custom"  # Include a custom subset specified by the caller
 
 
+class RequestPriority(str, Enum):
+    """
+    Admission priority of an LLM request when the provider's rate limit is reached.
+    """
+    INTERACTIVE = "interactive"  # A user is waiting for the turn
+    BACKGROUND = "background"  # Kernel-internal work such as adaptation or summarization
+
+
 class ToolInclusionConfig(BaseModel):
     """
     Configuration for tool inclusion strategy.
@@ -175,12 +191,13 @@ class PromptObject(BaseModel):
     custom_tools: Optional[List[Dict[str, Any]]] = Field(default=None, description="Custom tools for this prompt")
     
     # Conversation history
-    conversation_history: List[Dict[str, Any]] = Field(default_factory=list, description="Complete conversation history")
+    conversation_history: MessageLog = Field(default_factory=MessageLog, description="Complete conversation history (append-only, shared between snapshots)")
     
     # Execution context
     context: Optional[Dict[str, Any]] = Field(default=None, description="Additional context for processing")
     user_id: Optional[str] = Field(default=None, description="User identifier if authenticated")
     session_id: Optional[str] = Field(default=None, description="Session identifier")
+    context_block: Optional[str] = Field(default=None, description="Context sent ahead of the prompt text in its user message, but not stored with it")
     
     # Execution metadata
     status: PromptStatus = Field(default=PromptStatus.PENDING)
@@ -199,6 +216,7 @@ class PromptObject(BaseModel):
     max_tokens: Optional[int] = Field(default=None, description="Maximum tokens to generate")
     tool_choice: str = Field(default="auto", description="Tool choice strategy")
     temperature: float = Field(default=0.7, description="Temperature setting for generation")
+    priority: RequestPriority = Field(default=RequestPriority.INTERACTIVE, description="Admission priority of the LLM requests")
     
     @classmethod
     def create(cls, 
@@ -213,7 +231,8 @@ class PromptObject(BaseModel):
                streaming_enabled: bool = True,
                max_tokens: int = None,
                tool_choice: str = "auto",
-               temperature: float = 0.7) -> 'PromptObject':
+               temperature: float = 0.7,
+               priority: RequestPriority = RequestPriority.INTERACTIVE) -> 'PromptObject':
         """
         Create a new PromptObject with sensible defaults.
         
@@ -223,12 +242,13 @@ class PromptObject(BaseModel):
             role: Role of the prompt in conversation (default: "user")
             tool_policy: Tool inclusion policy (default: ALL_AVAILABLE)
             custom_tools: Custom tools for this prompt
-            conversation_history: Complete conversation history
+            conversation_history: Complete conversation history (a MessageLog is shared, not copied)
             user_id: User identifier if authenticated
             session_id: Session identifier
             streaming_enabled: Whether to stream the response (default: True)
             max_tokens: Maximum tokens to generate
             temperature: Temperature setting for generation (default: 0.7)
+            priority: Admission priority of the LLM requests (default: INTERACTIVE)
             
         Returns:
             A new PromptObject instance
@@ -247,7 +267,8 @@ class PromptObject(BaseModel):
             streaming_enabled=streaming_enabled,
             max_tokens=max_tokens,
             tool_choice="auto",
-            temperature=temperature
+            temperature=temperature,
+            priority=priority
         )
     
     @classmethod
@@ -341,10 +362,35 @@ class PromptObject(BaseModel):
     def add_system_message(self, content: str):
         """Add a system message to the conversation history."""
         self.add_message_to_history("system", content)
+
+    def set_system_message(self, content: str):
+        """
+        Set the system message in its single slot at the start of the conversation history.
+
+        The slot is replaced in place rather than appended to, so the history
+        keeps one system message and its prefix stays identical across turns.
+
+        Args:
+            content: The system message content
+        """
+        history = self.conversation_history
+        if history and history[0].get("role") == "system":
+            if history[0].get("content") == content:
+                return
+            history[0] = {"role": "system", "content": content}
+        else:
+            history.insert(0, {"role": "system", "content": content})
+        self.updated_at = datetime.now()
     
     def add_user_message(self, content: str):
         """Add a user message to the conversation history."""
         self.add_message_to_history("user", content)
+
+    def user_message_content(self) -> str:
+        """The prompt text as sent in its user message, preceded by the context block if there is one."""
+        if not self.context_block:
+            return self.content
+        return f"{self.context_block}\n\n{self.content}"
     
     def add_assistant_message(self, content: str, tool_calls: List[Dict[str, Any]] = None):
         """Add an assistant message to the conversation history."""
@@ -391,7 +437,13 @@ class PromptObject(BaseModel):
         return len(self.tool_results) > 0
     
     def clone(self) -> 'PromptObject':
-        """Create a deep copy of the prompt object."""
+        """
+        Create a deep copy of the prompt object.
+
+        The conversation history is forked rather than copied: the clone shares
+        the existing messages, and messages appended to either object are not
+        seen by the other.
+        """
         import copy
         return copy.deepcopy(self)
     
@@ -6,8 +6,10 @@ their registration, and discovery (command-based and MCP-based).
 """
 
 import asyncio
-from typing import Dict, Any, Optional, Protocol
+from dataclasses import dataclass
+from typing import Callable, Dict, Any, List, Optional, Protocol
 from gcs_kernel.models import ToolDefinition, ToolResult, ToolApprovalMode
+from gcs_kernel.tool_schema import normalize_parameters_schema, get_schema_validator
 
 
 class BaseTool(Protocol):
@@ -21,6 +23,8 @@ class BaseTool(Protocol):
     display_name: str
     description: str
     parameters: Dict[str, Any]  # Following OpenAI-compatible format
+    # Tools without side effects set this, so the orchestrator may start them while the model is still streaming
+    read_only: bool = False
     
     async def execute(self, parameters: Dict[str, Any]) -> ToolResult:
         """
@@ -35,6 +39,98 @@ class BaseTool(Protocol):
         ...
 
 
+def to_provider_tool(tool_name: str, tool: Any) -> Dict[str, Any]:
+    """
+    Describe a registered tool in the OpenAI function-calling format.
+    
+    Args:
+        tool_name: The name the tool is registered under
+        tool: The tool object
+        
+    Returns:
+        The tool as a {"type": "function", "function": {...}} dictionary
+    """
+    return {
+        "type": "function",
+        "function": {
+            "name": getattr(tool, 'name', tool_name),
+            "description": getattr(tool, 'description', ''),
+            "parameters": getattr(tool, 'parameters', {})
+        }
+    }
+
+
+@dataclass(frozen=True)
+class ToolCatalog:
+    """
+    Snapshot of the registered tools at one registry version.
+    
+    The tool list is handed to every prompt as-is, so it must be treated as
+    read-only; the registry builds a new catalog whenever its tools change.
+    """
+    version: int
+    tools: List[Dict[str, Any]]  # Provider-format tools sorted by name
+
+    @classmethod
+    def from_tools(cls, tools: Dict[str, Any], version: int = 0) -> 'ToolCatalog':
+        """
+        Build a catalog from a name-to-tool mapping.
+        
+        Args:
+            tools: Registered tools by name
+            version: The registry version the tools belong to
+            
+        Returns:
+            The catalog, with tools in a stable order so the request prefix
+            stays identical across turns
+        """
+        provider_tools = sorted((to_provider_tool(name, tool) for name, tool in tools.items()),
+                                key=lambda tool: tool["function"]["name"])
+        return cls(version=version, tools=provider_tools)
+
+
+class _VersionedToolDict(dict):
+    """Tool dictionary that reports every mutation to its registry."""
+
+    def __init__(self, *args, on_change: Callable[[], None], **kwargs):
+        super().__init__(*args, **kwargs)
+        self._on_change = on_change
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._on_change()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._on_change()
+
+    def pop(self, key, *default):
+        # Popping a missing key with a default changes nothing, so the version stays
+        removed = key in self
+        result = super().pop(key, *default)
+        if removed:
+            self._on_change()
+        return result
+
+    def popitem(self):
+        result = super().popitem()
+        self._on_change()
+        return result
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._on_change()
+
+    def clear(self):
+        super().clear()
+        self._on_change()
+
+
 class ToolRegistry:
     """
     Tool Registry System that manages available tools, their registration,
@@ -43,6 +139,8 @@ class ToolRegistry:
     
     def __init__(self, mcp_client_manager=None):
         """Initialize the tool registry with necessary components."""
+        self._version = 0  # Bumped on every change to the tools
+        self._catalog: Optional[ToolCatalog] = None
         self.tools: Dict[str, BaseTool] = {}  # Local tools only
         # Map external tool names to their MCP client configuration
         self.external_tool_mcp_configs: Dict[str, str] = {}  # Maps tool names to MCP client server URLs
@@ -50,6 +148,24 @@ class ToolRegistry:
         self.mcp_client_manager = mcp_client_manager  # Reference to MCP client manager
         self.logger = None  # Will be set by kernel
 
+    @property
+    def tools(self) -> Dict[str, BaseTool]:
+        """Registered tools by name; any change to them bumps the registry version."""
+        return self._tools
+
+    @tools.setter
+    def tools(self, tools: Dict[str, BaseTool]):
+        self._tools = _VersionedToolDict(tools, on_change=self._bump_version)
+        self._bump_version()
+
+    @property
+    def version(self) -> int:
+        """Monotonically increasing version of the registered tools."""
+        return self._version
+
+    def _bump_version(self):
+        self._version += 1
+
     async def initialize(self, kernel=None):
         """Initialize the registry."""
         # Register built-in tools
@@ -217,13 +333,16 @@ class ToolRegistry:
         # If it doesn't exist at all, return None
         return None
 
-    async def register_external_tool(self, tool_name: str, server_url: str) -> bool:
+    async def register_external_tool(self, tool_name: str, server_url: str,
+                                     tool_definition: Optional[Dict[str, Any]] = None) -> bool:
         """
         Register an external tool that is available via an MCP server.
         
         Args:
             tool_name: Name of the external tool
             server_url: URL of the MCP server hosting the tool
+            tool_definition: Optional MCP tool definition (description, inputSchema);
+                             looked up in the MCP capability cache when not given
             
         Returns:
             True if registration was successful
@@ -232,9 +351,12 @@ class ToolRegistry:
             # Register the tool with its server configuration
             self.external_tool_mcp_configs[tool_name] = server_url
             
+            if tool_definition is None:
+                tool_definition = self._get_cached_tool_definition(tool_name, server_url)
+            
             # Create a dynamic external tool instance that routes calls to the MCP server
             # This tool instance will be added to the main tools registry
-            external_tool_instance = self._create_external_tool_wrapper(tool_name, server_url)
+            external_tool_instance = self._create_external_tool_wrapper(tool_name, server_url, tool_definition)
             
             # Add the external tool to the main tools registry so it appears in get_all_tools()
             self.tools[tool_name] = external_tool_instance
@@ -248,25 +370,56 @@ class ToolRegistry:
                 self.logger.error(f"Failed to register external tool {tool_name}: {e}")
             return False
 
-    def _create_external_tool_wrapper(self, tool_name: str, server_url: str):
+    def _get_cached_tool_definition(self, tool_name: str, server_url: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up an external tool's definition in the MCP client manager's capability cache.
+        
+        Args:
+            tool_name: Name of the external tool
+            server_url: URL of the MCP server hosting the tool
+            
+        Returns:
+            The cached MCP tool definition, or None if unavailable
+        """
+        capability_cache = getattr(self.mcp_client_manager, 'capability_cache', None)
+        if capability_cache is None:
+            return None
+        return capability_cache.get_tool_definition(tool_name, server_url)
+
+    def _create_external_tool_wrapper(self, tool_name: str, server_url: str,
+                                      tool_definition: Optional[Dict[str, Any]] = None):
         """
         Create a wrapper tool instance for an external tool that routes execution to the MCP server.
         
         Args:
             tool_name: Name of the external tool
             server_url: URL of the server hosting the tool
+            tool_definition: Optional MCP tool definition providing description and inputSchema
             
         Returns:
             A tool instance that wraps external tool execution
         """
+        tool_definition = tool_definition or {}
+
         # Create a dynamic class that implements BaseTool for the external tool
         class MCPExternalToolWrapper:
             def __init__(self, wrapper_tool_name, wrapper_server_url, registry_instance):
                 self.name = wrapper_tool_name
                 self.display_name = f"{wrapper_tool_name} (external)"
-                self.description = f"External tool '{wrapper_tool_name}' available via MCP server at {wrapper_server_url}"
-                # Default parameters schema - in real implementation, this would come from the actual tool schema
-                self.parameters = {"type": "object", "properties": {}, "required": []}
+                self.description = tool_definition.get("description") or \
+                    f"External tool '{wrapper_tool_name}' available via MCP server at {wrapper_server_url}"
+                # Parameters schema normalized from the server's inputSchema (OpenAI-compatible format)
+                self.parameters = normalize_parameters_schema(
+                    tool_definition.get("inputSchema", tool_definition.get("parameters"))
+                )
+                # Compiled once at registration so argument validation doesn't recompile the schema
+                try:
+                    self.parameters_validator = get_schema_validator(self.parameters)
+                except Exception:
+                    # A server-side schema jsonschema can't compile shouldn't block registration
+                    self.parameters_validator = None
+                # MCP tool annotations declare whether the tool modifies its environment
+                self.read_only = bool((tool_definition.get("annotations") or {}).get("readOnlyHint"))
                 self._server_url = wrapper_server_url
                 self._registry = registry_instance  # Keep reference to registry for MCP client access
 
@@ -309,6 +462,10 @@ class ToolRegistry:
                 # If client manager method fails, fall back to manual client creation
                 pass
 
+        # Local stdio servers are spawned by the client manager's process pool only
+        if server_url.startswith("stdio://"):
+            return None
+
         # If client manager isn't available or doesn't have the client, use cached or create new one
         if server_url not in self.mcp_clients:
             # Create and initialize an MCP client for this server using the new architecture
@@ -316,7 +473,7 @@ class ToolRegistry:
             from gcs_kernel.mcp.client_manager import MCPConnection
 
             # Create a direct connection using the new pattern
-            connection = MCPConnection(server_url)
+            connection = MCPConnection(server_url, transport=MCPConnection.transport_for_url(server_url))
             client = await connection.connect()
             client.logger = self.logger
 
@@ -363,6 +520,20 @@ class ToolRegistry:
         """
         return self.tools.copy()
 
+    def get_tool_catalog(self) -> ToolCatalog:
+        """
+        Get the provider-format snapshot of the registered tools.
+        
+        The snapshot is rebuilt only when the registry version changes, so
+        every prompt in between shares the same tool list object.
+        
+        Returns:
+            The ToolCatalog for the current registry version
+        """
+        if self._catalog is None or self._catalog.version != self._version:
+            self._catalog = ToolCatalog.from_tools(self.tools, self._version)
+        return self._catalog
+
     async def discover_command_based_tools(self) -> Dict[str, BaseTool]:
         """
         Discover tools using command-based discovery mechanism.
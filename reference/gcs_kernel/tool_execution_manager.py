@@ -10,13 +10,14 @@ import asyncio
 import json
 from datetime import datetime
 from typing import Dict, Any, Optional, List
-from jsonschema import validate, ValidationError
+from jsonschema import ValidationError
 
 from gcs_kernel.models import (
     ToolDefinition, ToolExecution, ToolState, ToolResult, 
     ToolApprovalMode, ToolInclusionConfig
 )
 from gcs_kernel.tool_call_model import ToolCall
+from gcs_kernel.tool_schema import get_schema_validator, is_schema_validator
 
 
 class ToolExecutionManager:
@@ -252,10 +253,7 @@ class ToolExecutionManager:
             True if validation passes, False otherwise
         """
         try:
-            # Use the jsonschema library to validate parameters against the schema
-            # All tools should now follow the OpenAI-compatible format with 'parameters' attribute
-            schema = tool_def.parameters
-            validate(instance=params, schema=schema)
+            self._get_validator(tool_def).validate(params)
             return True
         except ValidationError as e:
             if self.logger:
@@ -266,6 +264,61 @@ class ToolExecutionManager:
                 self.logger.error(f"Unexpected error during parameter validation: {str(e)}")
             return False
 
+    def _get_validator(self, tool_def):
+        """
+        Get the compiled JSON Schema validator for a tool's parameters.
+        
+        Args:
+            tool_def: The tool definition containing the schema
+            
+        Returns:
+            A jsonschema validator instance
+        """
+        # External tool wrappers carry a validator compiled at registration;
+        # other tools use the shared cache keyed by schema content.
+        # All tools follow the OpenAI-compatible format with 'parameters' attribute
+        validator = getattr(tool_def, 'parameters_validator', None)
+        if not is_schema_validator(validator):
+            validator = get_schema_validator(tool_def.parameters)
+        return validator
+
+    async def _validate_external_parameters(self, tool_name: str, params: Dict[str, Any]) -> Optional[ToolResult]:
+        """
+        Validate the arguments of an external tool call against the tool's cached inputSchema,
+        so malformed calls are answered locally instead of making a round trip to the MCP server.
+        
+        Args:
+            tool_name: The name of the external tool
+            params: The parameters to validate
+            
+        Returns:
+            A failed ToolResult describing the problem, or None if the arguments are valid
+        """
+        tool_def = await self.registry.get_tool(tool_name) if self.registry else None
+        if tool_def is None or not hasattr(tool_def, 'parameters'):
+            return None
+        
+        try:
+            self._get_validator(tool_def).validate(params)
+            return None
+        except ValidationError as e:
+            if self.logger:
+                self.logger.error(f"Parameter validation failed for external tool '{tool_name}': {e.message}")
+            # Give the LLM the schema violation so it can correct the call in the next iteration
+            message = f"Invalid arguments for tool '{tool_name}': {e.message}"
+            return ToolResult(
+                tool_name=tool_name,
+                success=False,
+                error="Invalid parameters",
+                llm_content=message,
+                return_display=message
+            )
+        except Exception as e:
+            # An uncompilable server schema leaves validation to the MCP server
+            if self.logger:
+                self.logger.warning(f"Could not validate parameters for external tool '{tool_name}': {e}")
+            return None
+
     async def _determine_approval_mode(self, tool_def: ToolDefinition, execution: ToolExecution) -> ToolApprovalMode:
         """
         Determine the approval mode for a tool execution.
@@ -502,6 +555,17 @@ class ToolExecutionManager:
         # Tool is registered, determine if it's local or external
         server_config = await self.registry.get_tool_server_config(tool_call.name)
         if server_config:
+            # Reject arguments that don't match the tool's inputSchema before contacting the server
+            validation_error = await self._validate_external_parameters(tool_call.name, tool_call.arguments)
+            if validation_error is not None:
+                return {
+                    "tool_call_id": tool_call.id,
+                    "tool_name": tool_call.name,
+                    "result": validation_error,
+                    "success": False,
+                    "execution_id": f"external_{tool_call.id}"
+                }
+            
             # This is an external tool, get the specific MCP client for this tool
             mcp_client = await self.registry.get_mcp_client_for_tool(tool_call.name)
             if mcp_client:
@@ -0,0 +1,109 @@
+"""
+Tool parameter schema helpers for the GCS Kernel.
+
+This module normalizes JSON schemas coming from MCP servers into the
+OpenAI-compatible `parameters` format used by ToolDefinition, and caches
+compiled jsonschema validators so that a schema is checked and compiled
+once instead of on every tool call.
+"""
+
+import copy
+import json
+from functools import lru_cache
+from typing import Dict, Any, Optional
+
+from jsonschema.validators import (
+    Draft3Validator, Draft4Validator, Draft6Validator, Draft7Validator,
+    Draft201909Validator, Draft202012Validator, validator_for,
+)
+
+
+# Keys that describe the schema document itself rather than the tool arguments
+_SCHEMA_META_KEYS = ("$schema", "$id", "title")
+
+# Validator classes validator_for() picks from, i.e. what get_schema_validator() returns
+_VALIDATOR_CLASSES = (Draft3Validator, Draft4Validator, Draft6Validator, Draft7Validator,
+                      Draft201909Validator, Draft202012Validator)
+
+
+def empty_parameters_schema() -> Dict[str, Any]:
+    """
+    Get the schema used for tools that take no arguments.
+
+    Returns:
+        An object schema without properties
+    """
+    return {"type": "object", "properties": {}, "required": []}
+
+
+def normalize_parameters_schema(input_schema: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Normalize an MCP tool inputSchema into an OpenAI-compatible parameters schema.
+
+    Args:
+        input_schema: The inputSchema reported by the MCP server, if any
+
+    Returns:
+        An object schema with 'properties' and 'required' always present
+    """
+    if not isinstance(input_schema, dict):
+        return empty_parameters_schema()
+
+    schema = copy.deepcopy(input_schema)
+    for key in _SCHEMA_META_KEYS:
+        schema.pop(key, None)
+
+    schema.setdefault("type", "object")
+    if not isinstance(schema.get("properties"), dict):
+        schema["properties"] = {}
+
+    # Only keep required names that are actual properties; some servers list extras
+    required = schema.get("required")
+    if isinstance(required, list):
+        schema["required"] = [name for name in required if name in schema["properties"]]
+    else:
+        schema["required"] = []
+
+    return schema
+
+
+@lru_cache(maxsize=256)
+def _compile_validator(schema_key: str):
+    """Check and compile the schema serialized in schema_key."""
+    schema = json.loads(schema_key)
+    validator_cls = validator_for(schema)
+    validator_cls.check_schema(schema)
+    return validator_cls(schema)
+
+
+def get_schema_validator(schema: Dict[str, Any]):
+    """
+    Get a compiled validator for a parameters schema.
+
+    Validators are cached by schema content, so repeated calls for the same
+    tool reuse the already checked and compiled validator.
+
+    Args:
+        schema: The JSON schema to validate against
+
+    Returns:
+        A jsonschema validator instance
+    """
+    schema_key = json.dumps(schema or {}, sort_keys=True, separators=(",", ":"), default=str)
+    return _compile_validator(schema_key)
+
+
+def is_schema_validator(validator: Any) -> bool:
+    """
+    Check whether an object is a compiled jsonschema validator.
+
+    The jsonschema Validator protocol can't tell a real validator from a mock
+    that has every attribute, so this checks for the concrete validator classes.
+
+    Args:
+        validator: The object to check
+
+    Returns:
+        True if the object is a validator returned by get_schema_validator
+    """
+    return isinstance(validator, _VALIDATOR_CLASSES)
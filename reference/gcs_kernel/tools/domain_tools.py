@@ -16,6 +16,7 @@ class DomainListTool:
     name = "domain_list"
     display_name = "List Domains"
     description = "List all available domains with their descriptions and status"
+    read_only = True
     parameters = {  # Following OpenAI-compatible format
         "type": "object",
         "properties": {},
@@ -281,6 +282,7 @@ class DomainInfoTool:
     name = "domain_info"
     display_name = "Get Domain Info"
     description = "Get detailed information about a specific domain including its metadata"
+    read_only = True
     parameters = {  # Following OpenAI-compatible format
         "type": "object",
         "properties": {
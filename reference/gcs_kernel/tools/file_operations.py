@@ -17,6 +17,7 @@ class ReadFileTool:
     name = "read_file"
     display_name = "Read File"
     description = "Read the contents of a specified file"
+    read_only = True
     parameters = {  # Following OpenAI-compatible format
         "type": "object",
         "properties": {
@@ -181,6 +182,7 @@ class ListDirectoryTool:
     name = "list_directory"
     display_name = "List Directory"
     description = "List the contents of a specified directory"
+    read_only = True
     parameters = {  # Following OpenAI-compatible format
         "type": "object",
         "properties": {
@@ -17,6 +17,7 @@ class MCPServerListTool:
     name = "list_mcp_servers"
     display_name = "List MCP Servers"
     description = "List all registered MCP servers with their status and details"
+    read_only = True
     parameters = {  # Following OpenAI-compatible format
         "type": "object",
         "properties": {},
@@ -93,6 +94,7 @@ class MCPServerStatusTool:
     name = "get_mcp_server_status"
     display_name = "Get MCP Server Status"
     description = "Get the connection status of a specific MCP server"
+    read_only = True
     parameters = {  # Following OpenAI-compatible format
         "type": "object",
         "properties": {
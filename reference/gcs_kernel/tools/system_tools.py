@@ -120,6 +120,7 @@ class ListToolsTool:
     name = "list_tools"
     display_name = "List Tools"
     description = "List all available tools in the kernel"
+    read_only = True
     parameters = {  # Following OpenAI-compatible format
         "type": "object",
         "properties": {},
@@ -190,6 +191,7 @@ class GetToolInfoTool:
     name = "get_tool_info"
     display_name = "Get Tool Info"
     description = "Get detailed information about a specific tool"
+    read_only = True
     parameters = {  # Following OpenAI-compatible format
         "type": "object",
         "properties": {
@@ -519,6 +521,7 @@ class GetConfigTool:
     name = "get_config"
     display_name = "Get Configuration"
     description = "Get current values of configuration parameters (e.g., log_level, max_tokens, max_context_length)"
+    read_only = True
     parameters = {  # Following OpenAI-compatible format
         "type": "object",
         "properties": {
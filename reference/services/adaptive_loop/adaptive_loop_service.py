@@ -10,7 +10,7 @@ import logging
 import re
 from typing import Any, Dict, Optional
 from gcs_kernel.mcp.client import MCPClient
-from gcs_kernel.models import PromptObject
+from gcs_kernel.models import PromptObject, RequestPriority
 from services.ai_orchestrator.orchestrator_service import AIOrchestratorService
 
 # TODO: Storing successful adaptations in a cache for future reference
@@ -60,7 +60,8 @@ class AdaptiveLoopService:
         prompt_obj = PromptObject.create(
             content=prompt_content,
             streaming_enabled=False,
-            user_id="adaptive_loop_service"  # Identify as kernel service
+            user_id="adaptive_loop_service",  # Identify as kernel service
+            priority=RequestPriority.BACKGROUND  # Interactive turns go first when the provider is busy
         )
 
         # Use the AI orchestrator to get the solution
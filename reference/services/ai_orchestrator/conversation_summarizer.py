@@ -0,0 +1,243 @@
+"""
+Background, incremental summarization of persisted conversation sessions.
+
+A resumed session loads its latest messages plus a rolling summary of the
+messages before them. ConversationSummarizer keeps that summary current.
+After a turn is saved, it checks in the background whether the session's
+unsummarized messages have outgrown the resume window or the token
+threshold. If so, it folds the oldest of them into the summary with one
+model request: the previous summary plus the new messages, never the whole
+history again.
+
+Summaries are requested with BACKGROUND priority, so interactive turns are
+admitted first when the provider is busy. Turns never wait for a summary.
+The next prompt of the session picks the summary up as soon as it is stored.
+"""
+
+import asyncio
+import json
+import logging
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional
+
+from common.settings import settings
+from gcs_kernel.message_log import MessageLog
+from gcs_kernel.models import PromptObject, PromptStatus, RequestPriority, ToolInclusionPolicy
+from services.llm_provider.context_window import ContextWindowManager
+from .session_store import SessionStore
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_INSTRUCTIONS = (
+    "You maintain the running summary of a conversation between a user and an AI assistant that uses tools. "
+    "Update the summary with the new messages. Keep the user's goals and preferences, decisions, facts "
+    "learned from tools, names of files and other entities, and open questions. Leave out pleasantries and "
+    "raw tool output. Reply with the updated summary only."
+)
+
+# Tool outputs are cut to this many characters in the summarization prompt
+MAX_TOOL_OUTPUT_CHARS = 2000
+
+
+def render_transcript(messages: List[Dict[str, Any]]) -> str:
+    """
+    Render messages as a plain-text transcript for summarization.
+
+    Args:
+        messages: Chat messages in OpenAI format
+
+    Returns:
+        One paragraph per message, tool outputs shortened
+    """
+    lines = []
+    for message in messages:
+        role = message.get("role")
+        content = message.get("content")
+        if not isinstance(content, str):
+            content = json.dumps(content, ensure_ascii=False) if content else ""
+        if role == "tool":
+            if len(content) > MAX_TOOL_OUTPUT_CHARS:
+                content = content[:MAX_TOOL_OUTPUT_CHARS] + " [...]"
+            lines.append(f"Tool result: {content}")
+            continue
+        if content:
+            lines.append(f"{(role or 'unknown').capitalize()}: {content}")
+        for call in message.get("tool_calls") or []:
+            function = call.get("function") or {}
+            lines.append(f"Assistant called {function.get('name')}({function.get('arguments', '')})")
+    return "\n\n".join(lines)
+
+
+@dataclass
+class ConversationSummarizerConfig:
+    """When and how much of a session to summarize."""
+    enabled: bool = True
+    trigger_ratio: float = 0.5  # Share of the context window unsummarized messages may take
+    keep_messages: int = 20  # Latest messages that are never summarized
+    max_summary_tokens: int = 512
+
+    @classmethod
+    def from_settings(cls) -> "ConversationSummarizerConfig":
+        """Create the configuration from the global settings."""
+        return cls(
+            enabled=settings.conversation_summary_enabled,
+            trigger_ratio=settings.conversation_summary_trigger,
+            keep_messages=settings.conversation_summary_keep_messages,
+            max_summary_tokens=settings.conversation_summary_max_tokens,
+        )
+
+
+@dataclass
+class ConversationSummarizerMetrics:
+    """Counters of background summarization."""
+    checks: int = 0
+    summaries: int = 0
+    failures: int = 0
+    messages_summarized: int = 0
+
+
+class ConversationSummarizer:
+    """Keeps the rolling summaries of persisted sessions current, off the request path."""
+
+    def __init__(self, store: SessionStore, content_generator: Any = None,
+                 config: Optional[ConversationSummarizerConfig] = None,
+                 context_window: Optional[ContextWindowManager] = None):
+        """
+        Initialize the summarizer.
+
+        Args:
+            store: Session store holding the sessions and their summaries
+            content_generator: Content generator answering the summarization requests
+            config: Summarization settings (defaults to the global settings)
+            context_window: Counts message tokens against the context window
+        """
+        self.store = store
+        self.content_generator = content_generator
+        self.config = config or ConversationSummarizerConfig.from_settings()
+        self.context_window = context_window or ContextWindowManager()
+        self.metrics = ConversationSummarizerMetrics()
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def schedule(self, session_id: str) -> Optional[asyncio.Task]:
+        """
+        Check a session in the background after its turn was saved, summarizing it if needed.
+
+        Returns immediately. A session already being checked is not checked twice.
+
+        Args:
+            session_id: Session identifier
+
+        Returns:
+            The background task, or None if summarization is disabled
+        """
+        if not self.config.enabled or self.content_generator is None:
+            return None
+        task = self._tasks.get(session_id)
+        if task is not None and not task.done():
+            return task
+        task = asyncio.create_task(self._run(session_id))
+        self._tasks[session_id] = task
+        task.add_done_callback(lambda done: self._tasks.pop(session_id, None) if self._tasks.get(
+            session_id) is done else None)
+        return task
+
+    async def _run(self, session_id: str):
+        """Summarize a session if needed, logging instead of raising failures."""
+        try:
+            await self.summarize_if_needed(session_id)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.metrics.failures += 1
+            logger.warning(f"Could not summarize session {session_id}: {e}")
+
+    async def summarize_if_needed(self, session_id: str) -> bool:
+        """
+        Fold a session's oldest unsummarized turns into its summary if they outgrew the limits.
+
+        The summary grows by whole turns: it ends right before a user message,
+        leaving at least keep_messages messages unsummarized.
+
+        Args:
+            session_id: Session identifier
+
+        Returns:
+            True if a new summary was stored
+        """
+        self.metrics.checks += 1
+        session = await asyncio.to_thread(self.store.get_session, session_id)
+        if session is None:
+            return False
+        count, summary_upto = session["message_count"], session["summary_upto"]
+        if count - summary_upto <= self.config.keep_messages:
+            return False
+
+        messages = await asyncio.to_thread(self.store.load_messages, session_id, summary_upto, count)
+        outgrew_window = len(messages) > self.store.config.tail_messages
+        tokens = self.context_window.count_messages(messages)
+        if not outgrew_window and tokens <= self.config.trigger_ratio * self.context_window.max_context_length:
+            return False
+
+        # Summarize up to the last turn boundary that keeps the latest messages verbatim;
+        # the last message always stays, even with keep_messages=0
+        start = len(messages) - max(self.config.keep_messages, 1)
+        cut = next((index for index in range(start, 0, -1)
+                    if messages[index].get("role") == "user"), 0)
+        if cut == 0:
+            return False
+        logger.info(f"Summarizing {cut} messages of session {session_id} ({tokens} unsummarized tokens)")
+        summary = await self.generate_summary(session.get("summary"), messages[:cut])
+        await asyncio.to_thread(self.store.set_summary, session_id, summary, summary_upto + cut)
+        self.metrics.summaries += 1
+        self.metrics.messages_summarized += cut
+        return True
+
+    async def generate_summary(self, previous_summary: Optional[str], messages: List[Dict[str, Any]]) -> str:
+        """
+        Ask the model to update a summary with new messages.
+
+        Args:
+            previous_summary: The summary so far, if any
+            messages: Messages following the summarized ones
+
+        Returns:
+            The updated summary
+        """
+        content = (f"Summary so far:\n{previous_summary or '(none)'}\n\n"
+                   f"New messages:\n{render_transcript(messages)}")
+        prompt_obj = PromptObject.create(
+            content=content,
+            tool_policy=ToolInclusionPolicy.NONE,
+            user_id="conversation_summarizer",  # Identify as kernel service
+            streaming_enabled=False,
+            max_tokens=self.config.max_summary_tokens,
+            temperature=0.0,
+            priority=RequestPriority.BACKGROUND  # Interactive turns go first when the provider is busy
+        )
+        prompt_obj.conversation_history = MessageLog([
+            {"role": "system", "content": SUMMARY_INSTRUCTIONS},
+            {"role": "user", "content": content},
+        ])
+        await self.content_generator.generate_response(prompt_obj)
+        if prompt_obj.status == PromptStatus.ERROR or not (prompt_obj.result_content or "").strip():
+            raise RuntimeError(prompt_obj.error_message or "the model returned no summary")
+        return prompt_obj.result_content.strip()
+
+    async def close(self):
+        """Cancel the summaries in progress."""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get the summarization counters.
+
+        Returns:
+            Dictionary of counter names to values
+        """
+        metrics = asdict(self.metrics)
+        metrics["in_progress"] = sum(not task.done() for task in self._tasks.values())
+        return metrics
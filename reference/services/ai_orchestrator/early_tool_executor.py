@@ -0,0 +1,102 @@
+"""
+Early Tool Executor for GCS Kernel AI Orchestrator.
+
+While the model streams a response, each tool call's arguments are usually
+complete long before the stream ends. This module starts side-effect-free
+tool calls (tools declaring `read_only = True`) as soon as they are complete,
+so their latency overlaps with the rest of the generation. The turn manager
+later claims each started execution instead of running the tool itself.
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+from gcs_kernel.tool_call_model import ToolCall
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+
+class EarlyToolExecutor:
+    """
+    Starts read-only tool calls while the model is still streaming.
+
+    Only tools that declare themselves side-effect-free are started early:
+    running them again or discarding their result is harmless if the model's
+    final response turns out to differ.
+    """
+
+    def __init__(self, tool_execution_manager, registry):
+        """
+        Initialize the executor for one turn.
+
+        Args:
+            tool_execution_manager: Executes the tool calls
+            registry: Tool registry used to look up whether a tool is read-only
+        """
+        self.tool_execution_manager = tool_execution_manager
+        self.registry = registry
+        self._executions: Dict[str, Tuple[str, str, asyncio.Task]] = {}
+
+    def is_eligible(self, tool_name: str) -> bool:
+        """
+        Check whether a tool may run before the model's response is complete.
+
+        Args:
+            tool_name: Name of the tool
+
+        Returns:
+            True if the tool is registered and declares itself read-only
+        """
+        tool = self.registry.get_all_tools().get(tool_name) if self.registry else None
+        return bool(getattr(tool, "read_only", False))
+
+    def submit(self, tool_call: Dict[str, Any]):
+        """
+        Start a completed tool call if its tool is eligible.
+
+        Args:
+            tool_call: Tool call in OpenAI format with complete argument JSON
+        """
+        tool_call_obj = ToolCall.from_openai_format(tool_call)
+        if not tool_call_obj.id or tool_call_obj.id in self._executions or not self.is_eligible(tool_call_obj.name):
+            return
+        logger.debug(f"EarlyToolExecutor - starting {tool_call_obj.name} ({tool_call_obj.id}) while streaming")
+        task = asyncio.ensure_future(self.tool_execution_manager.execute_tool_call(tool_call_obj))
+        self._executions[tool_call_obj.id] = (tool_call_obj.name, tool_call_obj.arguments_json, task)
+
+    def take(self, tool_call_obj: ToolCall) -> Optional[asyncio.Task]:
+        """
+        Claim the early execution of a tool call from the final response.
+
+        Args:
+            tool_call_obj: The tool call as it appears in the complete response
+
+        Returns:
+            The running or finished execution task, or None if the call was not
+            started early or its name or arguments changed since it was started
+        """
+        execution = self._executions.pop(tool_call_obj.id, None)
+        if execution is None:
+            return None
+        name, arguments, task = execution
+        if name != tool_call_obj.name or arguments != tool_call_obj.arguments_json:
+            task.cancel()
+            return None
+        return task
+
+    @property
+    def started_count(self) -> int:
+        """Number of early executions that have not been claimed yet."""
+        return len(self._executions)
+
+    def cancel_pending(self):
+        """Cancel every early execution that was not claimed by the turn."""
+        for _, _, task in self._executions.values():
+            if not task.done():
+                task.cancel()
+            else:
+                # Retrieve the outcome so an unclaimed failure isn't reported as never retrieved
+                task.cancelled() or task.exception()
+        self._executions.clear()
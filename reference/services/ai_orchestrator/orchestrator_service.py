@@ -6,14 +6,27 @@ session management, and provider abstraction following Qwen architecture pattern
 The content generator must be provided separately to maintain clean separation of concerns.
 """
 
+import asyncio
+import logging
+import sqlite3
 import uuid
-from typing import Any, Dict, List, AsyncGenerator
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from typing import Any, Dict, List, AsyncGenerator, Optional, Tuple
+from gcs_kernel.mcp.capability_cache import compute_tool_hash
 from gcs_kernel.mcp.client import MCPClient
-from gcs_kernel.models import PromptObject, ToolInclusionConfig
+from gcs_kernel.models import PromptObject, PromptStatus, ToolInclusionConfig, ToolInclusionPolicy
+from gcs_kernel.registry import ToolCatalog, ToolRegistry
 from services.llm_provider.base_generator import BaseContentGenerator
+from .conversation_summarizer import ConversationSummarizer
+from .session_store import open_session_store
 from .system_context_builder import SystemContextBuilder
+from .tool_selector import ToolSelector
+from .turn_memory import TurnMemory
 from .turn_manager import TurnManager, TurnEventType
 
+logger = logging.getLogger(__name__)
+
 
 class AIOrchestratorService:
     """
@@ -42,6 +55,9 @@ class AIOrchestratorService:
         
         # Initialize components based on Qwen architecture
         self.turn_manager = TurnManager(mcp_client, content_generator)
+        # Picks the tools relevant to each prompt under the CONTEXTUAL_SUBSET policy
+        self.tool_selector = ToolSelector()
+        self.turn_manager.tool_selector = self.tool_selector
 
         
         # Initialize system context builder for creating system context with prompts
@@ -49,6 +65,16 @@ class AIOrchestratorService:
         
         # Initialize conversation history to maintain context across interactions
         self.conversation_history = []
+        # Persists the history of prompts carrying a session ID (None unless a store path is configured)
+        self.session_store = open_session_store()
+        # Folds older turns of persisted sessions into their summaries in the background
+        self.summarizer = ConversationSummarizer(self.session_store, content_generator) if self.session_store else None
+        # Recalls the earlier turns of persisted sessions relevant to each prompt
+        self.turn_memory = TurnMemory(self.session_store) if self.session_store else None
+        # Session ID -> [lock, prompts holding or waiting for it]; one turn of a session runs at a time
+        self._session_locks: Dict[str, list] = {}
+        # (content hash, catalog) of the tools listed without a ToolRegistry
+        self._fallback_catalog: Optional[Tuple[str, ToolCatalog]] = None
 
     def set_kernel_services(self, registry=None, scheduler=None, tool_execution_manager=None):
         """
@@ -83,6 +109,8 @@ class AIOrchestratorService:
         # Also update the components
         if self.turn_manager:
             self.turn_manager.content_generator = provider
+        if self.summarizer:
+            self.summarizer.content_generator = provider
 
         
         # Also update kernel and MCP client references on the provider directly if available
@@ -109,12 +137,7 @@ class AIOrchestratorService:
         self._get_tool_inclusion_policy_for_prompt(prompt_obj)
         
         # Fetch and populate tools based on the policy
-        if (prompt_obj.tool_policy and 
-            prompt_obj.tool_policy.value != "none" and 
-            not prompt_obj.custom_tools):  # Only fetch if custom_tools isn't already populated
-            available_tools = await self._get_available_tools()
-            if available_tools:
-                prompt_obj.custom_tools = available_tools
+        await self._populate_tools(prompt_obj)
         
         # Apply system context to the prompt object
         model_name = getattr(self.content_generator, 'model_name', None) if self.content_generator else None
@@ -124,55 +147,63 @@ class AIOrchestratorService:
             # but log the issue
             import logging
             logging.warning("Failed to build and apply system context, continuing with interaction")
-        
-        # Use the turn manager to properly handle the interaction with potential tool calls
-        # Create an abort signal for the turn
-        import asyncio
-        abort_signal = asyncio.Event()
-        
-        # Process the interaction using turn manager which handles the streaming/non-streaming
-        # transition for tool execution
-        final_response = ""
-        
-        try:
-            async for event in self.turn_manager.run_turn(
-                prompt_obj,
-                abort_signal
-            ):
-                if event.type == TurnEventType.CONTENT:
-                    if prompt_obj.streaming_enabled:
-                        # In streaming mode, accumulate content events
-                        final_response += event.value
-                    # In non-streaming mode, content is handled internally by the turn manager,
-                    # and the prompt object will be updated with the final result
-                elif event.type == TurnEventType.TOOL_CALL_RESPONSE:
-                    # Tool result handled internally by turn manager
-                    continue
-                elif event.type == TurnEventType.ERROR:
-                    if prompt_obj.streaming_enabled:
-                        # Only accumulate error messages in streaming mode
-                        final_response += f"\nError: {event.error}"
-                    # Update prompt object with error
-                    prompt_obj.mark_error(str(event.error))
-                    return prompt_obj
-                elif event.type == TurnEventType.FINISHED:
-                    break
-        except Exception as e:
-            prompt_obj.mark_error(str(e))
-            return prompt_obj
-        
-        # Update the result content in the prompt object
-        if prompt_obj.streaming_enabled and final_response:
-            # In streaming mode, use accumulated response
-            prompt_obj.result_content = final_response
-            prompt_obj.mark_completed(final_response)
-        else:
-            # In non-streaming mode, the prompt object should have been updated internally
-            # by the content generator and turn manager after the complete turn
-            if not prompt_obj.result_content:
-                # Fallback to mark as completed with some default content if no content was generated
-                prompt_obj.result_content = "Interaction completed"
-            prompt_obj.mark_completed(prompt_obj.result_content)
+
+        # Turns of the same session run one at a time, so each resumes after the previous one was saved
+        async with self._session_turn(prompt_obj.session_id):
+            # Resume the prompt's session after its system message
+            session_start = await self._resume_session(prompt_obj)
+        
+            # Use the turn manager to properly handle the interaction with potential tool calls
+            # Create an abort signal for the turn
+            import asyncio
+            abort_signal = asyncio.Event()
+        
+            # Process the interaction using turn manager which handles the streaming/non-streaming
+            # transition for tool execution
+            final_response = ""
+        
+            try:
+                async for event in self.turn_manager.run_turn(
+                    prompt_obj,
+                    abort_signal
+                ):
+                    if event.type == TurnEventType.CONTENT:
+                        if prompt_obj.streaming_enabled:
+                            # In streaming mode, accumulate content events
+                            final_response += event.value
+                        # In non-streaming mode, content is handled internally by the turn manager,
+                        # and the prompt object will be updated with the final result
+                    elif event.type == TurnEventType.TOOL_CALL_RESPONSE:
+                        # Tool result handled internally by turn manager
+                        continue
+                    elif event.type == TurnEventType.ERROR:
+                        if prompt_obj.streaming_enabled:
+                            # Only accumulate error messages in streaming mode
+                            final_response += f"\nError: {event.error}"
+                        # Update prompt object with error
+                        prompt_obj.mark_error(str(event.error))
+                        await self._save_session(prompt_obj, session_start)
+                        return prompt_obj
+                    elif event.type == TurnEventType.FINISHED:
+                        break
+            except Exception as e:
+                prompt_obj.mark_error(str(e))
+                await self._save_session(prompt_obj, session_start)
+                return prompt_obj
+        
+            # Update the result content in the prompt object
+            if prompt_obj.streaming_enabled and final_response:
+                # In streaming mode, use accumulated response
+                prompt_obj.result_content = final_response
+                prompt_obj.mark_completed(final_response)
+            else:
+                # In non-streaming mode, the prompt object should have been updated internally
+                # by the content generator and turn manager after the complete turn
+                if not prompt_obj.result_content:
+                    # Fallback to mark as completed with some default content if no content was generated
+                    prompt_obj.result_content = "Interaction completed"
+                prompt_obj.mark_completed(prompt_obj.result_content)
+            await self._save_session(prompt_obj, session_start)
         
         # Update conversation history from result
         self.conversation_history = prompt_obj.conversation_history
@@ -195,12 +226,7 @@ class AIOrchestratorService:
         self._get_tool_inclusion_policy_for_prompt(prompt_obj)
         
         # Fetch and populate tools based on the policy
-        if (prompt_obj.tool_policy and 
-            prompt_obj.tool_policy.value != "none" and 
-            not prompt_obj.custom_tools):  # Only fetch if custom_tools isn't already populated
-            available_tools = await self._get_available_tools()
-            if available_tools:
-                prompt_obj.custom_tools = available_tools
+        await self._populate_tools(prompt_obj)
         
         # Apply system context to the prompt object
         model_name = getattr(self.content_generator, 'model_name', None) if self.content_generator else None
@@ -210,23 +236,31 @@ class AIOrchestratorService:
             # but log the issue
             import logging
             logging.warning("Failed to build and apply system context, continuing with interaction")
-        
-        # Ensure the content generator has access to the kernel and kernel client
-        if hasattr(self.content_generator, 'kernel'):
-            self.content_generator.kernel = self.kernel
-        if hasattr(self.content_generator, 'kernel_client'):
-            self.content_generator.mcp_client = self.mcp_client
-        
-        # Stream using the turn manager which handles potential tool calls during interaction
-        import asyncio
-        abort_signal = asyncio.Event()
-        
-        async for event in self.turn_manager.run_turn(
-            prompt_obj,
-            abort_signal
-        ):
-            if event.type == TurnEventType.CONTENT:
-                yield event.value
+
+        # Turns of the same session run one at a time, so each resumes after the previous one was saved
+        async with self._session_turn(prompt_obj.session_id):
+            # Resume the prompt's session after its system message
+            session_start = await self._resume_session(prompt_obj)
+        
+            # Ensure the content generator has access to the kernel and kernel client
+            if hasattr(self.content_generator, 'kernel'):
+                self.content_generator.kernel = self.kernel
+            if hasattr(self.content_generator, 'kernel_client'):
+                self.content_generator.mcp_client = self.mcp_client
+        
+            # Stream using the turn manager which handles potential tool calls during interaction
+            import asyncio
+            abort_signal = asyncio.Event()
+        
+            try:
+                async for event in self.turn_manager.run_turn(
+                    prompt_obj,
+                    abort_signal
+                ):
+                    if event.type == TurnEventType.CONTENT:
+                        yield event.value
+            finally:
+                await self._save_session(prompt_obj, session_start)
         
         # Update conversation history from result (for compatibility with get_conversation_history)
         self.conversation_history = prompt_obj.conversation_history
@@ -271,6 +305,32 @@ class AIOrchestratorService:
             policy=policy
         )
     
+    async def _populate_tools(self, prompt_obj: PromptObject):
+        """
+        Set the tools sent with a prompt according to its tool inclusion policy.
+
+        Tools already set on the prompt are kept. Catalogs larger than the tool
+        selection threshold switch ALL_AVAILABLE prompts to CONTEXTUAL_SUBSET,
+        which sends only the tools relevant to the prompt.
+
+        Args:
+            prompt_obj: The prompt object to populate
+        """
+        if (not prompt_obj.tool_policy or
+                prompt_obj.tool_policy == ToolInclusionPolicy.NONE or
+                prompt_obj.custom_tools):  # Only fetch if custom_tools isn't already populated
+            return
+        available_tools = await self._get_available_tools()
+        if not available_tools:
+            return
+
+        if (prompt_obj.tool_policy == ToolInclusionPolicy.ALL_AVAILABLE and
+                self.tool_selector.should_select(available_tools)):
+            prompt_obj.tool_policy = ToolInclusionPolicy.CONTEXTUAL_SUBSET
+        if prompt_obj.tool_policy == ToolInclusionPolicy.CONTEXTUAL_SUBSET:
+            available_tools = self.tool_selector.select(available_tools, prompt_obj.content)
+        prompt_obj.custom_tools = available_tools
+
     async def _get_available_tools(self) -> List[Dict[str, Any]]:
         """
         Get available tools from the system context builder or kernel registry.
@@ -281,17 +341,11 @@ class AIOrchestratorService:
         """
         # Get available tools to provide to the LLM natively
         if self.kernel and hasattr(self.kernel, 'registry'):
-            tools = self.kernel.registry.get_all_tools()
-            # Convert tool objects to dictionary format expected by LLM
-            llm_tools = []
-            for tool_name, tool_obj in tools.items():
-                llm_tool = {
-                    "name": getattr(tool_obj, 'name', tool_name),
-                    "description": getattr(tool_obj, 'description', ''),
-                    "parameters": getattr(tool_obj, 'parameters', {})  # Using OpenAI-compatible format
-                }
-                llm_tools.append(llm_tool)
-            return llm_tools
+            registry = self.kernel.registry
+            if isinstance(registry, ToolRegistry):
+                # Reuse the registry's snapshot until its tools change
+                return registry.get_tool_catalog().tools
+            return self._get_fallback_catalog(registry.get_all_tools())
         else:
             # Fallback to MCP client if kernel isn't available
             tools_response = await self.mcp_client.list_tools()
@@ -315,19 +369,158 @@ class AIOrchestratorService:
             else:
                 tools = {}
         
-        # Convert available tools to kernel tool format to pass to LLM
-        kernel_tools = []
-        for tool_name, tool_info in tools.items():
-            kernel_tool = {
-                "name": tool_info.get("name", tool_name),
-                "description": tool_info.get("description", ""),
-                "parameters": tool_info.get("parameters", {})
-            }
-            kernel_tools.append(kernel_tool)
-        
-        return kernel_tools
+        # Convert available tools to the provider format passed to the LLM
+        tools = {
+            tool_name: SimpleNamespace(
+                name=tool_info.get("name", tool_name),
+                description=tool_info.get("description", ""),
+                parameters=tool_info.get("parameters", {})
+            )
+            for tool_name, tool_info in tools.items()
+        }
+        return self._get_fallback_catalog(tools)
+
+    def _get_fallback_catalog(self, tools: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Get the catalog of tools listed without a ToolRegistry, reused while they are unchanged.
+
+        These sources have no registry version, so the content hash of the
+        tools stands in for it. Passing the same list object every prompt keeps
+        the tool selector's index and the converters' encoded tools.
+
+        Args:
+            tools: Listed tools by name
+
+        Returns:
+            Provider-format tools sorted by name
+        """
+        version = compute_tool_hash([
+            [name, getattr(tool, 'name', name), getattr(tool, 'description', ''), getattr(tool, 'parameters', {})]
+            for name, tool in sorted(tools.items())
+        ])
+        if self._fallback_catalog is None or self._fallback_catalog[0] != version:
+            self._fallback_catalog = (version, ToolCatalog.from_tools(tools))
+        return self._fallback_catalog[1].tools
+
 
 
+    @asynccontextmanager
+    async def _session_turn(self, session_id: Optional[str]):
+        """
+        Hold the session's lock for one turn: resuming it, running the turn and saving it.
+
+        Concurrent prompts of a session would otherwise resume from the same
+        stored history and interleave their appended messages. Prompts of
+        other sessions, and prompts that are not persisted, do not wait.
+
+        Args:
+            session_id: The prompt's session ID
+        """
+        if self.session_store is None or not session_id:
+            yield
+            return
+        entry = self._session_locks.setdefault(session_id, [asyncio.Lock(), 0])
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                yield
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._session_locks[session_id]
+
+    async def _resume_session(self, prompt_obj: PromptObject) -> Optional[int]:
+        """
+        Load the stored tail and summary of the prompt's session into its history.
+
+        The earlier turns relevant to the prompt are sent as a context block in
+        the prompt's own message. They are recalled for this prompt only and
+        not stored again.
+
+        Prompts without a session ID, and prompts whose caller supplied the
+        history, are neither resumed nor persisted.
+
+        Args:
+            prompt_obj: The prompt object, with its system message applied
+
+        Returns:
+            Position in the history where the turn's new messages start, or
+            None if the prompt's session is not persisted
+        """
+        if self.session_store is None or not prompt_obj.session_id:
+            return None
+        if any(message.get("role") != "system" for message in prompt_obj.conversation_history):
+            return None
+        try:
+            snapshot = await asyncio.to_thread(self.session_store.load_session, prompt_obj.session_id)
+        except sqlite3.Error as e:
+            logger.warning(f"Could not load session {prompt_obj.session_id}, it will not be persisted: {e}")
+            return None
+        if snapshot is not None:
+            history = prompt_obj.conversation_history
+            if snapshot.summary:
+                # The summary shares the system slot; it only changes when the summary does
+                system_context = history[0].get("content") if history and history[0].get("role") == "system" else None
+                prompt_obj.set_system_message(snapshot.system_message(system_context))
+            history.extend(snapshot.messages)
+            if self.turn_memory and snapshot.start > 0:
+                try:
+                    recalled = await asyncio.to_thread(
+                        self.turn_memory.recall, prompt_obj.session_id, prompt_obj.content, snapshot.start)
+                except sqlite3.Error as e:
+                    logger.warning(f"Could not recall earlier turns of session {prompt_obj.session_id}: {e}")
+                    recalled = None
+                if recalled:
+                    prompt_obj.context_block = recalled
+        return len(prompt_obj.conversation_history)
+
+    async def _save_session(self, prompt_obj: PromptObject, start: Optional[int]):
+        """
+        Append the messages of the prompt's turn to its stored session.
+
+        The final answer is kept in the prompt's result rather than its history,
+        so it is stored as the turn's closing assistant message.
+
+        Args:
+            prompt_obj: The prompt object after its turn
+            start: Position of the turn's first message, as returned by _resume_session
+        """
+        if start is None:
+            return
+        messages = prompt_obj.conversation_history[start:]
+        if prompt_obj.context_block and messages and messages[0].get("role") == "user":
+            # The context block was sent with this prompt only; the session keeps the plain request
+            messages[0] = {**messages[0], "content": prompt_obj.content}
+        answer = prompt_obj.result_content
+        if prompt_obj.status == PromptStatus.COMPLETED and answer and not (
+                messages and messages[-1].get("role") == "assistant" and messages[-1].get("content") == answer):
+            messages.append({"role": "assistant", "content": answer})
+        if not messages:
+            return
+        try:
+            await asyncio.to_thread(self.session_store.append_messages, prompt_obj.session_id, messages)
+        except sqlite3.Error as e:
+            logger.warning(f"Could not persist session {prompt_obj.session_id}: {e}")
+            return
+        if self.summarizer:
+            # Runs in the background; the next prompt of the session uses the summary once stored
+            self.summarizer.schedule(prompt_obj.session_id)
+
+    async def load_session_messages(self, session_id: str, start: int, stop: int) -> List[Dict[str, Any]]:
+        """
+        Page in stored messages of a session, such as those older than its resumed tail.
+
+        Args:
+            session_id: Session identifier
+            start: Position of the first message
+            stop: Position after the last message
+
+        Returns:
+            The messages in the range (empty if sessions are not persisted)
+        """
+        if self.session_store is None:
+            return []
+        return await asyncio.to_thread(self.session_store.load_messages, session_id, start, stop)
 
     async def reset_conversation(self):
         """
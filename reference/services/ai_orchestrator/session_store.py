@@ -0,0 +1,307 @@
+"""
+Persistent conversation sessions for the AI orchestrator.
+
+Conversation history used to live only in the orchestrator's memory, so a
+restart lost every session and each session kept its whole history in RAM.
+SessionStore persists sessions in SQLite in WAL mode. Every message is
+appended once, in the transaction of the turn that produced it, and never
+rewritten. Resuming a session loads only its latest messages plus the
+session summary. Older messages stay on disk and are paged in on demand, so
+dormant sessions cost no memory and resuming one costs a single indexed
+range read.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional
+
+from common.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Introduces the summary of the messages before a resumed session's tail
+SUMMARY_PREFIX = "Summary of the earlier conversation:\n"
+
+
+@dataclass
+class SessionStoreConfig:
+    """Location and resume window of the session store."""
+    path: Optional[str] = None  # SQLite database file, sessions are not persisted if unset
+    tail_messages: int = 40  # Latest messages loaded when a session resumes
+
+    @classmethod
+    def from_settings(cls) -> "SessionStoreConfig":
+        """Create the configuration from the global settings."""
+        return cls(path=settings.session_store_path, tail_messages=settings.session_tail_messages)
+
+
+@dataclass
+class SessionStoreMetrics:
+    """Counters of the session store."""
+    sessions_resumed: int = 0
+    messages_appended: int = 0
+    messages_loaded: int = 0
+    pages_loaded: int = 0
+
+
+@dataclass
+class SessionSnapshot:
+    """The part of a stored session loaded to resume it."""
+    session_id: str
+    messages: List[Dict[str, Any]]  # The tail of the session
+    start: int  # Position of the first tail message in the session
+    message_count: int  # Messages stored for the session
+    summary: Optional[str] = None  # Summary of the messages before summary_upto
+    summary_upto: int = 0
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+    def system_message(self, system_context: Optional[str] = None) -> Optional[str]:
+        """
+        Build the system message the session resumes with.
+
+        The summary joins the system context rather than following it as a
+        second system message, which many chat templates reject or ignore.
+
+        Args:
+            system_context: The prompt's system context, if any
+
+        Returns:
+            The system context followed by the summary, or None if there is neither
+        """
+        parts = [part for part in (system_context, self.summary and SUMMARY_PREFIX + self.summary) if part]
+        return "\n\n".join(parts) if parts else None
+
+    def history(self, system_context: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Build the conversation history the session resumes with.
+
+        Args:
+            system_context: The prompt's system context, if any
+
+        Returns:
+            The system message with the summary, if there is one, followed by the tail
+        """
+        system_message = self.system_message(system_context)
+        if not system_message:
+            return list(self.messages)
+        return [{"role": "system", "content": system_message}] + self.messages
+
+
+def _dumps(message: Dict[str, Any]) -> str:
+    """Serialize a message; values JSON does not support are stored as text."""
+    return json.dumps(message, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+class SessionStore:
+    """Append-only SQLite store of conversation sessions, safe to use from worker threads."""
+
+    def __init__(self, config: Optional[SessionStoreConfig] = None):
+        """
+        Open (and create if needed) the session database.
+
+        Args:
+            config: Store settings (defaults to the global settings); config.path must be set
+        """
+        self.config = config or SessionStoreConfig.from_settings()
+        if not self.config.path:
+            raise ValueError("SessionStore needs a database path")
+        directory = os.path.dirname(self.config.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.metrics = SessionStoreMetrics()
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.config.path, check_same_thread=False)
+        # WAL lets readers proceed during appends; a commit then costs one sequential log write
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            "session_id TEXT PRIMARY KEY, message_count INTEGER NOT NULL, "
+            "summary TEXT, summary_upto INTEGER NOT NULL DEFAULT 0, "
+            "created_at REAL NOT NULL, updated_at REAL NOT NULL)"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS messages ("
+            "session_id TEXT NOT NULL, seq INTEGER NOT NULL, message TEXT NOT NULL, "
+            "PRIMARY KEY (session_id, seq)) WITHOUT ROWID"
+        )
+        self._db.commit()
+
+    def append_messages(self, session_id: str, messages: List[Dict[str, Any]]) -> int:
+        """
+        Append messages to a session, creating the session if needed.
+
+        Args:
+            session_id: Session identifier
+            messages: Messages in conversation order
+
+        Returns:
+            The number of messages stored for the session afterwards
+        """
+        rows = [_dumps(message) for message in messages]
+        now = time.time()
+        with self._lock:
+            row = self._db.execute("SELECT message_count FROM sessions WHERE session_id = ?",
+                                   (session_id,)).fetchone()
+            count = row[0] if row else 0
+            if not rows:
+                return count
+            with self._db:
+                if row is None:
+                    self._db.execute(
+                        "INSERT INTO sessions (session_id, message_count, created_at, updated_at) "
+                        "VALUES (?, 0, ?, ?)", (session_id, now, now))
+                self._db.executemany("INSERT INTO messages (session_id, seq, message) VALUES (?, ?, ?)",
+                                     [(session_id, count + offset, text) for offset, text in enumerate(rows)])
+                self._db.execute("UPDATE sessions SET message_count = ?, updated_at = ? WHERE session_id = ?",
+                                 (count + len(rows), now, session_id))
+        self.metrics.messages_appended += len(rows)
+        return count + len(rows)
+
+    def load_session(self, session_id: str, tail_messages: Optional[int] = None) -> Optional[SessionSnapshot]:
+        """
+        Load the latest messages and the summary of a session.
+
+        The tail never reaches back into the summarized messages, and it starts
+        at a user message so it does not open with a tool result whose call
+        was left out.
+
+        Args:
+            session_id: Session identifier
+            tail_messages: Messages to load at most (defaults to the configured tail)
+
+        Returns:
+            The session's snapshot, or None if the session is unknown
+        """
+        tail_messages = self.config.tail_messages if tail_messages is None else tail_messages
+        with self._lock:
+            row = self._db.execute(
+                "SELECT message_count, summary, summary_upto FROM sessions WHERE session_id = ?",
+                (session_id,)).fetchone()
+            if row is None:
+                return None
+            count, summary, summary_upto = row
+            start = max(count - tail_messages, summary_upto, 0)
+            rows = self._db.execute(
+                "SELECT seq, message FROM messages WHERE session_id = ? AND seq >= ? ORDER BY seq",
+                (session_id, start)).fetchall()
+
+        messages = [json.loads(text) for _, text in rows]
+        first_user = next((index for index, message in enumerate(messages) if message.get("role") == "user"),
+                          len(messages))
+        self.metrics.sessions_resumed += 1
+        self.metrics.messages_loaded += len(messages) - first_user
+        return SessionSnapshot(session_id, messages[first_user:], start + first_user, count, summary, summary_upto)
+
+    def get_session(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Read a session's counters and summary without loading its messages.
+
+        Args:
+            session_id: Session identifier
+
+        Returns:
+            The session's message_count, summary, summary_upto and updated_at, or None if unknown
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT message_count, summary, summary_upto, updated_at FROM sessions WHERE session_id = ?",
+                (session_id,)).fetchone()
+        if row is None:
+            return None
+        return dict(zip(("message_count", "summary", "summary_upto", "updated_at"), row))
+
+    def load_messages(self, session_id: str, start: int, stop: int) -> List[Dict[str, Any]]:
+        """
+        Page in a range of a session's messages, such as the turns before its loaded tail.
+
+        Args:
+            session_id: Session identifier
+            start: Position of the first message
+            stop: Position after the last message
+
+        Returns:
+            The stored messages in the range, in order
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT message FROM messages WHERE session_id = ? AND seq >= ? AND seq < ? ORDER BY seq",
+                (session_id, max(start, 0), stop)).fetchall()
+        self.metrics.pages_loaded += 1
+        self.metrics.messages_loaded += len(rows)
+        return [json.loads(text) for text, in rows]
+
+    def set_summary(self, session_id: str, summary: str, upto: int):
+        """
+        Record the summary of a session's first messages.
+
+        Args:
+            session_id: Session identifier
+            summary: Summary text
+            upto: Number of leading messages the summary covers
+        """
+        with self._lock, self._db:
+            self._db.execute("UPDATE sessions SET summary = ?, summary_upto = ?, updated_at = ? WHERE session_id = ?",
+                             (summary, upto, time.time(), session_id))
+
+    def list_sessions(self, limit: int = 100) -> List[Dict[str, Any]]:
+        """
+        List the most recently active sessions.
+
+        Args:
+            limit: Sessions to return at most
+
+        Returns:
+            Session IDs with their message counts and last update times, newest first
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT session_id, message_count, updated_at FROM sessions ORDER BY updated_at DESC LIMIT ?",
+                (limit,)).fetchall()
+        return [{"session_id": session_id, "message_count": count, "updated_at": updated_at}
+                for session_id, count, updated_at in rows]
+
+    def delete_session(self, session_id: str):
+        """Delete a session and its messages."""
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM messages WHERE session_id = ?", (session_id,))
+            self._db.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get the store counters.
+
+        Returns:
+            Dictionary of counter names to values
+        """
+        metrics = asdict(self.metrics)
+        with self._lock:
+            metrics["sessions"] = self._db.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+        return metrics
+
+    def close(self):
+        """Close the database."""
+        with self._lock:
+            self._db.close()
+
+
+def open_session_store() -> Optional[SessionStore]:
+    """
+    Open the session store configured in the settings.
+
+    Returns:
+        The store, or None if no store path is configured
+    """
+    config = SessionStoreConfig.from_settings()
+    if not config.path:
+        return None
+    try:
+        return SessionStore(config)
+    except sqlite3.Error as e:
+        logger.warning(f"Could not open the session store at {config.path}, sessions stay in memory: {e}")
+        return None
@@ -4,12 +4,19 @@ System Context Builder for the GCS Kernel AI Orchestrator.
 This module implements the SystemContextBuilder which constructs
 system-level context for AI interactions, including available tools,
 capabilities, and relevant context information.
+
+The system context is rendered once per combination of domain prompts,
+model style and additional context, then served from a template cache.
+It occupies a single slot at the start of the conversation history, so
+every request of a conversation starts with a byte-identical prefix.
+OpenAI-compatible servers with prefix caching (such as vLLM and llama.cpp)
+can then reuse the KV cache of that prefix instead of prefilling it again.
 """
 
 import json
 import logging
 import os
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
 from gcs_kernel.mcp.client import MCPClient
 from gcs_kernel.models import PromptObject
 
@@ -33,9 +40,24 @@ class SystemContextBuilder:
         """
         self.mcp_client = mcp_client
         self.kernel = kernel
+        # Rendered system contexts by (domain prompts, model style, additional context)
+        self._template_cache: Dict[Tuple, str] = {}
+        # Domain prompts file identity (path, modification time) and its system context
+        self._domain_data_cache: Optional[Tuple[Tuple[str, int], Dict[str, Any]]] = None
         self._default_prompts = self._load_prompts()
         self.prompts = self._default_prompts.copy()
 
+    @property
+    def prompts(self) -> Dict[str, Any]:
+        """The base prompts the system context is rendered from."""
+        return self._prompts
+
+    @prompts.setter
+    def prompts(self, prompts: Dict[str, Any]):
+        """Replace the base prompts (as the domain manager does), invalidating rendered contexts."""
+        self._prompts = prompts
+        self._template_cache.clear()
+
     def _load_prompts(self) -> Dict[str, Any]:
         """
         Load prompts from the prompts.json file.
@@ -70,35 +92,46 @@ class SystemContextBuilder:
         Returns:
             Formatted prompt string based on model style
         """
-        # Determine if we should use XML-style or JSON-style based on model
-        use_xml_style = False
-        if model_name:
-            # Check for qwen3-coder or similar models that prefer XML-style
-            if 'qwen' in model_name.lower() and ('-coder' in model_name.lower() or '3-coder' in model_name.lower()):
-                use_xml_style = True
-            # You can add more model detection logic here
-
         # For model-specific formatting, only use base prompts (tool format is system-level)
         # Domain data should not override the fundamental tool calling format
         prompt_data = self.prompts.get(prompt_type)
 
         # If prompt_data is a dict with 'json' and 'xml' keys, get the appropriate one
         if isinstance(prompt_data, dict):
-            if use_xml_style:
-                prompt_data = prompt_data.get('xml', [])
-            else:
-                prompt_data = prompt_data.get('json', [])
+            prompt_data = prompt_data.get(self.get_model_style(model_name), [])
         elif prompt_data is None:
             # If the prompt type doesn't exist, default to empty list
             prompt_data = []
 
         return self._format_prompt(prompt_data, **kwargs)
 
+    @staticmethod
+    def get_model_style(model_name: str = None) -> str:
+        """
+        Get the tool call style a model prefers.
+
+        Args:
+            model_name: Name of the model
+
+        Returns:
+            "xml" for models preferring XML-style tool calls (such as qwen3-coder), else "json"
+        """
+        if model_name:
+            name = model_name.lower()
+            # Check for qwen3-coder or similar models that prefer XML-style
+            if 'qwen' in name and ('-coder' in name or '3-coder' in name):
+                return "xml"
+            # You can add more model detection logic here
+        return "json"
+
     async def build_and_apply_system_context(self, prompt_obj: PromptObject, additional_context: str = None, model_name: str = None) -> bool:
         """
         Build system context with general information about capabilities and apply it to the prompt object.
         Supports model-specific tool call formats (XML vs JSON).
 
+        The context is placed in the prompt's single system message slot,
+        replacing the one applied on an earlier turn.
+
         Args:
             prompt_obj: The PromptObject to apply the system context to
             additional_context: Optional additional context to include
@@ -108,66 +141,107 @@ class SystemContextBuilder:
             Boolean indicating success or failure
         """
         try:
-            # Build the system context with base message and tools
-            system_context = self._format_prompt(self.prompts["base_message_with_tools"], tool_names="available through the tools API")
+            system_context = self.render_system_context(additional_context=additional_context, model_name=model_name)
 
-            # Add domain-specific information if available
-            domain_data = self.get_domain_data()
-            if domain_data and domain_data.get("domain_specific_info"):
-                system_context += self._format_prompt(domain_data["domain_specific_info"])
-                
-            # Add tool usage rules
-            if "tool_usage_rules" in self.prompts:
-                system_context += self._format_prompt(self.prompts["tool_usage_rules"])
-
-            # Add tool call format contract
-            if "tool_call_format_contract" in self.prompts:
-                system_context += self._format_prompt(self.prompts["tool_call_format_contract"])
-
-            # Add model-specific tool usage instructions
-            tool_instructions = self.get_formatted_prompt_with_model_style("tool_usage_instructions", model_name=model_name)
-            system_context += tool_instructions
-
-            # Add any additional context if provided
-            if additional_context:
-                system_context += self._format_prompt(self.prompts["additional_context_format"], additional_context=additional_context)
-
-            # Add the system context to the prompt object's conversation history
-            prompt_obj.add_system_message(system_context)
+            # Put the system context in the prompt object's system message slot
+            prompt_obj.set_system_message(system_context)
 
             return True
         except Exception as e:
             logger.error(f"Error building and applying system context: {str(e)}")
             return False
 
+    def render_system_context(self, additional_context: str = None, model_name: str = None) -> str:
+        """
+        Render the system context, or return it from the template cache.
+
+        Rendering is deterministic, so the same domain prompts, model style
+        and additional context always give the same string.
+
+        Args:
+            additional_context: Optional additional context to include
+            model_name: Name of the model to determine appropriate tool call format
+
+        Returns:
+            The system context
+        """
+        domain_key = self._get_domain_prompts_key()
+        cache_key = (domain_key, self.get_model_style(model_name), additional_context)
+        system_context = self._template_cache.get(cache_key)
+        if system_context is not None:
+            return system_context
+
+        # Build the system context with base message and tools
+        system_context = self._format_prompt(self.prompts["base_message_with_tools"], tool_names="available through the tools API")
+
+        # Add domain-specific information if available
+        domain_data = self.get_domain_data()
+        if domain_data and domain_data.get("domain_specific_info"):
+            system_context += self._format_prompt(domain_data["domain_specific_info"])
+
+        # Add tool usage rules
+        if "tool_usage_rules" in self.prompts:
+            system_context += self._format_prompt(self.prompts["tool_usage_rules"])
+
+        # Add tool call format contract
+        if "tool_call_format_contract" in self.prompts:
+            system_context += self._format_prompt(self.prompts["tool_call_format_contract"])
+
+        # Add model-specific tool usage instructions
+        tool_instructions = self.get_formatted_prompt_with_model_style("tool_usage_instructions", model_name=model_name)
+        system_context += tool_instructions
+
+        # Add any additional context if provided
+        if additional_context:
+            system_context += self._format_prompt(self.prompts["additional_context_format"], additional_context=additional_context)
+
+        self._template_cache[cache_key] = system_context
+        return system_context
+
     def get_domain_data(self) -> Dict[str, Any]:
         """
         Get domain-specific data from the current domain context.
         This method looks for domain-specific prompts in the kernel or through the MCP client.
+        The prompts file is only read again when it changed.
 
         Returns:
             Dictionary containing domain-specific data, or empty dict if not available
         """
         try:
-            # If kernel is available, try to get the current domain from kernel state
-            if self.kernel:
-                # Look for domain information in kernel's context
-                if hasattr(self.kernel, 'current_domain') and self.kernel.current_domain:
-                    domain_path = self.kernel.current_domain
-
-                    # Try to load domain-specific prompts from the domain directory
-                    domain_prompts_path = os.path.join(domain_path, 'prompts.json')
-                    if os.path.exists(domain_prompts_path):
-                        with open(domain_prompts_path, 'r', encoding='utf-8') as f:
-                            domain_data = json.load(f)
-                            return domain_data.get('system_context', {})
-
-            # If kernel or domain is not available, return empty dict
-            return {}
+            domain_key = self._get_domain_prompts_key()
+            if domain_key is None:
+                # If kernel or domain is not available, return empty dict
+                return {}
+            if self._domain_data_cache is not None and self._domain_data_cache[0] == domain_key:
+                return self._domain_data_cache[1]
+
+            with open(domain_key[0], 'r', encoding='utf-8') as f:
+                domain_data = json.load(f).get('system_context', {})
+            self._domain_data_cache = (domain_key, domain_data)
+            return domain_data
         except Exception as e:
             logger.warning(f"Could not load domain data: {str(e)}")
             return {}
 
+    def _get_domain_prompts_key(self) -> Optional[Tuple[str, int]]:
+        """
+        Identify the current domain's prompts file.
+
+        Returns:
+            The file's path and modification time, or None without a current domain or prompts file
+        """
+        # If kernel is available, try to get the current domain from kernel state
+        domain_path = getattr(self.kernel, 'current_domain', None) if self.kernel else None
+        if not isinstance(domain_path, (str, os.PathLike)) or not domain_path:
+            return None
+
+        # Look for domain-specific prompts in the domain directory
+        domain_prompts_path = os.path.join(domain_path, 'prompts.json')
+        try:
+            return domain_prompts_path, os.stat(domain_prompts_path).st_mtime_ns
+        except OSError:
+            return None
+
     def _get_default_prompts(self) -> Dict[str, Any]:
         """
         Get default prompts in case the file is not found or invalid.
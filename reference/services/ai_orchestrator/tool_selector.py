@@ -0,0 +1,303 @@
+"""
+Contextual tool selection for the AI orchestrator.
+
+Sending every registered tool with every prompt costs prompt tokens and
+prefill time, and with hundreds of tools most of them are irrelevant to
+the prompt at hand. Under the CONTEXTUAL_SUBSET policy, ToolSelector ranks
+the tool catalog against the prompt with BM25 over each tool's name,
+description and parameter text, and sends the top-k tools plus the pinned
+ones. When the model calls a tool outside the subset, the subset is
+expanded for the rest of the turn.
+"""
+
+import logging
+import math
+import re
+from collections import Counter, OrderedDict
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from common.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Splits identifiers into words: read_file, readFile and READ-FILE all give "read", "file"
+_WORD_PATTERN = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|[0-9]+")
+
+# Words too common in prompts and tool descriptions to tell tools apart
+STOP_WORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "by", "can", "do", "for", "from", "how", "i", "in", "is", "it",
+    "me", "my", "of", "on", "or", "please", "that", "the", "this", "to", "use", "what", "with", "you",
+})
+
+# Name words count this many times: a tool's name is its best summary
+NAME_WEIGHT = 3
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase words, breaking up snake_case and camelCase identifiers.
+
+    Args:
+        text: Prompt or tool text
+
+    Returns:
+        The words of the text without stop words
+    """
+    return [word for word in (match.lower() for match in _WORD_PATTERN.findall(text or ""))
+            if word not in STOP_WORDS]
+
+
+def tool_name(tool: Dict[str, Any]) -> str:
+    """Name of a tool in provider format."""
+    return (tool.get("function") or {}).get("name", "")
+
+
+def _parameter_text(schema: Any) -> Iterable[str]:
+    """Yield the property names and descriptions of a parameters schema, nested ones included."""
+    if not isinstance(schema, dict):
+        return
+    if isinstance(schema.get("description"), str):
+        yield schema["description"]
+    for name, value in (schema.get("properties") or {}).items():
+        yield name
+        yield from _parameter_text(value)
+    yield from _parameter_text(schema.get("items"))
+
+
+def tool_document(tool: Dict[str, Any]) -> List[str]:
+    """
+    Words a tool is indexed under.
+
+    Args:
+        tool: Tool definition in provider format
+
+    Returns:
+        The words of the tool's name (weighted), description and parameters
+    """
+    function = tool.get("function") or {}
+    words = tokenize(function.get("name", "")) * NAME_WEIGHT
+    words += tokenize(function.get("description") or "")
+    for text in _parameter_text(function.get("parameters")):
+        words += tokenize(text)
+    return words
+
+
+class ToolIndex:
+    """BM25 index over a tool catalog."""
+
+    def __init__(self, tools: List[Dict[str, Any]], k1: float = 1.2, b: float = 0.75):
+        """
+        Index a tool catalog.
+
+        Args:
+            tools: Tool definitions in provider format
+            k1: Term frequency saturation
+            b: Document length normalization
+        """
+        self.tools = tools
+        self.k1 = k1
+        self.positions = {tool_name(tool): position for position, tool in enumerate(tools)}
+        documents = [tool_document(tool) for tool in tools]
+        average_length = sum(len(words) for words in documents) / len(documents) if documents else 0.0
+
+        # Word -> [(tool position, term frequency)]
+        self.postings: Dict[str, List[Tuple[int, int]]] = {}
+        for position, words in enumerate(documents):
+            for word, count in Counter(words).items():
+                self.postings.setdefault(word, []).append((position, count))
+        self.idf = {word: math.log(1 + (len(documents) - len(postings) + 0.5) / (len(postings) + 0.5))
+                    for word, postings in self.postings.items()}
+        # Length normalization of each tool's term frequencies
+        self.norms = [k1 * (1 - b + b * len(words) / average_length) if average_length else k1
+                      for words in documents]
+
+    def score(self, query: str) -> Dict[int, float]:
+        """
+        Score the tools against a query.
+
+        Args:
+            query: Prompt text
+
+        Returns:
+            BM25 score by tool position, for tools sharing at least one word with the query
+        """
+        scores: Dict[int, float] = {}
+        for word in set(tokenize(query)):
+            postings = self.postings.get(word)
+            if not postings:
+                continue
+            idf = self.idf[word]
+            for position, count in postings:
+                scores[position] = scores.get(position, 0.0) + idf * count * (self.k1 + 1) / (
+                    count + self.norms[position])
+        return scores
+
+
+@dataclass
+class ToolSelectorConfig:
+    """Settings of contextual tool selection."""
+    threshold: int = 64  # Catalogs with more tools use the contextual subset by default (0 = never)
+    top_k: int = 15  # Relevant tools picked per prompt
+    pinned_tools: List[str] = field(default_factory=list)  # Always sent
+
+    @classmethod
+    def from_settings(cls) -> "ToolSelectorConfig":
+        """Create the configuration from the global settings."""
+        return cls(
+            threshold=settings.tool_selection_threshold,
+            top_k=settings.tool_selection_top_k,
+            pinned_tools=list(settings.tool_selection_pinned_tools),
+        )
+
+
+@dataclass
+class ToolSelectorMetrics:
+    """Counters of contextual tool selection."""
+    selections: int = 0
+    tools_offered: int = 0
+    tools_sent: int = 0
+    expansions: int = 0
+
+
+class ToolSelector:
+    """
+    Picks the tools relevant to a prompt from the tool catalog.
+
+    Subsets keep the catalog's order, and a subset picked before is returned
+    as the same list object, so repeated prompts produce identical requests
+    whose encoded tools are reused.
+    """
+
+    def __init__(self, config: Optional[ToolSelectorConfig] = None, max_cached_subsets: int = 256):
+        """
+        Initialize the selector.
+
+        Args:
+            config: Selection settings (defaults to the global settings)
+            max_cached_subsets: Distinct subsets kept for reuse
+        """
+        self.config = config or ToolSelectorConfig.from_settings()
+        self.max_cached_subsets = max_cached_subsets
+        self.metrics = ToolSelectorMetrics()
+        self._index: Optional[ToolIndex] = None
+        self._subsets: "OrderedDict[Tuple[int, ...], List[Dict[str, Any]]]" = OrderedDict()
+
+    @property
+    def catalog(self) -> Optional[List[Dict[str, Any]]]:
+        """The tool catalog indexed last, which subsets are expanded from."""
+        return self._index.tools if self._index else None
+
+    def should_select(self, tools: List[Dict[str, Any]]) -> bool:
+        """
+        Check whether a catalog is large enough to send a contextual subset by default.
+
+        Args:
+            tools: Tool definitions in provider format
+
+        Returns:
+            True if the catalog has more tools than the threshold
+        """
+        return 0 < self.config.threshold < len(tools)
+
+    def get_index(self, tools: List[Dict[str, Any]]) -> ToolIndex:
+        """
+        Get the index of a catalog, rebuilt only when a different catalog is passed.
+
+        Args:
+            tools: Tool definitions in provider format
+
+        Returns:
+            The catalog's ToolIndex
+        """
+        if self._index is None or self._index.tools is not tools:
+            self._index = ToolIndex(tools)
+            self._subsets.clear()
+        return self._index
+
+    def select(self, tools: List[Dict[str, Any]], query: str) -> List[Dict[str, Any]]:
+        """
+        Pick the pinned tools and the top-k tools relevant to a prompt.
+
+        Only tools sharing a word with the prompt are relevant, so fewer than
+        top-k may be picked.
+
+        Args:
+            tools: The tool catalog in provider format
+            query: Prompt text
+
+        Returns:
+            The selected tools in catalog order; the whole catalog if it is not
+            larger than the selection, or if no tool matches the prompt at all
+        """
+        if len(tools) <= self.config.top_k:
+            return tools
+        index = self.get_index(tools)
+        pinned = {index.positions[name] for name in self.config.pinned_tools if name in index.positions}
+        if len(tools) <= self.config.top_k + len(pinned):
+            return tools
+
+        scores = index.score(query)
+        if not scores:
+            # Nothing to go on: let the model see every tool rather than guess
+            logger.debug("No tool matches the prompt, sending the whole catalog")
+            return tools
+
+        ranked = sorted(scores, key=lambda position: (-scores[position], position))
+        selected = self._subset(tools, set(ranked[:self.config.top_k]) | pinned)
+        self.metrics.selections += 1
+        self.metrics.tools_offered += len(tools)
+        self.metrics.tools_sent += len(selected)
+        return selected
+
+    def expand(self, tools: List[Dict[str, Any]], selected: List[Dict[str, Any]],
+               requested_names: Iterable[str]) -> List[Dict[str, Any]]:
+        """
+        Expand a subset with tools the model asked for but was not sent.
+
+        Args:
+            tools: The tool catalog in provider format
+            selected: The tools sent so far
+            requested_names: Names of the tools the model called
+
+        Returns:
+            The subset with the requested catalog tools added; the whole catalog
+            if the model asked for a tool the catalog does not have, so it can see
+            the names that exist
+        """
+        index = self.get_index(tools)
+        positions = {index.positions[tool_name(tool)] for tool in selected if tool_name(tool) in index.positions}
+        missing = [name for name in requested_names if index.positions.get(name) not in positions]
+        if not missing:
+            return selected
+
+        self.metrics.expansions += 1
+        if any(name not in index.positions for name in missing):
+            logger.info(f"Model requested unknown tools {missing}, sending the whole catalog")
+            return tools
+        logger.info(f"Model requested tools outside the selected subset: {missing}")
+        return self._subset(tools, positions | {index.positions[name] for name in missing})
+
+    def _subset(self, tools: List[Dict[str, Any]], positions: Iterable[int]) -> List[Dict[str, Any]]:
+        """Get the catalog tools at the given positions, reusing a list built for the same subset."""
+        key = tuple(sorted(positions))
+        subset = self._subsets.get(key)
+        if subset is None:
+            subset = [tools[position] for position in key]
+            self._subsets[key] = subset
+            if len(self._subsets) > self.max_cached_subsets:
+                self._subsets.popitem(last=False)
+        else:
+            self._subsets.move_to_end(key)
+        return subset
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get the selection counters.
+
+        Returns:
+            Dictionary of counter names to values
+        """
+        metrics = asdict(self.metrics)
+        metrics["indexed_tools"] = len(self._index.tools) if self._index else 0
+        return metrics
@@ -6,13 +6,17 @@ managing the flow between streaming content and tool execution as per Qwen archi
 """
 
 import asyncio
+import inspect
 import logging
 from typing import Any, Optional, AsyncGenerator
 from enum import Enum
 from datetime import datetime
 
 from gcs_kernel.mcp.client import MCPClient
-from gcs_kernel.models import ToolResult, PromptObject
+from gcs_kernel.models import ToolResult, PromptObject, ToolInclusionPolicy
+from gcs_kernel.tool_call_model import ToolCall
+from common.settings import settings
+from services.ai_orchestrator.early_tool_executor import EarlyToolExecutor
 from services.llm_provider.base_generator import BaseContentGenerator
 
 # Set up logging
@@ -59,6 +63,7 @@ class TurnManager:
         self.registry = None  # Will be set via set_kernel_services
         # We're fully committing to the new architecture - removing scheduler
         self.tool_execution_manager = None  # Will be set via set_kernel_services (new architecture)
+        self.tool_selector = None  # Expands contextual tool subsets, set by the orchestrator
         self.conversation_history = []
 
     def get_conversation_history(self) -> list:
@@ -89,18 +94,55 @@ class TurnManager:
             prompt_obj: The prompt object containing all necessary information
             signal: Optional abort signal
         """
+        early_tools = self._create_early_tool_executor(prompt_obj)
+        try:
+            async for event in self._run_turn(prompt_obj, signal, early_tools):
+                yield event
+        finally:
+            # Tools started early for calls the turn never got to are not needed anymore
+            if early_tools:
+                early_tools.cancel_pending()
+
+    def _create_early_tool_executor(self, prompt_obj: PromptObject) -> Optional[EarlyToolExecutor]:
+        """
+        Create the executor starting read-only tools while the response streams, if applicable.
+
+        Args:
+            prompt_obj: The prompt object of the turn
+
+        Returns:
+            An EarlyToolExecutor, or None if streaming, early execution or the
+            content generator's ready-tool-call callback is unavailable
+        """
+        if not (settings.early_tool_execution and prompt_obj.streaming_enabled
+                and self.tool_execution_manager and self.registry):
+            return None
+        try:
+            parameters = inspect.signature(self.content_generator.stream_response).parameters
+        except (TypeError, ValueError):
+            return None
+        if "on_tool_call_ready" not in parameters:
+            return None
+        return EarlyToolExecutor(self.tool_execution_manager, self.registry)
+
+    async def _run_turn(self,
+                        prompt_obj: PromptObject,
+                        signal: Optional[asyncio.Event],
+                        early_tools: Optional[EarlyToolExecutor]) -> AsyncGenerator[TurnEvent, None]:
+        """
+        Run the turn's generation and tool-calling loop.
+
+        Args:
+            prompt_obj: The prompt object containing all necessary information
+            signal: Optional abort signal
+            early_tools: Executor of tool calls started while streaming, if enabled
+        """
         # Add the new user prompt to the conversation history in the prompt object
-        prompt_obj.add_user_message(prompt_obj.content)
+        prompt_obj.add_user_message(prompt_obj.user_message_content())
 
         # Get the initial response (streaming or non-streaming)
-        if prompt_obj.streaming_enabled:
-            # Stream the response from LLM using the content generator's streaming method
-            async for chunk in self.content_generator.stream_response(prompt_obj):
-                yield TurnEvent(TurnEventType.CONTENT, chunk)
-        else:
-            # Generate a complete response without streaming
-            # Content generator operates on the live prompt object in place
-            await self.content_generator.generate_response(prompt_obj)
+        async for event in self._generate(prompt_obj, early_tools):
+            yield event
 
         # After processing completes, get the complete response from the prompt object
         # since the content generator has already processed the response (with or without streaming)
@@ -123,11 +165,11 @@ class TurnManager:
                 full_response_content or prompt_obj.result_content,
                 tool_calls=current_tool_calls
             )
+            self._expand_tools(prompt_obj, current_tool_calls)
 
             # Process each tool call - handle both OpenAI format dictionaries and ToolCall objects
             for tool_call in current_tool_calls:
                 # Use ToolCall utility to ensure proper format handling and create ToolCall object
-                from gcs_kernel.tool_call_model import ToolCall
                 openai_tool_call = ToolCall.ensure_openai_format(tool_call)
                 tool_call_obj = ToolCall.from_openai_format(openai_tool_call)
 
@@ -153,8 +195,13 @@ class TurnManager:
                             "arguments": tool_call_arguments
                         })
 
-                        # Execute the tool using the unified method from ToolExecutionManager
-                        tool_execution_result = await self.tool_execution_manager.execute_tool_call(tool_call_obj)
+                        # Join the execution started while streaming, or execute the tool
+                        # using the unified method from ToolExecutionManager
+                        early_execution = early_tools.take(tool_call_obj) if early_tools else None
+                        if early_execution is not None:
+                            tool_execution_result = await early_execution
+                        else:
+                            tool_execution_result = await self.tool_execution_manager.execute_tool_call(tool_call_obj)
                         tool_result = tool_execution_result['result']
 
                         # Add tool result to the prompt object's conversation history
@@ -192,28 +239,24 @@ class TurnManager:
             logger.debug(f"TurnManager run_turn - After clearing tool calls, prompt_obj.tool_calls: {prompt_obj.tool_calls}")
 
             # After executing tool calls, get the next response from the content generator
-            # using the updated prompt object which now includes tool results in the conversation history
-            # Always use non-streaming for responses after tool execution to avoid complications
-            # Create a temporary prompt object with streaming disabled for this internal call
-            was_streaming = prompt_obj.streaming_enabled
-            prompt_obj.streaming_enabled = False  # Temporarily disable streaming for internal call
-
-            logger.debug(f"TurnManager run_turn - Calling generate_response, prompt_obj.tool_calls before: {prompt_obj.tool_calls}")
-            await self.content_generator.generate_response(prompt_obj)
-            logger.debug(f"TurnManager run_turn - After generate_response, prompt_obj.tool_calls: {prompt_obj.tool_calls}, result_content: '{prompt_obj.result_content}'")
-
-            prompt_obj.streaming_enabled = was_streaming  # Restore original streaming setting
+            # using the updated prompt object which now includes tool results in the conversation history.
+            # It is generated in the same mode as the first one, so in streaming mode its content
+            # reaches the caller as it is generated rather than after the whole answer is complete
+            logger.debug(f"TurnManager run_turn - Generating follow-up response, prompt_obj.tool_calls before: {prompt_obj.tool_calls}")
+            async for event in self._generate(prompt_obj, early_tools):
+                yield event
+            logger.debug(f"TurnManager run_turn - After follow-up response, prompt_obj.tool_calls: {prompt_obj.tool_calls}, result_content: '{prompt_obj.result_content}'")
 
             # Get the new tool calls for the next iteration (if any)
             current_tool_calls = prompt_obj.tool_calls
             full_response_content = prompt_obj.result_content
             logger.debug(f"TurnManager run_turn - End of loop iteration, current_tool_calls: {current_tool_calls}, full_response_content: '{full_response_content}'")
 
-        # Yield final content in non-streaming mode or when tool calls were processed in streaming mode
-        if (not prompt_obj.streaming_enabled) or (prompt_obj.streaming_enabled and iteration_count > 0):
+        # Yield final content in non-streaming mode
+        if not prompt_obj.streaming_enabled:
             yield TurnEvent(TurnEventType.CONTENT, full_response_content)
-        # In streaming mode with no tool calls, content was already streamed chunk by chunk,
-        # so we don't send it again to avoid duplication
+        # In streaming mode every response, including those after tool calls, was already
+        # streamed chunk by chunk, so we don't send it again to avoid duplication
 
         # Update the prompt object with the final result content
         # The result content was already updated during the tool call processing loop
@@ -235,6 +278,55 @@ class TurnManager:
 
         yield TurnEvent(TurnEventType.FINISHED)
 
+    def _expand_tools(self, prompt_obj: PromptObject, tool_calls: list):
+        """
+        Add tools the model called but was not sent to a contextual tool subset.
+
+        The follow-up requests of the turn then describe the tools the model is
+        using, or the whole catalog if it asked for a tool that does not exist.
+
+        Args:
+            prompt_obj: The prompt object of the turn
+            tool_calls: The tool calls of the latest response
+        """
+        if prompt_obj.tool_policy != ToolInclusionPolicy.CONTEXTUAL_SUBSET or not self.tool_selector:
+            return
+        catalog = self.tool_selector.catalog
+        if catalog is None:
+            return
+        names = [ToolCall.ensure_openai_format(tool_call)["function"]["name"] for tool_call in tool_calls]
+        prompt_obj.custom_tools = self.tool_selector.expand(catalog, prompt_obj.custom_tools or [],
+                                                            [name for name in names if name])
+
+    async def _generate(self,
+                        prompt_obj: PromptObject,
+                        early_tools: Optional[EarlyToolExecutor]) -> AsyncGenerator[TurnEvent, None]:
+        """
+        Generate the next response in the prompt object's streaming mode.
+
+        The content generator operates on the live prompt object in place, leaving the
+        complete response and any tool calls on it once generation finishes.
+
+        Args:
+            prompt_obj: The prompt object of the turn
+            early_tools: Executor of tool calls started while streaming, if enabled
+
+        Yields:
+            Content events for each streamed chunk (none in non-streaming mode)
+        """
+        if prompt_obj.streaming_enabled:
+            # Stream the response from LLM using the content generator's streaming method,
+            # starting read-only tools as soon as their calls are complete
+            if early_tools:
+                stream = self.content_generator.stream_response(prompt_obj, on_tool_call_ready=early_tools.submit)
+            else:
+                stream = self.content_generator.stream_response(prompt_obj)
+            async for chunk in stream:
+                yield TurnEvent(TurnEventType.CONTENT, chunk)
+        else:
+            # Generate a complete response without streaming
+            await self.content_generator.generate_response(prompt_obj)
+
     async def _wait_for_execution_result(self, execution_id: str, timeout: int = 60):
         """
         Wait for an execution to complete and return its result.
@@ -0,0 +1,288 @@
+"""
+Retrieval memory over the earlier turns of persisted conversation sessions.
+
+A resumed session sends its latest messages and a rolling summary of the
+turns before them. In long operational sessions, the detail of an earlier
+turn is often what the new request is about: the error code a tool
+returned, or the host a fix was applied to. The summary may have dropped
+it, and sending the whole history wastes tokens on unrelated turns.
+
+TurnMemory indexes every finished turn of a session (the user's request,
+the tool calls with their results, and the answer) with BM25 once it has
+left the resume window. For each prompt, it sends the top-k earlier turns
+relevant to the request, next to the recent window, as a delimited block
+in the request's user message. The index is kept in memory for the most
+recently active sessions and extended incrementally; the turns themselves
+stay in the session store and only the recalled ones are paged in.
+"""
+
+import logging
+import math
+import threading
+from collections import Counter, OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from common.settings import settings
+from .conversation_summarizer import render_transcript
+from .session_store import SessionStore
+from .tool_selector import tokenize
+
+logger = logging.getLogger(__name__)
+
+# Delimit the recalled turns, sent ahead of the new request in its user message
+MEMORY_PREFIX = "<recalled_turns>\nEarlier turns of this conversation related to the request below:\n\n"
+MEMORY_SUFFIX = "\n</recalled_turns>"
+
+# Messages read from the store at a time while indexing a session
+INDEX_PAGE_MESSAGES = 500
+
+
+def split_turns(messages: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+    """
+    Split messages into turns, each starting at a user message.
+
+    Args:
+        messages: Chat messages in conversation order
+
+    Returns:
+        The turns in order; messages before the first user message form a turn of their own
+    """
+    turns: List[List[Dict[str, Any]]] = []
+    for message in messages:
+        if not turns or message.get("role") == "user":
+            turns.append([])
+        turns[-1].append(message)
+    return turns
+
+
+class TurnIndex:
+    """Incremental BM25 index over the finished turns of one session."""
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        """
+        Initialize an empty index.
+
+        Args:
+            k1: Term frequency saturation
+            b: Document length normalization
+        """
+        self.k1 = k1
+        self.b = b
+        self.turns: List[Tuple[int, int]] = []  # (start, stop) positions of each turn in the session
+        self.lengths: List[int] = []
+        self.total_length = 0
+        self.indexed_upto = 0  # Session position up to which messages are indexed
+        # Word -> [(turn number, term frequency)]
+        self.postings: Dict[str, List[Tuple[int, int]]] = {}
+
+    def add_turn(self, start: int, messages: List[Dict[str, Any]]):
+        """
+        Index a finished turn.
+
+        Args:
+            start: Position of the turn's first message in the session
+            messages: Messages of the turn
+        """
+        words = tokenize(render_transcript(messages))
+        number = len(self.turns)
+        self.turns.append((start, start + len(messages)))
+        self.lengths.append(len(words))
+        self.total_length += len(words)
+        for word, count in Counter(words).items():
+            self.postings.setdefault(word, []).append((number, count))
+        self.indexed_upto = start + len(messages)
+
+    def search(self, query: str, top_k: int, before: Optional[int] = None) -> List[Tuple[int, float]]:
+        """
+        Rank the indexed turns against a query.
+
+        Args:
+            query: Prompt text
+            top_k: Turns to return at most
+            before: Only consider turns ending at or before this session position
+
+        Returns:
+            (turn number, BM25 score) pairs, best first; more recent turns win ties.
+            Only turns sharing at least one word with the query are returned.
+        """
+        if not self.turns:
+            return []
+        average_length = self.total_length / len(self.turns) or 1.0
+        scores: Dict[int, float] = {}
+        for word in set(tokenize(query)):
+            postings = self.postings.get(word)
+            if not postings:
+                continue
+            idf = math.log(1 + (len(self.turns) - len(postings) + 0.5) / (len(postings) + 0.5))
+            for number, count in postings:
+                if before is not None and self.turns[number][1] > before:
+                    continue
+                norm = self.k1 * (1 - self.b + self.b * self.lengths[number] / average_length)
+                scores[number] = scores.get(number, 0.0) + idf * count * (self.k1 + 1) / (count + norm)
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], -item[0]))
+        return ranked[:top_k]
+
+
+@dataclass
+class TurnMemoryConfig:
+    """How many earlier turns to recall, and how many sessions to keep indexed."""
+    top_k: int = 3  # Earlier turns recalled per prompt (0 = disabled)
+    snippet_chars: int = 1500  # Length limit of each recalled turn
+    max_sessions: int = 64  # Session indexes kept in memory
+
+    @classmethod
+    def from_settings(cls) -> "TurnMemoryConfig":
+        """Create the configuration from the global settings."""
+        return cls(
+            top_k=settings.session_memory_top_k,
+            snippet_chars=settings.session_memory_snippet_chars,
+            max_sessions=settings.session_memory_max_sessions,
+        )
+
+
+@dataclass
+class TurnMemoryMetrics:
+    """Counters of the turn memory."""
+    retrievals: int = 0
+    turns_indexed: int = 0
+    turns_recalled: int = 0
+    index_builds: int = 0  # Sessions indexed from their first message
+
+
+@dataclass
+class RecalledTurn:
+    """An earlier turn recalled for a prompt."""
+    start: int  # Position of the turn's first message in the session
+    score: float
+    messages: List[Dict[str, Any]]
+
+
+class TurnMemory:
+    """BM25 retrieval over the earlier turns of persisted sessions, safe to use from worker threads."""
+
+    def __init__(self, store: SessionStore, config: Optional[TurnMemoryConfig] = None):
+        """
+        Initialize the memory.
+
+        Args:
+            store: Session store holding the sessions' messages
+            config: Retrieval settings (defaults to the global settings)
+        """
+        self.store = store
+        self.config = config or TurnMemoryConfig.from_settings()
+        self.metrics = TurnMemoryMetrics()
+        self._lock = threading.Lock()
+        self._indexes: "OrderedDict[str, TurnIndex]" = OrderedDict()
+
+    def get_index(self, session_id: str, upto: int) -> TurnIndex:
+        """
+        Get a session's index, extended with the turns finished before a position.
+
+        Only messages not indexed yet are read from the store, a page at a time.
+
+        Args:
+            session_id: Session identifier
+            upto: Session position where the turns to index end; must start a turn
+
+        Returns:
+            The session's TurnIndex
+        """
+        with self._lock:
+            index = self._indexes.get(session_id)
+            if index is None:
+                index = TurnIndex()
+                self._indexes[session_id] = index
+                self.metrics.index_builds += 1
+                if len(self._indexes) > self.config.max_sessions:
+                    self._indexes.popitem(last=False)
+            else:
+                self._indexes.move_to_end(session_id)
+
+            pending: List[Dict[str, Any]] = []
+            pending_start = position = index.indexed_upto
+            while position < upto:
+                page = self.store.load_messages(session_id, position, min(position + INDEX_PAGE_MESSAGES, upto))
+                if not page:
+                    break
+                for message in page:
+                    if message.get("role") == "user" and pending:
+                        self._add_turn(index, pending_start, pending)
+                        pending, pending_start = [], position
+                    pending.append(message)
+                    position += 1
+            if pending:
+                self._add_turn(index, pending_start, pending)
+            return index
+
+    def _add_turn(self, index: TurnIndex, start: int, messages: List[Dict[str, Any]]):
+        """Index a turn and count it."""
+        index.add_turn(start, messages)
+        self.metrics.turns_indexed += 1
+
+    def retrieve(self, session_id: str, query: str, before: int) -> List[RecalledTurn]:
+        """
+        Find the earlier turns of a session most relevant to a request.
+
+        Args:
+            session_id: Session identifier
+            query: Prompt text
+            before: Session position where the recent window starts; only turns before it are recalled
+
+        Returns:
+            The top-k relevant turns in conversation order, with their messages paged in
+        """
+        if self.config.top_k <= 0 or before <= 0 or not (query or "").strip():
+            return []
+        index = self.get_index(session_id, before)
+        ranked = index.search(query, self.config.top_k, before)
+        self.metrics.retrievals += 1
+        recalled = []
+        for number, score in sorted(ranked):
+            start, stop = index.turns[number]
+            recalled.append(RecalledTurn(start, score, self.store.load_messages(session_id, start, stop)))
+        self.metrics.turns_recalled += len(recalled)
+        return recalled
+
+    def recall(self, session_id: str, query: str, before: int) -> Optional[str]:
+        """
+        Build the context block carrying the earlier turns relevant to a request.
+
+        The block goes in the request's user message: chat templates of many
+        models reject or ignore system messages after the first one.
+
+        Args:
+            session_id: Session identifier
+            query: Prompt text
+            before: Session position where the recent window starts
+
+        Returns:
+            The delimited recalled turns, or None if no earlier turn is relevant
+        """
+        turns = self.retrieve(session_id, query, before)
+        if not turns:
+            return None
+        snippets = []
+        for turn in turns:
+            snippet = render_transcript(turn.messages)
+            if len(snippet) > self.config.snippet_chars:
+                snippet = snippet[:self.config.snippet_chars] + " [...]"
+            snippets.append(snippet)
+        logger.debug(f"Recalled {len(turns)} earlier turns of session {session_id}")
+        return MEMORY_PREFIX + "\n\n---\n\n".join(snippets) + MEMORY_SUFFIX
+
+    def forget(self, session_id: str):
+        """Drop a session's index, such as after the session was deleted."""
+        with self._lock:
+            self._indexes.pop(session_id, None)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get the memory counters.
+
+        Returns:
+            Dictionary of counter names to values
+        """
+        metrics = asdict(self.metrics)
+        metrics["indexed_sessions"] = len(self._indexes)
+        return metrics
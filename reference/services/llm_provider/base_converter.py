@@ -6,9 +6,11 @@ using OpenAI API standards as the default format.
 """
 
 import logging
+from collections import OrderedDict
 from typing import Dict, Any, List
 from gcs_kernel.models import ToolResult
 from common.settings import settings
+from services.llm_provider.tool_compaction import ToolCompactor
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -21,8 +23,17 @@ class BaseConverter:
     using OpenAI API as the standard.
     """
 
+    # Tool lists whose conversion is kept; contextual subsets alternate between a few lists
+    MAX_CACHED_TOOL_LISTS = 16
+
     def __init__(self, model: str):
         self.model = model
+        self.tool_compactor = ToolCompactor()
+        # Recently converted tool lists by id -> (list, provider format, compacted); prompts share
+        # the registry's tool catalog or a memoized subset, so most requests pass a list again.
+        # The list is referenced so its id cannot be reused by another list.
+        self._converted_tools = OrderedDict()
+        self._last_provider_tools = []
 
     def convert_kernel_request_to_provider(self, request: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -61,7 +72,7 @@ class BaseConverter:
         if "tools" in request:
             provider_request["tools"] = self.convert_kernel_tools_to_provider(request["tools"])
         
-        logger.debug(f"BaseConverter convert_kernel_request_to_provider - provider_request: {provider_request}")
+        logger.debug("BaseConverter convert_kernel_request_to_provider - provider_request: %s", provider_request)
         
         return provider_request
 
@@ -92,7 +103,7 @@ class BaseConverter:
     def convert_kernel_tools_to_provider(self, kernel_tools: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         Convert kernel tools to provider format.
-        Passthrough for OpenAI-compatible tools.
+        Passthrough for OpenAI-compatible tools, which are then compacted.
         
         Args:
             kernel_tools: Tools in kernel format
@@ -100,6 +111,12 @@ class BaseConverter:
         Returns:
             Tools in provider format
         """
+        cached = self._converted_tools.get(id(kernel_tools))
+        if cached is not None and cached[0] is kernel_tools:
+            self._converted_tools.move_to_end(id(kernel_tools))
+            self._last_provider_tools = cached[1]
+            return cached[2]
+
         # The kernel tools should already be in OpenAI format, convert if needed
         from gcs_kernel.models import ToolDefinition
         
@@ -133,7 +150,21 @@ class BaseConverter:
                 # For any other format, return as-is
                 provider_tools.append(tool)
         
-        return provider_tools
+        compacted_tools = self.tool_compactor.compact_tools(provider_tools)
+        self._converted_tools[id(kernel_tools)] = (kernel_tools, provider_tools, compacted_tools)
+        if len(self._converted_tools) > self.MAX_CACHED_TOOL_LISTS:
+            self._converted_tools.popitem(last=False)
+        self._last_provider_tools = provider_tools
+        return compacted_tools
+
+    def get_tool_token_report(self) -> Dict[str, Any]:
+        """
+        Report the estimated tokens of the tools converted last, before and after compaction.
+
+        Returns:
+            Total and per-tool token estimates
+        """
+        return self.tool_compactor.get_report(self._last_provider_tools)
 
     def convert_kernel_tool_result_to_provider(self, tool_result: ToolResult) -> Dict[str, Any]:
         """
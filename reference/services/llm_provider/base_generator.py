@@ -37,6 +37,10 @@ class BaseContentGenerator(ABC):
     async def stream_response(self, prompt_obj: 'PromptObject') -> AsyncIterator[str]:
         """
         Stream a response to the given prompt object.
+
+        Implementations may accept an optional `on_tool_call_ready` keyword
+        argument, called with each tool call (OpenAI format) as soon as its
+        arguments are complete, so callers can start tools before the stream ends.
         
         Args:
             prompt_obj: The prompt object containing all necessary information
@@ -7,11 +7,12 @@ It supports multiple LLM providers through the provider factory.
 """
 
 import logging
-from typing import Any, AsyncIterator, Dict
+from typing import Any, AsyncIterator, Callable, Dict, Optional
 from gcs_kernel.models import PromptObject
 from services.llm_provider.base_generator import BaseContentGenerator
 from services.llm_provider.pipeline import ContentGenerationPipeline
 from services.llm_provider.providers.provider_factory import ProviderFactory
+from services.llm_provider.stream_accumulator import StreamAccumulator
 
 
 # Set up logging
@@ -65,12 +66,16 @@ class LLMContentGenerator(BaseContentGenerator):
             prompt_obj.mark_error(str(e))
             raise
 
-    async def stream_response(self, prompt_obj: 'PromptObject') -> AsyncIterator[str]:
+    async def stream_response(self, prompt_obj: 'PromptObject',
+                              on_tool_call_ready: Optional[Callable[[Dict[str, Any]], None]] = None
+                              ) -> AsyncIterator[str]:
         """
         Stream a response to the given prompt object.
 
         Args:
             prompt_obj: The prompt object containing all necessary information
+            on_tool_call_ready: Optional callback receiving each tool call (OpenAI format)
+                                as soon as its argument JSON is complete, before the stream ends
 
         Yields:
             Partial response strings as they become available
@@ -79,30 +84,24 @@ class LLMContentGenerator(BaseContentGenerator):
         prompt_obj.mark_processing()
 
         try:
-            # Store all chunks to reconstruct the full response temporarily
-            chunks_accumulated = []
+            # Fold each chunk into the response as it arrives, so the full response
+            # (including tool calls) is ready as soon as the stream ends
+            accumulator = StreamAccumulator()
 
             # Process streaming chunks from the pipeline and yield content as it comes
             async for chunk in self.pipeline.execute_stream(prompt_obj):
-                choices = chunk.get("choices", [])
-                if choices:
-                    delta = choices[0].get("delta", {})
-
-                    # Yield content chunks as they become available
-                    content = delta.get("content", "")
-                    if content:
-                        yield content
-
-                # Store the chunk to reconstruct the full response later
-                chunks_accumulated.append(chunk)
+                content = accumulator.add(chunk)
+                if on_tool_call_ready:
+                    for tool_call in accumulator.pop_ready_tool_calls():
+                        on_tool_call_ready(tool_call)
+                if content:
+                    yield content
 
-            # After streaming completes, reconstruct the full response from accumulated chunks
             # NOTE: For OpenAI-compatible APIs including vLLM, the streaming response provides
             # content deltas during the stream and potentially a final chunk with finish_reason,
             # but may not include post-processing metadata like usage statistics that would 
-            # be available in a non-streaming response. The process_streaming_chunks method
-            # reconstructs the complete message content and structure from the streamed deltas.
-            full_response = self.process_streaming_chunks(chunks_accumulated)
+            # be available in a non-streaming response.
+            full_response = accumulator.build_response()
             
             # Process the reconstructed full response
             self.process_full_response(prompt_obj, full_response)
@@ -165,80 +164,12 @@ class LLMContentGenerator(BaseContentGenerator):
         Returns:
             Complete response in OpenAI format
         """
-        # Initialize variables to collect the full response for potential tool calls
-        accumulated_tool_calls = []
-        accumulated_content = ""
-        final_finish_reason = None  # Track the finish reason from the final chunk
-
-        # Process each chunk to accumulate content and tool calls
+        accumulator = StreamAccumulator()
         for chunk in chunks:
-            choices = chunk.get("choices", [])
-            if choices:
-                delta = choices[0].get("delta", {})
+            accumulator.add(chunk)
+        full_response = accumulator.build_response()
 
-                # Handle content chunks
-                content = delta.get("content", "")
-                if content:
-                    accumulated_content += content
-
-                # Handle tool call chunks - OpenAI streams tool calls as deltas too
-                tool_calls_delta = delta.get("tool_calls")
-                if tool_calls_delta:
-                    # Process tool call deltas
-                    for tool_call_delta in tool_calls_delta:
-                        index = tool_call_delta.get("index")
-                        # Ensure we have enough slots in accumulated_tool_calls
-                        while len(accumulated_tool_calls) <= index:
-                            accumulated_tool_calls.append({
-                                "id": "",
-                                "type": "",
-                                "function": {"name": "", "arguments": ""}
-                            })
-
-                        # Update the appropriate tool call slot with the delta info
-                        current_tc = accumulated_tool_calls[index]
-                        if "id" in tool_call_delta:
-                            current_tc["id"] = tool_call_delta["id"]
-                        if "type" in tool_call_delta:
-                            current_tc["type"] = tool_call_delta["type"]
-                        if "function" in tool_call_delta:
-                            function_delta = tool_call_delta["function"]
-                            if "name" in function_delta:
-                                current_tc["function"]["name"] += function_delta["name"]
-                            if "arguments" in function_delta:
-                                current_tc["function"]["arguments"] += function_delta["arguments"]
-
-                # Check if this chunk contains the finish_reason (which would be in the choice, not delta)
-                # This is important for capturing the final message object's finish_reason
-                chunk_finish_reason = choices[0].get("finish_reason")
-                if chunk_finish_reason:
-                    # If we have a finish_reason in this chunk, it's likely the final chunk
-                    final_finish_reason = chunk_finish_reason
-
-        # Construct the full response
-        full_response = {
-            "choices": []
-        }
-
-        # Add the message to the choices
-        message_obj = {
-            "role": "assistant"
-        }
-        if accumulated_content:
-            message_obj["content"] = accumulated_content
-        if accumulated_tool_calls:
-            message_obj["tool_calls"] = accumulated_tool_calls
-
-        # Use the finish_reason from the final chunk if available, otherwise determine it based on tool calls
-        finish_reason = final_finish_reason if final_finish_reason else ("tool_calls" if accumulated_tool_calls else "stop")
-
-        full_response["choices"].append({
-            "index": 0,
-            "message": message_obj,
-            "finish_reason": finish_reason
-        })
-
-        logger.debug(f"ContentGenerator process_streaming_chunks - accumulated_content: '{accumulated_content}', accumulated_tool_calls: {accumulated_tool_calls}, finish_reason: {finish_reason}")
+        logger.debug(f"ContentGenerator process_streaming_chunks - assembled {accumulator.chunk_count} chunks: {full_response}")
 
         return full_response
 
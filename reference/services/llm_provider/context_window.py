@@ -0,0 +1,392 @@
+"""
+Token-budgeted context window management for provider requests.
+
+The kernel learns the model's context length (llm_max_context_length) at
+startup, but requests used to carry the whole conversation history until
+the provider rejected them. ContextWindowManager fits the messages of each
+request into the context window before it is sent. It keeps the system
+messages and the latest turn, trims old tool outputs, drops the oldest
+turns, and reserves room for the completion. Token counts are cached per
+message, so counting a long history again on every request only costs a
+dictionary lookup per message.
+
+Tokens are counted with tiktoken when it is installed. Otherwise a
+character-based estimate is used.
+"""
+
+import json
+import logging
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from common.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Tokens every message costs on top of its content (role, separators), and the
+# tokens priming the assistant's reply, as counted for OpenAI chat models
+MESSAGE_OVERHEAD_TOKENS = 4
+REPLY_PRIMING_TOKENS = 3
+CHARS_PER_TOKEN = 4
+
+
+@dataclass(frozen=True)
+class Tokenizer:
+    """A named function counting the tokens of a text."""
+    name: str
+    count: Callable[[str], int]
+
+
+def _estimate_tokens(text: str) -> int:
+    """Estimate tokens from characters, rounding up."""
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def _load_tokenizer(name: str, model: Optional[str] = None) -> Optional[Tokenizer]:
+    """Create a tokenizer by name, or return None if it is not installed."""
+    if name == "tiktoken":
+        try:
+            import tiktoken
+        except ImportError:
+            return None
+        try:
+            encoding = tiktoken.encoding_for_model(model or "")
+        except KeyError:
+            encoding = tiktoken.get_encoding("cl100k_base")
+        # Special-token text in user content is counted as plain text instead of raising
+        return Tokenizer("tiktoken", lambda text: len(encoding.encode(text, disallowed_special=())))
+    if name == "chars":
+        return Tokenizer("chars", _estimate_tokens)
+    raise ValueError(f"Unknown tokenizer '{name}'")
+
+
+def get_tokenizer(name: Optional[str] = None, model: Optional[str] = None) -> Tokenizer:
+    """
+    Get a tokenizer for counting request tokens.
+
+    Args:
+        name: "tiktoken", "chars" or "auto" for tiktoken when installed (defaults to llm_tokenizer)
+        model: Model whose encoding tiktoken should use (defaults to llm_model)
+
+    Returns:
+        The requested tokenizer, or the character-based estimate if it is not installed
+    """
+    name = (name or settings.llm_tokenizer).lower()
+    model = model or settings.llm_model
+    if name == "auto":
+        return _load_tokenizer("tiktoken", model) or _load_tokenizer("chars")
+
+    tokenizer = _load_tokenizer(name, model)
+    if tokenizer is None:
+        logger.warning(f"Tokenizer '{name}' requested for the context window but not installed; "
+                       f"estimating from characters")
+        return _load_tokenizer("chars")
+    return tokenizer
+
+
+@dataclass
+class ContextWindowMetrics:
+    """Counters describing how requests were fitted into the context window."""
+    requests: int = 0
+    requests_fitted: int = 0
+    tool_outputs_trimmed: int = 0
+    messages_dropped: int = 0
+    tokens_removed: int = 0
+    requests_over_budget: int = 0
+
+
+class ContextWindowManager:
+    """
+    Fits the messages of provider requests into the model's context window.
+
+    When a request does not fit, it is shrunk in this order until it does:
+
+    1. Tool outputs before the latest turn are trimmed to tool_output_tokens,
+       oldest first.
+    2. The oldest turns are dropped. A turn is a user message with every
+       message answering it, so tool calls are never separated from their results.
+    3. Tool outputs of the latest turn are trimmed.
+
+    System messages and the latest turn are always kept, so a request that
+    still does not fit is sent anyway and logged. Only the request is changed,
+    never the conversation history it was built from.
+    """
+
+    def __init__(self, max_context_length: Optional[int] = None, tokenizer: Optional[Tokenizer] = None,
+                 tool_output_tokens: Optional[int] = None, enabled: Optional[bool] = None,
+                 max_cached_messages: int = 4096):
+        """
+        Initialize the context window manager.
+
+        Args:
+            max_context_length: Context window in tokens (defaults to the current
+                                llm_max_context_length, which the kernel learns from the model)
+            tokenizer: Tokenizer for counting tokens (defaults to get_tokenizer())
+            tool_output_tokens: Tokens old tool outputs are trimmed to
+                                (defaults to llm_context_tool_output_tokens)
+            enabled: Whether requests are fitted at all (defaults to llm_context_management_enabled)
+            max_cached_messages: Token counts of this many distinct messages are cached
+        """
+        self._max_context_length = max_context_length
+        self.tokenizer = tokenizer or get_tokenizer()
+        self.tool_output_tokens = (settings.llm_context_tool_output_tokens
+                                   if tool_output_tokens is None else tool_output_tokens)
+        self.enabled = settings.llm_context_management_enabled if enabled is None else enabled
+        self.max_cached_messages = max_cached_messages
+        self.metrics = ContextWindowMetrics()
+        self._message_tokens: "OrderedDict[Hashable, int]" = OrderedDict()
+        self._tools_tokens: Optional[Tuple[Any, int]] = None
+        # Message id -> (message, content and limit it was trimmed from, trimmed copy), so a
+        # trimmed tool output is the same object in every request and its encoding is reused
+        self._trimmed: "OrderedDict[int, Tuple[Dict[str, Any], str, int, Dict[str, Any]]]" = OrderedDict()
+
+    @property
+    def max_context_length(self) -> int:
+        """The context window in tokens."""
+        return self._max_context_length or settings.llm_max_context_length
+
+    def count_message(self, message: Dict[str, Any]) -> int:
+        """
+        Count the tokens of one message, cached across requests.
+
+        Args:
+            message: Chat message in OpenAI format
+
+        Returns:
+            Tokens of the message's content, tool calls and overhead
+        """
+        key = self._message_key(message)
+        tokens = self._message_tokens.get(key)
+        if tokens is not None:
+            self._message_tokens.move_to_end(key)
+            return tokens
+
+        tokens = MESSAGE_OVERHEAD_TOKENS + self._count_content(message.get("content"))
+        for tool_call in message.get("tool_calls") or ():
+            function = tool_call.get("function") or {}
+            tokens += self.tokenizer.count(function.get("name") or "")
+            tokens += self.tokenizer.count(function.get("arguments") or "")
+        if message.get("name"):
+            tokens += self.tokenizer.count(message["name"])
+
+        self._message_tokens[key] = tokens
+        if len(self._message_tokens) > self.max_cached_messages:
+            self._message_tokens.popitem(last=False)
+        return tokens
+
+    def count_messages(self, messages: List[Dict[str, Any]]) -> int:
+        """
+        Count the prompt tokens of a list of messages.
+
+        Args:
+            messages: Chat messages in OpenAI format
+
+        Returns:
+            Tokens of all messages, including the reply priming
+        """
+        return REPLY_PRIMING_TOKENS + sum(self.count_message(message) for message in messages)
+
+    def count_tools(self, tools: Optional[List[Dict[str, Any]]]) -> int:
+        """
+        Count the tokens of a request's tool definitions.
+
+        The count of the last tools list is kept, so a catalog sent with
+        every request is only serialized once.
+
+        Args:
+            tools: Tool definitions in OpenAI format
+
+        Returns:
+            Tokens of the serialized definitions
+        """
+        if not tools:
+            return 0
+        if self._tools_tokens is not None and self._tools_tokens[0] is tools:
+            return self._tools_tokens[1]
+        tokens = self.tokenizer.count(json.dumps(tools, separators=(",", ":")))
+        # The list is referenced so its identity cannot be reused by another list
+        self._tools_tokens = (tools, tokens)
+        return tokens
+
+    def prompt_budget(self, request: Dict[str, Any]) -> int:
+        """
+        Tokens left for the messages of a request.
+
+        Args:
+            request: Provider request in OpenAI format
+
+        Returns:
+            The context window minus the completion reserve and the tool definitions
+        """
+        context = self.max_context_length
+        completion = request.get("max_tokens") or request.get("max_completion_tokens") or settings.llm_max_tokens
+        # A completion reserve above half the window would leave no room for the conversation
+        reserve = min(completion, context // 2)
+        return context - reserve - self.count_tools(request.get("tools"))
+
+    def fit_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Fit the messages of a request into the context window.
+
+        Args:
+            request: Provider request in OpenAI format
+
+        Returns:
+            The request itself if it fits, else a copy with fitted messages
+        """
+        messages = request.get("messages")
+        if not self.enabled or not messages:
+            return request
+        self.metrics.requests += 1
+
+        budget = self.prompt_budget(request)
+        total = self.count_messages(messages)
+        if total <= budget:
+            return request
+
+        fitted, fitted_total = self.fit_messages(messages, budget)
+        self.metrics.requests_fitted += 1
+        self.metrics.tokens_removed += total - fitted_total
+        if fitted_total > budget:
+            self.metrics.requests_over_budget += 1
+            logger.warning(f"Request needs {fitted_total} prompt tokens after fitting, over the budget "
+                           f"of {budget}; sending the system messages and latest turn anyway")
+        else:
+            logger.info(f"Fitted request from {total} to {fitted_total} prompt tokens "
+                        f"({len(messages) - len(fitted)} messages dropped, budget {budget})")
+        return {**request, "messages": fitted}
+
+    def fit_messages(self, messages: List[Dict[str, Any]], budget: int) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Shrink messages until they fit a token budget or only the protected ones remain.
+
+        Args:
+            messages: Chat messages in OpenAI format
+            budget: Prompt tokens available
+
+        Returns:
+            The fitted messages and their token count
+        """
+        messages = list(messages)
+        tokens = [self.count_message(message) for message in messages]
+        total = REPLY_PRIMING_TOKENS + sum(tokens)
+
+        # The latest turn starts at the last user message; leading system messages stay as well
+        latest_turn = next((index for index in range(len(messages) - 1, -1, -1)
+                            if messages[index].get("role") == "user"), len(messages) - 1)
+        history_start = next((index for index, message in enumerate(messages)
+                              if message.get("role") != "system"), len(messages))
+
+        # 1. Trim old tool outputs, oldest first
+        for index in range(history_start, latest_turn):
+            if total <= budget:
+                break
+            total -= self._trim_tool_output(messages, tokens, index)
+
+        # 2. Drop the oldest turns
+        drop_end = history_start
+        while total > budget and drop_end < latest_turn:
+            turn_end = drop_end + 1
+            while turn_end < latest_turn and messages[turn_end].get("role") != "user":
+                turn_end += 1
+            total -= sum(tokens[drop_end:turn_end])
+            self.metrics.messages_dropped += turn_end - drop_end
+            drop_end = turn_end
+        if drop_end > history_start:
+            del messages[history_start:drop_end]
+            del tokens[history_start:drop_end]
+            latest_turn -= drop_end - history_start
+
+        # 3. Trim the latest turn's tool outputs
+        for index in range(latest_turn, len(messages)):
+            if total <= budget:
+                break
+            total -= self._trim_tool_output(messages, tokens, index)
+        return messages, total
+
+    def _trim_tool_output(self, messages: List[Dict[str, Any]], tokens: List[int], index: int) -> int:
+        """
+        Trim the content of a tool message to tool_output_tokens.
+
+        Args:
+            messages: Messages being fitted, updated with the trimmed copy
+            tokens: Token counts of the messages, updated as well
+            index: Position of the message to trim
+
+        Returns:
+            Tokens saved (0 if the message is not a long tool output)
+        """
+        message = messages[index]
+        content = message.get("content")
+        if message.get("role") != "tool" or not isinstance(content, str):
+            return 0
+        content_tokens = tokens[index] - MESSAGE_OVERHEAD_TOKENS
+        if content_tokens <= self.tool_output_tokens:
+            return 0
+
+        trimmed = self._get_trimmed_copy(message, content, content_tokens)
+        trimmed_tokens = self.count_message(trimmed)
+        saved = tokens[index] - trimmed_tokens
+        messages[index] = trimmed
+        tokens[index] = trimmed_tokens
+        self.metrics.tool_outputs_trimmed += 1
+        return saved
+
+    def _get_trimmed_copy(self, message: Dict[str, Any], content: str, content_tokens: int) -> Dict[str, Any]:
+        """Get the copy of a tool message with its content trimmed to tool_output_tokens, cached per message."""
+        entry = self._trimmed.get(id(message))
+        if entry is not None and entry[0] is message and entry[1] is content and entry[2] == self.tool_output_tokens:
+            self._trimmed.move_to_end(id(message))
+            return entry[3]
+
+        kept_chars = len(content) * self.tool_output_tokens // content_tokens
+        trimmed = {**message, "content": f"{content[:kept_chars]}\n[... output truncated, "
+                                         f"{content_tokens - self.tool_output_tokens} tokens omitted]"}
+        # The message is referenced so its id cannot be reused by another object
+        self._trimmed[id(message)] = (message, content, self.tool_output_tokens, trimmed)
+        if len(self._trimmed) > self.max_cached_messages:
+            self._trimmed.popitem(last=False)
+        return trimmed
+
+    def _count_content(self, content: Any) -> int:
+        """Count the tokens of a message's content, plain or a list of parts."""
+        if content is None:
+            return 0
+        if isinstance(content, str):
+            return self.tokenizer.count(content)
+        if isinstance(content, list):
+            return sum(self.tokenizer.count(part.get("text") or "") if isinstance(part, dict) else 0
+                       for part in content)
+        return self.tokenizer.count(str(content))
+
+    @staticmethod
+    def _message_key(message: Dict[str, Any]) -> Hashable:
+        """
+        Cache key of a message's token count.
+
+        Strings cache their hash, so a message already counted is found without rehashing its content.
+        """
+        content = message.get("content")
+        if not isinstance(content, str):
+            content = None if content is None else json.dumps(content, sort_keys=True)
+        tool_calls = message.get("tool_calls")
+        if tool_calls:
+            tool_calls = tuple(((call.get("function") or {}).get("name"), (call.get("function") or {}).get("arguments"))
+                               for call in tool_calls)
+        return message.get("role"), content, tool_calls, message.get("name")
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get the fitting counters and the current budget parameters.
+
+        Returns:
+            Dictionary of counter names to values
+        """
+        metrics = asdict(self.metrics)
+        metrics["max_context_length"] = self.max_context_length
+        metrics["tokenizer"] = self.tokenizer.name
+        metrics["cached_messages"] = len(self._message_tokens)
+        # Tokens of the tool definitions counted last, part of every prompt's budget
+        metrics["tool_tokens"] = self._tools_tokens[1] if self._tools_tokens else 0
+        return metrics
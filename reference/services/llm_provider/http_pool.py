@@ -0,0 +1,299 @@
+"""
+Shared HTTP client pool for LLM provider traffic.
+
+Every provider request used to run on a client with httpx's default pool
+limits, and some calls (such as model info lookups) created and tore down a
+client of their own, paying a fresh TCP and TLS handshake each time. This
+module keeps one tuned httpx.AsyncClient per provider endpoint for the whole
+process, can pre-warm connections at kernel startup, and records pool
+saturation and connection reuse so handshake and queuing costs show up in
+metrics instead of in time-to-first-token.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, asdict
+from typing import Dict, Optional, Tuple
+
+import httpx
+
+from common.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+def http2_available() -> bool:
+    """Check whether the optional h2 package needed for HTTP/2 is installed."""
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+@dataclass
+class HTTPPoolConfig:
+    """Connection limits and keepalive settings of the provider client pool."""
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+    http2: bool = False
+    prewarm_connections: int = 1
+
+    @classmethod
+    def from_settings(cls) -> "HTTPPoolConfig":
+        """Build the pool configuration from the global settings."""
+        return cls(
+            max_connections=settings.llm_http_max_connections,
+            max_keepalive_connections=settings.llm_http_max_keepalive_connections,
+            keepalive_expiry=settings.llm_http_keepalive_expiry,
+            http2=settings.llm_http2,
+            prewarm_connections=settings.llm_http_prewarm_connections,
+        )
+
+
+@dataclass
+class HTTPPoolMetrics:
+    """Counters describing how provider requests used the connection pool."""
+    requests: int = 0
+    connections_opened: int = 0
+    connections_reused: int = 0
+    tls_handshakes: int = 0
+    in_flight: int = 0
+    peak_in_flight: int = 0
+    saturated_requests: int = 0  # Requests started while every connection of their client was busy
+    connection_wait_seconds: float = 0.0  # Time spent waiting for a connection, including handshakes
+
+    def snapshot(self) -> Dict[str, float]:
+        """
+        Get the current counters.
+
+        Returns:
+            Dictionary of counter names to values
+        """
+        return asdict(self)
+
+
+class _MeteredStream(httpx.AsyncByteStream):
+    """Response stream that reports when the response has been closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, on_close):
+        self._stream = stream
+        self._on_close = on_close
+        self._closed = False
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self):
+        try:
+            await self._stream.aclose()
+        finally:
+            if not self._closed:
+                self._closed = True
+                self._on_close()
+
+
+class MeteredTransport(httpx.AsyncBaseTransport):
+    """
+    Transport wrapper recording pool usage through httpcore trace events.
+
+    A request counts as in flight from the moment it is sent until its
+    response is closed, which for streamed completions is the end of the
+    stream. The metrics are shared by every client of the pool, but each
+    client has its own connections, so saturation is judged per transport.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, metrics: HTTPPoolMetrics, max_connections: int):
+        self._transport = transport
+        self.metrics = metrics
+        self.max_connections = max_connections
+        self.in_flight = 0  # Requests in flight on this transport's connections
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        metrics = self.metrics
+        if self.in_flight >= self.max_connections:
+            metrics.saturated_requests += 1
+        self.in_flight += 1
+        metrics.in_flight += 1
+        metrics.peak_in_flight = max(metrics.peak_in_flight, metrics.in_flight)
+        metrics.requests += 1
+
+        started = time.monotonic()
+        state = {"opened": False, "waited": False}
+        inner_trace = request.extensions.get("trace")
+
+        async def trace(event_name: str, info: dict):
+            if event_name == "connection.connect_tcp.complete":
+                state["opened"] = True
+                metrics.connections_opened += 1
+            elif event_name == "connection.start_tls.complete":
+                metrics.tls_handshakes += 1
+            elif event_name.endswith("send_request_headers.started") and not state["waited"]:
+                state["waited"] = True
+                metrics.connection_wait_seconds += time.monotonic() - started
+            if inner_trace:
+                await inner_trace(event_name, info)
+
+        request.extensions = {**request.extensions, "trace": trace}
+
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException:
+            self.in_flight -= 1
+            metrics.in_flight -= 1
+            raise
+
+        if not state["opened"]:
+            metrics.connections_reused += 1
+        response.stream = _MeteredStream(response.stream, self._on_response_closed)
+        return response
+
+    def _on_response_closed(self):
+        self.in_flight -= 1
+        self.metrics.in_flight -= 1
+
+    async def aclose(self):
+        await self._transport.aclose()
+
+
+class ProviderClientPool:
+    """
+    Process-wide pool of HTTP clients for LLM providers.
+
+    Clients are shared per (base URL, headers, timeout), so all pipelines and
+    model info lookups of a provider reuse the same keepalive connections.
+    """
+
+    def __init__(self, config: Optional[HTTPPoolConfig] = None):
+        """
+        Initialize the client pool.
+
+        Args:
+            config: Pool configuration, taken from the global settings if omitted
+        """
+        self.config = config or HTTPPoolConfig.from_settings()
+        self.metrics = HTTPPoolMetrics()
+        self._clients: Dict[Tuple, httpx.AsyncClient] = {}
+
+        self.http2 = self.config.http2
+        if self.http2 and not http2_available():
+            logger.warning("HTTP/2 requested for LLM providers but the h2 package is not installed; using HTTP/1.1")
+            self.http2 = False
+
+    def get_client(self, base_url: str, headers: Optional[Dict[str, str]] = None,
+                   timeout: float = 60) -> httpx.AsyncClient:
+        """
+        Get the shared client for a provider endpoint, creating it on first use.
+
+        The returned client is owned by the pool and must not be closed by the caller.
+
+        Args:
+            base_url: Base URL of the provider API
+            headers: Default headers sent with every request
+            timeout: Request timeout in seconds
+
+        Returns:
+            The shared httpx.AsyncClient
+        """
+        headers = headers or {}
+        key = (base_url, tuple(sorted(headers.items())), timeout)
+        client = self._clients.get(key)
+        if client is None or client.is_closed:
+            client = self._create_client(headers, timeout)
+            self._clients[key] = client
+        return client
+
+    def _create_client(self, headers: Dict[str, str], timeout: float) -> httpx.AsyncClient:
+        """Create a client with the pool's limits and a metered transport."""
+        limits = httpx.Limits(
+            max_connections=self.config.max_connections,
+            max_keepalive_connections=self.config.max_keepalive_connections,
+            keepalive_expiry=self.config.keepalive_expiry,
+        )
+        transport = MeteredTransport(
+            httpx.AsyncHTTPTransport(limits=limits, http2=self.http2),
+            self.metrics,
+            self.config.max_connections,
+        )
+        return httpx.AsyncClient(timeout=timeout, headers=headers, transport=transport)
+
+    async def prewarm(self, base_url: str, headers: Optional[Dict[str, str]] = None,
+                      timeout: float = 60, connections: Optional[int] = None) -> int:
+        """
+        Open keepalive connections to a provider ahead of the first prompt.
+
+        Any HTTP response counts as success: the point is to complete the TCP
+        and TLS handshakes, not to call a particular endpoint.
+
+        Args:
+            base_url: Base URL of the provider API
+            headers: Default headers of the provider's client
+            timeout: Request timeout in seconds
+            connections: Number of connections to open, defaults to the configured count
+
+        Returns:
+            Number of connections that were established
+        """
+        count = self.config.prewarm_connections if connections is None else connections
+        if count <= 0:
+            return 0
+
+        client = self.get_client(base_url, headers, timeout)
+
+        async def warm():
+            try:
+                response = await client.head(base_url)
+                await response.aclose()
+                return True
+            except httpx.HTTPError as e:
+                logger.debug(f"Pre-warming connection to {base_url} failed: {e}")
+                return False
+
+        # Concurrent requests each hold a connection, so each one opens its own
+        results = await asyncio.gather(*(warm() for _ in range(count)))
+        warmed = sum(results)
+        logger.info(f"Pre-warmed {warmed}/{count} connections to {base_url}")
+        return warmed
+
+    def get_metrics(self) -> Dict[str, float]:
+        """
+        Get pool saturation and connection reuse counters.
+
+        Returns:
+            Dictionary of counter names to values
+        """
+        return self.metrics.snapshot()
+
+    async def aclose(self):
+        """Close all pooled clients and their connections."""
+        clients = list(self._clients.values())
+        self._clients.clear()
+        for client in clients:
+            await client.aclose()
+
+
+_provider_client_pool: Optional[ProviderClientPool] = None
+
+
+def get_provider_client_pool() -> ProviderClientPool:
+    """
+    Get the process-wide provider client pool.
+
+    Returns:
+        The shared ProviderClientPool, created from settings on first use
+    """
+    global _provider_client_pool
+    if _provider_client_pool is None:
+        _provider_client_pool = ProviderClientPool()
+    return _provider_client_pool
+
+
+async def close_provider_client_pool():
+    """Close the process-wide provider client pool if it was created."""
+    global _provider_client_pool
+    if _provider_client_pool is not None:
+        await _provider_client_pool.aclose()
+        _provider_client_pool = None
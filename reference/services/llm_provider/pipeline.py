@@ -5,12 +5,24 @@ This module implements the content generation pipeline following Qwen Code patte
 """
 
 import asyncio
+import hashlib
 import httpx
 import logging
-from typing import Dict, Any, AsyncIterator
+import time
+from typing import Dict, Any, AsyncIterator, Optional
 from unittest.mock import MagicMock
-from gcs_kernel.models import PromptObject
+from common.settings import settings
+from gcs_kernel.models import PromptObject, RequestPriority
+from services.llm_provider.context_window import ContextWindowManager
 from services.llm_provider.providers.base_provider import BaseProvider
+from services.llm_provider.request_encoder import RequestEncoder, request_body_kwargs
+from services.llm_provider.response_cache import ResponseCache, get_response_cache, normalize_request
+from services.llm_provider.rate_limiter import ProviderRateLimiter, get_rate_limiter
+from services.llm_provider.single_flight import SingleFlight
+from services.llm_provider.sse import get_json_backend, iter_sse_json
+from services.llm_provider.retry import (
+    LatencyTracker, ProviderHTTPError, RetryPolicy, call_with_retry, hedged_call, parse_retry_after
+)
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -21,21 +33,76 @@ class ContentGenerationPipeline:
     Pipeline for content generation following Qwen Code patterns.
     """
     
-    def __init__(self, provider: BaseProvider):
+    def __init__(self, provider: BaseProvider, retry_policy: Optional[RetryPolicy] = None,
+                 stream_resume_policy: Optional[RetryPolicy] = None, hedge_requests: Optional[bool] = None,
+                 response_cache: Optional[ResponseCache] = None, coalesce_requests: Optional[bool] = None,
+                 rate_limiter: Optional[ProviderRateLimiter] = None,
+                 context_window: Optional[ContextWindowManager] = None):
         """
         Initialize the content generation pipeline.
         
         Args:
             provider: The LLM provider to use for content generation
+            retry_policy: Retries for requests and for streams that have not produced a chunk yet,
+                          built from the provider's max_retries and settings if omitted
+            stream_resume_policy: Retries for streams that fail after their first chunk
+                                  (disabled unless llm_stream_resume_retries is set)
+            hedge_requests: Whether to hedge slow non-streaming requests (defaults to llm_hedge_requests)
+            response_cache: Exact-match response cache (defaults to the process-wide cache,
+                            which is disabled unless llm_response_cache_enabled is set)
+            coalesce_requests: Whether concurrent identical deterministic requests share one
+                               upstream call (defaults to llm_coalesce_requests)
+            rate_limiter: Admission control of provider requests (defaults to the
+                          process-wide limiter of the provider's base URL)
+            context_window: Fits each request's messages into the model's context window
+                            (defaults to one following llm_max_context_length)
         """
         self.provider = provider
         self.client = provider.build_client()
         # Use the converter provided by the provider
         self.converter = provider.converter
+
+        self.retry_policy = retry_policy or RetryPolicy(
+            max_retries=provider.max_retries,
+            base_delay=settings.llm_retry_base_delay,
+            max_delay=settings.llm_retry_max_delay,
+            max_retry_after=settings.llm_retry_after_max,
+        )
+        self.stream_resume_policy = stream_resume_policy or RetryPolicy(
+            max_retries=settings.llm_stream_resume_retries,
+            base_delay=settings.llm_retry_base_delay,
+            max_delay=settings.llm_retry_max_delay,
+            max_retry_after=settings.llm_retry_after_max,
+        )
+        self.hedge_requests = settings.llm_hedge_requests if hedge_requests is None else hedge_requests
+        self.latency_tracker = LatencyTracker()
+        self.response_cache = response_cache or get_response_cache()
+        self.coalesce_requests = settings.llm_coalesce_requests if coalesce_requests is None else coalesce_requests
+        self.single_flight = SingleFlight()
+        self.json_backend = get_json_backend()
+        self.rate_limiter = rate_limiter or get_rate_limiter(provider.base_url)
+        self.context_window = context_window or ContextWindowManager()
+        # Request bodies are assembled from the cached JSON of their messages and tools
+        self.request_encoder = RequestEncoder()
     
+    def _hedge_delay(self) -> float:
+        """Delay before a hedged request: the observed p95 latency, or the configured minimum."""
+        p95 = self.latency_tracker.percentile(0.95)
+        if p95 is None:
+            return settings.llm_hedge_min_delay
+        return max(p95, settings.llm_hedge_min_delay)
+
     async def execute(self, prompt_obj: 'PromptObject') -> Any:
         """
         Execute a content generation request through the pipeline using a PromptObject.
+
+        Transient failures (429, 5xx, connection errors) are retried with
+        backoff, and with hedging enabled a request slower than the p95
+        latency is raced against a second attempt. Repeated deterministic
+        requests are answered from the response cache when it is enabled,
+        and concurrent identical requests share one upstream call. Every attempt
+        is admitted by the rate limiter in the order of the prompt's priority.
+        Histories longer than the context window are fitted into it first.
         
         Args:
             prompt_obj: The PromptObject containing all necessary information
@@ -43,26 +110,92 @@ class ContentGenerationPipeline:
         Returns:
             The content generation response in OpenAI format
         """
-        # Build the final request directly from the prompt object using provider's method
-        final_request = self.provider.build_request(prompt_obj)
-        
-        import logging
-        logger = logging.getLogger(__name__)
+        # Build the final request directly from the prompt object using provider's method,
+        # with the history fitted into the context window
+        final_request = self.context_window.fit_request(self.provider.build_request(prompt_obj))
         
-        logger.debug(f"Pipeline execute - final_request sent to LLM: {final_request}")
+        # Formatted lazily: rendering the whole history costs more than encoding it
+        logger.debug("Pipeline execute - final_request sent to LLM: %s", final_request)
         
         # Determine the URL for content generation
         # TODO: Adjust endpoint as needed based on provider specifics
         url = f"{self.provider.base_url}/chat/completions"
 
-        
-        # Use the stored client in the pipeline to allow for test mocking
-        # Add detailed logging for debugging
+        cached = await self.response_cache.get_response(final_request)
+        if cached is not None:
+            logger.debug("Pipeline execute - served from response cache")
+            return cached
 
+        priority = getattr(prompt_obj, "priority", RequestPriority.INTERACTIVE)
+
+        async def attempt():
+            async with self.rate_limiter.slot(final_request, priority) as slot:
+                started = time.monotonic()
+                result = await self._send_request(url, final_request)
+                self.latency_tracker.record(time.monotonic() - started)
+                slot.record_usage(self._total_tokens(result))
+                return result
+
+        async def fetch():
+            if self.hedge_requests:
+                result = await call_with_retry(lambda: hedged_call(attempt, self._hedge_delay()), self.retry_policy)
+            else:
+                result = await call_with_retry(attempt, self.retry_policy)
+            await self.response_cache.put_response(final_request, result)
+            return result
+
+        if self._should_coalesce(final_request):
+            return await self.single_flight.call(self._coalescing_key(final_request), fetch)
+        return await fetch()
+
+    def _should_coalesce(self, request: Dict[str, Any]) -> bool:
+        """
+        Check whether a request may share an upstream call with concurrent identical requests.
+
+        Callers of a sampled request expect completions drawn independently,
+        so only deterministic requests (temperature 0 or unset) are coalesced.
+
+        Args:
+            request: The final request body
+
+        Returns:
+            True if coalescing is enabled and the request is not sampled
+        """
+        return self.coalesce_requests and not request.get("temperature")
+
+    def _coalescing_key(self, request: Dict[str, Any]) -> str:
+        """
+        Key under which concurrent identical requests share one upstream call.
+
+        Hashes the encoded request without its per-call fields, which reuses the
+        encoder's cached fragments instead of serializing the history again.
+
+        Args:
+            request: The final request body
+
+        Returns:
+            Hex SHA-256 digest of the normalized request body
+        """
+        return hashlib.sha256(self.request_encoder.encode(normalize_request(request))).hexdigest()
+
+    async def _send_request(self, url: str, final_request: Dict[str, Any]) -> Any:
+        """
+        Send one content generation request.
+
+        Args:
+            url: Chat completions URL of the provider
+            final_request: The request body
+
+        Returns:
+            The content generation response in OpenAI format
+
+        Raises:
+            ProviderHTTPError: If the provider returned an error status
+        """
+        logger.debug("Pipeline execute - sending request to %s with data: %s", url, final_request)
         
-        logger.debug(f"Pipeline execute - sending request to {url} with data: {final_request}")
-        
-        response = await self.client.post(url, json=final_request)
+        response = await self.client.post(url, **request_body_kwargs(self.client, final_request,
+                                                                      self.request_encoder))
         
         # Log response details for debugging
         # Handle the case where response.headers might be mocked and behave differently
@@ -120,12 +253,22 @@ class ContentGenerationPipeline:
             logger.error(f"Response headers: {error_headers_dict}")
             logger.error(f"Response content: {error_content}")
             
-            raise Exception(f"Provider returned status code {response.status_code}: {error_content}")
+            raise ProviderHTTPError(response.status_code, error_content, self._get_retry_after(response))
+
+    @staticmethod
+    def _get_retry_after(response) -> Optional[float]:
+        """Read the Retry-After header of an error response, tolerating mocked responses."""
+        try:
+            return parse_retry_after(response.headers.get("retry-after"))
+        except (AttributeError, TypeError):
+            return None
 
     async def execute_stream(self, prompt_obj: 'PromptObject') -> AsyncIterator[Dict[str, Any]]:
         """
         Execute a streaming content generation request through the pipeline using a PromptObject.
         This method focuses only on streaming delivery, yielding raw chunks without accumulating content.
+        A cache hit replays the cached chunks; a completed cacheable stream is stored for replay.
+        Concurrent identical streams share one upstream stream, fanned out to every caller.
         
         Args:
             prompt_obj: The prompt object containing all necessary information
@@ -133,35 +276,123 @@ class ContentGenerationPipeline:
         Yields:
             Raw response chunks from the LLM provider as they become available
         """
-        # Build the final request directly from the prompt object using provider's method
-        final_request = self.provider.build_request(prompt_obj)
+        # Build the final request directly from the prompt object using provider's method,
+        # with the history fitted into the context window
+        final_request = self.context_window.fit_request(self.provider.build_request(prompt_obj))
         
         # Ensure stream is enabled in the request
         final_request["stream"] = True
         
-        logger.debug(f"Pipeline execute_stream - final_request sent to LLM: {final_request}")
+        logger.debug("Pipeline execute_stream - final_request sent to LLM: %s", final_request)
         
         # Determine the URL for content generation
         # TODO: Adjust endpoint as needed based on provider specifics
         url = f"{self.provider.base_url}/chat/completions"
+
+        cached_chunks = await self.response_cache.get_stream(final_request)
+        if cached_chunks is not None:
+            logger.debug("Pipeline execute_stream - replaying response cache entry")
+            for chunk in cached_chunks:
+                yield chunk
+            return
+
+        priority = getattr(prompt_obj, "priority", RequestPriority.INTERACTIVE)
+        if self._should_coalesce(final_request):
+            stream = self.single_flight.stream(
+                self._coalescing_key(final_request), lambda: self._stream_from_provider(url, final_request, priority)
+            )
+        else:
+            stream = self._stream_from_provider(url, final_request, priority)
+        async for chunk in stream:
+            yield chunk
+
+    async def _stream_from_provider(self, url: str, final_request: Dict[str, Any],
+                                    priority: RequestPriority = RequestPriority.INTERACTIVE
+                                    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream a content generation request from the provider, retrying transient failures.
+
+        Each attempt holds a rate limiter slot until the stream ends, and reports
+        its time to the first chunk as the latency.
+
+        Args:
+            url: Chat completions URL of the provider
+            final_request: The request body, with stream enabled
+            priority: Admission priority of the request
+
+        Yields:
+            Raw response chunks from the LLM provider as they become available
+        """
+        # Only cacheable streams keep their chunks, everything else streams through
+        recorded_chunks = [] if self.response_cache.is_cacheable(final_request) else None
         
-        # Use the stored client in the pipeline's stream method
-        async with self.client.stream("POST", url, json=final_request) as response:
-            async for line in response.aiter_lines():
-                # Process server-sent events format
-                line = line.strip()
-                if line.startswith("data: "):
-                    data_content = line[6:]  # Remove "data: " prefix
-                    if data_content == "[DONE]":
-                        break  # End of stream
-                    try:
-                        import json
-                        # Check if data_content is not empty before parsing
-                        if data_content and data_content.strip():
-                            parsed_data = json.loads(data_content)
-                            
-                            # Yield the raw chunk data
-                            yield parsed_data
-                    except json.JSONDecodeError:
-                        # If JSON parsing fails, just continue
-                        continue
+        # Retries before the first chunk are invisible to the caller. Once chunks were
+        # yielded, a retry replays the stream and skips what the caller already has,
+        # which is only safe for deterministic endpoints and therefore opt-in.
+        retries_before_first_chunk = 0
+        retries_after_first_chunk = 0
+        delivered = 0
+        while True:
+            received = 0
+            try:
+                # Use the stored client in the pipeline's stream method
+                async with self.rate_limiter.slot(final_request, priority) as slot, \
+                        self.client.stream("POST", url, **request_body_kwargs(
+                            self.client, final_request, self.request_encoder)) as response:
+                    await self._raise_for_stream_status(response)
+                    # Server-sent events are decoded from the raw bytes, up to the [DONE] sentinel
+                    async for parsed_data in iter_sse_json(response.aiter_bytes(), self.json_backend):
+                        received += 1
+                        if received == 1:
+                            slot.mark_first_response()
+                        if isinstance(parsed_data, dict) and parsed_data.get("usage"):
+                            slot.record_usage(self._total_tokens(parsed_data))
+                        if received <= delivered:
+                            continue
+
+                        # Yield the raw chunk data
+                        delivered += 1
+                        if recorded_chunks is not None:
+                            recorded_chunks.append(parsed_data)
+                        yield parsed_data
+                if recorded_chunks is not None:
+                    await self.response_cache.put_stream(final_request, recorded_chunks)
+                return
+            except Exception as e:
+                if delivered == 0:
+                    policy, attempt = self.retry_policy, retries_before_first_chunk
+                    retries_before_first_chunk += 1
+                else:
+                    policy, attempt = self.stream_resume_policy, retries_after_first_chunk
+                    retries_after_first_chunk += 1
+                if attempt >= policy.max_retries or not policy.is_retryable(e):
+                    raise
+                delay = policy.compute_delay(attempt, e)
+                logger.warning(f"Provider stream failed after {delivered} chunks ({e}); "
+                               f"retry {attempt + 1}/{policy.max_retries} in {delay:.2f}s")
+                await asyncio.sleep(delay)
+
+    @staticmethod
+    def _total_tokens(response: Any) -> Optional[int]:
+        """Total tokens the provider reported for a response or final stream chunk, if any."""
+        if not isinstance(response, dict):
+            return None
+        return (response.get("usage") or {}).get("total_tokens")
+
+    async def _raise_for_stream_status(self, response):
+        """
+        Raise for an error status on a streaming response.
+
+        Args:
+            response: The streaming response
+
+        Raises:
+            ProviderHTTPError: If the provider returned an error status
+        """
+        status_code = getattr(response, "status_code", None)
+        if not isinstance(status_code, int) or status_code == 200:
+            return
+        error_content = None
+        if hasattr(response, "aread"):
+            error_content = (await response.aread()).decode("utf-8", errors="replace")
+        raise ProviderHTTPError(status_code, error_content, self._get_retry_after(response))
@@ -72,6 +72,29 @@ class BaseProvider(ABC):
         """
         pass
 
+    async def prewarm_connections(self) -> int:
+        """
+        Open connections to the provider ahead of the first request.
+
+        Providers without network connections keep this default.
+
+        Returns:
+            Number of connections that were established
+        """
+        return 0
+
+    async def check_health(self) -> bool:
+        """
+        Check whether the provider is currently able to serve requests.
+
+        Used by the router provider to reinstate ejected backends. Providers
+        without a cheap way to check keep this default.
+
+        Returns:
+            True if the provider is healthy
+        """
+        return True
+
     @abstractmethod
     async def get_model_info(self, model_name: str) -> Dict[str, Any]:
         """
@@ -257,19 +257,26 @@ class MockProvider(BaseProvider):
 
                         return chunks
 
+                    @property
+                    def status_code(self):
+                        """Status code of the stream, 500 when simulating an error."""
+                        return 500 if self.provider.should_error else self.provider.status_code
+
                     async def __aenter__(self):
+                        # Simulate the delay until the response headers arrive
+                        await asyncio.sleep(self.provider.response_delay)
                         return self
 
                     async def __aexit__(self, exc_type, exc_val, exc_tb):
                         pass
 
-                    async def aiter_lines(self):
-                        """Async iterator for streaming lines, similar to httpx."""
+                    async def aiter_bytes(self):
+                        """Async iterator over the raw server-sent events body, similar to httpx."""
                         for chunk in self._content_chunks:
                             import json
-                            yield f"data: {json.dumps(chunk)}"
+                            yield f"data: {json.dumps(chunk)}\n\n".encode()
                         # Yield the DONE signal
-                        yield "data: [DONE]"
+                        yield b"data: [DONE]\n\n"
 
                 return MockStream(self.provider, json)
 
@@ -350,6 +357,16 @@ class MockProvider(BaseProvider):
         """
         self.tool_calls = tool_calls
 
+    async def check_health(self) -> bool:
+        """
+        Simulate a health check with the configured delay and error behavior.
+
+        Returns:
+            False if the provider is configured to return errors
+        """
+        await asyncio.sleep(self.response_delay)
+        return not self.should_error
+
     async def get_model_info(self, model_name: str) -> Dict[str, Any]:
         """
         Get information about a specific model (mock implementation).
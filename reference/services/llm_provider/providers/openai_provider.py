@@ -8,6 +8,8 @@ import httpx
 from typing import Dict, Any
 from gcs_kernel.models import PromptObject
 from services.llm_provider.providers.base_provider import BaseProvider
+from services.llm_provider.http_pool import get_provider_client_pool
+from services.llm_provider.single_flight import SingleFlight
 from .openai_converter import OpenAIConverter
 
 
@@ -37,6 +39,8 @@ class OpenAIProvider(BaseProvider):
         
         # Initialize the converter for this provider
         self._converter = OpenAIConverter(self.model)
+        # Concurrent lookups of the same model share one probe
+        self._model_info_flights = SingleFlight()
     
     @property
     def converter(self):
@@ -64,12 +68,31 @@ class OpenAIProvider(BaseProvider):
     
     def build_client(self):
         """
-        Build the OpenAI API client.
+        Get the OpenAI API client from the shared provider client pool.
         
         Returns:
-            Initialized httpx.AsyncClient instance
+            Pooled httpx.AsyncClient instance, owned by the pool
         """
-        return httpx.AsyncClient(timeout=self.timeout, headers=self.build_headers())
+        return get_provider_client_pool().get_client(self.base_url, self.build_headers(), self.timeout)
+
+    async def prewarm_connections(self) -> int:
+        """
+        Open pooled connections to the OpenAI API ahead of the first request.
+
+        Returns:
+            Number of connections that were established
+        """
+        return await get_provider_client_pool().prewarm(self.base_url, self.build_headers(), self.timeout)
+
+    async def check_health(self) -> bool:
+        """
+        Check that the OpenAI-compatible API answers its models endpoint.
+
+        Returns:
+            True if the endpoint returned status 200
+        """
+        response = await self.build_client().get(f"{self.base_url}/models")
+        return response.status_code == 200
     
     def build_request(self, prompt_obj: 'PromptObject') -> Dict[str, Any]:
         """
@@ -82,13 +105,14 @@ class OpenAIProvider(BaseProvider):
             Request with OpenAI-specific format and features
         """
         # Start with the messages from the prompt object
-        # OpenAI-compliant: messages should contain the complete conversation history
-        messages = prompt_obj.conversation_history.copy()
+        # OpenAI-compliant: messages should contain the complete conversation history.
+        # The history's messages are read-only and shared, only the list is built here.
+        messages = list(prompt_obj.conversation_history)
         
         # Log the messages for debugging to see if system message is present
         import logging
         logger = logging.getLogger(__name__)
-        logger.debug(f"OpenAIProvider build_request - conversation history: {messages}")
+        logger.debug("OpenAIProvider build_request - conversation history: %s", messages)
         
         # Create the OpenAI request from the prompt object fields
         openai_request = {
@@ -130,6 +154,7 @@ class OpenAIProvider(BaseProvider):
         """
         Get information about a specific model by querying the OpenAI API.
         This includes model capabilities like maximum context length.
+        Concurrent lookups of the same model share one request.
         
         Args:
             model_name: Name of the model to get information for
@@ -137,99 +162,107 @@ class OpenAIProvider(BaseProvider):
         Returns:
             Dictionary containing model information including capabilities
         """
-        import httpx
+        return await self._model_info_flights.call(model_name, lambda: self._fetch_model_info(model_name))
+
+    async def _fetch_model_info(self, model_name: str) -> Dict[str, Any]:
+        """
+        Query the models endpoint for a model's information.
+
+        Args:
+            model_name: Name of the model to get information for
+
+        Returns:
+            Dictionary containing model information including capabilities
+        """
         import logging
         logger = logging.getLogger(__name__)
 
-        # Build headers for the request
-        headers = self.build_headers()
-
         # Use the models endpoint to get information about the model
         url = f"{self.base_url}/models/{model_name}"
         
         try:
-            # Create a temporary client for this request
-            async with httpx.AsyncClient(timeout=self.timeout, headers=headers) as client:
-                response = await client.get(url)
+            # Reuse the pooled client instead of paying a new handshake per lookup
+            client = self.build_client()
+            response = await client.get(url)
+            
+            if response.status_code == 200:
+                model_data = response.json()
+                logger.info(f"Successfully retrieved model info for {model_name}")
                 
-                if response.status_code == 200:
-                    model_data = response.json()
-                    logger.info(f"Successfully retrieved model info for {model_name}")
-                    
-                    # Extract max context length - some OpenAI API responses include this information
-                    # In the future, we could also make a separate call to model-specific endpoints
-                    # that provide more detailed information including context window size
-                    max_context_length = None
-                    
-                    # Some OpenAI API responses include context length in various fields
-                    # Check for different possible field names (including the VLLM response format like Qwen3)
-                    if 'max_model_len' in model_data:
-                        # VLLM and many other backends use this field name
-                        max_context_length = model_data['max_model_len']
-                    elif 'max_context_length' in model_data:
-                        max_context_length = model_data['max_context_length']
-                    elif 'max_input_tokens' in model_data:
-                        max_context_length = model_data['max_input_tokens']
-                    
-                    # Here we go!!!!  The first Adaptive Loop in the system!
-                    # If we couldn't extract from the API, use the AI service to determine the value
-                    # This pattern allows us to adaptively learn about new models without hardcoding values
-                    # increasing the capabilities of the system over time, if we were to keep track
-                    # of these adaptively learned values in a persistent store.
-                    if max_context_length is None:
-                        # Prepare context for AI processing
-                        context_data = {
-                            "model_response": model_data,
-                            "model_name": model_name,
-                            "missing_field": "max_context_length",
-                            "possible_field_names": [
-                                "max_model_len", "max_context_length", "context_length",
-                                "max_tokens", "max_input_tokens", "max_seq_len", "max_position_embeddings"
-                            ]
-                        }
-
-                        # Use the adaptive loop service if available
-                        if hasattr(self, 'adaptive_loop_service') and self.adaptive_loop_service:
-                            ai_suggested_value = await self.adaptive_loop_service.adapt_async(
-                                context=context_data,
-                                problem_description=f"Find the maximum context length field in the model response for {model_name}",
-                                fallback_value=4096  # Default fallback
-                            )
-                            logger.info(f"AI suggested max_context_length: {ai_suggested_value}")
-                            max_context_length = ai_suggested_value
-                        else:
-                            # If adaptive loop service is not available, use intelligent defaults as fallback
-                            if 'gpt-4-turbo' in model_name or 'gpt-4o' in model_name:
-                                max_context_length = 128000
-                            elif 'gpt-4' in model_name:
-                                max_context_length = 128000
-                            elif 'gpt-3.5-turbo' in model_name:
-                                max_context_length = 16384
-                            else:
-                                max_context_length = 4096  # Default fallback
-    
-                    # Extract relevant information from the model data
-                    # TODO: Yes, we can and should use the adaptive loop for all the fields
-                    result = {
-                        'id': model_data.get('id'),
-                        'object': model_data.get('object'),
-                        'created': model_data.get('created'),
-                        'owned_by': model_data.get('owned_by'),
-                        'max_context_length': max_context_length,
-                        'capabilities': {
-                            # Additional capabilities could be included here
-                        }
+                # Extract max context length - some OpenAI API responses include this information
+                # In the future, we could also make a separate call to model-specific endpoints
+                # that provide more detailed information including context window size
+                max_context_length = None
+                
+                # Some OpenAI API responses include context length in various fields
+                # Check for different possible field names (including the VLLM response format like Qwen3)
+                if 'max_model_len' in model_data:
+                    # VLLM and many other backends use this field name
+                    max_context_length = model_data['max_model_len']
+                elif 'max_context_length' in model_data:
+                    max_context_length = model_data['max_context_length']
+                elif 'max_input_tokens' in model_data:
+                    max_context_length = model_data['max_input_tokens']
+                
+                # Here we go!!!!  The first Adaptive Loop in the system!
+                # If we couldn't extract from the API, use the AI service to determine the value
+                # This pattern allows us to adaptively learn about new models without hardcoding values
+                # increasing the capabilities of the system over time, if we were to keep track
+                # of these adaptively learned values in a persistent store.
+                if max_context_length is None:
+                    # Prepare context for AI processing
+                    context_data = {
+                        "model_response": model_data,
+                        "model_name": model_name,
+                        "missing_field": "max_context_length",
+                        "possible_field_names": [
+                            "max_model_len", "max_context_length", "context_length",
+                            "max_tokens", "max_input_tokens", "max_seq_len", "max_position_embeddings"
+                        ]
                     }
-                    return result
-                else:
-                    logger.error(f"Failed to retrieve model info: {response.status_code} - {response.text}")
-                    # Return default info with the fallback value from settings
-                    from common.settings import settings
-                    return {
-                        'id': model_name,
-                        'max_context_length': settings.llm_max_tokens,
-                        'capabilities': {}
+
+                    # Use the adaptive loop service if available
+                    if hasattr(self, 'adaptive_loop_service') and self.adaptive_loop_service:
+                        ai_suggested_value = await self.adaptive_loop_service.adapt_async(
+                            context=context_data,
+                            problem_description=f"Find the maximum context length field in the model response for {model_name}",
+                            fallback_value=4096  # Default fallback
+                        )
+                        logger.info(f"AI suggested max_context_length: {ai_suggested_value}")
+                        max_context_length = ai_suggested_value
+                    else:
+                        # If adaptive loop service is not available, use intelligent defaults as fallback
+                        if 'gpt-4-turbo' in model_name or 'gpt-4o' in model_name:
+                            max_context_length = 128000
+                        elif 'gpt-4' in model_name:
+                            max_context_length = 128000
+                        elif 'gpt-3.5-turbo' in model_name:
+                            max_context_length = 16384
+                        else:
+                            max_context_length = 4096  # Default fallback
+
+                # Extract relevant information from the model data
+                # TODO: Yes, we can and should use the adaptive loop for all the fields
+                result = {
+                    'id': model_data.get('id'),
+                    'object': model_data.get('object'),
+                    'created': model_data.get('created'),
+                    'owned_by': model_data.get('owned_by'),
+                    'max_context_length': max_context_length,
+                    'capabilities': {
+                        # Additional capabilities could be included here
                     }
+                }
+                return result
+            else:
+                logger.error(f"Failed to retrieve model info: {response.status_code} - {response.text}")
+                # Return default info with the fallback value from settings
+                from common.settings import settings
+                return {
+                    'id': model_name,
+                    'max_context_length': settings.llm_max_tokens,
+                    'capabilities': {}
+                }
         except Exception as e:
             logger.error(f"Error retrieving model info for {model_name}: {str(e)}")
             # Return default info with the fallback value from settings
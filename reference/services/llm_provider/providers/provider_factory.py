@@ -4,11 +4,12 @@ Provider Factory for GCS Kernel LLM Provider Backend.
 This module implements the provider factory following Qwen Code patterns.
 """
 
-from typing import Dict, Any, Type
+from typing import Dict, Any, List, Type
 from common.settings import settings
 from services.llm_provider.providers.base_provider import BaseProvider
 from services.llm_provider.providers.openai_provider import OpenAIProvider
 from services.llm_provider.providers.mock_provider import MockProvider
+from services.llm_provider.providers.router_provider import RouterBackend, RouterProvider
 
 
 class ProviderFactory:
@@ -20,6 +21,7 @@ class ProviderFactory:
         self.providers: Dict[str, Type[BaseProvider]] = {
             "openai": OpenAIProvider,
             "mock": MockProvider,
+            "router": RouterProvider,
         }
     
     def register_provider(self, name: str, provider_class: Type[BaseProvider]):
@@ -50,6 +52,10 @@ class ProviderFactory:
         if provider_type not in self.providers:
             raise ValueError(f"Provider type '{provider_type}' is not registered")
         
+        if provider_type == "router":
+            config = {**config, "backends": self.create_router_backends(config.get("backends") or [],
+                                                                        adaptive_loop_service)}
+
         provider_class = self.providers[provider_type]
         provider = provider_class(config)
         
@@ -58,6 +64,39 @@ class ProviderFactory:
             provider.set_adaptive_error_service(adaptive_loop_service)
             
         return provider
+
+    def create_router_backends(self, specs: List[Any], adaptive_loop_service=None) -> List[RouterBackend]:
+        """
+        Create the backends of a router provider.
+
+        Args:
+            specs: Backends as RouterBackend or provider instances, or as configuration
+                   dictionaries with a provider "type" (default "openai"), an optional
+                   "name" and "model_map", and the provider's own configuration keys
+            adaptive_loop_service: Optional adaptive loop service
+
+        Returns:
+            The router backends
+
+        Raises:
+            ValueError: If a backend's provider type is not registered or is "router"
+        """
+        backends = []
+        for spec in specs:
+            if isinstance(spec, RouterBackend):
+                backends.append(spec)
+            elif isinstance(spec, BaseProvider):
+                backends.append(RouterBackend(spec))
+            else:
+                spec = dict(spec)
+                provider_type = spec.pop("type", "openai")
+                if provider_type == "router":
+                    raise ValueError("Router backends cannot be routers themselves")
+                name = spec.pop("name", "")
+                model_map = spec.pop("model_map", None) or {}
+                provider = self.create_provider(provider_type, spec, adaptive_loop_service)
+                backends.append(RouterBackend(provider, name=name, model_map=model_map))
+        return backends
     
     def create_provider_from_settings(self, adaptive_loop_service=None) -> BaseProvider:
         """
@@ -98,6 +137,16 @@ class ProviderFactory:
         if llm_config.llm_max_retries:
             config["max_retries"] = llm_config.llm_max_retries
             
+        if provider_type == "router":
+            # Backends inherit the top-level settings they do not override
+            specs = [{**config, **backend} for backend in llm_config.llm_router_backends]
+            if not specs:
+                raise ValueError("The router provider requires LLM_ROUTER_BACKENDS")
+            if not all(spec.get("api_key") or spec.get("type") == "mock" for spec in specs):
+                raise ValueError("API key is required but not provided for every router backend")
+            return self.create_provider("router", {"model": config.get("model"), "backends": specs},
+                                        adaptive_loop_service)
+
         # Validate required configuration
         if not config["api_key"]:
             raise ValueError("API key is required but not provided in environment variables")
@@ -0,0 +1,574 @@
+"""
+Router Provider for GCS Kernel LLM Provider Backend.
+
+This module implements a provider that spreads requests over several
+configured providers. Each backend's latency and error rate are tracked
+as exponentially weighted moving averages (EWMA). Every request compares
+two randomly picked healthy backends ("power of two choices") and goes to
+the one with the lower expected cost. This keeps a slow or degraded
+endpoint from dragging down overall latency without herding every request
+onto a single backend. Requests failing with a transient error fail over
+to the next backend. Backends failing repeatedly are ejected until a
+health check finds them working again.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import httpx
+
+from common.settings import settings
+from gcs_kernel.models import PromptObject
+from services.llm_provider.providers.base_provider import BaseProvider
+from services.llm_provider.request_encoder import RequestEncoder, request_body_kwargs
+from services.llm_provider.retry import RETRYABLE_STATUS_CODES
+
+logger = logging.getLogger(__name__)
+
+# Connection-level failures of one backend, worth trying another backend for
+FAILOVER_ERRORS = (httpx.TransportError, ConnectionError, asyncio.TimeoutError)
+
+
+@dataclass
+class RouterConfig:
+    """Routing, failover and health check settings of the router provider."""
+    health_check_interval: float = 10.0  # Seconds between health checks (0 disables them)
+    health_check_timeout: float = 5.0
+    failure_threshold: int = 3  # Consecutive failures that eject a backend
+    ejection_time: float = 30.0  # Seconds an ejected backend is skipped unless a health check passes
+    latency_smoothing: float = 0.3  # Weight of the newest latency sample in the EWMA
+    error_smoothing: float = 0.3  # Weight of the newest outcome in the error rate EWMA
+    idle_decay_half_life: float = 30.0  # Latency of a backend without new samples halves this often
+
+    @classmethod
+    def from_settings(cls) -> "RouterConfig":
+        """Build the router configuration from the global settings."""
+        return cls(
+            health_check_interval=settings.llm_router_health_check_interval,
+            failure_threshold=settings.llm_router_failure_threshold,
+            ejection_time=settings.llm_router_ejection_time,
+        )
+
+
+@dataclass(eq=False)
+class RouterBackend:
+    """One provider behind the router and what was observed about it."""
+    provider: BaseProvider
+    name: str = ""
+    # Model names the kernel requests, mapped to this backend's names for them.
+    # Unmapped names are replaced with the provider's configured model.
+    model_map: Dict[str, str] = field(default_factory=dict)
+    client: Any = None
+    latency: Optional[float] = None  # EWMA of successful request latency in seconds
+    last_sample_at: float = 0.0
+    error_rate: float = 0.0  # EWMA of failed requests (1) and successful ones (0)
+    in_flight: int = 0
+    consecutive_failures: int = 0
+    ejected_until: float = 0.0
+    requests: int = 0
+    failures: int = 0
+    failovers: int = 0
+
+    def __post_init__(self):
+        """Name the backend after its endpoint unless a name was given."""
+        self.name = self.name or self.provider.base_url
+
+    def map_model(self, model: Optional[str]) -> str:
+        """
+        Get this backend's name for a model the kernel requested.
+
+        Args:
+            model: Model name of the request
+
+        Returns:
+            The mapped model name, or the provider's configured model if there is no mapping
+        """
+        return self.model_map.get(model, self.provider.model)
+
+    def is_ejected(self, now: float) -> bool:
+        """Check whether the backend is currently ejected from routing."""
+        return now < self.ejected_until
+
+    def cost(self, now: float, config: RouterConfig) -> float:
+        """
+        Expected cost of sending one more request to this backend.
+
+        The latency EWMA decays while no samples arrive, so a backend that
+        was slow once is retried eventually. It is scaled by the requests
+        already in flight and penalized by the error rate.
+
+        Args:
+            now: Current monotonic time
+            config: Router configuration
+
+        Returns:
+            Relative cost, lower is better (0 for a backend without samples yet)
+        """
+        if self.latency is None:
+            return 0.0
+        idle = max(0.0, now - self.last_sample_at)
+        latency = self.latency * 0.5 ** (idle / config.idle_decay_half_life)
+        return latency * (self.in_flight + 1) / max(1.0 - self.error_rate, 0.05)
+
+
+class RoutingClient:
+    """
+    Client fanning requests out to the backends of a router provider.
+
+    Offers the post() and stream() calls of an httpx.AsyncClient used by the
+    content generation pipeline. Requests are sent to the backend the router
+    picks, with the model name mapped and the URL rebased onto the backend's
+    endpoint.
+    """
+
+    def __init__(self, router: "RouterProvider"):
+        """
+        Initialize the client.
+
+        Args:
+            router: The router provider choosing the backends
+        """
+        self.router = router
+
+    async def post(self, url: str, json: Optional[Dict[str, Any]] = None, **kwargs) -> Any:
+        """
+        Send a request, failing over to other backends on transient errors.
+
+        Args:
+            url: Request URL under the router's base URL
+            json: Request body
+            **kwargs: Passed on to the backend client
+
+        Returns:
+            The first response that is not a transient error, or the last backend's response
+        """
+        candidates = self.router.candidates()
+        for index, backend in enumerate(candidates):
+            is_last = index == len(candidates) - 1
+            started = self.router.begin(backend)
+            try:
+                response = await backend.client.post(self.router.backend_url(backend, url),
+                                                     **self.router.request_body(backend, json), **kwargs)
+            except FAILOVER_ERRORS as e:
+                self.router.end(backend, started, failed=True)
+                if is_last:
+                    raise
+                self.router.fail_over(backend, e)
+                continue
+            except BaseException:
+                self.router.end(backend, started, failed=None)
+                raise
+
+            status_code = getattr(response, "status_code", 200)
+            if status_code in RETRYABLE_STATUS_CODES:
+                self.router.end(backend, started, failed=True)
+                if not is_last:
+                    self.router.fail_over(backend, f"status {status_code}")
+                    continue
+            else:
+                # Client errors say nothing about the backend's health
+                self.router.end(backend, started, failed=False if status_code < 400 else None)
+            return response
+
+    def stream(self, method: str, url: str, json: Optional[Dict[str, Any]] = None, **kwargs) -> "RoutedStream":
+        """
+        Open a streaming request on the backend the router picks.
+
+        Args:
+            method: HTTP method
+            url: Request URL under the router's base URL
+            json: Request body
+            **kwargs: Passed on to the backend client
+
+        Returns:
+            Async context manager entering the backend's streaming response
+        """
+        return RoutedStream(self.router, method, url, json, kwargs)
+
+
+class RoutedStream:
+    """
+    Streaming response of a routed request.
+
+    Fails over while opening the stream, that is until the response status
+    arrives. A stream failing after that is reported as a failure of its
+    backend and left to the pipeline's retries, which route it again.
+    """
+
+    def __init__(self, router: "RouterProvider", method: str, url: str,
+                 json: Optional[Dict[str, Any]], kwargs: Dict[str, Any]):
+        """Initialize the stream without opening it."""
+        self.router = router
+        self.method = method
+        self.url = url
+        self.json = json
+        self.kwargs = kwargs
+        self._backend: Optional[RouterBackend] = None
+        self._stream = None
+        self._started = 0.0
+        self._failed: Optional[bool] = None
+
+    async def __aenter__(self):
+        """Open the stream on the first backend that does not fail with a transient error."""
+        candidates = self.router.candidates()
+        for index, backend in enumerate(candidates):
+            is_last = index == len(candidates) - 1
+            started = self.router.begin(backend)
+            stream = backend.client.stream(self.method, self.router.backend_url(backend, self.url),
+                                           **self.router.request_body(backend, self.json), **self.kwargs)
+            try:
+                response = await stream.__aenter__()
+            except FAILOVER_ERRORS as e:
+                self.router.end(backend, started, failed=True)
+                if is_last:
+                    raise
+                self.router.fail_over(backend, e)
+                continue
+            except BaseException:
+                self.router.end(backend, started, failed=None)
+                raise
+
+            status_code = getattr(response, "status_code", 200)
+            if isinstance(status_code, int) and status_code in RETRYABLE_STATUS_CODES and not is_last:
+                await stream.__aexit__(None, None, None)
+                self.router.end(backend, started, failed=True)
+                self.router.fail_over(backend, f"status {status_code}")
+                continue
+
+            self._backend, self._stream, self._started = backend, stream, started
+            self._failed = self._classify(status_code)
+            if self._failed is False:
+                # Time to the response headers is the stream's latency sample
+                self.router.record_latency(backend, time.monotonic() - started)
+            return response
+
+    @staticmethod
+    def _classify(status_code: Any) -> Optional[bool]:
+        """Whether a status is a failure of the backend (None for client errors)."""
+        if not isinstance(status_code, int) or status_code < 400:
+            return False
+        return True if status_code in RETRYABLE_STATUS_CODES else None
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Close the backend stream and record how it ended."""
+        try:
+            return await self._stream.__aexit__(exc_type, exc_val, exc_tb)
+        finally:
+            failed = self._failed
+            if isinstance(exc_val, FAILOVER_ERRORS):
+                failed = True
+            self.router.end(self._backend, self._started, failed=failed, record_latency=False)
+
+
+class RouterProvider(BaseProvider):
+    """
+    Provider routing requests over several providers by observed latency and error rate.
+
+    Requests are built by the first backend's provider, so all backends are
+    expected to speak the same (OpenAI-compatible) API. The model name of
+    each request is mapped per backend.
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        """
+        Initialize the router provider.
+
+        Args:
+            config: Dictionary containing provider configuration
+                    Additional options:
+                    - backends: Providers to route over, as RouterBackend or BaseProvider instances
+                    - router_config: RouterConfig (defaults to the global settings)
+        """
+        backends: Sequence[Union[RouterBackend, BaseProvider]] = config.get("backends") or []
+        if not backends:
+            raise ValueError("The router provider needs at least one backend")
+        self.backends: List[RouterBackend] = [
+            backend if isinstance(backend, RouterBackend) else RouterBackend(backend) for backend in backends
+        ]
+        primary = self.backends[0].provider
+        config = {
+            "model": primary.model,
+            "base_url": "router://" + ",".join(backend.name for backend in self.backends),
+            "timeout": primary.timeout,
+            "max_retries": primary.max_retries,
+            **{key: value for key, value in config.items() if value is not None},
+        }
+        super().__init__(config)
+
+        self.router_config: RouterConfig = config.get("router_config") or RouterConfig.from_settings()
+        self.random = random.Random()
+        # Shared by the backends: a message is encoded the same for all of them
+        self.request_encoder = RequestEncoder()
+        self._health_task: Optional[asyncio.Task] = None
+
+    @property
+    def converter(self):
+        """The converter of the first backend, shared by all backends."""
+        return self.backends[0].provider.converter
+
+    def build_headers(self) -> Dict[str, str]:
+        """
+        Build headers for API requests.
+
+        Returns:
+            The first backend's headers (each backend's client sends its own)
+        """
+        return self.backends[0].provider.build_headers()
+
+    def build_client(self) -> RoutingClient:
+        """
+        Build the routing client, along with the client of every backend.
+
+        Returns:
+            Client sending each request to the backend the router picks
+        """
+        for backend in self.backends:
+            if backend.client is None:
+                backend.client = backend.provider.build_client()
+        return RoutingClient(self)
+
+    def build_request(self, prompt_obj: 'PromptObject') -> Dict[str, Any]:
+        """
+        Build the request from a PromptObject with the first backend's provider.
+
+        Args:
+            prompt_obj: The PromptObject containing all necessary information
+
+        Returns:
+            Request for the router's model name, mapped per backend when it is sent
+        """
+        request = self.backends[0].provider.build_request(prompt_obj)
+        request["model"] = self.model
+        return request
+
+    async def prewarm_connections(self) -> int:
+        """
+        Open connections to every backend ahead of the first request.
+
+        Returns:
+            Number of connections that were established
+        """
+        results = await asyncio.gather(*(backend.provider.prewarm_connections() for backend in self.backends),
+                                       return_exceptions=True)
+        return sum(result for result in results if isinstance(result, int))
+
+    async def check_health(self) -> bool:
+        """
+        Check every backend's health now.
+
+        Returns:
+            True if at least one backend is healthy
+        """
+        results = await asyncio.gather(*(self._check_backend(backend) for backend in self.backends))
+        return any(results)
+
+    async def get_model_info(self, model_name: str) -> Dict[str, Any]:
+        """
+        Get information about a model from every backend.
+
+        Any backend may serve a request, so the smallest context length
+        reported by the backends is the one the kernel can rely on.
+
+        Args:
+            model_name: Name of the model to get information for
+
+        Returns:
+            Dictionary containing model information including capabilities
+
+        Raises:
+            Exception: The first backend's error if no backend returned information
+        """
+        results = await asyncio.gather(
+            *(backend.provider.get_model_info(backend.map_model(model_name)) for backend in self.backends),
+            return_exceptions=True,
+        )
+        infos = [result for result in results if isinstance(result, dict)]
+        if not infos:
+            raise results[0]
+        info = dict(infos[0])
+        context_lengths = [entry["max_context_length"] for entry in infos if entry.get("max_context_length")]
+        if context_lengths:
+            info["max_context_length"] = min(context_lengths)
+        info["id"] = model_name
+        return info
+
+    def candidates(self) -> List[RouterBackend]:
+        """
+        Order the backends to try for a request.
+
+        The first is the cheaper of two healthy backends picked at random.
+        The remaining healthy backends follow by cost as failover targets,
+        then the ejected ones as a last resort.
+
+        Returns:
+            Every backend, in the order to try them
+        """
+        self._ensure_health_checks()
+        now = time.monotonic()
+        config = self.router_config
+        healthy = [backend for backend in self.backends if not backend.is_ejected(now)]
+        ejected = [backend for backend in self.backends if backend.is_ejected(now)]
+        ordered: List[RouterBackend] = []
+        if len(healthy) >= 2:
+            first, second = self.random.sample(healthy, 2)
+            chosen = first if first.cost(now, config) <= second.cost(now, config) else second
+            ordered.append(chosen)
+            healthy.remove(chosen)
+        ordered.extend(sorted(healthy, key=lambda backend: backend.cost(now, config)))
+        ordered.extend(sorted(ejected, key=lambda backend: backend.ejected_until))
+        return ordered
+
+    def backend_url(self, backend: RouterBackend, url: str) -> str:
+        """Rebase a URL under the router's base URL onto a backend's endpoint."""
+        if url.startswith(self.base_url):
+            url = url[len(self.base_url):]
+        return f"{backend.provider.base_url}{url}"
+
+    @staticmethod
+    def map_request(backend: RouterBackend, request: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Copy a request body with the model name mapped for a backend."""
+        if not isinstance(request, dict):
+            return request
+        model = backend.map_model(request.get("model"))
+        if model == request.get("model"):
+            return request
+        return {**request, "model": model}
+
+    def request_body(self, backend: RouterBackend, request: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Keyword arguments sending a request body to a backend, with the model name mapped."""
+        return request_body_kwargs(backend.client, self.map_request(backend, request), self.request_encoder)
+
+    def begin(self, backend: RouterBackend) -> float:
+        """
+        Record that a request was sent to a backend.
+
+        Returns:
+            Start time of the request
+        """
+        backend.in_flight += 1
+        backend.requests += 1
+        return time.monotonic()
+
+    def end(self, backend: RouterBackend, started: float, failed: Optional[bool], record_latency: bool = True):
+        """
+        Record how a request to a backend ended.
+
+        Args:
+            backend: The backend
+            started: Start time returned by begin()
+            failed: True for transient failures, False for successes and
+                    None for outcomes that say nothing about the backend
+            record_latency: Whether a success updates the latency EWMA
+        """
+        backend.in_flight -= 1
+        if failed is None:
+            return
+        if failed:
+            self.record_failure(backend)
+        else:
+            if record_latency:
+                self.record_latency(backend, time.monotonic() - started)
+            backend.consecutive_failures = 0
+            backend.error_rate *= 1.0 - self.router_config.error_smoothing
+
+    def record_latency(self, backend: RouterBackend, latency: float):
+        """Fold a successful request's latency into a backend's EWMA."""
+        smoothing = self.router_config.latency_smoothing
+        if backend.latency is None:
+            backend.latency = latency
+        else:
+            backend.latency += smoothing * (latency - backend.latency)
+        backend.last_sample_at = time.monotonic()
+
+    def record_failure(self, backend: RouterBackend):
+        """Count a transient failure of a backend, ejecting it after too many in a row."""
+        config = self.router_config
+        backend.failures += 1
+        backend.consecutive_failures += 1
+        backend.error_rate += config.error_smoothing * (1.0 - backend.error_rate)
+        if backend.consecutive_failures >= config.failure_threshold and not backend.is_ejected(time.monotonic()):
+            backend.ejected_until = time.monotonic() + config.ejection_time
+            logger.warning(f"Ejecting LLM backend {backend.name} after {backend.consecutive_failures} "
+                           f"consecutive failures")
+
+    def fail_over(self, backend: RouterBackend, reason: Any):
+        """Log and count a failover away from a backend."""
+        backend.failovers += 1
+        logger.warning(f"LLM backend {backend.name} failed ({reason}); failing over")
+
+    async def _check_backend(self, backend: RouterBackend) -> bool:
+        """
+        Run one backend's health check, ejecting or reinstating it.
+
+        Returns:
+            Whether the backend is healthy
+        """
+        try:
+            healthy = await asyncio.wait_for(backend.provider.check_health(),
+                                             self.router_config.health_check_timeout)
+        except Exception as e:
+            logger.debug(f"Health check of LLM backend {backend.name} failed: {e}")
+            healthy = False
+
+        if healthy:
+            if backend.is_ejected(time.monotonic()):
+                logger.info(f"LLM backend {backend.name} passed its health check; reinstating it")
+            backend.ejected_until = 0.0
+            backend.consecutive_failures = 0
+        elif not backend.is_ejected(time.monotonic()):
+            logger.warning(f"LLM backend {backend.name} failed its health check; ejecting it")
+            backend.ejected_until = time.monotonic() + self.router_config.ejection_time
+        return healthy
+
+    def _ensure_health_checks(self):
+        """Start the periodic health checks on the running event loop, once."""
+        if self.router_config.health_check_interval <= 0 or len(self.backends) < 2:
+            return
+        if self._health_task is not None and not self._health_task.done():
+            return
+        try:
+            self._health_task = asyncio.get_running_loop().create_task(self._health_check_loop())
+        except RuntimeError:
+            # No running loop (synchronous use); checks start with the first async request
+            pass
+
+    async def _health_check_loop(self):
+        """Check the backends' health periodically."""
+        while True:
+            await asyncio.sleep(self.router_config.health_check_interval)
+            await self.check_health()
+
+    async def close(self):
+        """Stop the periodic health checks."""
+        if self._health_task is not None:
+            self._health_task.cancel()
+            try:
+                await self._health_task
+            except asyncio.CancelledError:
+                pass
+            self._health_task = None
+
+    def get_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get what the router observed about each backend.
+
+        Returns:
+            Dictionary of backend names to their latency, error rate and counters
+        """
+        now = time.monotonic()
+        return {
+            backend.name: {
+                "latency_ewma": backend.latency,
+                "error_rate": round(backend.error_rate, 4),
+                "in_flight": backend.in_flight,
+                "requests": backend.requests,
+                "failures": backend.failures,
+                "failovers": backend.failovers,
+                "ejected": backend.is_ejected(now),
+            }
+            for backend in self.backends
+        }
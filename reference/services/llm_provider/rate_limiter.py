@@ -0,0 +1,459 @@
+"""
+Client-side rate limiting and adaptive concurrency for LLM provider requests.
+
+Nothing used to bound how fast requests went out, so a burst of turns ran
+straight into the provider's 429s. Each rejected request was then retried
+into the same overload. ProviderRateLimiter sits in front of every
+provider request and combines three mechanisms:
+
+- Token buckets for requests per minute and estimated tokens per minute,
+  which keep traffic under the provider's published quota.
+- An AIMD controller for the number of requests in flight. The limit is
+  halved when the provider answers 429/503 or latency spikes, and grows by
+  about one request per round of successful responses.
+- A priority queue. Requests that cannot start yet wait there, and
+  interactive turns are admitted before background work such as the
+  adaptive loop.
+"""
+
+import asyncio
+import heapq
+import itertools
+import json
+import logging
+import time
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, List, Optional
+
+from common.settings import settings
+from gcs_kernel.models import RequestPriority
+from services.llm_provider.retry import ProviderHTTPError
+
+logger = logging.getLogger(__name__)
+
+# Provider answers meaning "send less", which shrink the concurrency limit
+OVERLOAD_STATUS_CODES = frozenset({429, 503})
+
+# Admission order of the priorities, lowest first
+PRIORITY_ORDER = {RequestPriority.INTERACTIVE: 0, RequestPriority.BACKGROUND: 1}
+
+
+def estimate_request_tokens(request: Dict[str, Any]) -> int:
+    """
+    Estimate the tokens a provider counts against the per-minute token quota.
+
+    Providers charge the prompt plus the maximum completion up front, so the
+    estimate is the serialized prompt at about four characters per token plus
+    the request's completion limit.
+
+    Args:
+        request: The final request body sent to the provider
+
+    Returns:
+        Estimated token count
+    """
+    prompt_chars = len(json.dumps(request.get("messages") or [], separators=(",", ":")))
+    if request.get("tools"):
+        prompt_chars += len(json.dumps(request["tools"], separators=(",", ":")))
+    completion_tokens = request.get("max_tokens") or request.get("max_completion_tokens") or 0
+    return prompt_chars // 4 + completion_tokens
+
+
+class TokenBucket:
+    """Refills `rate` units per minute up to `capacity`, allowing bursts of up to the capacity."""
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        """
+        Initialize a full bucket.
+
+        Args:
+            rate_per_minute: Units added per minute (0 or less disables the bucket)
+            capacity: Largest burst (defaults to one minute's worth)
+        """
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self.level = self.capacity
+        self._updated = time.monotonic()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the bucket limits anything."""
+        return self.rate > 0
+
+    def _refill(self, now: float):
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def time_until_available(self, amount: float, now: float) -> float:
+        """
+        Seconds until `amount` units can be taken.
+
+        Args:
+            amount: Units needed (capped at the capacity, so oversized requests wait for a full bucket)
+            now: Current monotonic time
+
+        Returns:
+            0 if available now, otherwise the wait in seconds
+        """
+        if not self.enabled:
+            return 0.0
+        self._refill(now)
+        missing = min(amount, self.capacity) - self.level
+        return 0.0 if missing <= 0 else missing / self.rate
+
+    def consume(self, amount: float):
+        """Take units, possibly going into debt for requests larger than the capacity."""
+        if self.enabled:
+            self.level -= amount
+
+    def refund(self, amount: float):
+        """Return units that were charged but not used, or charge more when `amount` is negative."""
+        if self.enabled:
+            self.level = min(self.capacity, self.level + amount)
+
+
+class AIMDController:
+    """
+    Additive-increase/multiplicative-decrease limit on requests in flight.
+
+    Each successful response adds 1/limit, so the limit grows by about one per
+    round of responses. An overload answer or a latency spike multiplies it by
+    the backoff factor. Only responses to requests started after the last
+    decrease can decrease it again, so one burst of 429s halves the limit once
+    instead of collapsing it.
+    """
+
+    def __init__(self, initial: float, minimum: float = 1, maximum: float = 64,
+                 backoff: float = 0.5, latency_spike_factor: float = 3.0, latency_smoothing: float = 0.05,
+                 min_latency_samples: int = 10):
+        """
+        Initialize the controller.
+
+        Args:
+            initial: Starting limit
+            minimum: Smallest limit
+            maximum: Largest limit
+            backoff: Factor applied to the limit on overload
+            latency_spike_factor: A latency this many times the baseline counts as overload
+            latency_smoothing: Weight of each new sample in the baseline latency average
+            min_latency_samples: Samples needed before latency spikes are detected
+        """
+        self.minimum = minimum
+        self.maximum = maximum
+        self.limit = float(min(max(initial, minimum), maximum))
+        self.backoff = backoff
+        self.latency_spike_factor = latency_spike_factor
+        self.latency_smoothing = latency_smoothing
+        self.min_latency_samples = min_latency_samples
+        self.baseline_latency: Optional[float] = None
+        self.latency_samples = 0
+        self.last_decrease = float("-inf")
+
+    @property
+    def concurrency(self) -> int:
+        """Requests allowed in flight."""
+        return max(int(self.limit), 1)
+
+    def on_success(self, latency: float, started_at: float) -> bool:
+        """
+        Record a successful response.
+
+        Args:
+            latency: Seconds until the response (or first streamed chunk) arrived
+            started_at: Monotonic time the request was admitted
+
+        Returns:
+            True if the latency counted as a spike and decreased the limit
+        """
+        baseline = self.baseline_latency
+        spike = (baseline is not None and self.latency_samples >= self.min_latency_samples
+                 and latency > baseline * self.latency_spike_factor)
+        # Spikes move the baseline too, so a lasting slowdown soon stops counting as one
+        self.baseline_latency = latency if baseline is None else \
+            baseline + self.latency_smoothing * (latency - baseline)
+        self.latency_samples += 1
+        if spike:
+            return self.on_overload(started_at)
+        self.limit = min(self.maximum, self.limit + 1.0 / self.limit)
+        return False
+
+    def on_overload(self, started_at: float) -> bool:
+        """
+        Record an overload answer for a request admitted at `started_at`.
+
+        Returns:
+            True if the limit was decreased
+        """
+        if started_at < self.last_decrease:
+            return False
+        self.limit = max(self.minimum, self.limit * self.backoff)
+        self.last_decrease = time.monotonic()
+        return True
+
+
+@dataclass
+class RateLimiterConfig:
+    """Quotas and concurrency bounds of a provider's rate limiter."""
+    enabled: bool = True
+    requests_per_minute: float = 0
+    tokens_per_minute: float = 0
+    initial_concurrency: int = 16
+    min_concurrency: int = 1
+    max_concurrency: int = 64
+    latency_spike_factor: float = 3.0
+
+    @classmethod
+    def from_settings(cls) -> "RateLimiterConfig":
+        """Build the limiter configuration from the global settings."""
+        return cls(
+            enabled=settings.llm_rate_limit_enabled,
+            requests_per_minute=settings.llm_requests_per_minute,
+            tokens_per_minute=settings.llm_tokens_per_minute,
+            initial_concurrency=settings.llm_initial_concurrency,
+            min_concurrency=settings.llm_min_concurrency,
+            max_concurrency=settings.llm_max_concurrency,
+            latency_spike_factor=settings.llm_latency_spike_factor,
+        )
+
+
+@dataclass
+class RateLimiterMetrics:
+    """Counters describing how requests were admitted."""
+    admitted: int = 0
+    admitted_background: int = 0
+    queued: int = 0
+    overloads: int = 0
+    latency_spikes: int = 0
+    limit_decreases: int = 0
+    queue_wait_seconds: float = 0.0
+
+
+@dataclass(order=True)
+class _Waiter:
+    priority: int
+    sequence: int
+    tokens: int
+    future: asyncio.Future
+    queued_at: float
+
+
+class RequestSlot:
+    """
+    Async context manager holding one admitted provider request.
+
+    Entering waits for admission. Leaving reports the outcome to the
+    concurrency controller: success with its latency, overload for a 429/503
+    ProviderHTTPError, or nothing for other failures. The slot is then
+    released.
+    """
+
+    def __init__(self, limiter: "ProviderRateLimiter", tokens: int, priority: RequestPriority):
+        self.limiter = limiter
+        self.tokens = tokens
+        self.priority = priority
+        self.admitted_at: Optional[float] = None
+        self.latency: Optional[float] = None
+
+    async def __aenter__(self) -> "RequestSlot":
+        await self.limiter._admit(self)
+        self.admitted_at = time.monotonic()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.limiter._release(self, exc)
+        return False
+
+    def mark_first_response(self):
+        """Record the latency now, for streams whose slot is held until they end."""
+        if self.latency is None and self.admitted_at is not None:
+            self.latency = time.monotonic() - self.admitted_at
+
+    def record_usage(self, used_tokens: Optional[int]):
+        """
+        Correct the token bucket with the usage the provider reported.
+
+        Args:
+            used_tokens: Total tokens of the request according to the provider
+        """
+        if used_tokens is not None:
+            self.limiter.token_bucket.refund(self.tokens - used_tokens)
+
+
+class ProviderRateLimiter:
+    """Admits requests to one provider within its quotas and adaptive concurrency limit."""
+
+    def __init__(self, config: Optional[RateLimiterConfig] = None):
+        """
+        Initialize the limiter.
+
+        Args:
+            config: Quotas and concurrency bounds (defaults to the global settings)
+        """
+        self.config = config or RateLimiterConfig.from_settings()
+        self.request_bucket = TokenBucket(self.config.requests_per_minute)
+        self.token_bucket = TokenBucket(self.config.tokens_per_minute)
+        self.controller = AIMDController(
+            initial=self.config.initial_concurrency,
+            minimum=self.config.min_concurrency,
+            maximum=self.config.max_concurrency,
+            latency_spike_factor=self.config.latency_spike_factor,
+        )
+        self.metrics = RateLimiterMetrics()
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self._queue: List[_Waiter] = []
+        self._sequence = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._timer_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._timer_due = 0.0
+
+    def slot(self, request: Dict[str, Any],
+             priority: RequestPriority = RequestPriority.INTERACTIVE) -> RequestSlot:
+        """
+        Get a slot for a provider request, to be entered with `async with`.
+
+        Args:
+            request: The final request body, used to estimate its tokens
+            priority: Admission priority of the request
+
+        Returns:
+            The request's slot
+        """
+        tokens = estimate_request_tokens(request) if self.token_bucket.enabled else 0
+        return RequestSlot(self, tokens, priority)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get admission counters and the current limits.
+
+        Returns:
+            Dictionary of metric names to values
+        """
+        metrics = asdict(self.metrics)
+        metrics.update(
+            concurrency_limit=self.controller.concurrency,
+            in_flight=self.in_flight,
+            waiting=sum(1 for waiter in self._queue if not waiter.future.done()),
+            baseline_latency=self.controller.baseline_latency,
+        )
+        return metrics
+
+    async def _admit(self, slot: RequestSlot):
+        """Wait until the slot's request may be sent."""
+        if not self.config.enabled:
+            return
+        loop = asyncio.get_running_loop()
+        waiter = _Waiter(PRIORITY_ORDER.get(slot.priority, 0), next(self._sequence), slot.tokens,
+                         loop.create_future(), time.monotonic())
+        heapq.heappush(self._queue, waiter)
+        self._dispatch()
+        if not waiter.future.done():
+            self.metrics.queued += 1
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # Admitted just as the caller gave up: hand the slot back
+                self._free_slot()
+            else:
+                waiter.future.cancel()
+                self._dispatch()
+            raise
+        self.metrics.admitted += 1
+        if slot.priority == RequestPriority.BACKGROUND:
+            self.metrics.admitted_background += 1
+        self.metrics.queue_wait_seconds += time.monotonic() - waiter.queued_at
+
+    def _release(self, slot: RequestSlot, error: Optional[BaseException]):
+        """Report the outcome of an admitted request and free its slot."""
+        if not self.config.enabled:
+            return
+        if error is None:
+            latency = slot.latency if slot.latency is not None else time.monotonic() - slot.admitted_at
+            if self.controller.on_success(latency, slot.admitted_at):
+                self.metrics.latency_spikes += 1
+                self.metrics.limit_decreases += 1
+                logger.info(f"LLM provider latency spike ({latency:.2f}s); "
+                            f"concurrency limit now {self.controller.concurrency}")
+        elif isinstance(error, ProviderHTTPError) and error.status_code in OVERLOAD_STATUS_CODES:
+            self.metrics.overloads += 1
+            if error.retry_after:
+                # Everyone waits out the provider's requested pause instead of collecting more 429s
+                self.paused_until = max(self.paused_until, time.monotonic() + error.retry_after)
+            if self.controller.on_overload(slot.admitted_at):
+                self.metrics.limit_decreases += 1
+                logger.info(f"LLM provider overloaded ({error.status_code}); "
+                            f"concurrency limit now {self.controller.concurrency}")
+        self._free_slot()
+
+    def _free_slot(self):
+        self.in_flight -= 1
+        self._dispatch()
+
+    def _dispatch(self):
+        """Admit waiting requests in priority order while concurrency and quotas allow."""
+        now = time.monotonic()
+        while self._queue:
+            waiter = self._queue[0]
+            if waiter.future.done():
+                heapq.heappop(self._queue)
+                continue
+            if self.in_flight >= self.controller.concurrency:
+                return
+            wait = max(
+                self.paused_until - now,
+                self.request_bucket.time_until_available(1, now),
+                self.token_bucket.time_until_available(waiter.tokens, now),
+            )
+            if wait > 0:
+                self._schedule(now + wait)
+                return
+            heapq.heappop(self._queue)
+            self.request_bucket.consume(1)
+            self.token_bucket.consume(waiter.tokens)
+            self.in_flight += 1
+            waiter.future.set_result(None)
+
+    def _schedule(self, due: float):
+        """Run the dispatcher again once the head of the queue can be admitted."""
+        loop = asyncio.get_running_loop()
+        if self._timer is not None:
+            if self._timer_loop is loop and not self._timer.cancelled() and self._timer_due <= due:
+                return
+            self._timer.cancel()
+        self._timer_loop = loop
+        self._timer_due = due
+        self._timer = loop.call_later(max(due - time.monotonic(), 0), self._on_timer)
+
+    def _on_timer(self):
+        self._timer = None
+        self._dispatch()
+
+
+_rate_limiters: Dict[str, ProviderRateLimiter] = {}
+
+
+def get_rate_limiter(base_url: str) -> ProviderRateLimiter:
+    """
+    Get the process-wide rate limiter of a provider endpoint.
+
+    Args:
+        base_url: Base URL of the provider
+
+    Returns:
+        The endpoint's ProviderRateLimiter, created from settings on first use
+    """
+    limiter = _rate_limiters.get(base_url)
+    if limiter is None:
+        limiter = _rate_limiters[base_url] = ProviderRateLimiter()
+    return limiter
+
+
+def get_rate_limiter_metrics() -> Dict[str, Dict[str, Any]]:
+    """
+    Get the metrics of every provider endpoint's rate limiter.
+
+    Returns:
+        Dictionary of base URLs to their limiter metrics
+    """
+    return {base_url: limiter.get_metrics() for base_url, limiter in _rate_limiters.items()}
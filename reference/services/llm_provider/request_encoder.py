@@ -0,0 +1,161 @@
+"""
+Incremental JSON encoding of provider request bodies.
+
+Every turn sends the whole conversation history and the tool catalog again,
+and httpx used to serialize the complete payload on each request. Only the
+newest messages are actually new. RequestEncoder keeps the encoded JSON of
+each message and of the last tool list, and assembles the request body from
+those byte fragments. A request then costs encoding its new messages plus
+joining the fragments.
+
+Messages and tool lists are recognized by identity. A conversation's
+messages are not modified once appended, and the tool catalog is rebuilt
+rather than changed, so a fragment stays valid as long as its object is
+alive. A cached message whose content was reassigned or whose fields were
+added or removed is encoded again.
+"""
+
+import json
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+# The body is sent as bytes, so the content type is no longer set by httpx
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+def _dumps(value: Any) -> bytes:
+    """Encode a value as compact UTF-8 JSON."""
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+@dataclass
+class RequestEncoderMetrics:
+    """Counters of the request encoder."""
+    requests: int = 0
+    messages_encoded: int = 0
+    messages_reused: int = 0
+    tools_encoded: int = 0
+    tools_reused: int = 0
+
+
+class RequestEncoder:
+    """
+    Encodes provider requests to JSON bytes, reusing the fragments of
+    messages and tool lists it has encoded before.
+    """
+
+    def __init__(self, max_cached_messages: int = 4096):
+        """
+        Initialize the encoder.
+
+        Args:
+            max_cached_messages: Encoded forms of this many messages are kept
+        """
+        self.max_cached_messages = max_cached_messages
+        self.metrics = RequestEncoderMetrics()
+        # Message id -> (message, its content and field count when encoded, encoded message).
+        # The message is referenced so its id cannot be reused by another object.
+        self._messages: "OrderedDict[int, Tuple[Dict[str, Any], Any, int, bytes]]" = OrderedDict()
+        self._tools: Optional[Tuple[List[Dict[str, Any]], bytes]] = None
+
+    def encode(self, request: Dict[str, Any]) -> bytes:
+        """
+        Encode a request body.
+
+        Args:
+            request: Provider request in OpenAI format
+
+        Returns:
+            The request as JSON bytes, with keys in the request's order
+        """
+        self.metrics.requests += 1
+        parts = []
+        for key, value in request.items():
+            if key == "messages" and isinstance(value, list):
+                encoded = b"[" + b",".join([self.encode_message(message) for message in value]) + b"]"
+            elif key == "tools" and isinstance(value, list):
+                encoded = self.encode_tools(value)
+            else:
+                encoded = _dumps(value)
+            parts.append(_dumps(key) + b":" + encoded)
+        return b"{" + b",".join(parts) + b"}"
+
+    def encode_message(self, message: Dict[str, Any]) -> bytes:
+        """
+        Encode one chat message, memoized across requests.
+
+        Args:
+            message: Chat message in OpenAI format
+
+        Returns:
+            The message as JSON bytes
+        """
+        content = message.get("content")
+        entry = self._messages.get(id(message))
+        if entry is not None and entry[0] is message and entry[1] is content and entry[2] == len(message):
+            self._messages.move_to_end(id(message))
+            self.metrics.messages_reused += 1
+            return entry[3]
+
+        encoded = _dumps(message)
+        self.metrics.messages_encoded += 1
+        self._messages[id(message)] = (message, content, len(message), encoded)
+        self._messages.move_to_end(id(message))
+        if len(self._messages) > self.max_cached_messages:
+            self._messages.popitem(last=False)
+        return encoded
+
+    def encode_tools(self, tools: List[Dict[str, Any]]) -> bytes:
+        """
+        Encode a tool list, reusing the encoding of the previous list when it is passed again.
+
+        The registry's tool catalog hands the same list to every prompt until
+        its tools change, so the list is encoded once per catalog version.
+
+        Args:
+            tools: Tool definitions in OpenAI format
+
+        Returns:
+            The tool list as JSON bytes
+        """
+        if self._tools is not None and self._tools[0] is tools:
+            self.metrics.tools_reused += 1
+            return self._tools[1]
+        encoded = _dumps(tools)
+        self.metrics.tools_encoded += 1
+        self._tools = (tools, encoded)
+        return encoded
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get the encoding counters.
+
+        Returns:
+            Dictionary of counter names to values
+        """
+        metrics = asdict(self.metrics)
+        metrics["cached_messages"] = len(self._messages)
+        return metrics
+
+
+def request_body_kwargs(client: Any, request: Dict[str, Any], encoder: RequestEncoder) -> Dict[str, Any]:
+    """
+    Get the keyword arguments sending a request body with a client's post() or stream().
+
+    httpx clients get the pre-encoded bytes. Other clients, such as the router's
+    and test doubles, get the request itself as the json argument.
+
+    Args:
+        client: The client sending the request
+        request: Provider request in OpenAI format
+        encoder: Encoder of the request body
+
+    Returns:
+        Either content and headers, or json keyword arguments
+    """
+    if isinstance(client, httpx.AsyncClient):
+        return {"content": encoder.encode(request), "headers": JSON_HEADERS}
+    return {"json": request}
@@ -0,0 +1,418 @@
+"""
+Exact-match response cache for LLM provider requests.
+
+Identical requests reach the model repeatedly: adaptations for the same
+error, summaries of the same history, repeated system-tool queries. This
+module keys responses on a canonical hash of the request (model, messages,
+tools and sampling parameters), keeps them in an in-memory LRU tier backed by
+an optional SQLite tier, and expires them after a TTL. Sampled requests
+(temperature above the configured maximum) are never cached, since a cached
+answer would hide the variation the caller asked for.
+"""
+
+import asyncio
+import copy
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, List, Optional, Tuple
+
+from common.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+# Request fields that do not change the model's answer
+NON_SEMANTIC_FIELDS = frozenset({"user", "user_prompt_id", "stream", "stream_options"})
+
+
+def normalize_request(request: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Strip the fields of a provider request that do not affect the response.
+
+    Args:
+        request: The final request body sent to the provider
+
+    Returns:
+        A copy of the request without per-call fields such as the user ID and stream flag
+    """
+    return {key: value for key, value in request.items() if key not in NON_SEMANTIC_FIELDS}
+
+
+def request_cache_key(request: Dict[str, Any]) -> str:
+    """
+    Compute the canonical key of a provider request.
+
+    Args:
+        request: The final request body sent to the provider
+
+    Returns:
+        Hex SHA-256 digest of the normalized request serialized with sorted keys
+    """
+    canonical = json.dumps(normalize_request(request), sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def response_to_stream_chunks(response: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Convert a complete chat completion into streaming chunks.
+
+    Used to replay a cached non-streaming response to a streaming caller.
+
+    Args:
+        response: Chat completion response in OpenAI format
+
+    Returns:
+        Chunks in OpenAI streaming format: one content/tool-call delta per choice
+    """
+    chunks = []
+    for position, choice in enumerate(response.get("choices", [])):
+        message = choice.get("message", {})
+        delta = {"role": message.get("role", "assistant")}
+        if message.get("content"):
+            delta["content"] = message["content"]
+        if message.get("tool_calls"):
+            delta["tool_calls"] = [
+                {"index": index, **tool_call} for index, tool_call in enumerate(message["tool_calls"])
+            ]
+        chunks.append({
+            "id": response.get("id"),
+            "object": "chat.completion.chunk",
+            "model": response.get("model"),
+            "choices": [{
+                "index": choice.get("index", position),
+                "delta": delta,
+                "finish_reason": choice.get("finish_reason"),
+            }],
+        })
+    return chunks
+
+
+@dataclass
+class ResponseCacheConfig:
+    """Size, lifetime and bypass rules of the response cache."""
+    enabled: bool = False
+    max_entries: int = 256
+    ttl: float = 3600.0  # Seconds an entry is served (0 = never expires)
+    max_temperature: float = 0.0  # Requests sampled above this temperature bypass the cache
+    sqlite_path: Optional[str] = None  # On-disk tier, disabled if unset
+
+    @classmethod
+    def from_settings(cls) -> "ResponseCacheConfig":
+        """Build the cache configuration from the global settings."""
+        return cls(
+            enabled=settings.llm_response_cache_enabled,
+            max_entries=settings.llm_response_cache_max_entries,
+            ttl=settings.llm_response_cache_ttl,
+            max_temperature=settings.llm_response_cache_max_temperature,
+            sqlite_path=settings.llm_response_cache_path,
+        )
+
+
+@dataclass
+class ResponseCacheMetrics:
+    """Counters describing how often the cache answered a request."""
+    hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    bypassed: int = 0
+    stores: int = 0
+
+    def snapshot(self) -> Dict[str, int]:
+        """
+        Get the current counters.
+
+        Returns:
+            Dictionary of counter names to values
+        """
+        return asdict(self)
+
+
+class SQLiteResponseStore:
+    """On-disk tier of the response cache, safe to use from worker threads."""
+
+    def __init__(self, path: str):
+        """
+        Open (and create if needed) the cache database.
+
+        Args:
+            path: Path of the SQLite database file
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, stored_at REAL NOT NULL)"
+        )
+        self._db.commit()
+
+    def get(self, key: str) -> Optional[Tuple[Any, float]]:
+        """
+        Read an entry.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Tuple of (value, stored_at timestamp), or None if the key is unknown
+        """
+        with self._lock:
+            row = self._db.execute("SELECT value, stored_at FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]), row[1]
+
+    def put(self, key: str, value: Any, stored_at: float):
+        """
+        Write an entry, replacing any previous value.
+
+        Args:
+            key: Cache key
+            value: JSON-serializable value
+            stored_at: Wall-clock time the value was produced
+        """
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, value, stored_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value), stored_at),
+            )
+            self._db.commit()
+
+    def delete(self, key: str):
+        """Remove an entry if present."""
+        with self._lock:
+            self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._db.commit()
+
+    def purge_expired(self, ttl: float) -> int:
+        """
+        Delete entries older than the TTL.
+
+        Args:
+            ttl: Entry lifetime in seconds
+
+        Returns:
+            Number of deleted entries
+        """
+        with self._lock:
+            cursor = self._db.execute("DELETE FROM responses WHERE stored_at < ?", (time.time() - ttl,))
+            self._db.commit()
+        return cursor.rowcount
+
+    def clear(self):
+        """Delete all entries."""
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+            self._db.commit()
+
+    def close(self):
+        """Close the database."""
+        with self._lock:
+            self._db.close()
+
+
+class ResponseCache:
+    """
+    Two-tier exact-match cache of provider responses.
+
+    Non-streaming responses are stored under the request key and streamed
+    responses under a separate stream key holding the raw chunks, so a
+    streaming hit replays exactly what the provider sent. A streaming lookup
+    falls back to a cached non-streaming response, converted into chunks.
+    """
+
+    def __init__(self, config: Optional[ResponseCacheConfig] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            config: Cache configuration, taken from the global settings if omitted
+        """
+        self.config = config or ResponseCacheConfig.from_settings()
+        self.metrics = ResponseCacheMetrics()
+        self._memory: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self._store = SQLiteResponseStore(self.config.sqlite_path) if self.config.sqlite_path else None
+        if self._store and self.config.ttl > 0:
+            self._store.purge_expired(self.config.ttl)
+
+    def is_cacheable(self, request: Dict[str, Any]) -> bool:
+        """
+        Check whether a request may be answered from the cache.
+
+        Args:
+            request: The final request body sent to the provider
+
+        Returns:
+            False if the cache is disabled or the request samples above the maximum temperature
+        """
+        if not self.config.enabled:
+            return False
+        temperature = request.get("temperature") or 0.0
+        return temperature <= self.config.max_temperature
+
+    async def get_response(self, request: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Look up the cached non-streaming response of a request.
+
+        Args:
+            request: The final request body sent to the provider
+
+        Returns:
+            The cached response, or None on a miss or if the request bypasses the cache
+        """
+        if not self.is_cacheable(request):
+            self.metrics.bypassed += 1
+            return None
+        response = await self._get(request_cache_key(request))
+        self._count(response)
+        return response
+
+    async def get_stream(self, request: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+        """
+        Look up cached streaming chunks of a request.
+
+        Args:
+            request: The final request body sent to the provider
+
+        Returns:
+            Chunks to replay, or None on a miss or if the request bypasses the cache
+        """
+        if not self.is_cacheable(request):
+            self.metrics.bypassed += 1
+            return None
+        key = request_cache_key(request)
+        chunks = await self._get(self._stream_key(key))
+        if chunks is None:
+            response = await self._get(key)
+            if response is not None:
+                chunks = response_to_stream_chunks(response)
+        self._count(chunks)
+        return chunks
+
+    async def put_response(self, request: Dict[str, Any], response: Dict[str, Any]):
+        """
+        Store the non-streaming response of a request.
+
+        Args:
+            request: The final request body sent to the provider
+            response: The provider's response
+        """
+        if self.is_cacheable(request):
+            await self._put(request_cache_key(request), response)
+
+    async def put_stream(self, request: Dict[str, Any], chunks: List[Dict[str, Any]]):
+        """
+        Store the chunks of a completed stream.
+
+        Args:
+            request: The final request body sent to the provider
+            chunks: Every chunk the provider streamed
+        """
+        if self.is_cacheable(request):
+            await self._put(self._stream_key(request_cache_key(request)), chunks)
+
+    def get_metrics(self) -> Dict[str, int]:
+        """
+        Get hit, miss and bypass counters.
+
+        Returns:
+            Dictionary of counter names to values
+        """
+        return self.metrics.snapshot()
+
+    async def clear(self):
+        """Drop every entry from both tiers."""
+        self._memory.clear()
+        if self._store:
+            await asyncio.to_thread(self._store.clear)
+
+    def close(self):
+        """Close the on-disk tier."""
+        if self._store:
+            self._store.close()
+            self._store = None
+
+    @staticmethod
+    def _stream_key(key: str) -> str:
+        return f"{key}:stream"
+
+    def _count(self, value: Any):
+        if value is None:
+            self.metrics.misses += 1
+        else:
+            self.metrics.hits += 1
+
+    def _expired(self, stored_at: float) -> bool:
+        return self.config.ttl > 0 and time.time() - stored_at > self.config.ttl
+
+    async def _get(self, key: str) -> Any:
+        entry = self._memory.get(key)
+        if entry is not None:
+            value, stored_at = entry
+            if not self._expired(stored_at):
+                self._memory.move_to_end(key)
+                return copy.deepcopy(value)
+            del self._memory[key]
+
+        if self._store is None:
+            return None
+        entry = await asyncio.to_thread(self._store.get, key)
+        if entry is None:
+            return None
+        value, stored_at = entry
+        if self._expired(stored_at):
+            await asyncio.to_thread(self._store.delete, key)
+            return None
+        self.metrics.disk_hits += 1
+        self._remember(key, copy.deepcopy(value), stored_at)
+        return value
+
+    async def _put(self, key: str, value: Any):
+        stored_at = time.time()
+        # Callers update responses in place, so the cache keeps its own copy
+        self._remember(key, copy.deepcopy(value), stored_at)
+        self.metrics.stores += 1
+        if self._store:
+            try:
+                await asyncio.to_thread(self._store.put, key, value, stored_at)
+            except (sqlite3.Error, TypeError, ValueError) as e:
+                logger.warning(f"Could not write response cache entry to disk: {e}")
+
+    def _remember(self, key: str, value: Any, stored_at: float):
+        self._memory[key] = (value, stored_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.config.max_entries:
+            self._memory.popitem(last=False)
+
+
+_response_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> ResponseCache:
+    """
+    Get the process-wide response cache.
+
+    Returns:
+        The shared ResponseCache, created from settings on first use
+    """
+    global _response_cache
+    if _response_cache is None:
+        _response_cache = ResponseCache()
+    return _response_cache
+
+
+def close_response_cache():
+    """Close the process-wide response cache if it was created."""
+    global _response_cache
+    if _response_cache is not None:
+        _response_cache.close()
+        _response_cache = None
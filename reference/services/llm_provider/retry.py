@@ -0,0 +1,197 @@
+"""
+Retry, backoff and request hedging for LLM provider calls.
+
+Busy inference endpoints shed load with 429 and 503 responses and drop
+connections under pressure. This module decides which failures are worth
+retrying, computes exponential backoff with full jitter (or honors the
+server's Retry-After header), and can hedge a slow request by firing a second
+attempt once the first has taken longer than the observed p95 latency.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, FrozenSet, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+RETRYABLE_STATUS_CODES = frozenset({408, 429, 500, 502, 503, 504})
+
+
+class ProviderHTTPError(Exception):
+    """Error response returned by an LLM provider."""
+
+    def __init__(self, status_code: int, content: Any = None, retry_after: Optional[float] = None):
+        super().__init__(f"Provider returned status code {status_code}: {content}")
+        self.status_code = status_code
+        self.content = content
+        self.retry_after = retry_after
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header value.
+
+    Args:
+        value: Header value, either delay seconds or an HTTP date
+
+    Returns:
+        Seconds to wait, or None if the value is missing or invalid
+    """
+    if not value or not isinstance(value, str):
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at is None:
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+@dataclass
+class RetryPolicy:
+    """When and how long to wait before retrying a failed provider call."""
+    max_retries: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 20.0
+    max_retry_after: float = 60.0  # Longer Retry-After values are not waited for
+    retry_status_codes: FrozenSet[int] = field(default_factory=lambda: RETRYABLE_STATUS_CODES)
+
+    def is_retryable(self, error: BaseException) -> bool:
+        """
+        Check whether an error is transient.
+
+        Args:
+            error: The error raised by the attempt
+
+        Returns:
+            True for retryable status codes and connection-level failures
+        """
+        if isinstance(error, ProviderHTTPError):
+            if error.retry_after is not None and error.retry_after > self.max_retry_after:
+                return False
+            return error.status_code in self.retry_status_codes
+        return isinstance(error, (httpx.TransportError, ConnectionError, asyncio.TimeoutError))
+
+    def compute_delay(self, attempt: int, error: Optional[BaseException] = None) -> float:
+        """
+        Compute the wait before the next attempt.
+
+        Args:
+            attempt: Number of retries already made (0 for the first retry)
+            error: The error that triggered the retry
+
+        Returns:
+            Delay in seconds: the server's Retry-After if given, else full-jitter exponential backoff
+        """
+        retry_after = getattr(error, "retry_after", None)
+        if retry_after is not None:
+            return min(retry_after, self.max_retry_after)
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+
+async def call_with_retry(call: Callable[[], Awaitable[Any]], policy: RetryPolicy) -> Any:
+    """
+    Await a call, retrying transient failures according to a policy.
+
+    Args:
+        call: Zero-argument async callable making one attempt
+        policy: Retry policy to apply
+
+    Returns:
+        The result of the first successful attempt
+    """
+    attempt = 0
+    while True:
+        try:
+            return await call()
+        except Exception as e:
+            if attempt >= policy.max_retries or not policy.is_retryable(e):
+                raise
+            delay = policy.compute_delay(attempt, e)
+            attempt += 1
+            logger.warning(f"Provider call failed ({e}); retry {attempt}/{policy.max_retries} in {delay:.2f}s")
+            await asyncio.sleep(delay)
+
+
+class LatencyTracker:
+    """Rolling window of request latencies for percentile estimates."""
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        """
+        Initialize the tracker.
+
+        Args:
+            window: Number of most recent latencies kept
+            min_samples: Samples needed before percentiles are reported
+        """
+        self.min_samples = min_samples
+        self._samples = deque(maxlen=window)
+
+    def record(self, seconds: float):
+        """Record the latency of a successful request."""
+        self._samples.append(seconds)
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """
+        Get a latency percentile.
+
+        Args:
+            fraction: Percentile as a fraction, e.g. 0.95
+
+        Returns:
+            The latency in seconds, or None until enough samples were recorded
+        """
+        if len(self._samples) < self.min_samples:
+            return None
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(fraction * len(ordered)))
+        return ordered[index]
+
+
+async def hedged_call(call: Callable[[], Awaitable[Any]], hedge_delay: float) -> Any:
+    """
+    Await a call and fire a second, identical attempt if the first is slow.
+
+    Whichever attempt succeeds first wins and the other is cancelled. An
+    attempt that fails while the other is still running does not fail the
+    call.
+
+    Args:
+        call: Zero-argument async callable making one attempt
+        hedge_delay: Seconds to wait for the first attempt before hedging
+
+    Returns:
+        The result of the first successful attempt
+    """
+    pending = {asyncio.ensure_future(call())}
+    try:
+        done, _ = await asyncio.wait(pending, timeout=hedge_delay)
+        if not done:
+            logger.debug(f"Provider call slower than {hedge_delay:.2f}s, sending hedged request")
+            pending.add(asyncio.ensure_future(call()))
+
+        error = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        for task in pending:
+            task.cancel()
@@ -0,0 +1,194 @@
+"""
+Single-flight coalescing of concurrent identical provider requests.
+
+When many sessions send the same request at once (identical first turns from
+scripted clients, adaptations for a shared provider error, a fleet restart),
+only the first caller reaches the provider. Concurrent callers with the same
+key await the same call, and a streamed response is fanned out to all of
+them as it arrives.
+"""
+
+import asyncio
+import copy
+import logging
+from dataclasses import dataclass, asdict
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CoalescingMetrics:
+    """Counters describing how many requests shared an upstream call."""
+    upstream_calls: int = 0
+    coalesced_calls: int = 0
+    upstream_streams: int = 0
+    coalesced_streams: int = 0
+
+    def snapshot(self) -> Dict[str, int]:
+        """
+        Get the current counters.
+
+        Returns:
+            Dictionary of counter names to values
+        """
+        return asdict(self)
+
+
+class _Flight:
+    """An upstream call and the number of callers waiting for it."""
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class _StreamFlight:
+    """
+    An upstream stream pumped into a buffer that every subscriber reads.
+
+    Subscribers that join late start from the first chunk, so all of them
+    see the complete response. The upstream is cancelled once the last
+    subscriber leaves.
+    """
+
+    def __init__(self, source: AsyncIterator[Any]):
+        self.chunks: List[Any] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.subscribers = 0
+        self._changed = asyncio.Event()
+        self.task = asyncio.ensure_future(self._pump(source))
+
+    async def _pump(self, source: AsyncIterator[Any]):
+        try:
+            async for chunk in source:
+                self.chunks.append(chunk)
+                self._notify()
+        except Exception as e:
+            self.error = e
+        finally:
+            self.done = True
+            self._notify()
+            if hasattr(source, "aclose"):
+                await source.aclose()
+
+    def _notify(self):
+        # Wake every waiting subscriber and arm a fresh event for the next chunk
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def subscribe(self) -> AsyncIterator[Any]:
+        index = 0
+        while True:
+            if index < len(self.chunks):
+                yield self.chunks[index]
+                index += 1
+            elif self.done:
+                if self.error is not None:
+                    raise self.error
+                return
+            else:
+                await self._changed.wait()
+
+
+class SingleFlight:
+    """
+    Registry of in-flight upstream calls keyed by canonical request.
+
+    A flight is only shared while it is running: once it completes, the next
+    caller with the same key starts a new upstream call (repeated requests
+    are the response cache's job).
+    """
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self.metrics = CoalescingMetrics()
+        self._flights: Dict[str, _Flight] = {}
+        self._streams: Dict[str, _StreamFlight] = {}
+
+    async def call(self, key: str, call: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Await a call, sharing it with concurrent callers of the same key.
+
+        The call runs in its own task, so a caller that is cancelled does not
+        cancel it for the others; it is cancelled only when every caller has
+        gone. Callers that joined an existing flight receive a deep copy of
+        the result, since callers update responses in place.
+
+        Args:
+            key: Canonical key of the request
+            call: Zero-argument async callable making the upstream request
+
+        Returns:
+            The result of the shared call
+        """
+        flight = self._flights.get(key)
+        joined = flight is not None
+        if joined:
+            self.metrics.coalesced_calls += 1
+            logger.debug(f"Coalescing request {key[:12]} with an in-flight call")
+        else:
+            flight = _Flight(asyncio.ensure_future(call()))
+            self._flights[key] = flight
+            self.metrics.upstream_calls += 1
+            flight.task.add_done_callback(lambda task: self._finish(self._flights, key, flight))
+
+        flight.waiters += 1
+        try:
+            result = await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                flight.task.cancel()
+        return copy.deepcopy(result) if joined else result
+
+    async def stream(self, key: str, open_stream: Callable[[], AsyncIterator[Any]]) -> AsyncIterator[Any]:
+        """
+        Iterate over a stream, fanning it out to concurrent callers of the same key.
+
+        Chunks are shared between subscribers and must be treated as read-only.
+
+        Args:
+            key: Canonical key of the request
+            open_stream: Zero-argument callable returning the upstream async iterator
+
+        Yields:
+            Every chunk of the shared stream, from the first one
+        """
+        flight = self._streams.get(key)
+        if flight is not None:
+            self.metrics.coalesced_streams += 1
+            logger.debug(f"Coalescing stream {key[:12]} with an in-flight stream")
+        else:
+            flight = _StreamFlight(open_stream())
+            self._streams[key] = flight
+            self.metrics.upstream_streams += 1
+            flight.task.add_done_callback(lambda task: self._finish(self._streams, key, flight))
+
+        flight.subscribers += 1
+        try:
+            async for chunk in flight.subscribe():
+                yield chunk
+        finally:
+            flight.subscribers -= 1
+            if flight.subscribers == 0 and not flight.task.done():
+                flight.task.cancel()
+
+    def get_metrics(self) -> Dict[str, int]:
+        """
+        Get upstream and coalesced request counters.
+
+        Returns:
+            Dictionary of counter names to values
+        """
+        return self.metrics.snapshot()
+
+    @staticmethod
+    def _finish(flights: Dict[str, Any], key: str, flight: Any):
+        if flights.get(key) is flight:
+            del flights[key]
+        task = flight.task
+        if not task.cancelled() and isinstance(flight, _Flight):
+            # Mark the exception as retrieved when every caller already left
+            task.exception()
@@ -0,0 +1,278 @@
+"""
+Byte-level server-sent events decoding for provider streams.
+
+Streamed completions used to be read with httpx's aiter_lines(), which
+decodes every network read to text and splits it into lines. Each line
+was then stripped, checked for the "data: " prefix and parsed with
+json.loads. SSEDecoder works on the raw bytes of each read instead. It
+splits lines in a single buffer and dispatches complete events according
+to the SSE specification: multi-line data fields, comments, and blank-line
+event boundaries. Payloads are handed to the fastest JSON backend
+installed (orjson, then msgspec), with the standard library as fallback.
+"""
+
+import json
+import logging
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, List, Optional, Tuple, Type
+
+from common.settings import settings
+
+logger = logging.getLogger(__name__)
+
+DONE_SENTINEL = b"[DONE]"
+
+
+@dataclass(frozen=True)
+class JSONBackend:
+    """A JSON decoder accepting bytes and the exception it raises on invalid input."""
+    name: str
+    loads: Callable[[bytes], Any]
+    decode_error: Tuple[Type[Exception], ...]
+
+
+_stdlib_decoder = json.JSONDecoder()
+
+
+def _stdlib_loads(payload: bytes) -> Any:
+    """Parse UTF-8 JSON with the standard library, skipping json.loads' encoding detection."""
+    return _stdlib_decoder.decode(payload.decode("utf-8"))
+
+
+def _load_backend(name: str) -> Optional[JSONBackend]:
+    """Import a JSON backend by name, or return None if it is not installed."""
+    if name == "orjson":
+        try:
+            import orjson
+        except ImportError:
+            return None
+        return JSONBackend("orjson", orjson.loads, (orjson.JSONDecodeError,))
+    if name == "msgspec":
+        try:
+            import msgspec
+        except ImportError:
+            return None
+        return JSONBackend("msgspec", msgspec.json.decode, (msgspec.DecodeError,))
+    if name == "json":
+        return JSONBackend("json", _stdlib_loads, (ValueError,))
+    raise ValueError(f"Unknown JSON backend '{name}'")
+
+
+def get_json_backend(name: Optional[str] = None) -> JSONBackend:
+    """
+    Get a JSON backend for decoding stream payloads.
+
+    Args:
+        name: "orjson", "msgspec", "json" or "auto" for the fastest one installed
+              (defaults to llm_json_backend)
+
+    Returns:
+        The requested backend, or the standard library's if it is not installed
+    """
+    name = (name or settings.llm_json_backend).lower()
+    if name == "auto":
+        for candidate in ("orjson", "msgspec"):
+            backend = _load_backend(candidate)
+            if backend:
+                return backend
+        return _load_backend("json")
+
+    backend = _load_backend(name)
+    if backend is None:
+        logger.warning(f"JSON backend '{name}' requested for LLM streams but not installed; using json")
+        return _load_backend("json")
+    return backend
+
+
+class SSEDecoder:
+    """
+    Incremental server-sent events decoder working on raw bytes.
+
+    Feed it network reads of any size. It returns the data payload of every
+    event completed by them. Only data fields are kept: event, id and retry
+    fields are not used by chat completion streams. Complete events are cut
+    off the buffer at their blank-line boundaries with a single split. An
+    event made of a single data line, which is what chat completion streams
+    send, is then handled without looking at its lines.
+    """
+
+    __slots__ = ("_buffer", "_skip_lf")
+
+    def __init__(self):
+        """Initialize the decoder before the first read."""
+        self._buffer = bytearray()
+        # A read ending in CR may be the first half of a CRLF line ending
+        self._skip_lf = False
+
+    def feed(self, data: bytes) -> List[bytes]:
+        """
+        Decode the next read of the stream.
+
+        Args:
+            data: Bytes read from the stream
+
+        Returns:
+            Data payloads of the events completed by this read, in order
+        """
+        if self._skip_lf and data[:1] == b"\n":
+            data = data[1:]
+        if not data:
+            return []
+        self._skip_lf = data[-1:] == b"\r"
+        if b"\r" in data:
+            data = data.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+
+        buffer = self._buffer
+        if not buffer and data.endswith(b"\n\n"):
+            # Reads usually end with the event they complete, leaving nothing to buffer
+            complete = data[:-2]
+        else:
+            # Boundaries before the new data were consumed by earlier reads
+            scan_from = max(len(buffer) - 1, 0)
+            buffer += data
+            boundary = buffer.rfind(b"\n\n", scan_from)
+            if boundary < 0:
+                return []
+            complete = bytes(buffer[:boundary])
+            del buffer[:boundary + 2]
+
+        payloads: List[bytes] = []
+        for event in complete.split(b"\n\n"):
+            if event.startswith(b"data: ") and b"\n" not in event:
+                if len(event) > 6:
+                    payloads.append(event[6:])
+            else:
+                self._process_event(event, payloads)
+        return payloads
+
+    def flush(self) -> List[bytes]:
+        """
+        Finish the stream, dispatching an event the server did not terminate.
+
+        Returns:
+            The data payload of the unterminated event, if there was one
+        """
+        payloads: List[bytes] = []
+        if self._buffer:
+            self._process_event(bytes(self._buffer), payloads)
+            self._buffer.clear()
+        return payloads
+
+    @staticmethod
+    def _process_event(event: bytes, payloads: List[bytes]):
+        """Collect the data lines of an event, dispatching at blank lines and at its end."""
+        data: List[bytes] = []
+        for line in event.split(b"\n") + [b""]:
+            if line.startswith(b"data:"):
+                # A data field, with its optional leading space
+                value = line[5:]
+                data.append(value[1:] if value[:1] == b" " else value)
+            elif not line:
+                if data:
+                    payload = b"\n".join(data)
+                    data = []
+                    # Events with empty data are not dispatched
+                    if payload:
+                        payloads.append(payload)
+            elif line == b"data":
+                # A field name without a colon has an empty value
+                data.append(b"")
+            # Comments (":...") and all other fields are ignored
+
+
+class SSEJSONDecoder:
+    """
+    Decodes a chat completion stream's bytes into parsed JSON chunks.
+
+    Stops at the "[DONE]" sentinel. Payloads that are not valid JSON are
+    skipped. Some servers omit the blank line between events, which joins
+    several data lines into one payload. Such a payload is parsed one line
+    at a time.
+    """
+
+    def __init__(self, backend: Optional[JSONBackend] = None):
+        """
+        Initialize the decoder.
+
+        Args:
+            backend: JSON backend for the payloads (defaults to get_json_backend())
+        """
+        self.backend = backend or get_json_backend()
+        self.sse = SSEDecoder()
+        self.done = False
+
+    def feed(self, data: bytes) -> List[Any]:
+        """
+        Decode the next read of the stream.
+
+        Args:
+            data: Bytes read from the stream
+
+        Returns:
+            Chunks completed by this read (none once the stream is done)
+        """
+        if self.done:
+            return []
+        return self._parse(self.sse.feed(data))
+
+    def flush(self) -> List[Any]:
+        """
+        Finish the stream.
+
+        Returns:
+            The chunk of an event the server did not terminate, if any
+        """
+        if self.done:
+            return []
+        return self._parse(self.sse.flush())
+
+    def _parse(self, payloads: List[bytes]) -> List[Any]:
+        """Parse payloads into chunks, stopping at the end-of-stream sentinel."""
+        if not payloads:
+            return []
+        loads, decode_error = self.backend.loads, self.backend.decode_error
+        if DONE_SENTINEL not in payloads:
+            # Mid-stream reads hold only well-formed chunks, parsed without per-payload checks
+            try:
+                return [loads(payload) for payload in payloads]
+            except decode_error:
+                pass
+
+        chunks = []
+        for payload in payloads:
+            if payload == DONE_SENTINEL:
+                self.done = True
+                break
+            try:
+                chunks.append(loads(payload))
+            except decode_error:
+                if b"\n" not in payload:
+                    logger.debug(f"Skipping stream payload that is not JSON: {payload[:200]!r}")
+                    continue
+                lines = [line for line in payload.split(b"\n") if line.strip()]
+                chunks.extend(self._parse(lines))
+                if self.done:
+                    break
+        return chunks
+
+
+async def iter_sse_json(byte_stream: AsyncIterator[bytes],
+                        backend: Optional[JSONBackend] = None) -> AsyncIterator[Any]:
+    """
+    Iterate over the JSON chunks of a server-sent events byte stream.
+
+    Args:
+        byte_stream: Raw reads of the response body, such as httpx's aiter_bytes()
+        backend: JSON backend for the payloads (defaults to get_json_backend())
+
+    Yields:
+        Parsed chunks, up to the "[DONE]" sentinel or the end of the stream
+    """
+    decoder = SSEJSONDecoder(backend)
+    async for data in byte_stream:
+        for chunk in decoder.feed(data):
+            yield chunk
+        if decoder.done:
+            return
+    for chunk in decoder.flush():
+        yield chunk
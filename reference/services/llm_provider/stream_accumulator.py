@@ -0,0 +1,259 @@
+"""
+Incremental assembly of streamed chat completions.
+
+A streamed completion arrives as many small deltas: content fragments and
+fragments of each tool call's name and arguments. Instead of buffering every
+chunk and walking them again once the stream ends, StreamAccumulator folds
+each delta into a content buffer and per-index tool call builders as it
+arrives, so the complete response is ready as soon as the last chunk is seen.
+Each tool call's argument JSON is scanned as it streams in, so a tool call is
+known to be complete as soon as its closing brace arrives, usually well
+before the stream ends.
+"""
+
+import json
+from typing import Any, Dict, List, Optional
+
+
+class JSONCompletenessScanner:
+    """
+    Incrementally detects when a streamed JSON object or array is closed.
+
+    Only tracks nesting depth and string/escape state, so each fragment is
+    scanned once and nothing is parsed until the value is complete.
+    """
+
+    __slots__ = ("depth", "in_string", "escaped", "started", "complete", "invalid")
+
+    def __init__(self):
+        """Initialize the scanner before the first fragment."""
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+        self.started = False
+        self.complete = False
+        self.invalid = False
+
+    def feed(self, text: str) -> bool:
+        """
+        Scan the next fragment of the JSON text.
+
+        Args:
+            text: The fragment, appended to everything fed before
+
+        Returns:
+            True once the top-level object or array has been closed
+        """
+        if self.invalid:
+            return False
+        for char in text:
+            if self.complete:
+                # Anything but whitespace after the closing bracket means the value was not final
+                if not char.isspace():
+                    self.complete = False
+                    self.invalid = True
+                    return False
+                continue
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == "\\":
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == "{" or char == "[":
+                self.depth += 1
+                self.started = True
+            elif char == "}" or char == "]":
+                self.depth -= 1
+                if self.depth == 0 and self.started:
+                    self.complete = True
+            elif char == '"':
+                self.in_string = True
+            elif not self.started and not char.isspace():
+                # Only objects and arrays can be detected before the stream ends
+                self.invalid = True
+                return False
+        return self.complete
+
+
+class ToolCallBuilder:
+    """Accumulates the deltas of one streamed tool call."""
+
+    __slots__ = ("index", "id", "type", "_name_parts", "_argument_parts", "_scanner")
+
+    def __init__(self, index: int):
+        """
+        Initialize an empty tool call.
+
+        Args:
+            index: Position of the tool call in the message
+        """
+        self.index = index
+        self.id = ""
+        self.type = ""
+        self._name_parts: List[str] = []
+        self._argument_parts: List[str] = []
+        self._scanner = JSONCompletenessScanner()
+
+    def add(self, delta: Dict[str, Any]):
+        """
+        Fold one tool call delta into the builder.
+
+        Args:
+            delta: A `delta.tool_calls` entry from a streaming chunk
+        """
+        if "id" in delta:
+            self.id = delta["id"]
+        if "type" in delta:
+            self.type = delta["type"]
+        function_delta = delta.get("function")
+        if function_delta:
+            if function_delta.get("name"):
+                self._name_parts.append(function_delta["name"])
+            if function_delta.get("arguments"):
+                self._argument_parts.append(function_delta["arguments"])
+                self._scanner.feed(function_delta["arguments"])
+
+    @property
+    def name(self) -> str:
+        """The function name received so far."""
+        return "".join(self._name_parts)
+
+    @property
+    def arguments(self) -> str:
+        """The argument JSON text received so far."""
+        return "".join(self._argument_parts)
+
+    @property
+    def arguments_complete(self) -> bool:
+        """Whether the argument JSON has been closed and parses."""
+        if not self._scanner.complete:
+            return False
+        try:
+            json.loads(self.arguments)
+        except ValueError:
+            return False
+        return True
+
+    def build(self) -> Dict[str, Any]:
+        """
+        Build the tool call in OpenAI format.
+
+        Returns:
+            Dictionary with id, type and function name/arguments
+        """
+        return {
+            "id": self.id,
+            "type": self.type,
+            "function": {"name": self.name, "arguments": self.arguments},
+        }
+
+
+class StreamAccumulator:
+    """
+    Builds a complete chat completion from streaming chunks as they arrive.
+
+    Content fragments are appended to a list and tool call deltas are routed
+    to a builder per index, so each chunk costs time proportional to its own
+    size and the end-of-stream work is a single join per field.
+    """
+
+    def __init__(self):
+        """Initialize an empty accumulator."""
+        self._content_parts: List[str] = []
+        self._tool_calls: Dict[int, ToolCallBuilder] = {}
+        self._ready: List[ToolCallBuilder] = []
+        self._reported: set = set()
+        self.finish_reason: Optional[str] = None
+        self.chunk_count = 0
+
+    def add(self, chunk: Dict[str, Any]) -> str:
+        """
+        Fold one streaming chunk into the response.
+
+        Args:
+            chunk: A streaming chunk in OpenAI format
+
+        Returns:
+            The chunk's content delta, or an empty string if it carried none
+        """
+        self.chunk_count += 1
+        choices = chunk.get("choices")
+        if not choices:
+            return ""
+        choice = choices[0]
+        delta = choice.get("delta") or {}
+
+        content = delta.get("content") or ""
+        if content:
+            self._content_parts.append(content)
+
+        tool_call_deltas = delta.get("tool_calls")
+        if tool_call_deltas:
+            for tool_call_delta in tool_call_deltas:
+                index = tool_call_delta.get("index") or 0
+                builder = self._tool_calls.get(index)
+                if builder is None:
+                    builder = self._tool_calls[index] = ToolCallBuilder(index)
+                builder.add(tool_call_delta)
+                if index not in self._reported and builder.id and builder.name and builder.arguments_complete:
+                    self._reported.add(index)
+                    self._ready.append(builder)
+
+        finish_reason = choice.get("finish_reason")
+        if finish_reason:
+            self.finish_reason = finish_reason
+        return content
+
+    def pop_ready_tool_calls(self) -> List[Dict[str, Any]]:
+        """
+        Get the tool calls whose arguments were completed since the last call.
+
+        A tool call is ready once it has an ID, a name and argument JSON that
+        has been closed and parses, so it can be executed before the stream ends.
+
+        Returns:
+            Newly completed tool calls in OpenAI format
+        """
+        ready = [builder.build() for builder in self._ready]
+        self._ready.clear()
+        return ready
+
+    @property
+    def content(self) -> str:
+        """The content received so far."""
+        return "".join(self._content_parts)
+
+    @property
+    def tool_calls(self) -> List[ToolCallBuilder]:
+        """Builders of the tool calls received so far, in index order."""
+        return [self._tool_calls[index] for index in sorted(self._tool_calls)]
+
+    def build_response(self) -> Dict[str, Any]:
+        """
+        Build the complete response received so far.
+
+        Returns:
+            Complete response in OpenAI format, with finish_reason taken from the
+            stream or inferred from the presence of tool calls
+        """
+        message: Dict[str, Any] = {"role": "assistant"}
+        content = self.content
+        if content:
+            message["content"] = content
+        if self._tool_calls:
+            # Indices are dense in practice; gaps are filled with empty calls like the provider would
+            message["tool_calls"] = [
+                (self._tool_calls.get(index) or ToolCallBuilder(index)).build()
+                for index in range(max(self._tool_calls) + 1)
+            ]
+
+        finish_reason = self.finish_reason or ("tool_calls" if self._tool_calls else "stop")
+        return {
+            "choices": [{
+                "index": 0,
+                "message": message,
+                "finish_reason": finish_reason,
+            }]
+        }
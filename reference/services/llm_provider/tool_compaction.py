@@ -0,0 +1,361 @@
+"""
+Token-cost-aware compaction of tool definitions sent to the model.
+
+Tool definitions reach the model with every request, and schemas generated
+from code or reported by MCP servers carry keywords the model does not need
+(titles, $schema, $comment), unused definitions, whitespace-padded
+descriptions and the same nested schema repeated under several properties.
+ToolCompactor rewrites each tool once, and the rewrite is reused for every
+request until the tool changes:
+
+- keywords that do not constrain the arguments are stripped,
+- unreferenced definitions are dropped and large subschemas repeated within
+  a tool are moved to its $defs and referenced,
+- descriptions are whitespace-normalized and, optionally, the tool's
+  description is shortened to a token budget at a sentence boundary.
+
+It also reports the estimated tokens of every tool before and after
+compaction, counted with the context window's tokenizer.
+"""
+
+import json
+import logging
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from common.settings import settings
+from services.llm_provider.context_window import Tokenizer, get_tokenizer
+
+logger = logging.getLogger(__name__)
+
+# Keywords that annotate a schema without constraining the arguments
+STRIPPED_KEYWORDS = frozenset({"$schema", "$id", "$comment", "title"})
+
+# Keywords whose value maps names to subschemas
+SCHEMA_MAP_KEYWORDS = frozenset({"properties", "patternProperties", "$defs", "definitions", "dependentSchemas"})
+# Keywords whose value is a subschema or a list of subschemas
+SCHEMA_KEYWORDS = frozenset({"items", "additionalProperties", "additionalItems", "contains", "propertyNames",
+                             "not", "if", "then", "else", "unevaluatedProperties", "unevaluatedItems"})
+SCHEMA_LIST_KEYWORDS = frozenset({"anyOf", "oneOf", "allOf", "prefixItems"})
+
+# Repeated subschemas shorter than this many serialized characters are left in place
+MIN_SHARED_DEFINITION_CHARS = 120
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+def _dumps(value: Any) -> str:
+    """Serialize a value the way it is sent: compact JSON."""
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+
+def strip_schema(schema: Any) -> Any:
+    """
+    Copy a schema without annotation keywords, empty descriptions and required lists,
+    and additionalProperties that allow what is allowed anyway.
+
+    Args:
+        schema: JSON schema
+
+    Returns:
+        The stripped copy
+    """
+    if not isinstance(schema, dict):
+        return schema
+    stripped = {}
+    for key, value in schema.items():
+        if key in STRIPPED_KEYWORDS or (key == "required" and value == []) or (
+                key == "additionalProperties" and value is True):
+            continue
+        if key in SCHEMA_MAP_KEYWORDS and isinstance(value, dict):
+            value = {name: strip_schema(subschema) for name, subschema in value.items()}
+        elif key in SCHEMA_KEYWORDS:
+            value = strip_schema(value)
+        elif key in SCHEMA_LIST_KEYWORDS and isinstance(value, list):
+            value = [strip_schema(subschema) for subschema in value]
+        elif key == "description" and isinstance(value, str):
+            value = " ".join(value.split())
+            if not value:
+                continue
+        stripped[key] = value
+    return stripped
+
+
+def _subschemas(schema: Dict[str, Any]) -> Iterator[Tuple[Any, Any]]:
+    """Yield (container, key) of every subschema below a schema, outside its definitions."""
+    for key, value in schema.items():
+        if key in ("$defs", "definitions"):
+            continue
+        if key in SCHEMA_MAP_KEYWORDS and isinstance(value, dict):
+            for name, subschema in value.items():
+                if isinstance(subschema, dict):
+                    yield value, name
+                    yield from _subschemas(subschema)
+        elif key in SCHEMA_KEYWORDS and isinstance(value, dict):
+            yield schema, key
+            yield from _subschemas(value)
+        elif key in SCHEMA_LIST_KEYWORDS and isinstance(value, list):
+            for index, subschema in enumerate(value):
+                if isinstance(subschema, dict):
+                    yield value, index
+                    yield from _subschemas(subschema)
+
+
+def _references(value: Any) -> Iterator[str]:
+    """Yield every $ref string in a schema."""
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if key == "$ref" and isinstance(item, str):
+                yield item
+            else:
+                yield from _references(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _references(item)
+
+
+def drop_unused_definitions(schema: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Remove the definitions of a schema that nothing references.
+
+    Args:
+        schema: JSON schema, modified in place
+
+    Returns:
+        The schema
+    """
+    for keyword in ("$defs", "definitions"):
+        definitions = schema.get(keyword)
+        if not isinstance(definitions, dict):
+            continue
+        prefix = f"#/{keyword}/"
+        # Definitions referenced from outside the definitions, and from those definitions in turn
+        reachable = set()
+        pending = [ref[len(prefix):] for ref in _references({k: v for k, v in schema.items() if k != keyword})
+                   if ref.startswith(prefix)]
+        while pending:
+            name = pending.pop()
+            if name in reachable or name not in definitions:
+                continue
+            reachable.add(name)
+            pending.extend(ref[len(prefix):] for ref in _references(definitions[name]) if ref.startswith(prefix))
+        for name in list(definitions):
+            if name not in reachable:
+                del definitions[name]
+        if not definitions:
+            del schema[keyword]
+    return schema
+
+
+def share_repeated_subschemas(schema: Dict[str, Any], min_chars: int = MIN_SHARED_DEFINITION_CHARS
+                              ) -> Dict[str, Any]:
+    """
+    Move subschemas repeated within a schema to its $defs and reference them.
+
+    The largest repeated subschema is shared first, until no repeated
+    subschema of at least min_chars serialized characters is left.
+
+    Args:
+        schema: JSON schema, modified in place
+        min_chars: Smallest serialized size worth sharing
+
+    Returns:
+        The schema
+    """
+    while True:
+        occurrences: Dict[str, List[Tuple[Any, Any]]] = {}
+        for container, key in _subschemas(schema):
+            serialized = _dumps(container[key])
+            if len(serialized) >= min_chars and "$ref" not in container[key]:
+                occurrences.setdefault(serialized, []).append((container, key))
+        repeated = [(serialized, places) for serialized, places in occurrences.items() if len(places) > 1]
+        if not repeated:
+            return schema
+
+        serialized, places = max(repeated, key=lambda item: len(item[0]))
+        definitions = schema.setdefault("$defs", {})
+        base = next((key for _, key in places if isinstance(key, str)), "shared")
+        name, suffix = base, 2
+        while name in definitions:
+            name, suffix = f"{base}_{suffix}", suffix + 1
+        definitions[name] = json.loads(serialized)
+        for container, key in places:
+            container[key] = {"$ref": f"#/$defs/{name}"}
+
+
+def shorten_text(text: str, max_tokens: int, tokenizer: Tokenizer) -> str:
+    """
+    Shorten a text to a token budget, keeping whole sentences where possible.
+
+    Args:
+        text: Text to shorten
+        max_tokens: Token budget (0 or less keeps the text)
+        tokenizer: Tokenizer counting the tokens
+
+    Returns:
+        The leading sentences fitting the budget, or the leading words of the
+        first sentence followed by an ellipsis if even that does not fit
+    """
+    if max_tokens <= 0 or tokenizer.count(text) <= max_tokens:
+        return text
+    kept = ""
+    for sentence in _SENTENCE_END.split(text):
+        candidate = f"{kept} {sentence}" if kept else sentence
+        if tokenizer.count(candidate) > max_tokens:
+            break
+        kept = candidate
+    if kept:
+        return kept
+
+    words = text.split()
+    low, high = 0, len(words)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if tokenizer.count(" ".join(words[:middle]) + "…") <= max_tokens:
+            low = middle
+        else:
+            high = middle - 1
+    return " ".join(words[:low]) + "…"
+
+
+@dataclass
+class ToolCompactionConfig:
+    """Settings of tool definition compaction."""
+    enabled: bool = True
+    description_tokens: int = 0  # Budget of each tool's description (0 = keep it whole)
+    share_definitions: bool = True  # Move repeated subschemas to $defs
+
+    @classmethod
+    def from_settings(cls) -> "ToolCompactionConfig":
+        """Create the configuration from the global settings."""
+        return cls(
+            enabled=settings.llm_tool_schema_compaction,
+            description_tokens=settings.llm_tool_description_tokens,
+        )
+
+
+@dataclass
+class _CompactedTool:
+    """A tool definition with its compacted form and token estimates."""
+    tool: Dict[str, Any]
+    compacted: Dict[str, Any]
+    tokens: int
+    original_tokens: int
+
+
+class ToolCompactor:
+    """
+    Compacts tool definitions in provider format, once per tool definition.
+
+    Definitions are recognized by identity: the registry's tool catalog keeps
+    the same definition objects until a tool changes.
+    """
+
+    def __init__(self, config: Optional[ToolCompactionConfig] = None, tokenizer: Optional[Tokenizer] = None,
+                 max_cached_tools: int = 4096):
+        """
+        Initialize the compactor.
+
+        Args:
+            config: Compaction settings (defaults to the global settings)
+            tokenizer: Tokenizer of the token report (defaults to the context window's)
+            max_cached_tools: Compacted definitions kept
+        """
+        self.config = config or ToolCompactionConfig.from_settings()
+        self._tokenizer = tokenizer
+        self.max_cached_tools = max_cached_tools
+        self._tools: "OrderedDict[int, _CompactedTool]" = OrderedDict()
+
+    @property
+    def tokenizer(self) -> Tokenizer:
+        """The tokenizer of the token report, loaded on first use."""
+        if self._tokenizer is None:
+            self._tokenizer = get_tokenizer()
+        return self._tokenizer
+
+    def compact_tools(self, tools: List[Any]) -> List[Any]:
+        """
+        Compact a list of tool definitions.
+
+        Args:
+            tools: Tool definitions in provider format
+
+        Returns:
+            The compacted definitions (the list itself if compaction is disabled)
+        """
+        if not self.config.enabled:
+            return tools
+        entries = [self._compact(tool) for tool in tools]
+        return [tool if entry is None else entry.compacted for tool, entry in zip(tools, entries)]
+
+    def _compact(self, tool: Any) -> Optional[_CompactedTool]:
+        """Get the compacted form of one tool definition, cached by identity."""
+        if not isinstance(tool, dict) or not isinstance(tool.get("function"), dict):
+            return None
+        entry = self._tools.get(id(tool))
+        if entry is not None and entry.tool is tool:
+            self._tools.move_to_end(id(tool))
+            return entry
+
+        compacted = self.compact_tool(tool)
+        # The tool is referenced so its id cannot be reused by another object
+        entry = _CompactedTool(tool, compacted, self.tokenizer.count(_dumps(compacted)),
+                               self.tokenizer.count(_dumps(tool)))
+        self._tools[id(tool)] = entry
+        logger.debug("Compacted tool %s from %d to %d tokens", compacted["function"].get("name"),
+                     entry.original_tokens, entry.tokens)
+        if len(self._tools) > self.max_cached_tools:
+            self._tools.popitem(last=False)
+        return entry
+
+    def compact_tool(self, tool: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Compact one tool definition.
+
+        Args:
+            tool: Tool definition in provider format
+
+        Returns:
+            A compacted copy of the definition
+        """
+        function = dict(tool["function"])
+        if isinstance(function.get("description"), str):
+            description = " ".join(function["description"].split())
+            function["description"] = shorten_text(description, self.config.description_tokens, self.tokenizer)
+        if isinstance(function.get("parameters"), dict):
+            parameters = strip_schema(function["parameters"])
+            if self.config.share_definitions:
+                share_repeated_subschemas(parameters)
+            function["parameters"] = drop_unused_definitions(parameters)
+        return {**tool, "function": function}
+
+    def get_report(self, tools: List[Any]) -> Dict[str, Any]:
+        """
+        Report the estimated tokens of a tool list.
+
+        Args:
+            tools: Tool definitions in provider format, before compaction
+
+        Returns:
+            Total tokens before and after compaction, and per-tool tokens, most expensive first
+        """
+        entries = []
+        for tool in tools:
+            entry = self._tools.get(id(tool))
+            if entry is None or entry.tool is not tool:
+                # Not compacted (compaction disabled or evicted): count the definition as sent
+                tokens = self.tokenizer.count(_dumps(tool))
+                name = tool.get("function", {}).get("name", "") if isinstance(tool, dict) else ""
+                entries.append((name, tokens, tokens))
+            else:
+                entries.append((entry.compacted["function"].get("name", ""), entry.tokens, entry.original_tokens))
+        entries.sort(key=lambda entry: entry[1], reverse=True)
+        return {
+            "tokenizer": self.tokenizer.name,
+            "tools": len(entries),
+            "total_tokens": sum(tokens for _, tokens, _ in entries),
+            "original_total_tokens": sum(original for _, _, original in entries),
+            "per_tool": {name: {"tokens": tokens, "original_tokens": original} for name, tokens, original in entries},
+        }
@@ -91,8 +91,8 @@ async def test_get_model_info_uses_adaptive_service_if_available(monkeypatch, mo
         async def get(self, url):
             return await mock_get(url)
 
-    # Patch httpx.AsyncClient
-    monkeypatch.setattr("httpx.AsyncClient", MockAsyncClient)
+    # Patch the provider's pooled client
+    monkeypatch.setattr(mock_openai_provider, "build_client", lambda: MockAsyncClient())
     
     # Create adaptive loop service with known return value
     mock_client = MagicMock()
@@ -147,8 +147,8 @@ async def test_get_model_info_uses_fallback_when_adaptive_service_not_available(
         async def get(self, url):
             return await mock_get(url)
 
-    # Patch httpx.AsyncClient
-    monkeypatch.setattr("httpx.AsyncClient", MockAsyncClient)
+    # Patch the provider's pooled client
+    monkeypatch.setattr(mock_openai_provider, "build_client", lambda: MockAsyncClient())
     
     # Don't set adaptive loop service, so it should use fallback logic
     # When the adaptive service is not set, it should use the hardcoded fallback logic
@@ -0,0 +1,127 @@
+"""
+Tests for incremental assembly of streamed chat completions.
+"""
+
+import pytest
+
+from common.settings import settings
+from gcs_kernel.models import PromptObject, ToolInclusionPolicy
+from services.llm_provider.content_generator import LLMContentGenerator
+from services.llm_provider.stream_accumulator import StreamAccumulator
+
+
+def content_chunk(text, finish_reason=None):
+    return {"choices": [{"index": 0, "delta": {"content": text}, "finish_reason": finish_reason}]}
+
+
+def tool_chunk(index, finish_reason=None, **fields):
+    return {"choices": [{"index": 0, "delta": {"tool_calls": [{"index": index, **fields}]},
+                         "finish_reason": finish_reason}]}
+
+
+@pytest.fixture
+def generator(monkeypatch):
+    # The provider is built from the settings, but no request reaches it
+    monkeypatch.setattr(settings, "llm_api_key", "test-key")
+    return LLMContentGenerator()
+
+
+def test_accumulates_content_and_returns_deltas():
+    accumulator = StreamAccumulator()
+
+    deltas = [accumulator.add(chunk) for chunk in [
+        {"choices": [{"delta": {"role": "assistant"}}]},
+        content_chunk("Hello"),
+        content_chunk(" world"),
+        {"choices": []},
+        content_chunk("", finish_reason="stop"),
+    ]]
+
+    assert deltas == ["", "Hello", " world", "", ""]
+    response = accumulator.build_response()
+    assert response["choices"][0]["message"] == {"role": "assistant", "content": "Hello world"}
+    assert response["choices"][0]["finish_reason"] == "stop"
+    assert accumulator.chunk_count == 5
+
+
+def test_accumulates_interleaved_tool_calls_per_index():
+    accumulator = StreamAccumulator()
+    for chunk in [
+        tool_chunk(0, id="call_a", type="function", function={"name": "read_file", "arguments": ""}),
+        tool_chunk(1, id="call_b", type="function", function={"name": "list_dir", "arguments": '{"pa'}),
+        tool_chunk(0, function={"arguments": '{"path": '}),
+        tool_chunk(1, function={"arguments": 'th": "/"}'}),
+        tool_chunk(0, function={"arguments": '"a.txt"}'}, finish_reason="tool_calls"),
+    ]:
+        accumulator.add(chunk)
+
+    tool_calls = accumulator.build_response()["choices"][0]["message"]["tool_calls"]
+
+    assert tool_calls == [
+        {"id": "call_a", "type": "function", "function": {"name": "read_file", "arguments": '{"path": "a.txt"}'}},
+        {"id": "call_b", "type": "function", "function": {"name": "list_dir", "arguments": '{"path": "/"}'}},
+    ]
+    assert [builder.id for builder in accumulator.tool_calls] == ["call_a", "call_b"]
+
+
+def test_finish_reason_is_inferred_without_final_chunk():
+    accumulator = StreamAccumulator()
+    accumulator.add(tool_chunk(0, id="call_a", function={"name": "f", "arguments": "{}"}))
+
+    assert accumulator.build_response()["choices"][0]["finish_reason"] == "tool_calls"
+
+
+def test_large_stream_is_assembled():
+    accumulator = StreamAccumulator()
+    for index in range(10000):
+        accumulator.add(content_chunk("x"))
+        accumulator.add(tool_chunk(0, function={"arguments": "y"}))
+
+    message = accumulator.build_response()["choices"][0]["message"]
+    assert len(message["content"]) == 10000
+    assert len(message["tool_calls"][0]["function"]["arguments"]) == 10000
+
+
+@pytest.mark.asyncio
+async def test_stream_response_assembles_incrementally(generator):
+    chunks = [
+        content_chunk("Let me check"),
+        tool_chunk(0, id="call_1", type="function", function={"name": "get_time", "arguments": "{}"}),
+        {"choices": [{"index": 0, "delta": {}, "finish_reason": "tool_calls"}]},
+    ]
+
+    async def fake_stream(prompt_obj):
+        for chunk in chunks:
+            yield chunk
+
+    generator.pipeline.execute_stream = fake_stream
+    prompt_obj = PromptObject.create(content="time?", tool_policy=ToolInclusionPolicy.NONE)
+
+    deltas = [delta async for delta in generator.stream_response(prompt_obj)]
+
+    assert deltas == ["Let me check"]
+    assert prompt_obj.result_content == "Let me check"
+    assert prompt_obj.tool_calls[0]["function"]["name"] == "get_time"
+
+
+@pytest.mark.asyncio
+async def test_stream_response_reports_tool_calls_before_stream_ends(generator):
+    seen = []
+    chunks = [
+        tool_chunk(0, id="call_1", type="function", function={"name": "read_file", "arguments": '{"path": "a"}'}),
+        content_chunk("still streaming"),
+        {"choices": [{"index": 0, "delta": {}, "finish_reason": "tool_calls"}]},
+    ]
+
+    async def fake_stream(prompt_obj):
+        for chunk in chunks:
+            seen.append("chunk")
+            yield chunk
+
+    generator.pipeline.execute_stream = fake_stream
+    prompt_obj = PromptObject.create(content="read", tool_policy=ToolInclusionPolicy.NONE)
+
+    async for _ in generator.stream_response(prompt_obj, on_tool_call_ready=lambda call: seen.append(call["id"])):
+        pass
+
+    assert seen == ["chunk", "call_1", "chunk", "chunk"]
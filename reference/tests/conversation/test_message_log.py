@@ -0,0 +1,90 @@
+"""
+Tests for the structurally shared conversation history.
+"""
+
+import copy
+
+import pytest
+
+from gcs_kernel.message_log import MessageLog
+from gcs_kernel.models import PromptObject
+from services.llm_provider.providers.openai_provider import OpenAIProvider
+
+
+def message(index, role="user"):
+    return {"role": role, "content": f"message {index}"}
+
+
+def test_log_behaves_like_a_list():
+    log = MessageLog([message(0), message(1)])
+    log.append(message(2))
+    log.extend([message(3), message(4)])
+
+    assert len(log) == 5
+    assert log == [message(i) for i in range(5)]
+    assert log[-1] == message(4)
+    assert log[1:3] == [message(1), message(2)]
+    assert list(reversed(log))[0] == message(4)
+    assert log + [message(5)] == [message(i) for i in range(6)]
+    with pytest.raises(IndexError):
+        log[5]
+
+
+def test_snapshots_share_messages_and_do_not_see_later_changes():
+    log = MessageLog([message(0), message(1)])
+    snapshot = log.snapshot()
+
+    log.append(message(2))
+    snapshot.append(message(3, "assistant"))
+
+    assert log == [message(0), message(1), message(2)]
+    assert snapshot == [message(0), message(1), message(3, "assistant")]
+    assert log[0] is snapshot[0]
+
+    # Replacing and inserting copy the log first, leaving snapshots as they were
+    branch = log.fork()
+    log[0] = {"role": "system", "content": "new system"}
+    log.insert(0, message(9))
+    assert branch == [message(0), message(1), message(2)]
+    assert log[:2] == [message(9), {"role": "system", "content": "new system"}]
+
+
+def test_fork_from_an_earlier_point():
+    log = MessageLog([message(i) for i in range(4)])
+
+    branch = log.fork(2)
+    branch.append(message(5, "assistant"))
+
+    assert branch == [message(0), message(1), message(5, "assistant")]
+    assert log == [message(i) for i in range(4)]
+    with pytest.raises(ValueError):
+        log.fork(5)
+
+
+def test_prompt_objects_share_history_without_copying():
+    history = MessageLog([message(i) for i in range(3)])
+    prompt_obj = PromptObject.create(content="next", conversation_history=history)
+
+    clone = prompt_obj.clone()
+    clone.add_user_message("only in the clone")
+    prompt_obj.add_assistant_message("only in the original")
+
+    assert isinstance(prompt_obj.conversation_history, MessageLog)
+    assert clone.conversation_history[0] is history[0]
+    assert clone.conversation_history[-1]["content"] == "only in the clone"
+    assert prompt_obj.conversation_history[-1]["content"] == "only in the original"
+    assert len(history) == 3
+    assert copy.deepcopy(history)[0] is history[0]
+    assert prompt_obj.model_dump()["conversation_history"][:3] == [message(i) for i in range(3)]
+
+
+def test_requests_get_a_plain_message_list():
+    provider = OpenAIProvider({"api_key": "test-key", "model": "gpt-4-test"})
+    prompt_obj = PromptObject.create(content="hi", conversation_history=[message(0)])
+    prompt_obj.add_user_message("hi")
+
+    request = provider.build_request(prompt_obj)
+
+    assert type(request["messages"]) is list
+    assert request["messages"] == [message(0), {"role": "user", "content": "hi"}]
+    assert request["messages"][0] is prompt_obj.conversation_history[0]
@@ -27,6 +27,7 @@ async def test_kernel_initialization_timing():
         assert kernel.ai_orchestrator.content_generator is not None
         assert kernel.is_running() is False  # _running starts as False
         assert getattr(kernel, '_fully_initialized', False) is False
+        assert await kernel.wait_until_initialized(timeout=0.05, interval=0.01) is False
         
         # Now initialize components (this is what happens in kernel.run())
         await kernel._initialize_components()
@@ -34,6 +35,7 @@ async def test_kernel_initialization_timing():
         # Content generator should now be set and initialization flag should be true
         assert kernel.ai_orchestrator.content_generator is not None
         assert getattr(kernel, '_fully_initialized', False) is True
+        assert await kernel.wait_until_initialized() is True
         assert kernel.is_running() is False  # But still not running until run() sets _running=True
         
         # Set running status to True (this happens in run() method)
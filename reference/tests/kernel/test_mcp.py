@@ -4,6 +4,8 @@ Unit tests for the MCP Server in the GCS Kernel.
 import pytest
 import pytest_asyncio
 import asyncio
+from types import SimpleNamespace
+from fastapi.testclient import TestClient
 from gcs_kernel.mcp.server import MCPServer
 from gcs_kernel.models import MCPConfig
 
@@ -46,4 +48,19 @@ class TestMCPServer:
         
         # Ensure a secret is generated automatically
         assert server.config.client_secret is not None
-        assert len(server.config.client_secret) >= 32
\ No newline at end of file
+        assert len(server.config.client_secret) >= 32
+    async def test_health_and_kernel_status_share_llm_metrics(self, mcp_server):
+        """The health check and kernel/status report the LLM metrics the kernel exposes."""
+        mcp_server.kernel = SimpleNamespace(
+            is_running=lambda: True,
+            registry=None,
+            get_llm_http_metrics=lambda: {"requests": 3},
+            get_llm_router_metrics=lambda: {"primary": {"ejected": False}},
+        )
+        expected = {"llm_http_pool": {"requests": 3}, "llm_router": {"primary": {"ejected": False}}}
+        assert mcp_server._llm_metrics() == expected
+
+        health = TestClient(mcp_server.app).get("/health").json()
+        status = await mcp_server._rpc_kernel_status({})
+        assert health == {"status": "healthy", "kernel_running": True, **expected}
+        assert status == {"status": "running", "tools": [], **expected}
@@ -0,0 +1,129 @@
+"""
+Unit tests for the MCP capability cache and its use in the MCPClientManager.
+"""
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from mcp.types import ServerNotification, ToolListChangedNotification
+from gcs_kernel.mcp.capability_cache import MCPCapabilityCache, MCPCapabilitySnapshot, compute_tool_hash
+from gcs_kernel.mcp.client_manager import MCPClientManager
+from gcs_kernel.models import MCPConfig
+
+
+TOOLS = [
+    {"name": "get_disk_usage", "description": "Disk usage", "inputSchema": {"type": "object"}},
+    {"name": "get_memory_usage", "description": "Memory usage", "inputSchema": {"type": "object"}},
+]
+
+
+def _make_client(tools):
+    """Create a mock MCPClient returning the given tools."""
+    client = MagicMock()
+    client.server_url = "http://localhost:3000/mcp"
+    client.list_tools = AsyncMock(return_value={"tools": tools})
+    client.list_prompts = AsyncMock(return_value={"prompts": []})
+    return client
+
+
+def test_tool_hash_is_order_insensitive_for_keys():
+    """The hash only changes when the tool definitions change."""
+    reordered = [{"inputSchema": {"type": "object"}, "description": "Disk usage", "name": "get_disk_usage"}, TOOLS[1]]
+    assert compute_tool_hash(TOOLS) == compute_tool_hash(reordered)
+    assert compute_tool_hash(TOOLS) != compute_tool_hash(TOOLS[:1])
+
+
+def test_snapshot_persists_across_instances(tmp_path):
+    """Cached capabilities survive a restart through the snapshot file."""
+    cache = MCPCapabilityCache(str(tmp_path), "capabilities.json", ttl_seconds=3600)
+    cache.store(MCPCapabilitySnapshot(server_id="srv", server_url="http://a", tools=list(TOOLS)))
+
+    reloaded = MCPCapabilityCache(str(tmp_path), "capabilities.json", ttl_seconds=3600)
+    assert reloaded.is_fresh("srv", "http://a")
+    assert reloaded.get("srv").tool_names == ["get_disk_usage", "get_memory_usage"]
+    assert reloaded.find_server_for_tool("get_memory_usage") == "srv"
+
+
+def test_invalidate_and_ttl(tmp_path):
+    """Entries go stale on invalidation, TTL expiry or a changed URL."""
+    cache = MCPCapabilityCache(str(tmp_path), "capabilities.json", ttl_seconds=60)
+    snapshot = cache.store(MCPCapabilitySnapshot(server_id="srv", server_url="http://a", tools=list(TOOLS)))
+    assert not cache.is_fresh("srv", "http://b")
+
+    cache.invalidate("srv")
+    assert not cache.is_fresh("srv")
+    assert cache.get("srv") is snapshot
+
+    cache.store(snapshot)
+    snapshot.fetched_at -= 61
+    assert not cache.is_fresh("srv")
+
+
+@pytest.mark.asyncio
+async def test_refresh_skips_prompts_without_capability(tmp_path):
+    """Prompts are only listed when the server announced prompt support."""
+    cache = MCPCapabilityCache(str(tmp_path), "capabilities.json", ttl_seconds=0)
+    client = _make_client(TOOLS)
+
+    await cache.refresh("srv", "http://a", client, {"tools": {}})
+    client.list_prompts.assert_not_called()
+
+    await cache.refresh("srv", "http://a", client, {"tools": {}, "prompts": {}})
+    client.list_prompts.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+class TestClientManagerCapabilityCache:
+    """Test cases for capability caching in the MCPClientManager."""
+
+    @pytest.fixture
+    def manager(self, tmp_path):
+        config = MCPConfig(
+            server_url="http://localhost:8000",
+            runtime_data_directory=str(tmp_path),
+            server_registry_filename="test_registry.json"
+        )
+        manager = MCPClientManager(config)
+        manager._notify_tool_discovered_event = AsyncMock()
+        return manager
+
+    async def test_connect_lists_tools_once_and_reuses_cache(self, manager):
+        """Connecting lists tools once; reconnecting with a fresh cache skips listing and re-registration."""
+        client = _make_client(TOOLS)
+        connection = MagicMock(server_capabilities={"tools": {"listChanged": True}})
+        connection.disconnect = AsyncMock()
+
+        with patch.object(manager, "_create_client_session", AsyncMock(return_value=(client, connection))):
+            assert await manager.connect_to_server(client.server_url, "it_operations")
+            assert client.list_tools.await_count == 1
+            assert manager._notify_tool_discovered_event.await_count == 1
+
+            assert await manager.connect_to_server(client.server_url, "it_operations")
+            assert client.list_tools.await_count == 1
+            assert manager._notify_tool_discovered_event.await_count == 1
+
+        assert await manager.get_client_for_tool("get_disk_usage") is client
+        assert client.list_tools.await_count == 1
+
+    async def test_list_changed_notification_refreshes(self, manager):
+        """A tools/list_changed notification triggers a refresh and re-registration."""
+        client = _make_client(TOOLS)
+        connection = MagicMock(server_capabilities={"tools": {"listChanged": True}})
+
+        with patch.object(manager, "_create_client_session", AsyncMock(return_value=(client, connection))):
+            assert await manager.connect_to_server(client.server_url)
+        server_id = next(iter(manager.clients))
+
+        client.list_tools.return_value = {"tools": TOOLS[:1]}
+        handler = manager._build_message_handler(server_id)
+        with patch.object(manager, "refresh_server_capabilities", AsyncMock()) as refresh:
+            await handler(ServerNotification(ToolListChangedNotification(method="notifications/tools/list_changed")))
+            assert len(manager._refresh_tasks) == 1
+            await asyncio.gather(*manager._refresh_tasks)
+        assert not manager.capability_cache.is_fresh(server_id)
+        refresh.assert_awaited_once_with(server_id)
+        assert not manager._refresh_tasks
+
+        snapshot = await manager.refresh_server_capabilities(server_id)
+        assert snapshot.tool_names == ["get_disk_usage"]
+        assert manager._notify_tool_discovered_event.await_count == 2
+        assert manager.server_registry.get_server(server_id).capabilities == ["get_disk_usage"]
@@ -0,0 +1,128 @@
+"""
+Tests for the in-process transport of the MCP server.
+"""
+
+import asyncio
+import pytest
+from types import SimpleNamespace
+
+from gcs_kernel.mcp.client_manager import MCPConnection
+from gcs_kernel.mcp.in_process import IN_PROCESS_SERVER_URL, InProcessRPCClient
+from gcs_kernel.mcp.unix_socket import KernelRPCError
+from gcs_kernel.models import ToolResult
+from ui.common.kernel_api import RPCKernelAPIClient
+
+
+class Chunk:
+    """A chunk object that cannot be JSON encoded."""
+
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeRegistry:
+    def get_all_tools(self):
+        return {
+            "echo": SimpleNamespace(
+                description="Echo a message",
+                parameters={"type": "object", "properties": {"message": {"type": "string"}}, "required": ["message"]}
+            )
+        }
+
+
+class FakeToolExecutionManager:
+    async def execute_tool_for_mcp_client(self, tool_name, params):
+        if "message" not in params:
+            raise ValueError("message is required")
+        return ToolResult(tool_name=tool_name, llm_content=params["message"], return_display=params["message"])
+
+
+class FakeKernel:
+    def __init__(self, chunks=None):
+        self.registry = FakeRegistry()
+        self.tool_execution_manager = FakeToolExecutionManager()
+        self.chunks = chunks if chunks is not None else ["in", "-", "process"]
+        self.produced = 0
+
+    def is_running(self):
+        return True
+
+    async def submit_prompt(self, prompt):
+        return f"answer to {prompt}"
+
+    async def stream_prompt(self, prompt):
+        for chunk in self.chunks:
+            self.produced += 1
+            yield chunk
+
+
+@pytest.mark.asyncio
+async def test_stream_passes_chunk_objects_through():
+    chunks = [Chunk("a"), Chunk("b")]
+    client = InProcessRPCClient.for_kernel(FakeKernel(chunks))
+
+    received = [chunk async for chunk in client.stream("ai/stream", {"prompt": "hi"})]
+
+    assert len(received) == 2
+    assert all(got is sent for got, sent in zip(received, chunks))
+
+
+@pytest.mark.asyncio
+async def test_request_and_unknown_method():
+    client = InProcessRPCClient.for_kernel(FakeKernel())
+
+    assert await client.request("ai/process", {"prompt": "hi"}) == {"response": "answer to hi"}
+    with pytest.raises(KernelRPCError):
+        await client.request("no/such/method")
+    with pytest.raises(KernelRPCError):
+        async for _ in client.stream("no/such/stream"):
+            pass
+
+
+@pytest.mark.asyncio
+async def test_stream_producer_stops_when_consumer_stops():
+    kernel = FakeKernel([str(i) for i in range(1000)])
+    client = InProcessRPCClient.for_kernel(kernel, stream_buffer_size=4)
+
+    stream = client.stream("ai/stream", {"prompt": "hi"})
+    assert await stream.__anext__() == "0"
+    await stream.aclose()
+    await asyncio.sleep(0)
+
+    # The producer runs at most the buffer size ahead and is cancelled on close
+    assert kernel.produced < 10
+
+
+@pytest.mark.asyncio
+async def test_mcp_session_over_memory_transport():
+    rpc = InProcessRPCClient.for_kernel(FakeKernel())
+    connection = MCPConnection(IN_PROCESS_SERVER_URL, transport="memory", in_process_server=rpc.server)
+
+    await connection.connect()
+    try:
+        tools = await connection.session.list_tools()
+        assert [tool.name for tool in tools.tools] == ["echo"]
+
+        result = await connection.session.call_tool("echo", {"message": "hello"})
+        assert result.isError is False
+        assert result.content[0].text == "hello"
+
+        with pytest.raises(Exception, match="message is required"):
+            await connection.session.call_tool("echo", {})
+    finally:
+        await connection.disconnect()
+
+
+def test_memory_transport_requires_server():
+    with pytest.raises(ValueError):
+        MCPConnection(IN_PROCESS_SERVER_URL, transport="memory")
+
+
+@pytest.mark.asyncio
+async def test_rpc_kernel_api_client_in_process():
+    api_client = RPCKernelAPIClient(InProcessRPCClient.for_kernel(FakeKernel()))
+    await api_client.connect()
+
+    assert api_client.list_registered_tools() == ["echo"]
+    assert await api_client.send_user_prompt("x") == "answer to x"
+    assert [chunk async for chunk in api_client.stream_user_prompt("x")] == ["in", "-", "process"]
@@ -0,0 +1,150 @@
+"""
+Unit tests for the local MCP server process pool.
+"""
+import asyncio
+import pytest
+from gcs_kernel.mcp.client import MCPClient
+from gcs_kernel.mcp.process_pool import LocalServerProcessPool, LocalServerSpec
+
+
+class FakeConnection:
+    """Connection stand-in whose 'process' can be crashed from the test."""
+
+    def __init__(self):
+        self._closed = asyncio.Event()
+        self.disconnected = False
+
+    def crash(self):
+        self._closed.set()
+
+    async def wait_closed(self):
+        await self._closed.wait()
+
+    async def disconnect(self):
+        self.disconnected = True
+        self._closed.set()
+
+
+class FakeFactory:
+    """Connection factory recording every spawned connection."""
+
+    def __init__(self):
+        self.connections = []
+
+    async def __call__(self, spec):
+        connection = FakeConnection()
+        self.connections.append(connection)
+        return f"client-{len(self.connections)}", connection
+
+
+def _spec(**kwargs):
+    return LocalServerSpec(server_id="srv", server_url="stdio://server --stdio", command="server", **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_lazy_start_on_acquire():
+    """Registered servers only spawn when first acquired, and only once."""
+    factory = FakeFactory()
+    pool = LocalServerProcessPool(factory)
+    pool.register(_spec(lazy_start=True))
+
+    assert factory.connections == []
+    clients = await asyncio.gather(pool.acquire("srv"), pool.acquire("srv"))
+    assert clients == ["client-1", "client-1"]
+    assert len(factory.connections) == 1
+    await pool.shutdown()
+    assert factory.connections[0].disconnected
+
+
+@pytest.mark.asyncio
+async def test_restart_on_crash():
+    """A crashed process is restarted and the start callback sees the new client."""
+    factory = FakeFactory()
+    started, stopped = [], []
+
+    async def on_started(server_id, client, connection):
+        started.append(client)
+
+    async def on_stopped(server_id, reason):
+        stopped.append(reason)
+
+    pool = LocalServerProcessPool(factory, restart_backoff=0.01, on_started=on_started, on_stopped=on_stopped)
+    pool.register(_spec())
+    await pool.acquire("srv")
+
+    factory.connections[0].crash()
+    for _ in range(50):
+        if len(started) == 2:
+            break
+        await asyncio.sleep(0.01)
+
+    assert stopped == ["crashed"]
+    assert started == ["client-1", "client-2"]
+    assert pool.get("srv").running
+    await pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_gives_up_after_max_restarts():
+    """Consecutive crashes beyond max_restarts mark the server failed until acquired again."""
+    factory = FakeFactory()
+    pool = LocalServerProcessPool(factory, max_restarts=1, restart_backoff=0.01)
+    pool.register(_spec())
+    await pool.acquire("srv")
+
+    factory.connections[0].crash()
+    await asyncio.sleep(0.05)
+    factory.connections[1].crash()
+    await asyncio.sleep(0.05)
+
+    assert pool.get("srv").state == "failed"
+    assert await pool.acquire("srv") == "client-3"
+    await pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_idle_servers_are_stopped():
+    """Servers unused for longer than their idle timeout are stopped, and restarted on demand."""
+    factory = FakeFactory()
+    pool = LocalServerProcessPool(factory, idle_check_interval=3600)
+    pool.register(_spec(idle_timeout=0.05))
+    await pool.acquire("srv")
+
+    assert await pool.stop_idle_servers() == []
+    await asyncio.sleep(0.06)
+    assert await pool.stop_idle_servers() == ["srv"]
+    assert pool.get("srv").state == "stopped"
+    assert factory.connections[0].disconnected
+
+    assert await pool.acquire("srv") == "client-2"
+    await pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_servers_with_slow_calls_are_not_idled_out():
+    """A tool call running past the idle timeout keeps its server, and the timeout restarts when it ends."""
+    release = asyncio.Event()
+
+    class SlowSession:
+        async def call_tool(self, name, arguments):
+            await release.wait()
+            return {"content": [], "isError": False}
+
+    async def factory(spec):
+        return MCPClient(SlowSession(), spec.server_url), FakeConnection()
+
+    pool = LocalServerProcessPool(factory, idle_check_interval=3600)
+    pool.register(_spec(idle_timeout=0.05))
+    client = await pool.acquire("srv")
+
+    call = asyncio.create_task(client.call_tool("slow", {}))
+    await asyncio.sleep(0.06)
+    assert pool.get("srv").calls_in_flight == 1
+    assert await pool.stop_idle_servers() == []
+
+    release.set()
+    assert await call == {"content": [], "isError": False}
+    assert await pool.stop_idle_servers() == []
+    await asyncio.sleep(0.06)
+    assert await pool.stop_idle_servers() == ["srv"]
+    await pool.shutdown()
@@ -0,0 +1,163 @@
+"""
+Tests for the Unix domain socket transport of the MCP server.
+"""
+
+import asyncio
+import os
+import pytest
+import pytest_asyncio
+from types import SimpleNamespace
+
+from gcs_kernel.mcp.server import MCPServer
+from gcs_kernel.mcp.client_manager import MCPConnection
+from gcs_kernel.mcp.unix_socket import (
+    UnixSocketRPCClient, KernelRPCError, encode_frame, read_frame
+)
+from gcs_kernel.models import MCPConfig, ToolResult
+from ui.common.kernel_api import UnixSocketKernelAPIClient
+
+
+class FakeRegistry:
+    def get_all_tools(self):
+        return {
+            "echo": SimpleNamespace(
+                description="Echo a message",
+                parameters={"type": "object", "properties": {"message": {"type": "string"}}, "required": ["message"]}
+            )
+        }
+
+
+class FakeToolExecutionManager:
+    async def execute_tool_for_mcp_client(self, tool_name, params):
+        return ToolResult(tool_name=tool_name, llm_content=params["message"], return_display=params["message"])
+
+
+class FakeKernel:
+    def __init__(self):
+        self.registry = FakeRegistry()
+        self.tool_execution_manager = FakeToolExecutionManager()
+
+    def is_running(self):
+        return True
+
+    async def submit_prompt(self, prompt):
+        return f"answer to {prompt}"
+
+    async def stream_prompt(self, prompt):
+        for word in ["streamed", " answer", " to", f" {prompt}"]:
+            await asyncio.sleep(0)
+            yield word
+
+
+@pytest_asyncio.fixture
+async def socket_server(tmp_path):
+    server = MCPServer(MCPConfig(server_url="http://localhost:8000"))
+    server.kernel = FakeKernel()
+    socket_path = str(tmp_path / "kernel.sock")
+    await server.start_unix_socket(socket_path)
+    yield server, socket_path
+    await server.stop_unix_socket()
+
+
+@pytest.mark.asyncio
+async def test_frame_round_trip():
+    reader = asyncio.StreamReader()
+    reader.feed_data(encode_frame(b'{"a":1}') + encode_frame(b""))
+    reader.feed_eof()
+
+    assert await read_frame(reader) == b'{"a":1}'
+    assert await read_frame(reader) == b""
+    assert await read_frame(reader) is None
+
+
+@pytest.mark.asyncio
+async def test_socket_is_private_and_removed_on_stop(socket_server):
+    server, socket_path = socket_server
+    assert os.stat(socket_path).st_mode & 0o777 == 0o600
+
+    await server.stop_unix_socket()
+    assert not os.path.exists(socket_path)
+
+
+@pytest.mark.asyncio
+async def test_only_stale_sockets_are_replaced(tmp_path):
+    server = MCPServer(MCPConfig(server_url="http://localhost:8000"))
+    regular_file = tmp_path / "notes.txt"
+    regular_file.write_text("keep me")
+    with pytest.raises(FileExistsError):
+        await server.start_unix_socket(str(regular_file))
+    assert regular_file.read_text() == "keep me"
+
+    # A socket left behind by a previous run is removed and listened on again
+    socket_path = str(tmp_path / "kernel.sock")
+    stale = await asyncio.start_unix_server(lambda reader, writer: None, path=socket_path)
+    stale.close()
+    await stale.wait_closed()
+    assert await server.start_unix_socket(socket_path) == socket_path
+    await server.stop_unix_socket()
+
+
+@pytest.mark.asyncio
+async def test_rpc_client_request_and_stream(socket_server):
+    _, socket_path = socket_server
+    client = UnixSocketRPCClient(socket_path)
+    try:
+        result = await client.request("ai/process", {"prompt": "hi"})
+        assert result == {"response": "answer to hi"}
+
+        chunks = [chunk async for chunk in client.stream("ai/stream", {"prompt": "hi"})]
+        assert "".join(chunks) == "streamed answer to hi"
+
+        with pytest.raises(KernelRPCError):
+            await client.request("no/such/method")
+    finally:
+        await client.close()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_one_connection(socket_server):
+    _, socket_path = socket_server
+    client = UnixSocketRPCClient(socket_path)
+
+    async def collect(prompt):
+        return "".join([chunk async for chunk in client.stream("ai/stream", {"prompt": prompt})])
+
+    try:
+        results = await asyncio.gather(collect("a"), collect("b"), client.request("ping"))
+        assert results == ["streamed answer to a", "streamed answer to b", {}]
+    finally:
+        await client.close()
+
+
+@pytest.mark.asyncio
+async def test_mcp_session_over_unix_socket(socket_server):
+    _, socket_path = socket_server
+    connection = MCPConnection(f"unix://{socket_path}", transport=MCPConnection.transport_for_url(f"unix://{socket_path}"))
+    assert connection.transport == "unix"
+
+    client = await connection.connect()
+    try:
+        tools = await connection.session.list_tools()
+        assert [tool.name for tool in tools.tools] == ["echo"]
+        assert tools.tools[0].inputSchema["required"] == ["message"]
+
+        result = await connection.session.call_tool("echo", {"message": "hello"})
+        assert result.isError is False
+        assert result.content[0].text == "hello"
+    finally:
+        await connection.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_kernel_api_client_over_unix_socket(socket_server):
+    _, socket_path = socket_server
+    api_client = UnixSocketKernelAPIClient(socket_path)
+    await api_client.connect()
+    try:
+        assert api_client.get_kernel_status() == "Kernel running: True"
+        assert api_client.list_registered_tools() == ["echo"]
+        assert await api_client.send_user_prompt("x") == "answer to x"
+        chunks = [chunk async for chunk in api_client.stream_user_prompt("x")]
+        assert chunks == ["streamed", " answer", " to", " x"]
+    finally:
+        await api_client.close()
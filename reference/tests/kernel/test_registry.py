@@ -141,6 +141,40 @@ class TestToolRegistry:
         assert "shell_command" in tools.keys()
         assert isinstance(tools["shell_command"], ShellCommandTool)
     
+    async def test_tool_catalog_is_reused_until_tools_change(self, registry):
+        """Test that the tool catalog is rebuilt only when the registry changes."""
+        await registry.register_tool(WriteFileTool())
+        await registry.register_tool(ReadFileTool())
+        
+        catalog = registry.get_tool_catalog()
+        assert registry.get_tool_catalog() is catalog
+        assert [tool["function"]["name"] for tool in catalog.tools] == ["read_file", "write_file"]
+        
+        version = registry.version
+        await registry.register_tool(MockTool())
+        assert registry.version > version
+        updated = registry.get_tool_catalog()
+        assert updated is not catalog
+        assert updated.version == registry.version
+        assert len(updated.tools) == 3
+    
+    async def test_direct_tool_changes_bump_the_version(self, registry):
+        """Test that edits to the tools dictionary outside the registry are noticed."""
+        await registry.register_tool(MockTool())
+        catalog = registry.get_tool_catalog()
+        
+        del registry.tools[MockTool.name]
+        assert registry.get_tool_catalog().tools == []
+        
+        # Popping a tool that is not registered keeps the catalog
+        version = registry.version
+        assert registry.tools.pop("unknown", None) is None
+        assert registry.version == version
+        
+        registry.tools = {"read_file": ReadFileTool()}
+        assert [tool["function"]["name"] for tool in registry.get_tool_catalog().tools] == ["read_file"]
+        assert registry.get_tool_catalog().version > catalog.version
+    
     async def test_discover_command_based_tools(self, registry):
         """Test command-based tool discovery."""
         discovered_tools = await registry.discover_command_based_tools()
@@ -0,0 +1,91 @@
+"""
+Unit tests for external tool parameter schemas in the GCS Kernel.
+"""
+import json
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from gcs_kernel.registry import ToolRegistry
+from gcs_kernel.tool_call_model import ToolCall
+from gcs_kernel.tool_execution_manager import ToolExecutionManager
+from gcs_kernel.tool_schema import normalize_parameters_schema, get_schema_validator, is_schema_validator
+
+
+DISK_USAGE_TOOL = {
+    "name": "get_disk_usage",
+    "description": "Get disk usage for a path",
+    "inputSchema": {
+        "$schema": "http://json-schema.org/draft-07/schema#",
+        "type": "object",
+        "properties": {"path": {"type": "string"}},
+        "required": ["path", "unknown"]
+    }
+}
+
+
+def test_normalize_parameters_schema():
+    """MCP inputSchemas are normalized into OpenAI-compatible parameters."""
+    schema = normalize_parameters_schema(DISK_USAGE_TOOL["inputSchema"])
+
+    assert "$schema" not in schema
+    assert schema["properties"] == {"path": {"type": "string"}}
+    assert schema["required"] == ["path"]
+    assert "$schema" in DISK_USAGE_TOOL["inputSchema"]  # The cached definition is left untouched
+    assert normalize_parameters_schema(None) == {"type": "object", "properties": {}, "required": []}
+    assert normalize_parameters_schema({"type": "object"})["properties"] == {}
+
+
+def test_schema_validator_is_compiled_once():
+    """Validators are reused for schemas with the same content."""
+    schema = normalize_parameters_schema(DISK_USAGE_TOOL["inputSchema"])
+    validator = get_schema_validator(schema)
+
+    assert get_schema_validator(json.loads(json.dumps(schema))) is validator
+    assert validator.is_valid({"path": "/"})
+    assert not validator.is_valid({"path": 1})
+
+
+@pytest.mark.asyncio
+async def test_mock_tools_are_validated_against_their_parameters():
+    """A mock's auto-created parameters_validator is not mistaken for a compiled validator."""
+    tool_def = MagicMock()
+    tool_def.parameters = normalize_parameters_schema(DISK_USAGE_TOOL["inputSchema"])
+    manager = ToolExecutionManager(kernel_registry=MagicMock(), mcp_client=MagicMock())
+
+    assert not is_schema_validator(tool_def.parameters_validator)
+    assert manager._get_validator(tool_def) is get_schema_validator(tool_def.parameters)
+    assert not await manager._validate_parameters(tool_def, {"path": 1})
+    assert await manager._validate_parameters(tool_def, {"path": "/"})
+
+
+@pytest.mark.asyncio
+async def test_external_tool_uses_cached_input_schema():
+    """External tools get their description and parameters from the capability cache."""
+    client_manager = MagicMock()
+    client_manager.capability_cache.get_tool_definition.return_value = DISK_USAGE_TOOL
+    registry = ToolRegistry(mcp_client_manager=client_manager)
+
+    assert await registry.register_external_tool("get_disk_usage", "http://localhost:3000/mcp")
+
+    tool = await registry.get_tool("get_disk_usage")
+    assert tool.description == "Get disk usage for a path"
+    assert tool.parameters["properties"] == {"path": {"type": "string"}}
+    assert tool.parameters["required"] == ["path"]
+    client_manager.capability_cache.get_tool_definition.assert_called_once_with(
+        "get_disk_usage", "http://localhost:3000/mcp")
+
+
+@pytest.mark.asyncio
+async def test_invalid_external_arguments_rejected_before_mcp_call():
+    """Malformed arguments for an external tool are answered locally with the schema error."""
+    registry = ToolRegistry()
+    await registry.register_external_tool("get_disk_usage", "http://localhost:3000/mcp", DISK_USAGE_TOOL)
+    mcp_client = AsyncMock()
+    registry.get_mcp_client_for_tool = AsyncMock(return_value=mcp_client)
+    manager = ToolExecutionManager(kernel_registry=registry, mcp_client=mcp_client)
+
+    tool_call = ToolCall(id="call_1", function={"name": "get_disk_usage", "arguments": json.dumps({"path": 42})})
+    result = await manager.execute_tool_call(tool_call)
+
+    assert result["success"] is False
+    assert "Invalid arguments for tool 'get_disk_usage'" in result["result"].llm_content
+    mcp_client.submit_tool_execution.assert_not_called()
@@ -0,0 +1,43 @@
+"""
+Test configuration and fixtures for the orchestrator's session tests.
+"""
+
+import pytest
+
+from services.ai_orchestrator.session_store import SessionStore, SessionStoreConfig
+
+
+def build_turn(index, topic=None):
+    """
+    Messages of one tool-using turn.
+
+    Args:
+        index: Turn number, used in the tool call ID and every message
+        topic: Words added to every message of the turn, if given
+
+    Returns:
+        The user question, the assistant's tool call, the tool output and the answer
+    """
+    call_id = f"call_{index}"
+    text = f"{topic} {index}" if topic else str(index)
+    return [
+        {"role": "user", "content": f"question {text}"},
+        {"role": "assistant", "content": None, "tool_calls": [
+            {"id": call_id, "type": "function", "function": {"name": "read_file", "arguments": "{}"}}]},
+        {"role": "tool", "tool_call_id": call_id, "content": f"output {text}"},
+        {"role": "assistant", "content": f"answer {text}"},
+    ]
+
+
+@pytest.fixture
+def make_turn():
+    """Factory of the messages of one tool-using turn."""
+    return build_turn
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Session store in a temporary directory, resuming sessions from their last 8 messages."""
+    store = SessionStore(SessionStoreConfig(path=str(tmp_path / "sessions.db"), tail_messages=8))
+    yield store
+    store.close()
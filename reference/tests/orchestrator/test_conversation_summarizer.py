@@ -0,0 +1,142 @@
+"""
+Tests for summarizing persisted sessions in the background.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from gcs_kernel.models import PromptObject, PromptStatus, RequestPriority, ToolInclusionPolicy
+from services.ai_orchestrator.conversation_summarizer import (
+    ConversationSummarizer,
+    ConversationSummarizerConfig,
+    render_transcript,
+)
+from services.ai_orchestrator.orchestrator_service import AIOrchestratorService
+from services.ai_orchestrator.session_store import SUMMARY_PREFIX
+from services.llm_provider.context_window import ContextWindowManager, get_tokenizer
+from services.llm_provider.test_mocks import MockContentGenerator
+
+
+class SummaryGenerator:
+    """Content generator answering summarization requests, optionally held until released."""
+
+    def __init__(self, release=None):
+        self.release = release
+        self.requests = []
+
+    async def generate_response(self, prompt_obj):
+        self.requests.append(prompt_obj)
+        if self.release is not None:
+            await self.release.wait()
+        prompt_obj.mark_completed(f"summary {len(self.requests)}")
+
+
+def make_summarizer(store, generator, **config):
+    config = {"keep_messages": 4, "trigger_ratio": 0.5, **config}
+    context_window = ContextWindowManager(max_context_length=100000, tokenizer=get_tokenizer("chars"))
+    return ConversationSummarizer(store, generator, ConversationSummarizerConfig(**config), context_window)
+
+
+def test_transcript_shows_calls_and_shortens_tool_output(make_turn):
+    transcript = render_transcript(make_turn(0)[:3] + [{"role": "tool", "content": "x" * 5000}])
+
+    assert transcript.startswith("User: question 0")
+    assert "Assistant called read_file({})" in transcript
+    assert "Tool result: output 0" in transcript
+    assert len(transcript) < 2500
+
+
+@pytest.mark.asyncio
+async def test_older_turns_are_folded_into_the_summary_incrementally(store, make_turn):
+    generator = SummaryGenerator()
+    summarizer = make_summarizer(store, generator)
+    store.append_messages("s1", make_turn(0) + make_turn(1))
+    assert not await summarizer.summarize_if_needed("s1")
+
+    for index in range(2, 4):
+        store.append_messages("s1", make_turn(index))
+    assert await summarizer.summarize_if_needed("s1")
+
+    # Whole turns are summarized, the latest keep_messages stay verbatim
+    session = store.get_session("s1")
+    assert (session["summary"], session["summary_upto"]) == ("summary 1", 12)
+    request = generator.requests[0]
+    assert request.priority == RequestPriority.BACKGROUND
+    assert request.tool_policy == ToolInclusionPolicy.NONE
+    assert "question 0" in request.content and "question 3" not in request.content
+
+    for index in range(4, 7):
+        store.append_messages("s1", make_turn(index))
+    assert await summarizer.summarize_if_needed("s1")
+
+    # Only the new messages are sent, with the previous summary
+    request = generator.requests[1]
+    assert "Summary so far:\nsummary 1" in request.content
+    assert "question 2" not in request.content and "question 5" in request.content
+    assert store.get_session("s1")["summary_upto"] == 24
+    snapshot = store.load_session("s1")
+    assert snapshot.history()[0]["content"] == SUMMARY_PREFIX + "summary 2"
+    assert snapshot.messages == make_turn(6)
+
+
+@pytest.mark.asyncio
+async def test_token_threshold_triggers_summarization(store, make_turn):
+    summarizer = make_summarizer(store, SummaryGenerator(), trigger_ratio=0.0001)
+    store.append_messages("s1", make_turn(0) + make_turn(1))
+
+    assert await summarizer.summarize_if_needed("s1")
+    assert store.get_session("s1")["summary_upto"] == 4
+
+
+@pytest.mark.asyncio
+async def test_latest_turn_stays_verbatim_without_kept_messages(store, make_turn):
+    summarizer = make_summarizer(store, SummaryGenerator(), keep_messages=0, trigger_ratio=0.0001)
+    store.append_messages("s1", make_turn(0) + make_turn(1))
+
+    assert await summarizer.summarize_if_needed("s1")
+    assert store.load_session("s1").messages == make_turn(1)
+
+
+@pytest.mark.asyncio
+async def test_failures_are_logged_not_raised(store, make_turn):
+    class FailingGenerator:
+        async def generate_response(self, prompt_obj):
+            prompt_obj.mark_error("provider unavailable")
+
+    summarizer = make_summarizer(store, FailingGenerator())
+    store.append_messages("s1", [message for index in range(4) for message in make_turn(index)])
+
+    await summarizer.schedule("s1")
+
+    assert summarizer.get_metrics()["failures"] == 1
+    assert store.get_session("s1")["summary"] is None
+
+
+@pytest.mark.asyncio
+async def test_turns_do_not_wait_for_the_summary(store, make_turn):
+    release = asyncio.Event()
+    generator = SummaryGenerator(release)
+    orchestrator = AIOrchestratorService(AsyncMock())
+    orchestrator.session_store = store
+    orchestrator.summarizer = make_summarizer(store, generator)
+    orchestrator.content_generator = orchestrator.turn_manager.content_generator = MockContentGenerator(response_content="Sure")
+    store.append_messages("s1", [message for index in range(3) for message in make_turn(index)])
+
+    prompt_obj = PromptObject.create(content="next question", streaming_enabled=False, session_id="s1")
+    result = await asyncio.wait_for(orchestrator.handle_ai_interaction(prompt_obj), timeout=5)
+
+    # The turn completed while its session is still being summarized
+    assert result.status == PromptStatus.COMPLETED
+    assert orchestrator.summarizer.get_metrics()["in_progress"] == 1
+
+    release.set()
+    await asyncio.gather(*orchestrator.summarizer._tasks.values())
+    follow_up = PromptObject.create(content="and then?", streaming_enabled=False, session_id="s1")
+    await orchestrator.handle_ai_interaction(follow_up)
+    # The summary is appended to the system context, the only system message
+    history = follow_up.conversation_history
+    assert history[0]["role"] == "system"
+    assert history[0]["content"].endswith("\n\n" + SUMMARY_PREFIX + "summary 1")
+    assert [message["role"] for message in history[1:]].count("system") == 0
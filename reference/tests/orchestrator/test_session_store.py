@@ -0,0 +1,111 @@
+"""
+Tests for persisting conversation sessions and resuming them lazily.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from gcs_kernel.models import PromptObject
+from services.ai_orchestrator.orchestrator_service import AIOrchestratorService
+from services.ai_orchestrator.session_store import SUMMARY_PREFIX, SessionStore, SessionStoreConfig
+from services.llm_provider.test_mocks import MockContentGenerator
+
+
+def test_sessions_survive_reopening_the_store(tmp_path, make_turn):
+    path = str(tmp_path / "sessions.db")
+    store = SessionStore(SessionStoreConfig(path=path))
+    assert store.append_messages("s1", make_turn(0)) == 4
+    assert store.append_messages("s1", make_turn(1)) == 8
+    store.close()
+
+    reopened = SessionStore(SessionStoreConfig(path=path))
+    snapshot = reopened.load_session("s1")
+    assert snapshot.message_count == 8
+    assert snapshot.messages == make_turn(0) + make_turn(1)
+    assert reopened.load_session("unknown") is None
+    assert reopened.list_sessions()[0]["session_id"] == "s1"
+    reopened.close()
+
+
+def test_resuming_loads_the_tail_and_pages_in_older_messages(store, make_turn):
+    for index in range(5):
+        store.append_messages("s1", make_turn(index))
+
+    snapshot = store.load_session("s1", tail_messages=6)
+
+    # The last 6 messages start inside turn 3, so the tail starts at turn 4's question
+    assert snapshot.start == 16
+    assert snapshot.messages == make_turn(4)
+    assert store.load_messages("s1", snapshot.start - 4, snapshot.start) == make_turn(3)
+    assert store.get_metrics()["sessions"] == 1
+
+
+def test_summaries_replace_the_messages_they_cover(store, make_turn):
+    for index in range(3):
+        store.append_messages("s1", make_turn(index))
+    store.set_summary("s1", "The user asked three questions.", upto=8)
+
+    snapshot = store.load_session("s1", tail_messages=12)
+
+    assert snapshot.start == 8
+    # The summary joins the system context in the single leading system message
+    history = snapshot.history("You are an assistant.")
+    assert history[0] == {"role": "system",
+                          "content": "You are an assistant.\n\n" + SUMMARY_PREFIX + "The user asked three questions."}
+    assert history[1:] == make_turn(2)
+    assert snapshot.history()[0]["content"] == SUMMARY_PREFIX + "The user asked three questions."
+
+    store.delete_session("s1")
+    assert store.load_session("s1") is None
+
+
+@pytest.mark.asyncio
+async def test_orchestrator_persists_and_resumes_sessions(store):
+    orchestrator = AIOrchestratorService(AsyncMock())
+    orchestrator.session_store = store
+    orchestrator.set_content_generator(MockContentGenerator(response_content="Hi"))
+
+    first = PromptObject.create(content="Hello", streaming_enabled=False, session_id="s1")
+    await orchestrator.handle_ai_interaction(first)
+    stored = store.load_session("s1")
+    # The system message is rebuilt for every prompt; the answer is stored after the question
+    assert stored.messages == [{"role": "user", "content": "Hello"},
+                               {"role": "assistant", "content": "Hi to: Hello"}]
+
+    # A new prompt of the session, as after a restart, starts from the stored history
+    second = PromptObject.create(content="And again", streaming_enabled=False, session_id="s1")
+    await orchestrator.handle_ai_interaction(second)
+
+    history = second.conversation_history
+    assert history[0]["role"] == "system"
+    assert history[1:] == stored.messages + [{"role": "user", "content": "And again"}]
+    assert store.load_session("s1").message_count == 4
+
+    # Prompts without a session ID are not persisted
+    await orchestrator.handle_ai_interaction(PromptObject.create(content="Anonymous", streaming_enabled=False))
+    assert store.get_metrics()["sessions"] == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_prompts_of_a_session_run_one_turn_at_a_time(store):
+    class SlowContentGenerator(MockContentGenerator):
+        async def generate_response(self, prompt_obj):
+            await asyncio.sleep(0.02)
+            await super().generate_response(prompt_obj)
+
+    orchestrator = AIOrchestratorService(AsyncMock())
+    orchestrator.session_store = store
+    orchestrator.set_content_generator(SlowContentGenerator(response_content="Hi"))
+
+    first, second = (PromptObject.create(content=content, streaming_enabled=False, session_id="s1")
+                     for content in ("One", "Two"))
+    await asyncio.gather(orchestrator.handle_ai_interaction(first), orchestrator.handle_ai_interaction(second))
+
+    # The second prompt resumed after the first turn was stored, so the turns do not interleave
+    turn = [{"role": "user", "content": "One"}, {"role": "assistant", "content": "Hi to: One"}]
+    assert second.conversation_history[1:] == turn + [{"role": "user", "content": "Two"}]
+    assert store.load_session("s1").messages == turn + [{"role": "user", "content": "Two"},
+                                                        {"role": "assistant", "content": "Hi to: Two"}]
+    assert orchestrator._session_locks == {}
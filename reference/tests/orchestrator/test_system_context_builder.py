@@ -0,0 +1,130 @@
+"""
+Tests for the stable system message slot, the system context template cache
+and the tool list handed to prompts.
+"""
+
+import json
+import os
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from gcs_kernel.models import PromptObject
+from gcs_kernel.registry import ToolRegistry
+from services.ai_orchestrator.orchestrator_service import AIOrchestratorService
+from services.ai_orchestrator.system_context_builder import SystemContextBuilder
+from services.llm_provider.providers.openai_converter import OpenAIConverter
+
+
+def write_domain_prompts(directory, info):
+    path = os.path.join(directory, "prompts.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"system_context": {"domain_specific_info": [info]}}, f)
+    return path
+
+
+@pytest.mark.asyncio
+async def test_system_context_occupies_a_single_slot():
+    builder = SystemContextBuilder(MagicMock())
+    prompt_obj = PromptObject.create(content="hello")
+    prompt_obj.conversation_history = [{"role": "user", "content": "earlier question"},
+                                       {"role": "assistant", "content": "earlier answer"}]
+
+    for _ in range(3):
+        assert await builder.build_and_apply_system_context(prompt_obj, model_name="gpt-4-turbo")
+    slot = prompt_obj.conversation_history[0]
+    assert await builder.build_and_apply_system_context(prompt_obj, model_name="gpt-4-turbo")
+
+    roles = [message["role"] for message in prompt_obj.conversation_history]
+    assert roles == ["system", "user", "assistant"]
+    # An unchanged context keeps the very same message
+    assert prompt_obj.conversation_history[0] is slot
+
+    assert await builder.build_and_apply_system_context(prompt_obj, model_name="qwen3-coder")
+    assert [message["role"] for message in prompt_obj.conversation_history] == roles
+    assert prompt_obj.conversation_history[0]["content"] == builder.render_system_context(model_name="qwen3-coder")
+
+
+def test_rendering_is_cached_per_model_style():
+    builder = SystemContextBuilder(MagicMock())
+
+    json_context = builder.render_system_context(model_name="gpt-4-turbo")
+    assert builder.render_system_context(model_name="gpt-4o") is json_context
+    xml_context = builder.render_system_context(model_name="Qwen3-Coder-30B")
+
+    assert xml_context != json_context
+    assert len(builder._template_cache) == 2
+    assert builder.get_model_style("qwen3-coder") == "xml"
+    assert builder.get_model_style(None) == "json"
+
+
+def test_replacing_prompts_invalidates_the_cache():
+    builder = SystemContextBuilder(MagicMock())
+    before = builder.render_system_context()
+
+    builder.prompts = {**builder.prompts, "tool_usage_rules": ["Domain rules."]}
+
+    after = builder.render_system_context()
+    assert after != before
+    assert "Domain rules." in after
+
+
+def test_domain_prompts_are_reloaded_only_when_changed(tmp_path):
+    path = write_domain_prompts(tmp_path, "Domain: astronomy.")
+    builder = SystemContextBuilder(MagicMock(), kernel=SimpleNamespace(current_domain=str(tmp_path)))
+
+    first = builder.render_system_context()
+    assert "Domain: astronomy." in first
+    assert builder.render_system_context() is first
+
+    write_domain_prompts(tmp_path, "Domain: geology.")
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1_000_000))
+    assert "Domain: geology." in builder.render_system_context()
+
+
+@pytest.mark.asyncio
+async def test_available_tools_are_sorted_by_name():
+    tools = {name: SimpleNamespace(name=name, description=f"{name} tool", parameters={})
+             for name in ["write_file", "list_directory", "read_file"]}
+    orchestrator = AIOrchestratorService(MagicMock(), kernel=SimpleNamespace(
+        registry=SimpleNamespace(get_all_tools=lambda: tools)))
+
+    available = await orchestrator._get_available_tools()
+
+    assert [tool["function"]["name"] for tool in available] == ["list_directory", "read_file", "write_file"]
+    assert await orchestrator._get_available_tools() is available
+
+
+@pytest.mark.asyncio
+async def test_tools_listed_over_mcp_are_reused_until_they_change():
+    listed = [{"name": "read_file", "description": "Read a file", "parameters": {}}]
+    mcp_client = MagicMock()
+    mcp_client.list_tools = AsyncMock(side_effect=lambda: {"tools": list(listed)})
+    orchestrator = AIOrchestratorService(mcp_client)
+
+    first = await orchestrator._get_available_tools()
+    assert await orchestrator._get_available_tools() is first
+
+    listed.append({"name": "write_file", "description": "Write a file", "parameters": {}})
+    second = await orchestrator._get_available_tools()
+    assert [tool["function"]["name"] for tool in second] == ["read_file", "write_file"]
+    assert await orchestrator._get_available_tools() is second
+
+
+@pytest.mark.asyncio
+async def test_available_tools_reuse_the_registry_catalog():
+    registry = ToolRegistry()
+    await registry.register_tool(SimpleNamespace(name="read_file", description="Read a file", parameters={},
+                                                 execute=None))
+    orchestrator = AIOrchestratorService.__new__(AIOrchestratorService)
+    orchestrator.kernel = SimpleNamespace(registry=registry)
+    converter = OpenAIConverter("gpt-4-turbo")
+
+    first = await orchestrator._get_available_tools()
+    assert await orchestrator._get_available_tools() is first
+    provider_tools = converter.convert_kernel_tools_to_provider(first)
+    assert converter.convert_kernel_tools_to_provider(first) is provider_tools
+
+    await registry.unregister_tool("read_file")
+    assert await orchestrator._get_available_tools() == []
@@ -0,0 +1,134 @@
+"""
+Tests for sending only the tools relevant to a prompt (CONTEXTUAL_SUBSET).
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from gcs_kernel.models import PromptObject, ToolInclusionPolicy
+from gcs_kernel.registry import ToolCatalog, ToolRegistry
+from services.ai_orchestrator.orchestrator_service import AIOrchestratorService
+from services.ai_orchestrator.tool_selector import ToolSelector, ToolSelectorConfig, tokenize, tool_name
+from services.ai_orchestrator.turn_manager import TurnManager
+
+DOMAIN_TOOLS = {
+    "read_file": ("Read the contents of a file from disk", {"path": "Path of the file to read"}),
+    "write_file": ("Write text to a file, replacing its contents", {"path": "Path of the file to write"}),
+    "list_directory": ("List the entries of a directory", {"path": "Directory to list"}),
+    "shell_command": ("Run a shell command and return its output", {"command": "The command line"}),
+    "get_weather": ("Current weather forecast for a city", {"city": "Name of the city"}),
+}
+
+
+def make_tool(name, description, parameters):
+    return SimpleNamespace(name=name, description=description, execute=None, parameters={
+        "type": "object",
+        "properties": {key: {"type": "string", "description": text} for key, text in parameters.items()},
+    })
+
+
+def make_catalog(filler=100):
+    tools = {name: make_tool(name, *spec) for name, spec in DOMAIN_TOOLS.items()}
+    for index in range(filler):
+        name = f"inventory_report_{index}"
+        tools[name] = make_tool(name, f"Generate inventory report number {index} for the warehouse",
+                                {"warehouse_id": "Identifier of the warehouse"})
+    return ToolCatalog.from_tools(tools).tools
+
+
+def names(tools):
+    return [tool_name(tool) for tool in tools]
+
+
+def test_tokenize_splits_identifiers():
+    assert tokenize("readFile read_file READ-FILE") == ["read", "file"] * 3
+    assert tokenize("What is the weather in Paris?") == ["weather", "paris"]
+
+
+def test_relevant_tools_are_selected():
+    catalog = make_catalog()
+    selector = ToolSelector(ToolSelectorConfig(top_k=3))
+
+    selected = selector.select(catalog, "Please read the file config.yaml")
+
+    assert names(selected) == ["read_file", "write_file"]
+    assert names(selector.select(catalog, "What's the weather like in Oslo?"))[0] == "get_weather"
+    metrics = selector.get_metrics()
+    assert metrics["selections"] == 2
+    assert metrics["tools_sent"] < metrics["tools_offered"]
+
+
+def test_pinned_tools_are_always_sent_and_subsets_are_reused():
+    catalog = make_catalog()
+    selector = ToolSelector(ToolSelectorConfig(top_k=2, pinned_tools=["shell_command", "not_registered"]))
+
+    selected = selector.select(catalog, "What's the weather like in Oslo?")
+
+    assert "shell_command" in names(selected)
+    assert "get_weather" in names(selected)
+    # The same subset is the same list, so its encoded form is reused
+    assert selector.select(catalog, "Weather in Oslo, please") is selected
+
+
+def test_small_catalogs_and_unmatched_prompts_send_every_tool():
+    catalog = make_catalog(filler=0)
+    assert ToolSelector(ToolSelectorConfig(top_k=10)).select(catalog, "read a file") is catalog
+
+    large_catalog = make_catalog()
+    assert ToolSelector(ToolSelectorConfig(top_k=3)).select(large_catalog, "hello there") is large_catalog
+
+
+def test_subsets_expand_to_tools_the_model_calls():
+    catalog = make_catalog()
+    selector = ToolSelector(ToolSelectorConfig(top_k=3))
+    selected = selector.select(catalog, "What's the weather like in Oslo?")
+    assert "write_file" not in names(selected)
+
+    expanded = selector.expand(catalog, selected, ["write_file"])
+    assert set(names(expanded)) == set(names(selected)) | {"write_file"}
+    assert selector.expand(catalog, expanded, ["write_file"]) is expanded
+
+    # An unknown tool name gets the model the whole catalog to choose from
+    assert selector.expand(catalog, selected, ["teleport"]) is catalog
+    assert selector.get_metrics()["expansions"] == 2
+
+
+@pytest.mark.asyncio
+async def test_large_catalogs_use_the_contextual_subset():
+    registry = ToolRegistry()
+    for tool in make_catalog():
+        function = tool["function"]
+        await registry.register_tool(SimpleNamespace(name=function["name"], description=function["description"],
+                                                     parameters=function["parameters"], execute=None))
+    orchestrator = AIOrchestratorService.__new__(AIOrchestratorService)
+    orchestrator.kernel = SimpleNamespace(registry=registry)
+    orchestrator.tool_selector = ToolSelector(ToolSelectorConfig(threshold=50, top_k=5))
+
+    prompt_obj = PromptObject.create(content="list the directory src")
+    await orchestrator._populate_tools(prompt_obj)
+
+    assert prompt_obj.tool_policy == ToolInclusionPolicy.CONTEXTUAL_SUBSET
+    assert names(prompt_obj.custom_tools) == ["list_directory"]
+
+    orchestrator.tool_selector = ToolSelector(ToolSelectorConfig(threshold=500, top_k=5))
+    prompt_obj = PromptObject.create(content="list the directory src")
+    await orchestrator._populate_tools(prompt_obj)
+    assert prompt_obj.tool_policy == ToolInclusionPolicy.ALL_AVAILABLE
+    assert len(prompt_obj.custom_tools) == len(registry.tools)
+
+
+def test_turn_manager_expands_the_subset_for_follow_up_requests():
+    catalog = make_catalog()
+    selector = ToolSelector(ToolSelectorConfig(top_k=3))
+    turn_manager = TurnManager(None, None)
+    turn_manager.tool_selector = selector
+
+    prompt_obj = PromptObject.create(content="What's the weather like in Oslo?",
+                                     tool_policy=ToolInclusionPolicy.CONTEXTUAL_SUBSET)
+    prompt_obj.custom_tools = selector.select(catalog, prompt_obj.content)
+    turn_manager._expand_tools(prompt_obj, [
+        {"id": "call_1", "type": "function", "function": {"name": "shell_command", "arguments": "{}"}}])
+
+    assert "shell_command" in names(prompt_obj.custom_tools)
+    assert "get_weather" in names(prompt_obj.custom_tools)
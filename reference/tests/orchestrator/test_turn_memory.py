@@ -0,0 +1,91 @@
+"""
+Tests for recalling the earlier turns of persisted sessions relevant to a prompt.
+"""
+
+from unittest.mock import AsyncMock
+
+import pytest
+
+from gcs_kernel.models import PromptObject
+from services.ai_orchestrator.orchestrator_service import AIOrchestratorService
+from services.ai_orchestrator.turn_memory import (
+    MEMORY_PREFIX,
+    TurnIndex,
+    TurnMemory,
+    TurnMemoryConfig,
+    split_turns,
+)
+from services.llm_provider.test_mocks import MockContentGenerator
+
+TOPICS = ["billing database migration", "nginx certificate renewal", "kafka consumer lag",
+          "redis memory eviction", "dns resolution failure", "disk quota exceeded"]
+
+
+@pytest.fixture
+def make_turn(make_turn):
+    """Turns about a different incident each."""
+    return lambda index: make_turn(index, TOPICS[index % len(TOPICS)])
+
+
+def test_index_ranks_turns_by_relevance(make_turn):
+    index = TurnIndex()
+    for number in range(4):
+        index.add_turn(number * 4, make_turn(number))
+
+    ranked = index.search("what fixed the kafka lag?", top_k=2)
+
+    assert [number for number, _ in ranked] == [2]
+    assert index.turns[2] == (8, 12)
+    assert index.search("kafka", top_k=2, before=8) == []
+    assert [len(turn) for turn in split_turns(make_turn(0) + make_turn(1))] == [4, 4]
+
+
+def test_sessions_are_indexed_incrementally_from_the_store(store, make_turn, monkeypatch):
+    monkeypatch.setattr("services.ai_orchestrator.turn_memory.INDEX_PAGE_MESSAGES", 3)
+    memory = TurnMemory(store, TurnMemoryConfig(top_k=2, max_sessions=1))
+    for index in range(6):
+        store.append_messages("s1", make_turn(index))
+
+    recalled = memory.retrieve("s1", "the dns resolution problem again", before=16)
+
+    # Turns split across pages are indexed whole; the dns turn (4) is in the recent window
+    assert memory.get_metrics()["turns_indexed"] == 4
+    assert recalled == []
+    recalled = memory.retrieve("s1", "nginx certificate", before=24)
+    assert [turn.start for turn in recalled] == [4]
+    assert recalled[0].messages == make_turn(1)
+    assert memory.get_metrics()["turns_indexed"] == 6
+
+    # Only the most recently used sessions stay indexed
+    store.append_messages("s2", make_turn(0) + make_turn(1))
+    memory.retrieve("s2", "billing", before=4)
+    assert memory.get_metrics()["indexed_sessions"] == 1
+    assert memory.get_metrics()["index_builds"] == 2
+
+
+@pytest.mark.asyncio
+async def test_orchestrator_recalls_relevant_turns_before_the_request(store, make_turn):
+    orchestrator = AIOrchestratorService(AsyncMock())
+    orchestrator.session_store = store
+    orchestrator.turn_memory = TurnMemory(store, TurnMemoryConfig(top_k=1))
+    orchestrator.set_content_generator(MockContentGenerator(response_content="Done"))
+    for index in range(6):
+        store.append_messages("s1", make_turn(index))
+
+    prompt_obj = PromptObject.create(content="Did the redis eviction come back?", streaming_enabled=False,
+                                     session_id="s1")
+    await orchestrator.handle_ai_interaction(prompt_obj)
+
+    # System context and the recent window (turns 4 and 5), then the request with the recalled turn
+    history = prompt_obj.conversation_history
+    assert [message["role"] for message in history].count("system") == 1
+    assert history[1:9] == make_turn(4) + make_turn(5)
+    request = history[9]
+    assert request["role"] == "user"
+    assert request["content"].startswith(MEMORY_PREFIX + "User: question redis memory eviction 3")
+    assert request["content"].endswith("</recalled_turns>\n\nDid the redis eviction come back?")
+
+    # The recalled turn is not stored again
+    stored = store.load_messages("s1", 24, 100)
+    assert stored == [{"role": "user", "content": "Did the redis eviction come back?"},
+                      {"role": "assistant", "content": "Done to: Did the redis eviction come back?"}]
@@ -0,0 +1,36 @@
+"""
+Test configuration and fixtures for pipeline tests.
+"""
+
+import pytest
+
+from services.llm_provider.pipeline import ContentGenerationPipeline
+from services.llm_provider.providers.mock_provider import MockProvider
+from services.llm_provider.rate_limiter import ProviderRateLimiter, RateLimiterConfig
+from services.llm_provider.response_cache import ResponseCache, ResponseCacheConfig
+from services.llm_provider.retry import RetryPolicy
+
+
+@pytest.fixture
+def make_pipeline():
+    """
+    Factory of content generation pipelines isolated from the settings.
+
+    Retries, hedging, the response cache, request coalescing and rate limiting
+    are off unless a test passes the stage it exercises. A client replaces the
+    provider's HTTP client.
+    """
+    def make(provider=None, client=None, **stages):
+        stages.setdefault("retry_policy", RetryPolicy(max_retries=0, base_delay=0))
+        stages.setdefault("stream_resume_policy", RetryPolicy(max_retries=0, base_delay=0))
+        stages.setdefault("hedge_requests", False)
+        stages.setdefault("response_cache", ResponseCache(ResponseCacheConfig(enabled=False)))
+        stages.setdefault("coalesce_requests", False)
+        stages.setdefault("rate_limiter", ProviderRateLimiter(RateLimiterConfig(enabled=False)))
+        pipeline = ContentGenerationPipeline(provider or MockProvider({"api_key": "test", "model": "test-model"}),
+                                             **stages)
+        if client is not None:
+            pipeline.client = client
+        return pipeline
+
+    return make
@@ -0,0 +1,180 @@
+"""
+Tests for fitting conversation histories into the model's context window.
+"""
+
+import json
+
+import pytest
+
+from gcs_kernel.models import PromptObject
+from services.llm_provider import context_window
+from services.llm_provider.context_window import ContextWindowManager, Tokenizer, get_tokenizer
+from services.llm_provider.providers.mock_provider import MockProvider
+
+# One token per word keeps the arithmetic of these tests readable
+WORDS = Tokenizer("words", lambda text: len(text.split()))
+
+
+def words(count, word="word"):
+    return " ".join([word] * count)
+
+
+def tool_turn(index, output_words=10):
+    call_id = f"call_{index}"
+    return [
+        {"role": "user", "content": f"question {index}"},
+        {"role": "assistant", "content": None, "tool_calls": [
+            {"id": call_id, "type": "function", "function": {"name": "read_file", "arguments": "{}"}}]},
+        {"role": "tool", "tool_call_id": call_id, "content": words(output_words, "output")},
+        {"role": "assistant", "content": f"answer {index}"},
+    ]
+
+
+def request_for(messages, max_tokens=10, **extra):
+    return {"model": "m", "messages": messages, "max_tokens": max_tokens, **extra}
+
+
+def test_request_within_budget_is_returned_unchanged():
+    manager = ContextWindowManager(max_context_length=1000, tool_output_tokens=5, tokenizer=WORDS, enabled=True)
+    request = request_for([{"role": "system", "content": "be brief"}] + tool_turn(0))
+
+    assert manager.fit_request(request) is request
+    assert manager.get_metrics()["requests_fitted"] == 0
+
+
+def test_old_tool_outputs_are_trimmed_before_turns_are_dropped():
+    manager = ContextWindowManager(max_context_length=200, tool_output_tokens=5, tokenizer=WORDS, enabled=True)
+    messages = [{"role": "system", "content": "be brief"}] + tool_turn(0, output_words=150) + tool_turn(1)
+
+    fitted = manager.fit_request(request_for(messages))["messages"]
+
+    assert len(fitted) == len(messages)
+    assert fitted[3]["content"].startswith(words(5, "output"))
+    assert "tokens omitted" in fitted[3]["content"]
+    assert manager.count_messages(fitted) <= 200 - 10
+    # The conversation history itself is left alone
+    assert messages[3]["content"] == words(150, "output")
+
+
+def test_oldest_turns_are_dropped_whole():
+    manager = ContextWindowManager(max_context_length=80, tool_output_tokens=5, tokenizer=WORDS, enabled=True)
+    system = {"role": "system", "content": "be brief"}
+    messages = [system] + [message for index in range(6) for message in tool_turn(index)]
+
+    fitted = manager.fit_request(request_for(messages))["messages"]
+
+    assert fitted[0] is system
+    assert fitted[-4:] == messages[-4:]
+    # Every kept turn starts with its user message, so no tool result lost its call
+    assert fitted[1]["role"] == "user"
+    call_ids = {call["id"] for message in fitted for call in message.get("tool_calls") or []}
+    assert all(message["tool_call_id"] in call_ids for message in fitted if message["role"] == "tool")
+    assert manager.count_messages(fitted) <= 80 - 10
+    assert manager.get_metrics()["messages_dropped"] == len(messages) - len(fitted)
+
+
+def test_completion_reserve_and_tools_shrink_the_budget():
+    manager = ContextWindowManager(max_context_length=1000, tool_output_tokens=5, tokenizer=WORDS, enabled=True)
+    tools = [{"type": "function", "function": {"name": "read_file", "description": words(100)}}]
+
+    assert manager.prompt_budget(request_for([], max_tokens=100)) == 900
+    # The reserve is capped at half the window
+    assert manager.prompt_budget(request_for([], max_tokens=5000)) == 500
+    assert manager.prompt_budget(request_for([], max_tokens=100, tools=tools)) == 900 - WORDS.count(
+        json.dumps(tools, separators=(",", ":")))
+
+
+def test_trimmed_tool_outputs_are_reused_across_requests():
+    manager = ContextWindowManager(max_context_length=200, tool_output_tokens=5, tokenizer=WORDS, enabled=True)
+    messages = [{"role": "system", "content": "be brief"}] + tool_turn(0, output_words=150) + tool_turn(1)
+
+    first = manager.fit_request(request_for(messages))["messages"]
+    second = manager.fit_request(request_for(messages + tool_turn(2)))["messages"]
+
+    # The same trimmed copy lets the request encoder reuse its JSON
+    assert second[3] is first[3]
+
+
+def test_latest_turn_is_kept_even_over_budget():
+    manager = ContextWindowManager(max_context_length=40, tool_output_tokens=5, tokenizer=WORDS, enabled=True)
+    messages = [{"role": "system", "content": "be brief"}] + tool_turn(0) + tool_turn(1, output_words=200)
+
+    fitted = manager.fit_request(request_for(messages))["messages"]
+
+    assert [message["role"] for message in fitted] == ["system", "user", "assistant", "tool", "assistant"]
+    assert "tokens omitted" in fitted[3]["content"]
+    assert manager.get_metrics()["requests_over_budget"] == 1
+
+
+def test_message_token_counts_are_cached():
+    calls = []
+    tokenizer = Tokenizer("counting", lambda text: calls.append(text) or len(text.split()))
+    manager = ContextWindowManager(max_context_length=100000, tokenizer=tokenizer, enabled=True)
+    history = [message for index in range(50) for message in tool_turn(index)]
+
+    manager.fit_request(request_for(history))
+    first_calls = len(calls)
+    manager.fit_request(request_for(history))
+    assert len(calls) == first_calls
+
+    history += tool_turn(50)
+    manager.fit_request(request_for(history))
+    # Only the texts of the new turn not seen before are tokenized
+    assert calls[first_calls:] == ["question 50", "answer 50"]
+
+
+def test_long_sessions_stay_within_budget():
+    manager = ContextWindowManager(max_context_length=500, tool_output_tokens=5, tokenizer=WORDS, enabled=True)
+    history = [{"role": "system", "content": "be brief"}]
+    sizes = []
+    for index in range(300):
+        history += tool_turn(index, output_words=30)
+        sizes.append(manager.count_messages(manager.fit_request(request_for(history))["messages"]))
+
+    assert max(sizes) <= 500 - 10
+    assert min(sizes[-100:]) > 400
+
+
+def test_disabled_manager_leaves_requests_alone():
+    manager = ContextWindowManager(max_context_length=10, tokenizer=WORDS, enabled=False)
+    request = request_for(tool_turn(0, output_words=100))
+
+    assert manager.fit_request(request) is request
+
+
+def test_tokenizer_selection(monkeypatch):
+    assert get_tokenizer("chars").count("abcdefghi") == 3
+    with pytest.raises(ValueError):
+        get_tokenizer("sentencepiece")
+
+    real_load = context_window._load_tokenizer
+    monkeypatch.setattr(context_window, "_load_tokenizer",
+                        lambda name, model=None: None if name == "tiktoken" else real_load(name, model))
+    assert get_tokenizer("tiktoken").name == "chars"
+    assert get_tokenizer("auto").name == "chars"
+
+
+@pytest.mark.asyncio
+async def test_pipeline_sends_fitted_history(make_pipeline):
+    sent = []
+
+    def record(request):
+        sent.append(request["messages"])
+        return "ok"
+
+    provider = MockProvider({"api_key": "test", "model": "test-model", "response_delay": 0,
+                             "response_callback": record})
+    pipeline = make_pipeline(provider, context_window=ContextWindowManager(
+        max_context_length=100, tool_output_tokens=5, tokenizer=WORDS, enabled=True))
+    history = [{"role": "system", "content": "be brief"}]
+    history += [message for index in range(20) for message in tool_turn(index)]
+
+    prompt_obj = PromptObject.create(content="latest question", streaming_enabled=False)
+    prompt_obj.conversation_history = history
+    prompt_obj.max_tokens = 10
+    await pipeline.execute(prompt_obj)
+
+    assert sent[0][0]["role"] == "system"
+    assert sent[0][-1]["content"] == "latest question"
+    assert len(sent[0]) < len(history)
+    assert len(prompt_obj.conversation_history) == len(history)
@@ -0,0 +1,141 @@
+"""
+Tests for the shared LLM provider HTTP client pool.
+"""
+
+import asyncio
+import pytest
+import pytest_asyncio
+
+from services.llm_provider.http_pool import HTTPPoolConfig, ProviderClientPool, http2_available
+from services.llm_provider.providers.openai_provider import OpenAIProvider
+
+
+class KeepaliveServer:
+    """Minimal HTTP/1.1 server that keeps connections open and counts them."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.connections = 0
+        self.server = None
+        self.url = None
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        port = self.server.sockets[0].getsockname()[1]
+        self.url = f"http://127.0.0.1:{port}"
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                try:
+                    request = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                if self.delay:
+                    await asyncio.sleep(self.delay)
+                body = b"" if request.startswith(b"HEAD") else b"ok"
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\n" + body)
+                await writer.drain()
+        finally:
+            writer.close()
+
+
+@pytest_asyncio.fixture
+async def http_server():
+    server = KeepaliveServer()
+    await server.start()
+    yield server
+    await server.stop()
+
+
+@pytest_asyncio.fixture
+async def pool():
+    pool = ProviderClientPool(HTTPPoolConfig(max_connections=4, prewarm_connections=2))
+    yield pool
+    await pool.aclose()
+
+
+def test_clients_are_shared_per_endpoint_and_headers(pool):
+    client = pool.get_client("http://llm.local/v1", {"Authorization": "Bearer a"}, 30)
+
+    assert pool.get_client("http://llm.local/v1", {"Authorization": "Bearer a"}, 30) is client
+    assert pool.get_client("http://llm.local/v1", {"Authorization": "Bearer b"}, 30) is not client
+
+
+@pytest.mark.asyncio
+async def test_sequential_requests_reuse_connection(pool, http_server):
+    client = pool.get_client(http_server.url)
+    for _ in range(3):
+        response = await client.get(f"{http_server.url}/chat/completions")
+        assert response.text == "ok"
+
+    metrics = pool.get_metrics()
+    assert http_server.connections == 1
+    assert metrics["requests"] == 3
+    assert metrics["connections_opened"] == 1
+    assert metrics["connections_reused"] == 2
+    assert metrics["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_streamed_response_stays_in_flight_until_closed(pool, http_server):
+    client = pool.get_client(http_server.url)
+
+    async with client.stream("GET", http_server.url) as response:
+        assert pool.metrics.in_flight == 1
+        await response.aread()
+    assert pool.metrics.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_saturation_is_recorded():
+    server = KeepaliveServer(delay=0.05)
+    await server.start()
+    pool = ProviderClientPool(HTTPPoolConfig(max_connections=1))
+    try:
+        client = pool.get_client(server.url)
+        await asyncio.gather(client.get(server.url), client.get(server.url))
+
+        metrics = pool.get_metrics()
+        assert metrics["saturated_requests"] == 1
+        assert metrics["peak_in_flight"] == 2
+        assert server.connections == 1
+
+        # Each client has its own connections, so requests on different clients do not saturate
+        other = pool.get_client(server.url, {"Authorization": "Bearer b"})
+        await asyncio.gather(client.get(server.url), other.get(server.url))
+        assert pool.get_metrics()["saturated_requests"] == 1
+    finally:
+        await pool.aclose()
+        await server.stop()
+
+
+@pytest.mark.asyncio
+async def test_prewarm_opens_reusable_connections(pool, http_server):
+    assert await pool.prewarm(http_server.url) == 2
+    assert http_server.connections == 2
+
+    await pool.get_client(http_server.url).get(http_server.url)
+    assert http_server.connections == 2
+    assert pool.get_metrics()["connections_reused"] == 1
+
+
+@pytest.mark.asyncio
+async def test_prewarm_failure_is_not_raised(pool):
+    assert await pool.prewarm("http://127.0.0.1:1", timeout=1, connections=1) == 0
+
+
+@pytest.mark.skipif(http2_available(), reason="h2 is installed")
+def test_http2_falls_back_without_h2():
+    assert ProviderClientPool(HTTPPoolConfig(http2=True)).http2 is False
+
+
+def test_openai_providers_share_pooled_client():
+    config = {"api_key": "test-key", "model": "gpt-4-test", "base_url": "http://llm.local/v1"}
+
+    assert OpenAIProvider(config).build_client() is OpenAIProvider(config).build_client()
@@ -0,0 +1,258 @@
+"""
+Tests for retry, backoff and hedged requests in ContentGenerationPipeline.
+"""
+
+import asyncio
+import json
+import pytest
+import httpx
+from contextlib import asynccontextmanager
+from email.utils import formatdate
+from unittest.mock import MagicMock
+
+from services.llm_provider.retry import (
+    LatencyTracker, ProviderHTTPError, RetryPolicy, call_with_retry, hedged_call, parse_retry_after
+)
+from gcs_kernel.models import PromptObject
+
+
+OK_BODY = {"choices": [{"message": {"role": "assistant", "content": "done"}}]}
+RETRY_POLICY = RetryPolicy(max_retries=3, base_delay=0)
+
+
+def make_response(status_code, body=None, headers=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    response.json.return_value = body if body is not None else {"error": "busy"}
+    return response
+
+
+class ScriptedClient:
+    """Client returning scripted responses or raising scripted errors in order."""
+
+    def __init__(self, post_script=(), stream_script=()):
+        self.post_script = list(post_script)
+        self.stream_script = list(stream_script)
+        self.post_calls = 0
+        self.stream_calls = 0
+
+    async def post(self, url, json=None):
+        self.post_calls += 1
+        outcome = self.post_script.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    @asynccontextmanager
+    async def stream(self, method, url, json=None):
+        self.stream_calls += 1
+        outcome = self.stream_script.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        yield outcome
+
+
+class FakeStreamResponse:
+    """Streaming response yielding chunks, optionally failing after some of them."""
+
+    def __init__(self, contents, fail_after=None, status_code=200):
+        self.contents = contents
+        self.fail_after = fail_after
+        self.status_code = status_code
+        self.headers = {}
+
+    async def aread(self):
+        return b'{"error": "busy"}'
+
+    async def aiter_bytes(self):
+        for index, content in enumerate(self.contents):
+            if self.fail_after is not None and index == self.fail_after:
+                raise httpx.ReadError("connection reset")
+            yield f"data: {json.dumps({'choices': [{'delta': {'content': content}}]})}\n\n".encode()
+        yield b"data: [DONE]\n\n"
+
+
+def stream_contents(chunks):
+    return [chunk["choices"][0]["delta"]["content"] for chunk in chunks]
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+    assert 0 <= parse_retry_after(formatdate(usegmt=True)) <= 1
+
+
+def test_retry_policy_classifies_errors():
+    policy = RetryPolicy(max_retry_after=30)
+
+    assert policy.is_retryable(ProviderHTTPError(429))
+    assert policy.is_retryable(ProviderHTTPError(503))
+    assert policy.is_retryable(httpx.ConnectError("reset"))
+    assert not policy.is_retryable(ProviderHTTPError(400))
+    assert not policy.is_retryable(ValueError("bad"))
+    assert not policy.is_retryable(ProviderHTTPError(429, retry_after=120))
+
+
+def test_retry_policy_delays():
+    policy = RetryPolicy(base_delay=1, max_delay=5)
+
+    assert all(0 <= policy.compute_delay(attempt) <= min(5, 2 ** attempt) for attempt in range(6))
+    assert policy.compute_delay(0, ProviderHTTPError(429, retry_after=2.5)) == 2.5
+
+
+@pytest.mark.asyncio
+async def test_execute_retries_transient_errors(monkeypatch, make_pipeline):
+    sleeps = []
+
+    async def fake_sleep(delay):
+        sleeps.append(delay)
+
+    monkeypatch.setattr("services.llm_provider.retry.asyncio.sleep", fake_sleep)
+    client = ScriptedClient(post_script=[
+        make_response(429, headers={"retry-after": "2"}),
+        httpx.ConnectError("reset"),
+        make_response(200, OK_BODY),
+    ])
+
+    result = await make_pipeline(client=client, retry_policy=RETRY_POLICY).execute(PromptObject.create(content="hi"))
+
+    assert result == OK_BODY
+    assert client.post_calls == 3
+    assert sleeps[0] == 2.0
+
+
+@pytest.mark.asyncio
+async def test_execute_does_not_retry_client_errors(make_pipeline):
+    client = ScriptedClient(post_script=[make_response(400), make_response(200, OK_BODY)])
+
+    with pytest.raises(ProviderHTTPError) as error:
+        await make_pipeline(client=client, retry_policy=RETRY_POLICY).execute(PromptObject.create(content="hi"))
+
+    assert error.value.status_code == 400
+    assert client.post_calls == 1
+
+
+@pytest.mark.asyncio
+async def test_execute_gives_up_after_max_retries(make_pipeline):
+    client = ScriptedClient(post_script=[make_response(503)] * 3)
+
+    with pytest.raises(ProviderHTTPError):
+        await make_pipeline(client=client, retry_policy=RetryPolicy(max_retries=2, base_delay=0)).execute(
+            PromptObject.create(content="hi"))
+
+    assert client.post_calls == 3
+
+
+@pytest.mark.asyncio
+async def test_stream_retries_before_first_chunk(make_pipeline):
+    client = ScriptedClient(stream_script=[
+        httpx.ConnectError("reset"),
+        FakeStreamResponse([], status_code=503),
+        FakeStreamResponse(["a", "b"]),
+    ])
+
+    pipeline = make_pipeline(client=client, retry_policy=RETRY_POLICY)
+
+    chunks = [chunk async for chunk in pipeline.execute_stream(PromptObject.create(content="hi"))]
+
+    assert stream_contents(chunks) == ["a", "b"]
+    assert client.stream_calls == 3
+
+
+@pytest.mark.asyncio
+async def test_stream_failure_after_first_chunk_is_raised_by_default(make_pipeline):
+    client = ScriptedClient(stream_script=[FakeStreamResponse(["a", "b", "c"], fail_after=1)])
+
+    pipeline = make_pipeline(client=client, retry_policy=RETRY_POLICY)
+
+    received = []
+    with pytest.raises(httpx.ReadError):
+        async for chunk in pipeline.execute_stream(PromptObject.create(content="hi")):
+            received.append(chunk)
+
+    assert stream_contents(received) == ["a"]
+    assert client.stream_calls == 1
+
+
+@pytest.mark.asyncio
+async def test_stream_resume_replays_without_duplicates(make_pipeline):
+    client = ScriptedClient(stream_script=[
+        FakeStreamResponse(["a", "b", "c"], fail_after=2),
+        FakeStreamResponse(["a", "b", "c"]),
+    ])
+    pipeline = make_pipeline(client=client, retry_policy=RETRY_POLICY,
+                             stream_resume_policy=RetryPolicy(max_retries=1, base_delay=0))
+
+    chunks = [chunk async for chunk in pipeline.execute_stream(PromptObject.create(content="hi"))]
+
+    assert stream_contents(chunks) == ["a", "b", "c"]
+    assert client.stream_calls == 2
+
+
+@pytest.mark.asyncio
+async def test_hedged_call_takes_faster_attempt():
+    calls = []
+
+    async def call():
+        calls.append(len(calls))
+        if len(calls) == 1:
+            await asyncio.sleep(10)
+            return "slow"
+        return "fast"
+
+    assert await asyncio.wait_for(hedged_call(call, hedge_delay=0.01), timeout=1) == "fast"
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_hedged_call_survives_one_failed_attempt():
+    calls = []
+
+    async def call():
+        calls.append(len(calls))
+        if len(calls) == 1:
+            await asyncio.sleep(0.02)
+            raise httpx.ReadError("reset")
+        await asyncio.sleep(0.05)
+        return "second"
+
+    assert await hedged_call(call, hedge_delay=0.01) == "second"
+
+
+@pytest.mark.asyncio
+async def test_hedged_call_does_not_hedge_fast_calls():
+    calls = []
+
+    async def call():
+        calls.append(1)
+        return "only"
+
+    assert await hedged_call(call, hedge_delay=1) == "only"
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_call_with_retry_retries_hedged_failures():
+    attempts = []
+
+    async def call():
+        attempts.append(1)
+        if len(attempts) < 2:
+            raise ProviderHTTPError(503)
+        return "ok"
+
+    policy = RetryPolicy(max_retries=2, base_delay=0)
+    assert await call_with_retry(lambda: hedged_call(call, hedge_delay=1), policy) == "ok"
+
+
+def test_latency_tracker_percentile():
+    tracker = LatencyTracker(min_samples=10)
+    for value in range(9):
+        tracker.record(value / 100)
+    assert tracker.percentile(0.95) is None
+
+    for value in range(9, 100):
+        tracker.record(value / 100)
+    assert tracker.percentile(0.95) == 0.95
@@ -0,0 +1,223 @@
+"""
+Tests for the router provider spreading requests over several providers.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from common.settings import settings
+from gcs_kernel.models import PromptObject
+from services.llm_provider.providers.mock_provider import MockProvider
+from services.llm_provider.providers.provider_factory import ProviderFactory
+from services.llm_provider.providers.router_provider import RouterBackend, RouterConfig, RouterProvider
+from services.llm_provider.retry import ProviderHTTPError
+
+
+def mock_backend(name, delay=0.0, should_error=False, model="gpt-4-turbo", model_map=None):
+    provider = MockProvider({"api_key": "test", "model": model, "base_url": f"http://{name}/v1",
+                             "response_content": name, "response_delay": delay, "should_error": should_error})
+    return RouterBackend(provider, name=name, model_map=model_map or {})
+
+
+async def generate(pipeline):
+    response = await pipeline.execute(PromptObject.create(content="hello", streaming_enabled=False))
+    return response["choices"][0]["message"]["content"]
+
+
+@pytest.mark.asyncio
+async def test_requests_go_to_the_faster_backend(make_pipeline):
+    router = RouterProvider({
+        "backends": [mock_backend("slow", delay=0.1), mock_backend("fast", delay=0.005)],
+        "router_config": RouterConfig(health_check_interval=0),
+    })
+    pipeline = make_pipeline(router)
+
+    served = [await generate(pipeline) for _ in range(12)]
+
+    # Each backend is tried once to learn its latency, then the fast one wins every comparison
+    assert served.count("slow") == 1
+    metrics = router.get_metrics()
+    assert metrics["slow"]["latency_ewma"] > metrics["fast"]["latency_ewma"]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_spread_over_equal_backends(make_pipeline):
+    router = RouterProvider({
+        "backends": [mock_backend("a", delay=0.02), mock_backend("b", delay=0.02)],
+        "router_config": RouterConfig(health_check_interval=0),
+    })
+    router.random.seed(0)
+    pipeline = make_pipeline(router)
+    for _ in range(2):
+        await generate(pipeline)
+
+    served = await asyncio.gather(*(generate(pipeline) for _ in range(20)))
+
+    # Requests in flight raise a backend's cost, so a burst does not herd onto one backend
+    assert served.count("a") >= 5 and served.count("b") >= 5
+
+
+@pytest.mark.asyncio
+async def test_error_status_fails_over_and_ejects_the_backend(make_pipeline):
+    router = RouterProvider({
+        "backends": [mock_backend("broken", should_error=True), mock_backend("healthy")],
+        "router_config": RouterConfig(health_check_interval=0, failure_threshold=2),
+    })
+    router.backends[0].latency = 0.0  # Make the broken backend look attractive
+    router.backends[1].latency = 1.0
+    pipeline = make_pipeline(router)
+
+    served = [await generate(pipeline) for _ in range(5)]
+
+    assert served == ["healthy"] * 5
+    metrics = router.get_metrics()
+    assert metrics["broken"]["failures"] == 2
+    assert metrics["broken"]["failovers"] == 2
+    assert metrics["broken"]["ejected"]
+    assert metrics["healthy"]["error_rate"] == 0
+
+
+@pytest.mark.asyncio
+async def test_connection_errors_fail_over(make_pipeline):
+    router = RouterProvider({
+        "backends": [mock_backend("unreachable"), mock_backend("healthy")],
+        "router_config": RouterConfig(health_check_interval=0),
+    })
+    pipeline = make_pipeline(router)
+
+    async def refuse(url, json=None, **kwargs):
+        raise httpx.ConnectError("connection refused")
+
+    router.backends[0].client.post = refuse
+
+    served = [await generate(pipeline) for _ in range(3)]
+
+    assert served == ["healthy"] * 3
+    assert router.get_metrics()["unreachable"]["failures"] >= 1
+
+
+@pytest.mark.asyncio
+async def test_last_backend_error_reaches_the_caller(make_pipeline):
+    router = RouterProvider({
+        "backends": [mock_backend("a", should_error=True), mock_backend("b", should_error=True)],
+        "router_config": RouterConfig(health_check_interval=0),
+    })
+    pipeline = make_pipeline(router)
+
+    with pytest.raises(ProviderHTTPError) as error:
+        await generate(pipeline)
+
+    assert error.value.status_code == 500
+    assert sum(backend["failures"] for backend in router.get_metrics().values()) == 2
+
+
+@pytest.mark.asyncio
+async def test_model_names_are_mapped_per_backend(make_pipeline):
+    seen = {}
+
+    def record(name):
+        def callback(request):
+            seen.setdefault(name, set()).add(request["model"])
+            return name
+        return callback
+
+    mapped = mock_backend("mapped", model_map={"gpt-4-turbo": "Qwen/Qwen3-32B"})
+    default = mock_backend("default", model="llama-3-70b")
+    mapped.provider.set_response_callback(record("mapped"))
+    default.provider.set_response_callback(record("default"))
+    router = RouterProvider({
+        "backends": [mapped, default],
+        "router_config": RouterConfig(health_check_interval=0),
+    })
+    pipeline = make_pipeline(router)
+
+    for _ in range(6):
+        await generate(pipeline)
+    router.backends[0].ejected_until = float("inf")
+    await generate(pipeline)
+
+    assert router.model == "gpt-4-turbo"
+    assert seen == {"mapped": {"Qwen/Qwen3-32B"}, "default": {"llama-3-70b"}}
+
+
+@pytest.mark.asyncio
+async def test_streams_fail_over_before_the_first_chunk(make_pipeline):
+    router = RouterProvider({
+        "backends": [mock_backend("broken", should_error=True), mock_backend("healthy")],
+        "router_config": RouterConfig(health_check_interval=0),
+    })
+    router.backends[0].latency = 0.0
+    router.backends[1].latency = 1.0
+    pipeline = make_pipeline(router)
+
+    prompt_obj = PromptObject.create(content="hello", streaming_enabled=True)
+    chunks = [chunk async for chunk in pipeline.execute_stream(prompt_obj)]
+
+    content = "".join(chunk["choices"][0]["delta"].get("content", "") for chunk in chunks)
+    assert content == "healthy"
+    metrics = router.get_metrics()
+    assert metrics["broken"]["failovers"] == 1
+    assert metrics["healthy"]["latency_ewma"] is not None
+    assert metrics["healthy"]["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_health_checks_eject_and_reinstate_backends(make_pipeline):
+    flaky = mock_backend("flaky")
+    router = RouterProvider({
+        "backends": [flaky, mock_backend("healthy")],
+        "router_config": RouterConfig(health_check_interval=0.02),
+    })
+    pipeline = make_pipeline(router)
+    try:
+        await generate(pipeline)
+
+        flaky.provider.should_error = True
+        await asyncio.sleep(0.1)
+        assert router.get_metrics()["flaky"]["ejected"]
+        assert [await generate(pipeline) for _ in range(3)] == ["healthy"] * 3
+
+        flaky.provider.should_error = False
+        await asyncio.sleep(0.1)
+        assert not router.get_metrics()["flaky"]["ejected"]
+    finally:
+        await router.close()
+
+
+@pytest.mark.asyncio
+async def test_model_info_reports_the_smallest_context_length():
+    router = RouterProvider({
+        "backends": [mock_backend("large", model="gpt-4"), mock_backend("small", model="gpt-3.5-turbo")],
+        "router_config": RouterConfig(health_check_interval=0),
+    })
+
+    info = await router.get_model_info("gpt-4-turbo")
+
+    assert info["id"] == "gpt-4-turbo"
+    assert info["max_context_length"] == 16384
+
+
+def test_router_is_created_from_settings(monkeypatch):
+    monkeypatch.setattr(settings, "llm_provider_type", "router")
+    monkeypatch.setattr(settings, "llm_api_key", "test-key")
+    monkeypatch.setattr(settings, "llm_model", "gpt-4-turbo")
+    monkeypatch.setattr(settings, "llm_router_backends", [
+        {"name": "primary", "base_url": "https://primary.example/v1"},
+        {"name": "local", "type": "mock", "base_url": "http://localhost:8001/v1",
+         "model_map": {"gpt-4-turbo": "Qwen/Qwen3-32B"}},
+    ])
+
+    router = ProviderFactory().create_provider_from_settings()
+
+    assert isinstance(router, RouterProvider)
+    assert [backend.name for backend in router.backends] == ["primary", "local"]
+    assert router.backends[0].provider.api_key == "test-key"
+    assert router.backends[0].map_model("gpt-4-turbo") == "gpt-4-turbo"
+    assert router.backends[1].map_model("gpt-4-turbo") == "Qwen/Qwen3-32B"
+    assert isinstance(router.backends[1].provider, MockProvider)
+
+    monkeypatch.setattr(settings, "llm_router_backends", [])
+    with pytest.raises(ValueError):
+        ProviderFactory().create_provider_from_settings()
@@ -0,0 +1,213 @@
+"""
+Tests for client-side rate limiting and adaptive concurrency of provider requests.
+"""
+
+import asyncio
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from gcs_kernel.models import PromptObject, RequestPriority
+from services.llm_provider.rate_limiter import (
+    AIMDController, ProviderRateLimiter, RateLimiterConfig, TokenBucket, estimate_request_tokens
+)
+from services.llm_provider.retry import ProviderHTTPError
+
+REQUEST = {"model": "m", "messages": [{"role": "user", "content": "x" * 400}], "max_tokens": 100}
+
+
+async def hold_slot(limiter, order, name, release, priority=RequestPriority.INTERACTIVE):
+    async with limiter.slot(REQUEST, priority):
+        order.append(name)
+        await release.wait()
+
+
+def test_estimate_request_tokens():
+    estimate = estimate_request_tokens(REQUEST)
+
+    assert 100 + 400 // 4 <= estimate <= 100 + 450 // 4
+    assert estimate_request_tokens({"messages": []}) == 0
+
+
+def test_token_bucket_refills_over_time():
+    bucket = TokenBucket(rate_per_minute=60, capacity=2)
+    now = time.monotonic()
+
+    assert bucket.time_until_available(2, now) == 0
+    bucket.consume(2)
+    assert bucket.time_until_available(1, now) == pytest.approx(1.0, abs=0.01)
+    assert bucket.time_until_available(1, now + 1.0) == 0
+    # Oversized requests wait for a full bucket instead of forever
+    assert bucket.time_until_available(10, now + 1.0) == pytest.approx(1.0, abs=0.01)
+    bucket.refund(5)
+    assert bucket.level == 2
+
+    assert TokenBucket(0).time_until_available(10 ** 9, now) == 0
+
+
+def test_aimd_grows_per_round_and_halves_on_overload():
+    controller = AIMDController(initial=4, maximum=8)
+    start = time.monotonic()
+
+    for _ in range(4):
+        controller.on_success(0.1, start)
+    assert controller.concurrency == 4
+    assert controller.limit > 4.9
+
+    assert controller.on_overload(time.monotonic())
+    assert controller.concurrency == 2
+    # Requests admitted before the decrease don't decrease it again
+    assert not controller.on_overload(start)
+    assert controller.concurrency == 2
+
+    controller.on_overload(time.monotonic())
+    controller.on_overload(time.monotonic())
+    assert controller.concurrency == 1
+
+
+def test_aimd_latency_spike_counts_as_overload():
+    controller = AIMDController(initial=8, min_latency_samples=5, latency_spike_factor=3)
+    for _ in range(5):
+        controller.on_success(0.1, time.monotonic())
+
+    assert not controller.on_success(0.2, time.monotonic())
+    assert controller.on_success(1.0, time.monotonic())
+    assert controller.concurrency == 4
+
+
+@pytest.mark.asyncio
+async def test_concurrency_limit_queues_requests():
+    limiter = ProviderRateLimiter(RateLimiterConfig(initial_concurrency=2, max_concurrency=2))
+    order, release = [], asyncio.Event()
+
+    tasks = [asyncio.create_task(hold_slot(limiter, order, index, release)) for index in range(5)]
+    await asyncio.sleep(0.01)
+
+    assert order == [0, 1]
+    assert limiter.get_metrics()["waiting"] == 3
+    release.set()
+    await asyncio.gather(*tasks)
+    assert order == [0, 1, 2, 3, 4]
+    assert limiter.in_flight == 0
+    assert limiter.get_metrics()["queued"] == 3
+
+
+@pytest.mark.asyncio
+async def test_interactive_requests_go_before_background():
+    limiter = ProviderRateLimiter(RateLimiterConfig(initial_concurrency=1, max_concurrency=1))
+    order, release = [], asyncio.Event()
+
+    first = asyncio.create_task(hold_slot(limiter, order, "running", release))
+    await asyncio.sleep(0)
+    background = [asyncio.create_task(hold_slot(limiter, order, f"background{index}", release,
+                                                RequestPriority.BACKGROUND)) for index in range(2)]
+    await asyncio.sleep(0)
+    interactive = asyncio.create_task(hold_slot(limiter, order, "interactive", release))
+    await asyncio.sleep(0)
+
+    release.set()
+    await asyncio.gather(first, interactive, *background)
+    assert order == ["running", "interactive", "background0", "background1"]
+    assert limiter.get_metrics()["admitted_background"] == 2
+
+
+@pytest.mark.asyncio
+async def test_request_quota_spaces_out_requests():
+    limiter = ProviderRateLimiter(RateLimiterConfig())
+    limiter.request_bucket = TokenBucket(rate_per_minute=1200, capacity=1)
+
+    started = time.monotonic()
+    for _ in range(3):
+        async with limiter.slot(REQUEST):
+            pass
+
+    # One request immediately, then one every 50ms
+    assert time.monotonic() - started >= 0.09
+
+
+@pytest.mark.asyncio
+async def test_overload_shrinks_limit_and_pauses_for_retry_after():
+    limiter = ProviderRateLimiter(RateLimiterConfig(initial_concurrency=4))
+
+    with pytest.raises(ProviderHTTPError):
+        async with limiter.slot(REQUEST):
+            raise ProviderHTTPError(429, retry_after=0.1)
+
+    assert limiter.controller.concurrency == 2
+    started = time.monotonic()
+    async with limiter.slot(REQUEST):
+        pass
+    assert time.monotonic() - started >= 0.08
+    assert limiter.get_metrics()["overloads"] == 1
+
+
+@pytest.mark.asyncio
+async def test_other_errors_and_cancellation_release_the_slot():
+    limiter = ProviderRateLimiter(RateLimiterConfig(initial_concurrency=1, max_concurrency=1))
+    release = asyncio.Event()
+
+    with pytest.raises(ValueError):
+        async with limiter.slot(REQUEST):
+            raise ValueError("bad request")
+    assert limiter.controller.concurrency == 1
+
+    holder = asyncio.create_task(hold_slot(limiter, [], "holder", release))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(hold_slot(limiter, [], "waiter", release))
+    await asyncio.sleep(0)
+    waiter.cancel()
+    release.set()
+    await holder
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    assert limiter.in_flight == 0
+    async with limiter.slot(REQUEST):
+        assert limiter.in_flight == 1
+
+
+@pytest.mark.asyncio
+async def test_token_quota_is_corrected_with_reported_usage():
+    limiter = ProviderRateLimiter(RateLimiterConfig(tokens_per_minute=1000))
+    slot = limiter.slot(REQUEST)
+
+    async with slot:
+        slot.record_usage(50)
+
+    assert limiter.token_bucket.level == pytest.approx(1000 - 50, abs=1)
+
+
+@pytest.mark.asyncio
+async def test_pipeline_admits_background_prompts_after_interactive_ones(make_pipeline):
+    order = []
+    release = asyncio.Event()
+
+    class BlockingClient:
+        async def post(self, url, json=None):
+            order.append(json["messages"][-1]["content"])
+            await release.wait()
+            response = MagicMock()
+            response.status_code = 200
+            response.headers = {}
+            response.json.return_value = {"choices": [{"message": {"role": "assistant", "content": "ok"}}],
+                                          "usage": {"total_tokens": 10}}
+            return response
+
+    pipeline = make_pipeline(client=BlockingClient(), rate_limiter=ProviderRateLimiter(
+        RateLimiterConfig(initial_concurrency=1, max_concurrency=1)))
+
+    def run(content, priority):
+        prompt_obj = PromptObject.create(content=content, streaming_enabled=False, priority=priority)
+        return asyncio.create_task(pipeline.execute(prompt_obj))
+
+    tasks = [run("first", RequestPriority.INTERACTIVE)]
+    await asyncio.sleep(0.01)
+    tasks.append(run("adaptation", RequestPriority.BACKGROUND))
+    await asyncio.sleep(0)
+    tasks.append(run("user turn", RequestPriority.INTERACTIVE))
+    await asyncio.sleep(0.01)
+
+    release.set()
+    await asyncio.gather(*tasks)
+    assert order == ["first", "user turn", "adaptation"]
@@ -0,0 +1,238 @@
+"""
+Tests for single-flight coalescing of concurrent identical LLM requests.
+"""
+
+import asyncio
+import json
+import pytest
+from contextlib import asynccontextmanager
+from unittest.mock import MagicMock
+
+from services.llm_provider.providers.openai_provider import OpenAIProvider
+from services.llm_provider.single_flight import SingleFlight
+from gcs_kernel.models import PromptObject
+
+
+class SlowClient:
+    """Client whose responses take a while, so concurrent requests overlap."""
+
+    def __init__(self, delay=0.05, contents=("a", "b", "c")):
+        self.delay = delay
+        self.contents = contents
+        self.post_calls = 0
+        self.stream_calls = 0
+
+    async def post(self, url, json=None):
+        self.post_calls += 1
+        await asyncio.sleep(self.delay)
+        response = MagicMock()
+        response.status_code = 200
+        response.headers = {}
+        response.json.return_value = {"choices": [{"message": {"role": "assistant", "content": "shared"}}]}
+        return response
+
+    @asynccontextmanager
+    async def stream(self, method, url, json=None):
+        self.stream_calls += 1
+        yield SlowStreamResponse(self.contents, self.delay)
+
+
+class SlowStreamResponse:
+    """Streaming response spreading its chunks over the delay."""
+
+    status_code = 200
+    headers = {}
+
+    def __init__(self, contents, delay):
+        self.contents = contents
+        self.delay = delay
+
+    async def aiter_bytes(self):
+        for content in self.contents:
+            await asyncio.sleep(self.delay / len(self.contents))
+            yield f"data: {json.dumps({'choices': [{'delta': {'content': content}}]})}\n\n".encode()
+        yield b"data: [DONE]\n\n"
+
+
+async def collect(stream):
+    return [chunk["choices"][0]["delta"]["content"] async for chunk in stream]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_upstream_call():
+    flights = SingleFlight()
+    calls = []
+
+    async def call():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"value": 1}
+
+    results = await asyncio.gather(*(flights.call("key", call) for _ in range(5)))
+
+    assert len(calls) == 1
+    assert all(result == {"value": 1} for result in results)
+    # Joined callers get their own copy of the result
+    assert len({id(result) for result in results}) == 5
+    assert flights.get_metrics()["coalesced_calls"] == 4
+
+
+@pytest.mark.asyncio
+async def test_finished_flight_is_not_reused():
+    flights = SingleFlight()
+    calls = []
+
+    async def call():
+        calls.append(1)
+        return len(calls)
+
+    assert await flights.call("key", call) == 1
+    assert await flights.call("key", call) == 2
+
+
+@pytest.mark.asyncio
+async def test_errors_reach_every_caller():
+    flights = SingleFlight()
+
+    async def call():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("provider down")
+
+    results = await asyncio.gather(*(flights.call("key", call) for _ in range(3)), return_exceptions=True)
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_shared_call():
+    flights = SingleFlight()
+
+    async def call():
+        await asyncio.sleep(0.05)
+        return "done"
+
+    first = asyncio.ensure_future(flights.call("key", call))
+    second = asyncio.ensure_future(flights.call("key", call))
+    await asyncio.sleep(0.01)
+    first.cancel()
+
+    assert await second == "done"
+
+
+@pytest.mark.asyncio
+async def test_stream_fans_out_to_late_subscribers():
+    flights = SingleFlight()
+    opened = []
+
+    async def source():
+        opened.append(1)
+        for index in range(4):
+            await asyncio.sleep(0.01)
+            yield index
+
+    async def subscribe(delay):
+        await asyncio.sleep(delay)
+        return [chunk async for chunk in flights.stream("key", source)]
+
+    results = await asyncio.gather(subscribe(0), subscribe(0.025))
+
+    assert len(opened) == 1
+    assert results == [[0, 1, 2, 3], [0, 1, 2, 3]]
+
+
+@pytest.mark.asyncio
+async def test_upstream_stream_is_cancelled_when_last_subscriber_leaves():
+    flights = SingleFlight()
+    produced = []
+
+    async def source():
+        for index in range(1000):
+            await asyncio.sleep(0.001)
+            produced.append(index)
+            yield index
+
+    stream = flights.stream("key", source)
+    assert await stream.__anext__() == 0
+    await stream.aclose()
+    await asyncio.sleep(0.02)
+
+    assert len(produced) < 10
+
+
+@pytest.mark.asyncio
+async def test_pipeline_coalesces_identical_requests(make_pipeline):
+    client = SlowClient()
+    pipeline = make_pipeline(client=client, coalesce_requests=True)
+
+    results = await asyncio.gather(*(pipeline.execute(PromptObject.create(content="same", temperature=0.0)) for _ in range(4)))
+
+    assert client.post_calls == 1
+    assert all(result["choices"][0]["message"]["content"] == "shared" for result in results)
+
+
+@pytest.mark.asyncio
+async def test_pipeline_does_not_coalesce_different_requests(make_pipeline):
+    client = SlowClient()
+    pipeline = make_pipeline(client=client, coalesce_requests=True)
+
+    await asyncio.gather(
+        pipeline.execute(PromptObject.create(content="one", temperature=0.0)),
+        pipeline.execute(PromptObject.create(content="two", temperature=0.0)),
+    )
+
+    assert client.post_calls == 2
+
+
+@pytest.mark.asyncio
+async def test_pipeline_does_not_coalesce_sampled_requests(make_pipeline):
+    client = SlowClient()
+    pipeline = make_pipeline(client=client, coalesce_requests=True)
+
+    await asyncio.gather(*(pipeline.execute(PromptObject.create(content="same", temperature=0.7)) for _ in range(3)))
+    await asyncio.gather(
+        *(collect(pipeline.execute_stream(PromptObject.create(content="same", temperature=0.7))) for _ in range(2))
+    )
+
+    # Each caller of a sampled request gets its own completion
+    assert client.post_calls == 3
+    assert client.stream_calls == 2
+
+
+@pytest.mark.asyncio
+async def test_pipeline_coalescing_can_be_disabled(make_pipeline):
+    client = SlowClient()
+    pipeline = make_pipeline(client=client, coalesce_requests=False)
+
+    await asyncio.gather(*(pipeline.execute(PromptObject.create(content="same", temperature=0.0)) for _ in range(3)))
+
+    assert client.post_calls == 3
+
+
+@pytest.mark.asyncio
+async def test_pipeline_fans_out_identical_streams(make_pipeline):
+    client = SlowClient()
+    pipeline = make_pipeline(client=client, coalesce_requests=True)
+
+    results = await asyncio.gather(
+        *(collect(pipeline.execute_stream(PromptObject.create(content="same", temperature=0.0))) for _ in range(3))
+    )
+
+    assert client.stream_calls == 1
+    assert results == [["a", "b", "c"]] * 3
+
+
+@pytest.mark.asyncio
+async def test_model_info_probes_are_coalesced(monkeypatch):
+    provider = OpenAIProvider({"api_key": "test-key", "model": "gpt-4-test"})
+    probes = []
+
+    async def fetch(model_name):
+        probes.append(model_name)
+        await asyncio.sleep(0.01)
+        return {"id": model_name, "max_context_length": 8192, "capabilities": {}}
+
+    monkeypatch.setattr(provider, "_fetch_model_info", fetch)
+    results = await asyncio.gather(*(provider.get_model_info("gpt-4-test") for _ in range(3)))
+
+    assert probes == ["gpt-4-test"]
+    assert all(result["max_context_length"] == 8192 for result in results)
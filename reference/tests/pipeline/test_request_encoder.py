@@ -0,0 +1,112 @@
+"""
+Tests for assembling provider request bodies from cached JSON fragments.
+"""
+
+import json
+
+import httpx
+import pytest
+
+from gcs_kernel.models import PromptObject
+from services.llm_provider.pipeline import ContentGenerationPipeline
+from services.llm_provider.providers.mock_provider import MockProvider
+from services.llm_provider.rate_limiter import ProviderRateLimiter, RateLimiterConfig
+from services.llm_provider.request_encoder import RequestEncoder, request_body_kwargs
+from services.llm_provider.response_cache import ResponseCache, ResponseCacheConfig
+
+TOOLS = [{"type": "function", "function": {"name": f"tool_{index}", "description": "Does things",
+                                           "parameters": {"type": "object", "properties": {}}}}
+         for index in range(3)]
+
+
+def make_history(turns):
+    history = [{"role": "system", "content": "Be brief."}]
+    for index in range(turns):
+        history.append({"role": "user", "content": f"question {index} — ünïcode"})
+        history.append({"role": "assistant", "content": f"answer {index}"})
+    return history
+
+
+def test_encoded_body_matches_the_request():
+    encoder = RequestEncoder()
+    request = {"messages": make_history(2), "model": "m", "tools": TOOLS, "max_tokens": 10, "stream": True}
+
+    body = encoder.encode(request)
+
+    assert json.loads(body) == request
+    assert list(json.loads(body)) == list(request)
+
+
+def test_only_new_messages_are_encoded():
+    encoder = RequestEncoder()
+    history = make_history(50)
+    encoder.encode({"messages": list(history), "model": "m", "tools": TOOLS})
+    assert encoder.get_metrics()["messages_encoded"] == len(history)
+
+    history.append({"role": "user", "content": "one more question"})
+    body = encoder.encode({"messages": list(history), "model": "m", "tools": TOOLS})
+
+    metrics = encoder.get_metrics()
+    assert metrics["messages_encoded"] == len(history)
+    assert metrics["messages_reused"] == len(history) - 1
+    assert metrics["tools_encoded"] == 1 and metrics["tools_reused"] == 1
+    assert json.loads(body)["messages"] == history
+
+
+def test_changed_messages_and_tools_are_encoded_again():
+    encoder = RequestEncoder()
+    message = {"role": "user", "content": "first"}
+    encoder.encode({"messages": [message], "tools": TOOLS})
+
+    message["content"] = "second"
+    tools = TOOLS[:1]
+    body = json.loads(encoder.encode({"messages": [message], "tools": tools}))
+
+    assert body["messages"][0]["content"] == "second"
+    assert body["tools"] == tools
+    assert encoder.get_metrics()["messages_encoded"] == 2
+
+
+def test_only_httpx_clients_are_sent_bytes():
+    encoder = RequestEncoder()
+    request = {"messages": [], "model": "m"}
+
+    assert request_body_kwargs(object(), request, encoder) == {"json": request}
+    kwargs = request_body_kwargs(httpx.AsyncClient(), request, encoder)
+    assert json.loads(kwargs["content"]) == request
+    assert kwargs["headers"]["Content-Type"] == "application/json"
+
+
+@pytest.mark.asyncio
+async def test_pipeline_sends_the_encoded_body():
+    bodies = []
+
+    def handler(request):
+        bodies.append(json.loads(request.content))
+        return httpx.Response(200, json={"choices": [{"index": 0, "finish_reason": "stop",
+                                                      "message": {"role": "assistant", "content": "ok"}}]})
+
+    provider = MockProvider({"api_key": "test", "model": "test-model"})
+    pipeline = ContentGenerationPipeline(
+        provider,
+        response_cache=ResponseCache(ResponseCacheConfig(enabled=False)),
+        rate_limiter=ProviderRateLimiter(RateLimiterConfig(enabled=False)),
+    )
+    pipeline.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    history = make_history(20)
+
+    for turn in range(2):
+        prompt_obj = PromptObject.create(content=f"turn {turn}", streaming_enabled=False)
+        prompt_obj.conversation_history = history
+        prompt_obj.custom_tools = TOOLS
+        response = await pipeline.execute(prompt_obj)
+        assert response["choices"][0]["message"]["content"] == "ok"
+    await pipeline.client.aclose()
+
+    assert bodies[1]["messages"][:-1] == history
+    assert bodies[1]["messages"][-1]["content"] == "turn 1"
+    assert bodies[1]["tools"] == TOOLS
+    metrics = pipeline.request_encoder.get_metrics()
+    # Apart from the history, each request only encoded its new user message
+    assert metrics["messages_encoded"] == len(history) + 2
+    assert metrics["tools_encoded"] == 1
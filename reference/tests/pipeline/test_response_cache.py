@@ -0,0 +1,203 @@
+"""
+Tests for the exact-match LLM response cache.
+"""
+
+import copy
+import json
+import pytest
+from contextlib import asynccontextmanager
+from unittest.mock import MagicMock
+
+from services.llm_provider.response_cache import (
+    ResponseCache, ResponseCacheConfig, request_cache_key, response_to_stream_chunks
+)
+from gcs_kernel.models import PromptObject
+
+
+OK_BODY = {"choices": [{"index": 0, "message": {"role": "assistant", "content": "cached answer"},
+                        "finish_reason": "stop"}]}
+REQUEST = {"model": "m", "messages": [{"role": "user", "content": "hi"}]}
+
+
+class FakeStreamResponse:
+    """Streaming response yielding one content chunk per item."""
+
+    status_code = 200
+    headers = {}
+
+    def __init__(self, contents):
+        self.contents = contents
+
+    async def aiter_bytes(self):
+        for content in self.contents:
+            yield f"data: {json.dumps({'choices': [{'delta': {'content': content}}]})}\n\n".encode()
+        yield b"data: [DONE]\n\n"
+
+
+class CountingClient:
+    """Client answering every request with the same completion and counting calls."""
+
+    def __init__(self, contents=("a", "b")):
+        self.contents = contents
+        self.post_calls = 0
+        self.stream_calls = 0
+
+    async def post(self, url, json=None):
+        self.post_calls += 1
+        response = MagicMock()
+        response.status_code = 200
+        response.headers = {}
+        response.json.return_value = copy.deepcopy(OK_BODY)
+        return response
+
+    @asynccontextmanager
+    async def stream(self, method, url, json=None):
+        self.stream_calls += 1
+        yield FakeStreamResponse(self.contents)
+
+
+def make_prompt(temperature=0.0):
+    return PromptObject.create(content="hi", temperature=temperature)
+
+
+def test_cache_key_ignores_per_call_fields():
+    key = request_cache_key(REQUEST)
+
+    assert request_cache_key({**REQUEST, "user": "prompt-1", "stream": True}) == key
+    assert request_cache_key(dict(reversed(list(REQUEST.items())))) == key
+    assert request_cache_key({**REQUEST, "temperature": 0.2}) != key
+    assert request_cache_key({**REQUEST, "tools": [{"type": "function"}]}) != key
+
+
+def test_response_to_stream_chunks():
+    response = {"choices": [{"message": {"role": "assistant", "content": "x", "tool_calls": [
+        {"id": "call_1", "type": "function", "function": {"name": "f", "arguments": "{}"}}
+    ]}, "finish_reason": "tool_calls"}]}
+
+    chunks = response_to_stream_chunks(response)
+
+    assert len(chunks) == 1
+    delta = chunks[0]["choices"][0]["delta"]
+    assert delta["content"] == "x"
+    assert delta["tool_calls"][0]["index"] == 0
+    assert delta["tool_calls"][0]["function"]["name"] == "f"
+    assert chunks[0]["choices"][0]["finish_reason"] == "tool_calls"
+
+
+@pytest.mark.asyncio
+async def test_execute_serves_repeated_request_from_cache(make_pipeline):
+    client = CountingClient()
+    pipeline = make_pipeline(client=client, response_cache=ResponseCache(ResponseCacheConfig(enabled=True)))
+
+    first = await pipeline.execute(make_prompt())
+    first["choices"][0]["message"]["content"] = "mutated by caller"
+    second = await pipeline.execute(make_prompt())
+
+    assert client.post_calls == 1
+    assert second == OK_BODY
+    assert pipeline.response_cache.get_metrics()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_sampled_requests_bypass_cache(make_pipeline):
+    client = CountingClient()
+    pipeline = make_pipeline(client=client, response_cache=ResponseCache(ResponseCacheConfig(enabled=True)))
+
+    await pipeline.execute(make_prompt(temperature=0.7))
+    await pipeline.execute(make_prompt(temperature=0.7))
+
+    assert client.post_calls == 2
+    assert pipeline.response_cache.get_metrics()["bypassed"] == 2
+
+
+@pytest.mark.asyncio
+async def test_disabled_cache_is_bypassed(make_pipeline):
+    client = CountingClient()
+    pipeline = make_pipeline(client=client, response_cache=ResponseCache(ResponseCacheConfig(enabled=False)))
+
+    await pipeline.execute(make_prompt())
+    await pipeline.execute(make_prompt())
+
+    assert client.post_calls == 2
+
+
+@pytest.mark.asyncio
+async def test_stream_is_replayed_from_cache(make_pipeline):
+    client = CountingClient(contents=("a", "b", "c"))
+    pipeline = make_pipeline(client=client, response_cache=ResponseCache(ResponseCacheConfig(enabled=True)))
+
+    first = [chunk async for chunk in pipeline.execute_stream(make_prompt())]
+    second = [chunk async for chunk in pipeline.execute_stream(make_prompt())]
+
+    assert client.stream_calls == 1
+    assert second == first
+    assert len(second) == 3
+
+
+@pytest.mark.asyncio
+async def test_abandoned_stream_is_not_cached(make_pipeline):
+    client = CountingClient(contents=("a", "b", "c"))
+    # Without coalescing the provider stream is read at the consumer's pace
+    pipeline = make_pipeline(client=client, response_cache=ResponseCache(ResponseCacheConfig(enabled=True)))
+
+    stream = pipeline.execute_stream(make_prompt())
+    await stream.__anext__()
+    await stream.aclose()
+    chunks = [chunk async for chunk in pipeline.execute_stream(make_prompt())]
+
+    assert client.stream_calls == 2
+    assert len(chunks) == 3
+
+
+@pytest.mark.asyncio
+async def test_stream_replays_cached_non_streaming_response(make_pipeline):
+    client = CountingClient()
+    pipeline = make_pipeline(client=client, response_cache=ResponseCache(ResponseCacheConfig(enabled=True)))
+
+    await pipeline.execute(make_prompt())
+    chunks = [chunk async for chunk in pipeline.execute_stream(make_prompt())]
+
+    assert client.stream_calls == 0
+    assert chunks[0]["choices"][0]["delta"]["content"] == "cached answer"
+
+
+@pytest.mark.asyncio
+async def test_memory_tier_evicts_least_recently_used():
+    cache = ResponseCache(ResponseCacheConfig(enabled=True, max_entries=2))
+    requests = [{**REQUEST, "messages": [{"role": "user", "content": str(i)}]} for i in range(3)]
+
+    await cache.put_response(requests[0], OK_BODY)
+    await cache.put_response(requests[1], OK_BODY)
+    assert await cache.get_response(requests[0]) == OK_BODY
+    await cache.put_response(requests[2], OK_BODY)
+
+    assert await cache.get_response(requests[1]) is None
+    assert await cache.get_response(requests[0]) == OK_BODY
+
+
+@pytest.mark.asyncio
+async def test_entries_expire_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("services.llm_provider.response_cache.time.time", lambda: now[0])
+    cache = ResponseCache(ResponseCacheConfig(enabled=True, ttl=10))
+
+    await cache.put_response(REQUEST, OK_BODY)
+    now[0] += 5
+    assert await cache.get_response(REQUEST) == OK_BODY
+    now[0] += 10
+    assert await cache.get_response(REQUEST) is None
+
+
+@pytest.mark.asyncio
+async def test_sqlite_tier_survives_restart(tmp_path):
+    path = str(tmp_path / "cache" / "responses.sqlite3")
+    cache = ResponseCache(ResponseCacheConfig(enabled=True, sqlite_path=path))
+    await cache.put_response(REQUEST, OK_BODY)
+    cache.close()
+
+    restarted = ResponseCache(ResponseCacheConfig(enabled=True, sqlite_path=path))
+    try:
+        assert await restarted.get_response(REQUEST) == OK_BODY
+        assert restarted.get_metrics()["disk_hits"] == 1
+    finally:
+        restarted.close()
@@ -0,0 +1,121 @@
+"""
+Tests for byte-level server-sent events decoding of provider streams.
+"""
+
+import json
+
+import pytest
+
+from services.llm_provider import sse
+from services.llm_provider.sse import SSEDecoder, SSEJSONDecoder, get_json_backend, iter_sse_json
+
+BACKENDS = [name for name in ("json", "orjson", "msgspec") if sse._load_backend(name)]
+
+
+def chunk(content):
+    return {"choices": [{"index": 0, "delta": {"content": content}}]}
+
+
+def sse_body(*events, terminator="\n\n"):
+    return "".join(f"data: {json.dumps(event)}{terminator}" for event in events).encode()
+
+
+def decode_in_reads(body, read_size, backend="json"):
+    decoder = SSEJSONDecoder(get_json_backend(backend))
+    chunks = []
+    for start in range(0, len(body), read_size):
+        chunks.extend(decoder.feed(body[start:start + read_size]))
+    return chunks + decoder.flush()
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("read_size", [1, 3, 7, 4096])
+def test_chunks_survive_any_read_boundaries(backend, read_size):
+    events = [chunk("héllo"), chunk(" wörld ✓"), chunk("")]
+    body = sse_body(*events) + b"data: [DONE]\n\n"
+
+    assert decode_in_reads(body, read_size, backend) == events
+
+
+@pytest.mark.parametrize("read_size", [1, 5, 4096])
+def test_crlf_and_cr_line_endings(read_size):
+    body = sse_body(chunk("a"), terminator="\r\n\r\n") + sse_body(chunk("b"), terminator="\r\r")
+
+    assert decode_in_reads(body, read_size) == [chunk("a"), chunk("b")]
+
+
+def test_multi_line_data_and_comments():
+    decoder = SSEDecoder()
+    payloads = decoder.feed(
+        b": keep-alive\n"
+        b"event: message\n"
+        b"id: 1\n"
+        b'data: {"a":\n'
+        b"data:1}\n"
+        b"retry: 100\n"
+        b"\n"
+        b"data\n"
+        b"\n"
+        b"data:\n"
+        b"\n"
+        b"data\n"
+        b"data: 2\n"
+        b"\n"
+    )
+
+    assert payloads == [b'{"a":\n1}', b"\n2"]
+
+
+def test_done_stops_the_stream():
+    decoder = SSEJSONDecoder(get_json_backend("json"))
+    chunks = decoder.feed(sse_body(chunk("a")) + b"data: [DONE]\n\n" + sse_body(chunk("late")))
+
+    assert chunks == [chunk("a")]
+    assert decoder.done
+    assert decoder.feed(sse_body(chunk("later"))) == []
+
+
+def test_unterminated_event_is_flushed():
+    decoder = SSEJSONDecoder(get_json_backend("json"))
+
+    assert decoder.feed(sse_body(chunk("a")) + b'data: {"last": true}') == [chunk("a")]
+    assert decoder.flush() == [{"last": True}]
+
+
+def test_events_without_blank_lines_are_parsed_per_line():
+    body = sse_body(chunk("a"), chunk("b"), terminator="\n") + b"data: [DONE]\n"
+
+    assert decode_in_reads(body, 4096) == [chunk("a"), chunk("b")]
+
+
+def test_invalid_json_is_skipped():
+    body = b"data: not json\n\n" + sse_body(chunk("a"))
+
+    assert decode_in_reads(body, 4096) == [chunk("a")]
+
+
+def test_backend_selection(monkeypatch):
+    assert get_json_backend("json").name == "json"
+    assert get_json_backend("auto").name == next((name for name in ("orjson", "msgspec") if name in BACKENDS), "json")
+    with pytest.raises(ValueError):
+        get_json_backend("yaml")
+
+    monkeypatch.setattr(sse, "_load_backend",
+                        lambda name: None if name != "json" else sse.JSONBackend("json", json.loads, (ValueError,)))
+    assert get_json_backend("orjson").name == "json"
+    assert get_json_backend("auto").name == "json"
+
+
+@pytest.mark.asyncio
+async def test_iter_sse_json_stops_reading_at_done():
+    reads = []
+
+    async def byte_stream():
+        for data in [sse_body(chunk("a"))[:10], sse_body(chunk("a"))[10:], b"data: [DONE]\n\n", b"never read"]:
+            reads.append(data)
+            yield data
+
+    chunks = [parsed async for parsed in iter_sse_json(byte_stream(), get_json_backend("json"))]
+
+    assert chunks == [chunk("a")]
+    assert len(reads) == 3
@@ -0,0 +1,139 @@
+"""
+Tests for compacting the tool definitions sent with every request.
+"""
+
+import json
+
+from services.llm_provider.base_converter import BaseConverter
+from services.llm_provider.context_window import get_tokenizer
+from services.llm_provider.tool_compaction import (
+    ToolCompactionConfig,
+    ToolCompactor,
+    drop_unused_definitions,
+    shorten_text,
+    strip_schema,
+)
+
+CHARS = get_tokenizer("chars")
+ADDRESS = {
+    "type": "object",
+    "title": "Address",
+    "description": "A postal address",
+    "properties": {
+        "street": {"type": "string", "description": "Street and house number"},
+        "city": {"type": "string", "description": "City name"},
+        "postal_code": {"type": "string", "description": "Postal or ZIP code"},
+        "country": {"type": "string", "description": "ISO 3166 country code"},
+    },
+    "required": ["street", "city"],
+}
+
+
+def make_tool(name, parameters, description="Ship a parcel."):
+    return {"type": "function", "function": {"name": name, "description": description, "parameters": parameters}}
+
+
+def test_annotation_keywords_are_stripped_but_properties_keep_their_names():
+    schema = {
+        "$schema": "https://json-schema.org/draft/2020-12/schema",
+        "title": "Arguments",
+        "type": "object",
+        "additionalProperties": True,
+        "properties": {
+            "title": {"type": "string", "title": "Title", "description": "  Title of the\n   issue  "},
+            "labels": {"type": "array", "items": {"type": "string", "title": "Label", "$comment": "free text"}},
+            "body": {"type": "string", "description": ""},
+        },
+        "required": [],
+    }
+
+    assert strip_schema(schema) == {
+        "type": "object",
+        "properties": {
+            "title": {"type": "string", "description": "Title of the issue"},
+            "labels": {"type": "array", "items": {"type": "string"}},
+            "body": {"type": "string"},
+        },
+    }
+    # The schema itself is left untouched
+    assert schema["properties"]["title"]["title"] == "Title"
+
+
+def test_unreferenced_definitions_are_dropped():
+    schema = {
+        "type": "object",
+        "properties": {"point": {"$ref": "#/$defs/point"}},
+        "$defs": {
+            "point": {"type": "object", "properties": {"x": {"$ref": "#/$defs/coordinate"}}},
+            "coordinate": {"type": "number"},
+            "unused": {"type": "string"},
+        },
+    }
+
+    assert set(drop_unused_definitions(schema)["$defs"]) == {"point", "coordinate"}
+    assert "$defs" not in drop_unused_definitions({"type": "object", "$defs": {"unused": {"type": "string"}}})
+
+
+def test_repeated_subschemas_are_shared():
+    tool = make_tool("ship_parcel", {
+        "type": "object",
+        "properties": {"sender": ADDRESS, "recipient": ADDRESS, "weight": {"type": "number"}},
+    })
+
+    compacted = ToolCompactor(ToolCompactionConfig(), tokenizer=CHARS).compact_tool(tool)
+    parameters = compacted["function"]["parameters"]
+
+    assert parameters["properties"]["sender"] == {"$ref": "#/$defs/sender"}
+    assert parameters["properties"]["recipient"] == {"$ref": "#/$defs/sender"}
+    assert parameters["properties"]["weight"] == {"type": "number"}
+    assert parameters["$defs"]["sender"] == strip_schema(ADDRESS)
+    assert len(json.dumps(compacted)) < len(json.dumps(tool))
+    # Simple schemas come out unchanged
+    simple = make_tool("echo", {"type": "object", "properties": {"text": {"type": "string"}}, "required": ["text"]})
+    assert ToolCompactor(ToolCompactionConfig(), tokenizer=CHARS).compact_tool(simple) == simple
+
+
+def test_descriptions_are_shortened_to_the_budget():
+    tokenizer = get_tokenizer("chars")
+    text = "Ship a parcel to a recipient. Prices depend on weight. Tracking is included for every parcel."
+
+    assert shorten_text(text, 0, tokenizer) == text
+    assert shorten_text(text, 15, tokenizer) == "Ship a parcel to a recipient. Prices depend on weight."
+    shortened = shorten_text(text, 4, tokenizer)
+    assert shortened.endswith("…") and tokenizer.count(shortened) <= 4
+
+    compactor = ToolCompactor(ToolCompactionConfig(description_tokens=8), tokenizer=tokenizer)
+    compacted = compactor.compact_tool(make_tool("ship_parcel", {}, text))
+    assert compacted["function"]["description"] == "Ship a parcel to a recipient."
+
+
+def test_converter_compacts_once_and_reports_tokens():
+    converter = BaseConverter("test-model")
+    catalog = [
+        make_tool("ship_parcel", {"type": "object", "properties": {"sender": ADDRESS, "recipient": ADDRESS}}),
+        make_tool("echo", {"type": "object", "properties": {"text": {"type": "string"}}}),
+    ]
+    subset = catalog[1:]
+
+    provider_tools = converter.convert_kernel_tools_to_provider(catalog)
+    converter.convert_kernel_tools_to_provider(subset)
+    # Alternating lists keep their converted, compacted form
+    assert converter.convert_kernel_tools_to_provider(catalog) is provider_tools
+    assert provider_tools[0]["function"]["parameters"]["properties"]["sender"]["$ref"] == "#/$defs/sender"
+
+    report = converter.get_tool_token_report()
+    assert report["tools"] == 2
+    assert list(report["per_tool"]) == ["ship_parcel", "echo"]
+    assert report["total_tokens"] == sum(tool["tokens"] for tool in report["per_tool"].values())
+    assert report["total_tokens"] < report["original_total_tokens"]
+    assert report["per_tool"]["echo"]["tokens"] == report["per_tool"]["echo"]["original_tokens"]
+
+
+def test_disabled_compaction_passes_tools_through():
+    tool = make_tool("ship_parcel", {"type": "object", "title": "Arguments", "properties": {"sender": ADDRESS}})
+    compactor = ToolCompactor(ToolCompactionConfig(enabled=False), tokenizer=CHARS)
+    tools = [tool]
+
+    assert compactor.compact_tools(tools) is tools
+    report = compactor.get_report(tools)
+    assert report["total_tokens"] == report["original_total_tokens"] > 0
@@ -0,0 +1,192 @@
+"""
+Tests for starting read-only tools while the model is still streaming.
+"""
+
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+
+from gcs_kernel.models import PromptObject, ToolInclusionPolicy, ToolResult
+from gcs_kernel.tool_call_model import ToolCall
+from services.ai_orchestrator.early_tool_executor import EarlyToolExecutor
+from services.ai_orchestrator.turn_manager import TurnManager, TurnEventType
+from services.llm_provider.base_generator import BaseContentGenerator
+from services.llm_provider.stream_accumulator import JSONCompletenessScanner, StreamAccumulator
+
+
+class ReadOnlyTool:
+    name = "read_file"
+    read_only = True
+
+
+class WritingTool:
+    name = "write_file"
+
+
+class RecordingToolExecutionManager:
+    """Records when each tool call starts and lets the test decide when it finishes."""
+
+    def __init__(self, events):
+        self.events = events
+        self.started = []
+
+    async def execute_tool_call(self, tool_call: ToolCall):
+        self.started.append(tool_call.id)
+        self.events.append(f"start:{tool_call.id}")
+        await asyncio.sleep(0)
+        result = ToolResult(tool_name=tool_call.name, success=True,
+                            llm_content=f"result of {tool_call.id}", return_display="")
+        return {"tool_call_id": tool_call.id, "tool_name": tool_call.name, "result": result, "success": True}
+
+
+class ReadyCallbackContentGenerator(BaseContentGenerator):
+    """Streams two tool calls, reporting each as ready before the stream ends."""
+
+    def __init__(self, events, tool_calls):
+        self.events = events
+        self.tool_calls = tool_calls
+        self.stream_count = 0
+
+    async def generate_response(self, prompt_obj):
+        prompt_obj.result_content = "done"
+
+    async def stream_response(self, prompt_obj, on_tool_call_ready=None):
+        self.stream_count += 1
+        if self.stream_count > 1:
+            # The follow-up after the tool results just answers
+            yield "done"
+            prompt_obj.result_content = "done"
+            return
+        for tool_call in self.tool_calls:
+            if on_tool_call_ready:
+                on_tool_call_ready(tool_call)
+            # Let early executions start before the rest of the stream arrives
+            await asyncio.sleep(0)
+            self.events.append(f"chunk:{tool_call['id']}")
+            yield "."
+        self.events.append("stream_end")
+        prompt_obj.result_content = "..."
+        for tool_call in self.tool_calls:
+            prompt_obj.add_tool_call(tool_call)
+
+
+def make_tool_call(call_id, name, arguments='{"path": "a.txt"}'):
+    return {"id": call_id, "type": "function", "function": {"name": name, "arguments": arguments}}
+
+
+def make_registry():
+    registry = MagicMock()
+    registry.get_all_tools.return_value = {"read_file": ReadOnlyTool(), "write_file": WritingTool()}
+    return registry
+
+
+def make_turn_manager(events, tool_calls):
+    generator = ReadyCallbackContentGenerator(events, tool_calls)
+    turn_manager = TurnManager(MagicMock(), generator)
+    turn_manager.registry = make_registry()
+    turn_manager.tool_execution_manager = RecordingToolExecutionManager(events)
+    return turn_manager
+
+
+def test_scanner_detects_closing_brace_across_fragments():
+    scanner = JSONCompletenessScanner()
+
+    assert not scanner.feed('{"text": "a }')
+    assert not scanner.feed(' \\" {[", "n": [1, {')
+    assert not scanner.feed("}]")
+    assert scanner.feed("}  ")
+
+    trailing = JSONCompletenessScanner()
+    trailing.feed("{}")
+    assert not trailing.feed(",")
+    assert trailing.invalid
+
+    assert not JSONCompletenessScanner().feed('"text"')
+
+
+def test_accumulator_reports_tool_call_once_arguments_close():
+    accumulator = StreamAccumulator()
+
+    def tool_delta(index, **fields):
+        return {"choices": [{"index": 0, "delta": {"tool_calls": [{"index": index, **fields}]}}]}
+
+    accumulator.add(tool_delta(0, id="call_a", type="function", function={"name": "read_file", "arguments": '{"pa'}))
+    accumulator.add(tool_delta(1, id="call_b", type="function", function={"name": "list_directory", "arguments": "{"}))
+    assert accumulator.pop_ready_tool_calls() == []
+
+    accumulator.add(tool_delta(0, function={"arguments": 'th": "a.txt"}'}))
+    assert accumulator.pop_ready_tool_calls() == [
+        {"id": "call_a", "type": "function", "function": {"name": "read_file", "arguments": '{"path": "a.txt"}'}}
+    ]
+    assert accumulator.pop_ready_tool_calls() == []
+
+    accumulator.add(tool_delta(1, function={"arguments": "}"}))
+    assert [call["id"] for call in accumulator.pop_ready_tool_calls()] == ["call_b"]
+
+
+@pytest.mark.asyncio
+async def test_executor_only_starts_read_only_tools():
+    events = []
+    manager = RecordingToolExecutionManager(events)
+    executor = EarlyToolExecutor(manager, make_registry())
+
+    executor.submit(make_tool_call("call_read", "read_file"))
+    executor.submit(make_tool_call("call_read", "read_file"))
+    executor.submit(make_tool_call("call_write", "write_file"))
+    executor.submit(make_tool_call("call_unknown", "unknown_tool"))
+    await asyncio.sleep(0)
+
+    assert manager.started == ["call_read"]
+    assert executor.started_count == 1
+    assert executor.take(ToolCall.from_openai_format(make_tool_call("call_write", "write_file"))) is None
+    task = executor.take(ToolCall.from_openai_format(make_tool_call("call_read", "read_file")))
+    assert (await task)["result"].llm_content == "result of call_read"
+
+
+@pytest.mark.asyncio
+async def test_executor_discards_execution_when_final_call_differs():
+    manager = RecordingToolExecutionManager([])
+    executor = EarlyToolExecutor(manager, make_registry())
+
+    executor.submit(make_tool_call("call_read", "read_file", '{"path": "a.txt"}'))
+    changed = ToolCall.from_openai_format(make_tool_call("call_read", "read_file", '{"path": "b.txt"}'))
+
+    assert executor.take(changed) is None
+    assert executor.started_count == 0
+
+
+@pytest.mark.asyncio
+async def test_read_only_tool_starts_before_stream_ends():
+    events = []
+    turn_manager = make_turn_manager(events, [
+        make_tool_call("call_read", "read_file"),
+        make_tool_call("call_write", "write_file"),
+    ])
+    prompt_obj = PromptObject.create(content="read and write", streaming_enabled=True,
+                                     tool_policy=ToolInclusionPolicy.NONE)
+
+    turn_events = [event async for event in turn_manager.run_turn(prompt_obj)]
+
+    # The read-only tool ran while streaming, the writing tool only after the response was complete
+    assert events.index("start:call_read") < events.index("stream_end")
+    assert events.index("start:call_write") > events.index("stream_end")
+    # Each tool ran exactly once and results are reported in the model's order
+    assert turn_manager.tool_execution_manager.started.count("call_read") == 1
+    responses = [event.value["call_id"] for event in turn_events if event.type == TurnEventType.TOOL_CALL_RESPONSE]
+    assert responses == ["call_read", "call_write"]
+    tool_messages = [message for message in prompt_obj.conversation_history if message["role"] == "tool"]
+    assert [message["content"] for message in tool_messages] == ["result of call_read", "result of call_write"]
+
+
+@pytest.mark.asyncio
+async def test_early_execution_can_be_disabled(monkeypatch):
+    from common.settings import settings
+    monkeypatch.setattr(settings, "early_tool_execution", False)
+    events = []
+    turn_manager = make_turn_manager(events, [make_tool_call("call_read", "read_file")])
+    prompt_obj = PromptObject.create(content="read", streaming_enabled=True, tool_policy=ToolInclusionPolicy.NONE)
+
+    [event async for event in turn_manager.run_turn(prompt_obj)]
+
+    assert events.index("start:call_read") > events.index("stream_end")
@@ -219,8 +219,9 @@ async def test_turn_manager_with_tool_calls_streaming():
     async for event in turn_manager.run_turn(prompt_obj):
         events.append(event)
     
-    # Verify that streaming path was used
-    assert content_generator.stream_response_call_count == 1
+    # Verify that streaming path was used for the first response and the one after the tool results
+    assert content_generator.stream_response_call_count == 2
+    assert content_generator.generate_response_call_count == 0
     
     # Verify that tool call events were generated
     tool_request_events = [e for e in events if e.type == TurnEventType.TOOL_CALL_REQUEST]
@@ -304,4 +305,65 @@ async def test_turn_manager_with_tool_calls_non_streaming():
     
     # Verify completion
     finished_events = [e for e in events if e.type == TurnEventType.FINISHED]
-    assert len(finished_events) > 0
\ No newline at end of file
+    assert len(finished_events) > 0
+
+@pytest.mark.asyncio
+async def test_turn_manager_streams_every_tool_loop_iteration():
+    """Test that responses after tool results are streamed chunk by chunk, not replayed at the end."""
+
+    class MultiIterationContentGenerator(BaseContentGenerator):
+        """Requests a tool in the first two responses and answers in the third."""
+
+        def __init__(self):
+            self.stream_response_call_count = 0
+            self.generate_response_call_count = 0
+            self.streaming_flags = []
+
+        async def generate_response(self, prompt_obj):
+            self.generate_response_call_count += 1
+
+        async def stream_response(self, prompt_obj):
+            self.stream_response_call_count += 1
+            self.streaming_flags.append(prompt_obj.streaming_enabled)
+            iteration = self.stream_response_call_count
+            chunks = [f"step {iteration} ", "done "] if iteration < 3 else ["final ", "answer"]
+            for chunk in chunks:
+                yield chunk
+            prompt_obj.result_content = "".join(chunks)
+            if iteration < 3:
+                prompt_obj.add_tool_call({
+                    "id": f"call_{iteration}",
+                    "function": {"name": "test_tool", "arguments": "{}"}
+                })
+
+    tool_result = ToolResult(tool_name="test_tool", llm_content="ok", return_display="ok", success=True)
+    mock_tool_execution_manager = AsyncMock()
+    mock_tool_execution_manager.execute_tool_call = AsyncMock(
+        return_value={"tool_call_id": "call", "tool_name": "test_tool", "result": tool_result, "success": True}
+    )
+
+    content_generator = MultiIterationContentGenerator()
+    turn_manager = TurnManager(AsyncMock(), content_generator)
+    turn_manager.tool_execution_manager = mock_tool_execution_manager
+    prompt_obj = PromptObject.create(content="Test prompt", streaming_enabled=True)
+
+    events = [event async for event in turn_manager.run_turn(prompt_obj)]
+
+    assert content_generator.stream_response_call_count == 3
+    assert content_generator.generate_response_call_count == 0
+    assert content_generator.streaming_flags == [True, True, True]
+    assert prompt_obj.streaming_enabled is True
+
+    contents = [e.value for e in events if e.type == TurnEventType.CONTENT]
+    # Deltas of every iteration arrive individually, with tool progress in between, and nothing is repeated
+    assert contents == [
+        "step 1 ", "done ", "[test_tool: {}]\n",
+        "step 2 ", "done ", "[test_tool: {}]\n",
+        "final ", "answer",
+    ]
+    # Tool progress events precede the follow-up content they led to
+    first_response = next(i for i, e in enumerate(events) if e.type == TurnEventType.TOOL_CALL_RESPONSE)
+    first_follow_up = next(i for i, e in enumerate(events) if e.value == "step 2 ")
+    assert first_response < first_follow_up
+    assert prompt_obj.result_content == "final answer"
+    assert events[-1].type == TurnEventType.FINISHED
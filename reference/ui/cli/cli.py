@@ -7,11 +7,12 @@ This module implements the CLI using new common UI components with proper async
 
 import asyncio
 import hashlib
+from typing import Optional
 from gcs_kernel.kernel import GCSKernel
 from gcs_kernel.models import MCPConfig
 from gcs_kernel.mcp.client import MCPClient
 from gcs_kernel.mcp.client_manager import MCPClientManager
-from ui.common.kernel_api import KernelAPIClient
+from ui.common.kernel_api import KernelAPIClient, UnixSocketKernelAPIClient
 from ui.common.cli_ui import CLIUI
 
 
@@ -23,7 +24,16 @@ def main():
     parser.add_argument("--config", type=str, help="Path to configuration file")
     parser.add_argument("--mode", type=str, choices=["cli", "server", "api"], 
                         default="cli", help="Operation mode")
+    parser.add_argument("--socket", type=str,
+                        help="Connect to a kernel serving this Unix domain socket instead of starting one")
+    parser.add_argument("--session", type=str,
+                        help="Resume and persist the conversation under this session ID "
+                             "(requires SESSION_STORE_PATH on the kernel)")
     args = parser.parse_args()
+
+    if args.socket:
+        asyncio.run(_run_socket_cli(args.socket, args.session))
+        return
     
     # Initialize the kernel
     kernel = GCSKernel()
@@ -37,20 +47,11 @@ def main():
             if args.mode == "cli":
                 # Wait for kernel to initialize before starting CLI
                 max_wait = 10  # seconds to wait for kernel initialization
-                wait_interval = 0.1
-                elapsed = 0
-                while elapsed < max_wait:
-                    # Check if kernel has completed full initialization
-                    if getattr(kernel, '_fully_initialized', False):
-                        break
-                    await asyncio.sleep(wait_interval)  # Use async sleep to allow other tasks to run
-                    elapsed += wait_interval
-                
-                if elapsed >= max_wait:
+                if not await kernel.wait_until_initialized(max_wait):
                     print(f"Warning: Kernel initialization took longer than {max_wait} seconds, proceeding anyway...")
                 
                 # Create the new clean kernel API client
-                kernel_api_client = KernelAPIClient(kernel)
+                kernel_api_client = KernelAPIClient(kernel, session_id=args.session)
                 
                 # Create the new CLI UI with proper async resource management
                 cli_ui = CLIUI(kernel_api_client)
@@ -85,5 +86,28 @@ def main():
     asyncio.run(_async_main())
 
 
+async def _run_socket_cli(socket_path: str, session_id: Optional[str] = None):
+    """
+    Run the interactive CLI against a kernel in another process.
+
+    Args:
+        socket_path: Path of the Unix domain socket the kernel serves
+            (see `python -m gcs_kernel --mode server --socket`)
+        session_id: Conversation session to resume and persist the prompts in, if any
+    """
+    kernel_api_client = UnixSocketKernelAPIClient(socket_path, session_id=session_id)
+    try:
+        await kernel_api_client.connect()
+    except OSError as e:
+        print(f"Could not connect to the kernel at unix://{socket_path}: {e}")
+        return
+    try:
+        await CLIUI(kernel_api_client)._interactive_loop()
+    except KeyboardInterrupt:
+        print("\nReceived interrupt signal...")
+    finally:
+        await kernel_api_client.close()
+
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -4,30 +4,37 @@ This provides a clean interface to the kernel that UI components can use.
 """
 
 import asyncio
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Optional
+from gcs_kernel.mcp.unix_socket import UnixSocketRPCClient
 from .base_ui import KernelAPIProtocol
 
 
 class KernelAPIClient(KernelAPIProtocol):
     """API client that provides clean interface to the kernel for UI components."""
     
-    def __init__(self, kernel):
+    def __init__(self, kernel, session_id: Optional[str] = None):
         """
         Initialize the kernel API client.
         
         Args:
             kernel: The GCSKernel instance to communicate with
+            session_id: Conversation session to resume and persist the prompts in, if any
         """
         self.kernel = kernel
+        self.session_id = session_id
     
     async def send_user_prompt(self, prompt: str) -> str:
         """Send a user prompt and receive a complete response."""
-        return await self.kernel.submit_prompt(prompt)
+        return await self.kernel.submit_prompt(prompt, **self._prompt_options())
     
     async def stream_user_prompt(self, prompt: str) -> AsyncGenerator[str, None]:
         """Stream a user prompt and receive chunks."""
-        async for chunk in self.kernel.stream_prompt(prompt):
+        async for chunk in self.kernel.stream_prompt(prompt, **self._prompt_options()):
             yield chunk
+
+    def _prompt_options(self) -> dict:
+        """Keyword arguments of the kernel's prompt methods, carrying the session ID if one is set."""
+        return {"session_id": self.session_id} if self.session_id else {}
     
     def get_kernel_status(self) -> str:
         """Get kernel status."""
@@ -106,4 +113,100 @@ class KernelAPIClient(KernelAPIProtocol):
                 elif expected_type == 'number' and not isinstance(param_value, (int, float)):
                     raise ValueError(f"Parameter '{param_name}' should be a number")
                 elif expected_type == 'boolean' and not isinstance(param_value, bool):
-                    raise ValueError(f"Parameter '{param_name}' should be a boolean")
\ No newline at end of file
+                    raise ValueError(f"Parameter '{param_name}' should be a boolean")
+
+
+class RPCKernelAPIClient(KernelAPIProtocol):
+    """
+    API client for UI components talking to the kernel through the JSON-RPC
+    methods of its MCPServer, over any of the local RPC clients.
+
+    With an InProcessRPCClient it exercises the same request path as a
+    frontend connected over the Unix socket, without any serialization.
+    """
+
+    def __init__(self, rpc, session_id: Optional[str] = None):
+        """
+        Initialize the kernel API client.
+
+        Args:
+            rpc: UnixSocketRPCClient or InProcessRPCClient to send requests with
+            session_id: Conversation session to resume and persist the prompts in, if any
+        """
+        self.rpc = rpc
+        self.session_id = session_id
+        self._status = "unknown"
+        self._tool_names: list = []
+
+    async def connect(self):
+        """Connect to the kernel and fetch its status and tool list."""
+        await self.rpc.connect()
+        await self.refresh_status()
+
+    async def close(self):
+        """Close the connection to the kernel."""
+        await self.rpc.close()
+
+    async def refresh_status(self):
+        """Refresh the cached kernel status and tool names."""
+        status = await self.rpc.request("kernel/status")
+        self._status = status.get("status", "unknown")
+        self._tool_names = status.get("tools", [])
+
+    async def send_user_prompt(self, prompt: str) -> str:
+        """Send a user prompt and receive a complete response."""
+        result = await self.rpc.request("ai/process", self._prompt_params(prompt))
+        return result.get("response", "")
+
+    async def stream_user_prompt(self, prompt: str) -> AsyncGenerator[str, None]:
+        """Stream a user prompt and receive chunks."""
+        async for chunk in self.rpc.stream("ai/stream", self._prompt_params(prompt)):
+            yield chunk
+
+    def _prompt_params(self, prompt: str) -> dict:
+        """Params of an AI request, carrying the session ID if one is set."""
+        params = {"prompt": prompt}
+        if self.session_id:
+            params["session_id"] = self.session_id
+        return params
+
+    def get_kernel_status(self) -> str:
+        """Get kernel status as of the last refresh."""
+        return f"Kernel running: {self._status == 'running'}"
+
+    async def get_available_tools(self):
+        """Get all available tools from the kernel, keyed by name."""
+        result = await self.rpc.request("tools/list")
+        tools = {tool["name"]: tool for tool in result.get("tools", [])}
+        self._tool_names = list(tools.keys())
+        return tools
+
+    def list_registered_tools(self) -> list:
+        """List tool names as of the last refresh."""
+        return list(self._tool_names)
+
+    async def execute_tool(self, tool_name: str, params: dict):
+        """Execute a tool in the kernel and return its MCP tools/call result."""
+        return await self.rpc.request("tools/call", {"name": tool_name, "arguments": params})
+
+    async def get_tool_result(self, execution_id: str):
+        """Tools executed over the socket return their result directly from execute_tool."""
+        return None
+
+
+class UnixSocketKernelAPIClient(RPCKernelAPIClient):
+    """
+    API client for UI components talking to a kernel in another process over
+    its Unix domain socket (see MCPServer.start_unix_socket).
+    """
+
+    def __init__(self, socket_path: str, session_id: Optional[str] = None):
+        """
+        Initialize the kernel API client.
+
+        Args:
+            socket_path: Path of the kernel's Unix domain socket
+            session_id: Conversation session to resume and persist the prompts in, if any
+        """
+        super().__init__(UnixSocketRPCClient(socket_path), session_id)
+